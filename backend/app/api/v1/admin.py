@@ -4,6 +4,8 @@ Provides:
 - GET /api/v1/admin/users - List all users with pagination (admin only)
 - POST /api/v1/admin/users - Create new user (admin only)
 - PATCH /api/v1/admin/users/{user_id} - Update user status (admin only)
+- GET /api/v1/admin/outbox/stats - Outbox queue statistics (admin only)
+- GET /api/v1/admin/cache/stats - In-process cache counters (admin only)
 """
 
 from datetime import UTC, datetime, timedelta
@@ -29,6 +31,9 @@ from app.models.outbox import Outbox
 from app.models.user import User
 from app.schemas.common import PaginatedResponse, PaginationMeta
 from app.schemas.user import AdminUserUpdate, UserCreate, UserRead
+from app.services.embedding_cache import query_embedding_cache
+from app.services.semantic_cache import semantic_answer_cache
+from app.services.single_flight import embedding_flight, vector_search_flight
 from app.workers.outbox_tasks import MAX_OUTBOX_ATTEMPTS
 
 
@@ -43,6 +48,48 @@ class OutboxStats(BaseModel):
     average_processing_time_ms: float | None
 
 
+class QueryEmbeddingCacheStats(BaseModel):
+    """Query embedding cache counters for the serving process."""
+
+    memory_hits: int
+    redis_hits: int
+    misses: int
+    redis_errors: int
+    hit_ratio: float
+    lru_entries: int
+    lru_capacity: int
+
+
+class SemanticAnswerCacheStats(BaseModel):
+    """Semantic answer cache counters for the serving process."""
+
+    hits: int
+    misses: int
+    stores: int
+    errors: int
+    hit_ratio: float
+    avg_hit_similarity: float
+
+
+class SingleFlightStats(BaseModel):
+    """Request coalescing counters for the serving process."""
+
+    calls: int
+    coalesced: int
+    remote_coalesced: int
+    lock_errors: int
+    in_flight: int
+
+
+class CacheStats(BaseModel):
+    """Cache statistics response."""
+
+    query_embedding: QueryEmbeddingCacheStats
+    semantic_answer: SemanticAnswerCacheStats
+    embedding_single_flight: SingleFlightStats
+    vector_search_single_flight: SingleFlightStats
+
+
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
@@ -349,3 +396,34 @@ async def get_outbox_stats(
         queue_depth=queue_depth,
         average_processing_time_ms=average_processing_time_ms,
     )
+
+
+@router.get(
+    "/cache/stats",
+    response_model=CacheStats,
+    responses={
+        401: {"description": "Not authenticated"},
+        403: {"description": "Not admin (is_superuser=False)"},
+    },
+)
+async def get_cache_stats(
+    _admin: User = Depends(current_superuser),
+) -> CacheStats:
+    """Get cache hit/miss and request coalescing counters (admin only).
+
+    Counters are kept per API process since startup.
+
+    Args:
+        admin: Current authenticated superuser.
+
+    Returns:
+        CacheStats: Hit/miss counters for each cache.
+    """
+    return CacheStats(
+        query_embedding=QueryEmbeddingCacheStats(**query_embedding_cache.get_stats()),
+        semantic_answer=SemanticAnswerCacheStats(**semantic_answer_cache.get_stats()),
+        embedding_single_flight=SingleFlightStats(**embedding_flight.get_stats()),
+        vector_search_single_flight=SingleFlightStats(
+            **vector_search_flight.get_stats()
+        ),
+    )
@@ -20,6 +20,7 @@ from app.schemas.knowledge_base import (
     KBCreate,
     KBListResponse,
     KBResponse,
+    KBSettings,
     KBUpdate,
     KnowledgeBaseListResponse,
     KnowledgeBaseResponse,
@@ -56,6 +57,7 @@ async def create_knowledge_base(
     - Collection name: kb_{uuid}
     - Vector size: 1536 (OpenAI ada-002)
     - Distance metric: Cosine similarity
+    - HNSW/quantization/on-disk options from settings.vector_index
     """
     kb_service = KBService(session)
 
@@ -64,7 +66,9 @@ async def create_knowledge_base(
 
     # Create Qdrant collection (AC2)
     try:
-        await qdrant_service.create_collection(kb.id)
+        await qdrant_service.create_collection(
+            kb.id, KBSettings.model_validate(kb.settings or {}).vector_index
+        )
     except Exception as e:
         # Log but don't fail - Qdrant collection can be created later
         logger.error(
@@ -90,6 +94,7 @@ async def create_knowledge_base(
         status=kb.status,
         document_count=0,
         total_size_bytes=0,
+        settings=KBSettings.model_validate(kb.settings or {}),
         created_at=kb.created_at,
         updated_at=kb.updated_at,
     )
@@ -152,6 +157,7 @@ async def get_knowledge_base(
         status=kb.status,
         document_count=doc_count,
         total_size_bytes=total_size,
+        settings=KBSettings.model_validate(kb.settings or {}),
         created_at=kb.created_at,
         updated_at=kb.updated_at,
     )
@@ -190,6 +196,22 @@ async def update_knowledge_base(
             detail="Knowledge Base not found",
         )
 
+    kb_settings = KBSettings.model_validate(kb.settings or {})
+
+    # Apply changed index settings to the existing Qdrant collection
+    if data.settings is not None and "vector_index" in data.settings.model_fields_set:
+        try:
+            await qdrant_service.update_collection_config(
+                kb.id, kb_settings.vector_index
+            )
+        except Exception as e:
+            # Log but don't fail - settings are saved and can be re-applied
+            logger.error(
+                "qdrant_collection_config_update_failed",
+                kb_id=str(kb.id),
+                error=str(e),
+            )
+
     # Get document stats
     doc_count, total_size = await kb_service.get_document_stats(kb_id)
 
@@ -201,6 +223,7 @@ async def update_knowledge_base(
         status=kb.status,
         document_count=doc_count,
         total_size_bytes=total_size,
+        settings=kb_settings,
         created_at=kb.created_at,
         updated_at=kb.updated_at,
     )
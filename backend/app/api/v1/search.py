@@ -2,10 +2,17 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import current_active_user
+from app.core.config import settings
+from app.core.database import get_async_session
 from app.models.user import User
 from app.schemas.search import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    ExplainBatchRequest,
+    ExplainBatchResponse,
     ExplainRequest,
     ExplanationResponse,
     QuickSearchRequest,
@@ -18,7 +25,9 @@ from app.services.explanation_service import (
     ExplanationService,
     get_explanation_service,
 )
+from app.services.kb_service import get_kb_permission_service
 from app.services.search_service import SearchService, get_search_service
+from app.services.sse_framing import coalesce_token_events, encode_sse_frame
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -30,6 +39,13 @@ async def search(
     stream: bool = Query(
         default=False, description="Enable SSE streaming for real-time results"
     ),
+    coalesce: bool | None = Query(
+        default=None,
+        description=(
+            "Coalesce answer tokens into timed frames and send sources before "
+            "synthesis (default: server setting). false = one event per token"
+        ),
+    ),
     current_user: User = Depends(current_active_user),
     service: SearchService = Depends(get_search_service),
 ) -> SearchResponse | StreamingResponse:
@@ -41,6 +57,7 @@ async def search(
     Args:
         request_body: Search request with query and optional filters
         stream: If True, return SSE stream. If False, return complete SearchResponse (AC1, AC8)
+        coalesce: Stream framing mode; None uses settings.sse_coalesce_tokens
         current_user: Authenticated user
         service: Search service dependency
 
@@ -57,11 +74,14 @@ async def search(
 
     SSE Event Sequence:
         1. StatusEvent - "Searching knowledge bases..."
-        2. StatusEvent - "Generating answer..."
-        3. TokenEvent* - Answer tokens word-by-word
-        4. CitationEvent* - Citation metadata when [n] detected
-        5. DoneEvent - Completion with confidence and result_count
+        2. SourcesEvent - Retrieved results (coalesced mode only)
+        3. StatusEvent - "Generating answer..."
+        4. TokenEvent* - Answer text, word-by-word or in coalesced frames
+        5. CitationEvent* - Citation metadata when [n] detected
+        6. DoneEvent - Completion with confidence and result_count
     """
+    if coalesce is None:
+        coalesce = settings.sse_coalesce_tokens
     try:
         result = await service.search(
             query=request_body.query,
@@ -69,6 +89,8 @@ async def search(
             user_id=str(current_user.id),
             limit=request_body.limit,
             stream=stream,
+            deadline_ms=request_body.deadline_ms,
+            include_sources=stream and coalesce,
         )
 
         # If streaming, return SSE response (AC1)
@@ -88,8 +110,22 @@ async def search(
                     )
                     yield error_event.to_sse_format()
 
+            async def coalesced_event_generator():
+                """Merge answer tokens into frames and encode them with orjson."""
+                try:
+                    async for event in coalesce_token_events(result):
+                        yield encode_sse_frame(event)
+                except Exception:
+                    from app.schemas.sse import ErrorEvent
+
+                    yield encode_sse_frame(
+                        ErrorEvent(
+                            message="Streaming error occurred", code="STREAM_ERROR"
+                        )
+                    )
+
             return StreamingResponse(
-                event_generator(),
+                coalesced_event_generator() if coalesce else event_generator(),
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",  # AC1
@@ -159,6 +195,52 @@ async def quick_search_route(
         ) from e
 
 
+@router.post("/batch", response_model=BatchSearchResponse)
+async def batch_search_route(
+    request_body: BatchSearchRequest,
+    current_user: User = Depends(current_active_user),
+    service: SearchService = Depends(get_search_service),
+) -> BatchSearchResponse:
+    """Batch search endpoint for running many queries over the same KBs.
+
+    Checks permissions once, embeds all queries in one request and sends one
+    batched vector search per Knowledge Base. Answer synthesis is opt-in.
+
+    Args:
+        request_body: Batch request with queries, optional kb_ids and limit
+        current_user: Authenticated user
+        service: Search service dependency
+
+    Returns:
+        BatchSearchResponse with one SearchResponse per query, in request order
+
+    Raises:
+        HTTPException: 404 if KB not found or unauthorized, 503 if services unavailable
+    """
+    try:
+        return await service.batch_search(
+            queries=request_body.queries,
+            kb_ids=request_body.kb_ids,
+            user_id=str(current_user.id),
+            limit=request_body.limit,
+            synthesize=request_body.synthesize,
+        )
+
+    except PermissionError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except ConnectionError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Search temporarily unavailable. Please try again in a moment.",
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Batch search failed: {str(e)}"
+        ) from e
+
+
 @router.post("/similar", response_model=SearchResponse)
 async def similar_search_route(
     request_body: SimilarSearchRequest,
@@ -188,6 +270,7 @@ async def similar_search_route(
             kb_ids=request_body.kb_ids,
             user_id=str(current_user.id),
             limit=request_body.limit,
+            source_kb_id=request_body.kb_id,
         )
         return result
 
@@ -260,3 +343,53 @@ async def explain_relevance(
         raise HTTPException(
             status_code=500, detail=f"Explanation failed: {str(e)}"
         ) from e
+
+
+@router.post("/explain/batch", response_model=ExplainBatchResponse)
+async def explain_relevance_batch(
+    request_body: ExplainBatchRequest,
+    current_user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+    service: ExplanationService = Depends(get_explanation_service),
+) -> ExplainBatchResponse:
+    """Explain why each result of a search is relevant, in one request.
+
+    Replaces one /explain call per result card: cache lookups, Qdrant
+    lookups and the LLM call are batched across all results.
+
+    Args:
+        request_body: Query and the results to explain
+        current_user: Authenticated user
+        session: Database session for the KB permission check
+        service: Explanation service dependency
+
+    Returns:
+        ExplainBatchResponse with one explanation per result, in request order
+
+    Raises:
+        HTTPException: 404 if the user lacks READ access to any result's KB
+                      503 if services unavailable
+    """
+    # Chunk stems and related documents are read from each result's KB
+    kb_ids = sorted({str(item.kb_id) for item in request_body.results})
+    permission_service = get_kb_permission_service(session)
+    if not await permission_service.check_permissions(
+        str(current_user.id), kb_ids, "READ"
+    ):
+        raise HTTPException(status_code=404, detail="Knowledge Base not found")
+
+    try:
+        explanations = await service.explain_batch(
+            query=request_body.query, items=request_body.results
+        )
+        return ExplainBatchResponse(explanations=explanations)
+
+    except ConnectionError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Explanation service temporarily unavailable. Please try again in a moment.",
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Explanation failed: {str(e)}"
+        ) from e
@@ -30,6 +30,53 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    acl_cache_ttl_seconds: int = 30  # Per-user KB permission snapshot TTL
+
+    # Query embedding cache (in-process LRU + binary Redis)
+    query_embedding_cache_ttl: int = 3600  # seconds
+    query_embedding_cache_dtype: str = "float32"  # "float32" or "float16"
+    query_embedding_lru_size: int = 2048  # entries held in-process
+    # Micro-batching of query embedding misses (engages at min_qps and above)
+    query_embedding_batch_enabled: bool = True
+    query_embedding_batch_window_ms: float = 5.0  # max wait for more queries
+    query_embedding_batch_max_size: int = 32  # queries per request
+    query_embedding_batch_min_qps: int = 20  # below this, embed immediately
+
+    # Chunk embedding cache (content-addressed, reused when reprocessing)
+    chunk_embedding_cache_enabled: bool = True
+    chunk_embedding_cache_ttl: int = 30 * 24 * 3600  # seconds, refreshed on hit
+    chunk_embedding_cache_max_mb: int = 512  # total vector bytes before LRU eviction
+
+    # Search result cache (invalidated by per-KB index generation)
+    search_result_cache_enabled: bool = True
+    search_result_cache_ttl: int = 900  # seconds
+
+    # Semantic answer cache (near-duplicate questions, stored in Qdrant)
+    semantic_cache_enabled: bool = True  # Per-KB opt-out via KB settings
+    semantic_cache_collection: str = "semantic_answer_cache"
+    # Min cosine similarity for a hit. ada-002 puts related but different
+    # questions at 0.90-0.97, so only near-verbatim rephrasings may match.
+    semantic_cache_threshold: float = 0.98
+    semantic_cache_ttl: int = 86400  # seconds
+
+    # Search latency budget (overridable per request via SearchRequest.deadline_ms)
+    search_deadline_ms: int = 15000  # embedding + retrieval + synthesis
+    search_retrieval_share: float = 0.3  # budget share before KB stragglers drop
+
+    # SSE streaming: coalesce LLM tokens into frames (stream=true&coalesce=false
+    # restores one event per token)
+    sse_coalesce_tokens: bool = True
+    sse_flush_interval_ms: int = 50  # flush buffered tokens at least this often
+    sse_flush_chars: int = 256  # ...or once this many characters are buffered
+
+    # Batch search (POST /search/batch)
+    search_batch_synthesis_concurrency: int = 4  # parallel LLM calls per batch
+
+    # Single-flight: identical concurrent embedding/Qdrant calls share one result
+    single_flight_enabled: bool = True
+    single_flight_distributed: bool = True  # Redis lock across API workers
+    single_flight_lock_ttl_ms: int = 5000  # max wait on another worker's call
+    single_flight_poll_interval_ms: int = 25
 
     # MinIO (S3-Compatible Object Storage)
     minio_endpoint: str = "localhost:9000"
@@ -64,12 +111,44 @@ class Settings(BaseSettings):
 
     # Embedding Configuration
     embedding_model: str = "text-embedding-ada-002"
-    embedding_batch_size: int = 20
+    # Batches are packed by token budget: ~32 texts at chunk_size=500. The
+    # count cap is only the provider's per-request input limit (OpenAI:
+    # 2048); a token-limit failure costs ~log2(n) extra calls to bisect.
+    embedding_batch_size: int = 2048
+    embedding_batch_max_tokens: int = 16000  # token budget per request
+    embedding_max_concurrent_batches: int = 4  # requests in flight per call
     embedding_max_retries: int = 5
     embedding_timeout: int = 30  # seconds per batch
+    # Cross-document micro-batching in workers: small submissions (below the
+    # token cap) are pooled through Redis for up to the window before flushing
+    embedding_microbatch_enabled: bool = True
+    embedding_microbatch_window_ms: int = 20
+    embedding_microbatch_max_tokens: int = 4000
+
+    # Shared LiteLLM rate limits (Redis token buckets, one per model). Off
+    # until set to the provider quota; chat limits apply to each chat model
+    llm_rate_limit_enabled: bool = True
+    embedding_rate_limit_rpm: int = 0  # requests/min, 0 = unlimited
+    embedding_rate_limit_tpm: int = 0  # tokens/min, 0 = unlimited
+    llm_rate_limit_rpm: int = 0
+    llm_rate_limit_tpm: int = 0
+    llm_rate_limit_burst_seconds: float = 5.0  # bucket capacity, in seconds of quota
+    llm_rate_limit_recovery_seconds: int = 60  # back to full rate after a 429
+    llm_rate_limit_min_scale: float = 0.1  # floor for the adaptive rate cut
+    # Chat completions give up after waiting this long for quota; search then
+    # returns retrieval-only results with synthesis_skipped="overloaded"
+    llm_rate_limit_max_wait_seconds: float = 2.0
 
     # LLM Configuration (for answer synthesis)
     llm_model: str = "gpt-4"  # Model for chat completion (synthesis)
+    synthesis_max_sources: int = 5  # top-ranked chunks offered as sources
+    synthesis_context_max_tokens: int = 2500  # token budget for packed sources
+    # Admission control: LLM calls beyond the limit wait in a bounded queue;
+    # when it is full or the wait times out, search returns retrieval-only
+    # results with synthesis_skipped="overloaded"
+    synthesis_max_concurrency: int = 16
+    synthesis_max_queue: int = 32
+    synthesis_queue_timeout_ms: int = 2000
 
     # Chunking Configuration
     chunk_size: int = 500  # target tokens
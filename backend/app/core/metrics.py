@@ -0,0 +1,84 @@
+"""Prometheus metrics for the API process.
+
+Exposed in text format on GET /metrics. Counters live per process; with
+several API workers, scrape each worker or front them with a Prometheus
+multiprocess setup.
+"""
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Latency buckets from sub-millisecond cache hits to long LLM syntheses
+STAGE_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+STAGE_DURATION_SECONDS = Histogram(
+    "lumikb_stage_duration_seconds",
+    "Duration of a named stage within an operation (see StageTimer)",
+    ["operation", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+# Admission control (see app.services.admission)
+ADMISSION_IN_FLIGHT = Gauge(
+    "lumikb_admission_in_flight",
+    "Calls currently holding an admission slot",
+    ["controller"],
+)
+ADMISSION_WAITING = Gauge(
+    "lumikb_admission_waiting",
+    "Calls waiting in the admission queue",
+    ["controller"],
+)
+ADMISSION_LIMIT = Gauge(
+    "lumikb_admission_limit",
+    "Configured admission limits (concurrency, queue)",
+    ["controller", "limit"],
+)
+ADMISSION_SHED = Counter(
+    "lumikb_admission_shed_total",
+    "Calls rejected by admission control",
+    ["controller", "reason"],
+)
+
+# Shared LiteLLM rate limiting (see app.integrations.llm_rate_limiter)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "lumikb_llm_rate_limit_wait_seconds",
+    "Time a LiteLLM call waited for the shared rate limiter",
+    ["limiter"],
+    buckets=STAGE_BUCKETS,
+)
+RATE_LIMITED_RESPONSES = Counter(
+    "lumikb_llm_rate_limited_total",
+    "LiteLLM calls rejected by the provider with 429",
+    ["limiter"],
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serialize the default registry.
+
+    Returns:
+        Tuple of (body, content type) for the /metrics response.
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
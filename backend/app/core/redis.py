@@ -2,6 +2,7 @@
 
 This module provides:
 - Async Redis client connection management
+- Binary (non-decoding) Redis client for packed vector payloads
 - Session storage for login metadata
 - Rate limiting for failed login attempts
 """
@@ -55,6 +56,34 @@ class RedisClient:
             cls._client = None
 
 
+class BinaryRedisClient:
+    """Singleton Redis client that returns raw bytes (no response decoding).
+
+    Used for binary payloads such as packed embedding vectors, which the
+    decode_responses=True client in RedisClient cannot round-trip.
+    """
+
+    _client: redis.Redis | None = None
+
+    @classmethod
+    async def get_client(cls) -> redis.Redis:
+        """Get or create the binary Redis client connection.
+
+        Returns:
+            redis.Redis: Async Redis client returning bytes.
+        """
+        if cls._client is None:
+            cls._client = redis.from_url(settings.redis_url, decode_responses=False)
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the binary Redis client connection."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+
 async def get_redis_client() -> redis.Redis:
     """FastAPI dependency for Redis client.
 
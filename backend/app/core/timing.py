@@ -0,0 +1,154 @@
+"""Per-stage latency measurement and latency budgets for request pipelines.
+
+StageTimer records wall-clock milliseconds per named stage, including stages
+that run concurrently as asyncio tasks, so completion logs can show where
+time was spent (e.g. embed / acl / kb_metadata / qdrant / synthesis). Each
+stage is also observed in the lumikb_stage_duration_seconds histogram and,
+inside an HTTP request, reported in the Server-Timing response header.
+
+Deadline carries a request's latency budget through those stages so each one
+can bound its own wait with the time that is actually left.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from app.core.metrics import STAGE_DURATION_SECONDS
+
+T = TypeVar("T")
+
+# Histogram children per (operation, stage); labels() takes a lock and
+# validates the labels on every call, about half of a stage's bookkeeping
+_stage_histograms: dict[tuple[str, str], Any] = {}
+
+# Stage durations (ms) of the current HTTP request, for the Server-Timing header
+server_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    "server_timings", default=None
+)
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    """Render stage durations as a Server-Timing header value.
+
+    Args:
+        timings: Stage name -> milliseconds.
+
+    Returns:
+        Header value, e.g. "acl;dur=1.2, embed;dur=35.0".
+    """
+    return ", ".join(f"{stage};dur={ms}" for stage, ms in timings.items())
+
+
+class StageTimer:
+    """Collects per-stage durations for a single request or task."""
+
+    def __init__(self, operation: str | None = None) -> None:
+        """Initialize the timer.
+
+        Args:
+            operation: Histogram label (e.g. "search"). None records the
+                stages in logs and Server-Timing only.
+        """
+        self.operation = operation
+        self.timings: dict[str, float] = {}
+
+    async def run(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """Await a stage and record its duration (also on failure).
+
+        Args:
+            stage: Stage name.
+            awaitable: Coroutine or future implementing the stage.
+
+        Returns:
+            The stage's result.
+        """
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._record(stage, time.perf_counter() - start)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Record the duration of a synchronous block (also on failure).
+
+        Args:
+            stage: Stage name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(stage, time.perf_counter() - start)
+
+    def start(self, stage: str, coro: Coroutine[Any, Any, T]) -> asyncio.Task[T]:
+        """Start a stage as a concurrent task; its duration is recorded on completion.
+
+        Args:
+            stage: Stage name.
+            coro: Coroutine implementing the stage.
+
+        Returns:
+            The running task.
+        """
+        return asyncio.create_task(self.run(stage, coro))
+
+    def as_dict(self) -> dict[str, float]:
+        """Stage durations in milliseconds, in completion order."""
+        return dict(self.timings)
+
+    def _record(self, stage: str, seconds: float) -> None:
+        ms = round(seconds * 1000, 1)
+        self.timings[stage] = ms
+        if self.operation is not None:
+            key = (self.operation, stage)
+            histogram = _stage_histograms.get(key)
+            if histogram is None:
+                histogram = _stage_histograms[key] = STAGE_DURATION_SECONDS.labels(*key)
+            histogram.observe(seconds)
+        request_timings = server_timings.get()
+        if request_timings is not None:
+            request_timings[stage] = ms
+
+
+class Deadline:
+    """Absolute point in time by which a request should complete."""
+
+    def __init__(self, budget_ms: int) -> None:
+        """Start the budget now.
+
+        Args:
+            budget_ms: Latency budget in milliseconds.
+        """
+        self.budget_ms = budget_ms
+        self._started_at = time.monotonic()
+        self._expires_at = self._started_at + budget_ms / 1000
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def share(self, fraction: float) -> "Deadline":
+        """Earlier deadline covering the first `fraction` of this budget.
+
+        Used to stop early stages (e.g. retrieval) from consuming the time
+        reserved for later ones (e.g. synthesis).
+
+        Args:
+            fraction: Portion of the budget, between 0 and 1.
+
+        Returns:
+            A Deadline that never expires after this one.
+        """
+        sub = Deadline(int(self.budget_ms * min(max(fraction, 0.0), 1.0)))
+        sub._started_at = self._started_at
+        sub._expires_at = self._started_at + sub.budget_ms / 1000
+        return sub
@@ -0,0 +1,19 @@
+"""Shared tiktoken encoder for token counting.
+
+Chunking, embedding batch packing, the LLM rate limiter's request estimates
+and synthesis context packing all count cl100k_base tokens (ada-002,
+text-embedding-3, GPT-3.5/4), so they share one encoder per process.
+"""
+
+from functools import lru_cache
+
+import tiktoken
+
+# Tiktoken encoding for OpenAI ada-002 / text-embedding-3 and GPT-3.5/4
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=1)
+def get_token_encoder() -> tiktoken.Encoding:
+    """Tiktoken encoder, loaded once per process."""
+    return tiktoken.get_encoding(ENCODING_NAME)
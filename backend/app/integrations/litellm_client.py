@@ -1,7 +1,8 @@
 """LiteLLM embedding client for generating document embeddings.
 
 Uses LiteLLM proxy for OpenAI-compatible embedding API calls.
-Implements batching, exponential backoff for rate limits, and cost tracking.
+Implements token-budgeted concurrent batching, a rate limiter shared by all
+workers (see llm_rate_limiter), backoff on rate limits, and cost tracking.
 
 Connection Management:
 - Provides explicit close_litellm_clients() for graceful shutdown
@@ -18,15 +19,27 @@ from litellm import acompletion, aembedding
 from litellm.exceptions import RateLimitError
 
 from app.core.config import settings
+from app.core.tokenizer import get_token_encoder
+from app.integrations.llm_rate_limiter import (
+    RateLimitWaitExceededError,
+    embedding_rate_limiter,
+    llm_rate_limiter,
+    retry_after_seconds,
+)
 
 logger = structlog.get_logger(__name__)
 
 # Suppress LiteLLM debug logging that causes issues during shutdown
 litellm.suppress_debug_info = True
 
-# Exponential backoff delays for rate limit (429) responses
+# Exponential backoff delays for rate limit (429) responses without a
+# Retry-After header
 RETRY_DELAYS = [30, 60, 120, 240, 300]  # seconds
 
+# Shorter backoff once the shared rate limiter enforces a configured quota:
+# it keeps 429s rare, so these only cover short spikes.
+LIMITED_RETRY_DELAYS = [1, 2, 4, 8, 16]  # seconds
+
 
 class EmbeddingError(Exception):
     """Base exception for embedding errors."""
@@ -37,19 +50,28 @@ class RateLimitExceededError(EmbeddingError):
 
 
 class TokenLimitExceededError(EmbeddingError):
-    """Raised when input exceeds token limit."""
+    """Raised when input exceeds token limit.
+
+    The provider rejects the whole request, so the error identifies the
+    failing batch: texts[chunk_index:chunk_index + batch_size]. When raised
+    by get_embeddings, `embeddings` holds the vectors of every batch that
+    succeeded (None for texts still to embed), so recovery only re-sends
+    the rest.
+    """
 
-    def __init__(self, message: str, chunk_index: int):
+    def __init__(self, message: str, chunk_index: int, batch_size: int = 1):
         super().__init__(message)
         self.chunk_index = chunk_index
+        self.batch_size = batch_size
+        self.embeddings: list[list[float] | None] | None = None
 
 
 class LiteLLMEmbeddingClient:
     """Client for generating embeddings via LiteLLM proxy.
 
     Features:
-    - Batched embedding requests (default: 20 chunks per batch)
-    - Exponential backoff on rate limits (429)
+    - Batches packed by token budget, several requests in flight at once
+    - Shared requests/tokens-per-minute limiter; Retry-After aware backoff
     - Token usage tracking for cost monitoring
     - OpenAI-compatible API via LiteLLM
     """
@@ -61,21 +83,30 @@ class LiteLLMEmbeddingClient:
         max_retries: int | None = None,
         api_base: str | None = None,
         api_key: str | None = None,
+        max_batch_tokens: int | None = None,
+        max_concurrent_batches: int | None = None,
     ):
         """Initialize the embedding client.
 
         Args:
             model: Embedding model name (default: from settings).
-            batch_size: Chunks per batch (default: from settings).
+            batch_size: Max chunks per batch (default: from settings).
             max_retries: Max retries for rate limits (default: from settings).
             api_base: LiteLLM proxy URL (default: from settings).
             api_key: API key for LiteLLM (default: from settings).
+            max_batch_tokens: Token budget per batch (default: from settings).
+            max_concurrent_batches: Batches in flight at once (default: from
+                settings).
         """
         self.model = model or settings.embedding_model
         self.batch_size = batch_size or settings.embedding_batch_size
         self.max_retries = max_retries or settings.embedding_max_retries
         self.api_base = api_base or settings.litellm_url
         self.api_key = api_key or settings.litellm_api_key
+        self.max_batch_tokens = max_batch_tokens or settings.embedding_batch_max_tokens
+        self.max_concurrent_batches = (
+            max_concurrent_batches or settings.embedding_max_concurrent_batches
+        )
 
         # Track total tokens for cost monitoring
         self.total_tokens_used = 0
@@ -86,7 +117,10 @@ class LiteLLMEmbeddingClient:
     ) -> list[list[float]]:
         """Generate embeddings for a list of texts.
 
-        Processes texts in batches and handles rate limits with exponential backoff.
+        Packs consecutive texts into batches under the token budget (and the
+        batch_size cap), sends up to max_concurrent_batches at once and
+        handles rate limits with exponential backoff. Output order matches
+        input order.
 
         Args:
             texts: List of text strings to embed.
@@ -96,54 +130,126 @@ class LiteLLMEmbeddingClient:
 
         Raises:
             RateLimitExceededError: If rate limit retries exhausted.
-            TokenLimitExceededError: If a text exceeds token limit.
+            TokenLimitExceededError: If a text exceeds token limit. The other
+                batches still run; their vectors are on the error.
             EmbeddingError: For other embedding failures.
         """
         if not texts:
             return []
 
-        all_embeddings: list[list[float]] = []
-        total_tokens = 0
-
-        # Process in batches
-        for batch_start in range(0, len(texts), self.batch_size):
-            batch_end = min(batch_start + self.batch_size, len(texts))
-            batch_texts = texts[batch_start:batch_end]
-
-            logger.debug(
-                "embedding_batch_started",
-                batch_start=batch_start,
-                batch_size=len(batch_texts),
-                total_texts=len(texts),
-            )
-
-            batch_embeddings, batch_tokens = await self._embed_batch_with_retry(
-                batch_texts, batch_start
-            )
-            all_embeddings.extend(batch_embeddings)
-            total_tokens += batch_tokens
+        batches = self._pack_batches(texts)
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
 
+        async def embed_batch(
+            batch_start: int, batch_texts: list[str], batch_tokens: int
+        ) -> tuple[list[list[float]], int] | TokenLimitExceededError:
+            async with semaphore:
+                logger.debug(
+                    "embedding_batch_started",
+                    batch_start=batch_start,
+                    batch_size=len(batch_texts),
+                    total_texts=len(texts),
+                )
+                try:
+                    return await self._embed_batch_with_retry(
+                        batch_texts, batch_start, batch_tokens
+                    )
+                except TokenLimitExceededError as e:
+                    # Not fatal to the other batches: the caller recovers
+                    # this one and keeps their vectors
+                    return e
+
+        tasks = [asyncio.create_task(embed_batch(*batch)) for batch in batches]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Stop the remaining batches once one has failed (or we are cancelled)
+            for task in tasks:
+                task.cancel()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Raise the earliest failed batch's error, as serial batching did
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(
+                outcome, asyncio.CancelledError | TokenLimitExceededError
+            ):
+                raise outcome
+
+        token_errors = [o for o in outcomes if isinstance(o, TokenLimitExceededError)]
+        if token_errors:
+            error = token_errors[0]
+            error.embeddings = [None] * len(texts)
+            for (batch_start, batch_texts, _), outcome in zip(
+                batches, outcomes, strict=True
+            ):
+                if isinstance(outcome, tuple):
+                    embeddings, tokens = outcome
+                    end = batch_start + len(batch_texts)
+                    error.embeddings[batch_start:end] = embeddings
+                    self.total_tokens_used += tokens
+            raise error
+
+        all_embeddings = [
+            embedding for embeddings, _ in outcomes for embedding in embeddings
+        ]
+        total_tokens = sum(tokens for _, tokens in outcomes)
         self.total_tokens_used += total_tokens
 
         logger.info(
             "embeddings_generated",
             text_count=len(texts),
+            batch_count=len(batches),
             total_tokens=total_tokens,
             embedding_dimensions=len(all_embeddings[0]) if all_embeddings else 0,
         )
 
         return all_embeddings
 
+    def _pack_batches(self, texts: list[str]) -> list[tuple[int, list[str], int]]:
+        """Split texts into consecutive batches under the token and count caps.
+
+        A text larger than the token budget gets a batch of its own, so a
+        provider token-limit error still points at that text.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            List of (start index in texts, batch texts, batch tokens).
+        """
+        encoder = get_token_encoder()
+        token_counts = [len(tokens) for tokens in encoder.encode_ordinary_batch(texts)]
+
+        batches: list[tuple[int, list[str], int]] = []
+        batch_start = 0
+        batch_tokens = 0
+        for index, text_tokens in enumerate(token_counts):
+            if index > batch_start and (
+                batch_tokens + text_tokens > self.max_batch_tokens
+                or index - batch_start >= self.batch_size
+            ):
+                batches.append((batch_start, texts[batch_start:index], batch_tokens))
+                batch_start = index
+                batch_tokens = 0
+            batch_tokens += text_tokens
+        batches.append((batch_start, texts[batch_start:], batch_tokens))
+        return batches
+
     async def _embed_batch_with_retry(
         self,
         texts: list[str],
         batch_start_index: int,
+        batch_tokens: int = 0,
     ) -> tuple[list[list[float]], int]:
         """Embed a batch of texts with retry logic for rate limits.
 
+        Each attempt first acquires from the shared rate limiter. A 429 pauses
+        every worker for the provider's Retry-After (or the backoff delay).
+
         Args:
             texts: Batch of texts to embed.
             batch_start_index: Starting index in the original list (for error reporting).
+            batch_tokens: Input tokens of the batch (for the tokens/min limit).
 
         Returns:
             Tuple of (embeddings list, tokens used).
@@ -154,14 +260,23 @@ class LiteLLMEmbeddingClient:
             EmbeddingError: For other failures.
         """
         for retry in range(self.max_retries):
+            await embedding_rate_limiter.acquire(batch_tokens, model=self.model)
             try:
                 return await self._call_embedding_api(texts)
 
             except RateLimitError as e:
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delays = (
+                        LIMITED_RETRY_DELAYS
+                        if embedding_rate_limiter.enabled
+                        else RETRY_DELAYS
+                    )
+                    delay = delays[min(retry, len(delays) - 1)]
+                await embedding_rate_limiter.penalize(delay, model=self.model)
                 if retry >= self.max_retries - 1:
                     break
 
-                delay = RETRY_DELAYS[min(retry, len(RETRY_DELAYS) - 1)]
                 logger.warning(
                     "embedding_rate_limit",
                     retry=retry + 1,
@@ -181,6 +296,7 @@ class LiteLLMEmbeddingClient:
                     raise TokenLimitExceededError(
                         f"Token limit exceeded: {e}",
                         chunk_index=batch_start_index,
+                        batch_size=len(texts),
                     ) from e
 
                 raise EmbeddingError(f"Embedding API error: {e}") from e
@@ -263,10 +379,12 @@ class LiteLLMEmbeddingClient:
             If stream=True: AsyncGenerator yielding chunks with delta content.
 
         Raises:
+            RateLimitWaitExceededError: If the shared quota is not available
+                within settings.llm_rate_limit_max_wait_seconds.
             EmbeddingError: If LLM API fails.
         """
         try:
-            response = await acompletion(
+            response = await rate_limited_acompletion(
                 model=settings.llm_model,  # e.g., "gpt-4"
                 messages=messages,
                 temperature=temperature,
@@ -293,6 +411,8 @@ class LiteLLMEmbeddingClient:
                 )
                 return response
 
+        except RateLimitWaitExceededError:
+            raise
         except Exception as e:
             logger.error("chat_completion_failed", error=str(e))
             raise EmbeddingError(f"LLM completion failed: {str(e)}") from e
@@ -302,6 +422,56 @@ class LiteLLMEmbeddingClient:
 embedding_client = LiteLLMEmbeddingClient()
 
 
+def estimate_chat_tokens(messages: list[dict], max_tokens: int | None) -> int:
+    """Estimate the tokens a chat completion counts against the quota.
+
+    Providers reserve prompt tokens plus max_tokens when admitting a request.
+
+    Args:
+        messages: Chat messages.
+        max_tokens: Output token cap of the request.
+
+    Returns:
+        Estimated token count.
+    """
+    encoder = get_token_encoder()
+    prompt = "\n".join(str(message.get("content") or "") for message in messages)
+    return len(encoder.encode_ordinary(prompt)) + (max_tokens or 0)
+
+
+async def rate_limited_acompletion(**kwargs):
+    """Call litellm.acompletion through the shared LLM rate limiter.
+
+    Use for every chat completion so all workers share one quota. A 429 is
+    recorded (pausing other callers for its Retry-After) and re-raised;
+    callers keep their own fallback behaviour.
+
+    Args:
+        **kwargs: Arguments for litellm.acompletion.
+
+    Returns:
+        The acompletion response (or stream).
+
+    Raises:
+        RateLimitWaitExceededError: If the quota is not available within
+            settings.llm_rate_limit_max_wait_seconds.
+    """
+    model = kwargs.get("model", "")
+    await llm_rate_limiter.acquire(
+        estimate_chat_tokens(kwargs.get("messages", []), kwargs.get("max_tokens")),
+        max_wait=settings.llm_rate_limit_max_wait_seconds,
+        model=model,
+    )
+    try:
+        return await acompletion(**kwargs)
+    except RateLimitError as e:
+        delay = retry_after_seconds(e)
+        await llm_rate_limiter.penalize(
+            LIMITED_RETRY_DELAYS[0] if delay is None else delay, model=model
+        )
+        raise
+
+
 async def get_embeddings(
     texts: list[str],
     model: str | None = None,
@@ -0,0 +1,330 @@
+"""Shared token-bucket rate limiting for LiteLLM calls.
+
+Every API and Celery worker acquires from the same Redis token buckets
+(requests/min and tokens/min) before calling the provider, so together they
+stay under its quota instead of discovering it through 429s and retrying in
+lockstep. Providers set quotas per model, so each model has its own buckets.
+The limiter stays off until a quota is configured.
+
+The buckets are updated atomically by Lua scripts using the Redis server
+clock, so workers never disagree about elapsed time. When a 429 still comes
+back:
+- every worker pauses until the provider's Retry-After has passed, and
+- the refill rate is halved (at most once per pause) and climbs back to the
+  configured quota linearly over llm_rate_limit_recovery_seconds.
+
+If Redis is unavailable the limiter lets calls through (fail open) and the
+caller's own retry handling applies. Callers that must answer quickly pass
+max_wait and get RateLimitWaitExceededError instead of queueing for quota.
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_WAIT_SECONDS, RATE_LIMITED_RESPONSES
+
+logger = structlog.get_logger(__name__)
+
+# Redis hash prefix for bucket state
+RATE_LIMIT_PREFIX = "llm_ratelimit:"
+
+# Idle bucket state expires; a fresh bucket starts full
+_STATE_TTL_MS = 10 * 60 * 1000
+
+# Up to this fraction is added to each wait so workers don't wake in lockstep
+_WAIT_JITTER = 0.1
+
+# Refill both buckets and take one request plus `cost` tokens, or return how
+# long to wait. The token capacity is at least `cost`, so a call larger than
+# the burst waits for its full cost instead of leaving the bucket in debt
+# and stalling every call behind it.
+# KEYS[1]: state hash
+# ARGV: rpm, tpm, cost, burst_seconds, recovery_seconds, ttl_ms
+# Returns: seconds to wait (string; 0 = acquired), current rate scale
+_ACQUIRE_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rpm, tpm, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local burst, recovery = tonumber(ARGV[4]), tonumber(ARGV[5])
+local s = redis.call("HMGET", KEYS[1], "req", "tok", "ts", "scale", "blocked")
+local ts = tonumber(s[3]) or now
+local elapsed = math.max(0, now - ts)
+local scale = math.min(1, (tonumber(s[4]) or 1) + elapsed / recovery)
+local req_rate, tok_rate = rpm * scale / 60, tpm * scale / 60
+local req_cap = math.max(1, req_rate * burst)
+local tok_cap = math.max(1, tok_rate * burst, cost)
+local req = math.min(req_cap, (tonumber(s[1]) or req_cap) + elapsed * req_rate)
+local tok = math.min(tok_cap, (tonumber(s[2]) or tok_cap) + elapsed * tok_rate)
+local wait = 0
+local blocked = tonumber(s[5]) or 0
+if blocked > now then
+    wait = blocked - now
+else
+    if rpm > 0 and req < 1 then
+        wait = (1 - req) / req_rate
+    end
+    if tpm > 0 and tok < cost then
+        wait = math.max(wait, (cost - tok) / tok_rate)
+    end
+    if wait == 0 then
+        req = req - 1
+        tok = tok - cost
+    end
+end
+redis.call("HSET", KEYS[1], "req", req, "tok", tok, "ts", now, "scale", scale)
+redis.call("PEXPIRE", KEYS[1], ARGV[6])
+return {tostring(wait), tostring(scale)}
+"""
+
+# Record a 429: pause everyone for `delay` seconds, drain the buckets and
+# halve the rate unless a pause from an earlier 429 is still running.
+# KEYS[1]: state hash
+# ARGV: delay, min_scale, recovery_seconds, ttl_ms
+# Returns: rate scale after the penalty (string)
+_PENALIZE_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local delay, min_scale = tonumber(ARGV[1]), tonumber(ARGV[2])
+local recovery = tonumber(ARGV[3])
+local s = redis.call("HMGET", KEYS[1], "ts", "scale", "blocked")
+local elapsed = math.max(0, now - (tonumber(s[1]) or now))
+local scale = math.min(1, (tonumber(s[2]) or 1) + elapsed / recovery)
+local blocked = tonumber(s[3]) or 0
+if blocked <= now then
+    scale = math.max(min_scale, scale / 2)
+end
+blocked = math.max(blocked, now + delay)
+redis.call("HSET", KEYS[1], "req", 0, "tok", 0, "ts", now, "scale", scale,
+    "blocked", blocked)
+redis.call("PEXPIRE", KEYS[1], ARGV[4])
+return tostring(scale)
+"""
+
+
+class RateLimitWaitExceededError(Exception):
+    """Raised when a call would wait longer than max_wait for quota."""
+
+    def __init__(self, name: str, wait: float) -> None:
+        super().__init__(f"{name} rate limit wait of {wait:.2f}s exceeds max_wait")
+        self.wait = wait
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read the provider's Retry-After hint from a rate limit error.
+
+    Args:
+        error: Exception raised by LiteLLM (carries the HTTP response).
+
+    Returns:
+        Seconds to wait, or None if the response has no usable header.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        headers = getattr(error, "litellm_response_headers", None)
+    if not headers:
+        return None
+    headers = {str(name).lower(): value for name, value in dict(headers).items()}
+
+    if "retry-after-ms" in headers:
+        try:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        except (TypeError, ValueError):
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMRateLimiter:
+    """Requests/min and tokens/min buckets shared by all workers via Redis.
+
+    Limits are read from settings (`{name}_rate_limit_rpm` and
+    `{name}_rate_limit_tpm`, 0 = unlimited) on every acquire and apply to
+    each model separately.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the limiter.
+
+        Args:
+            name: Limiter name ("embedding" or "llm"); selects the settings
+                and the Redis key prefix.
+        """
+        self.name = name
+        self.key = f"{RATE_LIMIT_PREFIX}{name}"
+        # Celery runs each task in a fresh event loop, so the client is
+        # recreated whenever the running loop changes
+        self._client: redis.Redis | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._closing_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def requests_per_minute(self) -> int:
+        return getattr(settings, f"{self.name}_rate_limit_rpm")
+
+    @property
+    def tokens_per_minute(self) -> int:
+        return getattr(settings, f"{self.name}_rate_limit_tpm")
+
+    @property
+    def enabled(self) -> bool:
+        return settings.llm_rate_limit_enabled and (
+            self.requests_per_minute > 0 or self.tokens_per_minute > 0
+        )
+
+    async def acquire(
+        self, tokens: int = 0, max_wait: float | None = None, model: str = ""
+    ) -> float:
+        """Wait until one request of `tokens` tokens fits the shared quota.
+
+        Args:
+            tokens: Tokens the call will consume (prompt plus max output).
+            max_wait: Longest total wait in seconds (default: unbounded).
+            model: Model the call goes to; selects its buckets.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            RateLimitWaitExceededError: If admission needs more than max_wait.
+        """
+        if not self.enabled:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            try:
+                client = self._get_client()
+                wait, _scale = await client.eval(
+                    _ACQUIRE_SCRIPT,
+                    1,
+                    self.key_for(model),
+                    self.requests_per_minute,
+                    self.tokens_per_minute,
+                    tokens,
+                    settings.llm_rate_limit_burst_seconds,
+                    settings.llm_rate_limit_recovery_seconds,
+                    _STATE_TTL_MS,
+                )
+            except Exception as e:
+                logger.warning(
+                    "llm_rate_limiter_unavailable", limiter=self.name, error=str(e)
+                )
+                break
+            wait = float(wait)
+            if wait <= 0:
+                break
+            wait += random.uniform(0, wait * _WAIT_JITTER)
+            if max_wait is not None and waited + wait > max_wait:
+                if waited:
+                    RATE_LIMIT_WAIT_SECONDS.labels(self.name).observe(waited)
+                logger.warning(
+                    "llm_rate_limit_wait_exceeded",
+                    limiter=self.name,
+                    tokens=tokens,
+                    wait_seconds=round(waited + wait, 3),
+                    max_wait_seconds=max_wait,
+                )
+                raise RateLimitWaitExceededError(self.name, waited + wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+        if waited:
+            RATE_LIMIT_WAIT_SECONDS.labels(self.name).observe(waited)
+            logger.debug(
+                "llm_rate_limit_wait",
+                limiter=self.name,
+                tokens=tokens,
+                waited_seconds=round(waited, 3),
+            )
+        return waited
+
+    async def penalize(self, delay: float, model: str = "") -> None:
+        """Record a 429 so every worker pauses and slows down.
+
+        Args:
+            delay: Seconds all workers should wait (Retry-After or backoff).
+            model: Model that returned the 429.
+        """
+        RATE_LIMITED_RESPONSES.labels(self.name).inc()
+        if not self.enabled:
+            return
+        try:
+            client = self._get_client()
+            scale = await client.eval(
+                _PENALIZE_SCRIPT,
+                1,
+                self.key_for(model),
+                delay,
+                settings.llm_rate_limit_min_scale,
+                settings.llm_rate_limit_recovery_seconds,
+                _STATE_TTL_MS,
+            )
+        except Exception as e:
+            logger.warning(
+                "llm_rate_limiter_unavailable", limiter=self.name, error=str(e)
+            )
+            return
+        logger.warning(
+            "llm_rate_limited",
+            limiter=self.name,
+            model=model,
+            pause_seconds=round(delay, 3),
+            rate_scale=round(float(scale), 3),
+        )
+
+    def key_for(self, model: str) -> str:
+        """Redis key of the bucket state for one model."""
+        return f"{self.key}:{model}" if model else self.key
+
+    def _get_client(self) -> redis.Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                self._close_stale_client(self._client)
+            self._client = redis.from_url(settings.redis_url, decode_responses=True)
+            self._client_loop = loop
+        return self._client
+
+    def _close_stale_client(self, client: redis.Redis) -> None:
+        """Close a client left behind by a previous event loop.
+
+        The client cannot be reused, but its pooled connections hold sockets
+        until closed, so the close runs as a task on the current loop.
+
+        Args:
+            client: Client created on a previous loop.
+        """
+
+        async def close() -> None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(
+                    "llm_rate_limiter_client_close_error",
+                    limiter=self.name,
+                    error=str(e),
+                )
+
+        task = asyncio.get_running_loop().create_task(close())
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+
+# Singleton instances for use across the application
+embedding_rate_limiter = LLMRateLimiter("embedding")
+llm_rate_limiter = LLMRateLimiter("llm")
@@ -1,15 +1,18 @@
 """Qdrant vector database integration for Knowledge Base collections."""
 
+import asyncio
 import atexit
+import math
 from typing import Any
 from uuid import UUID
 
 import structlog
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from app.core.config import settings
+from app.schemas.knowledge_base import KBVectorIndexSettings
 
 logger = structlog.get_logger(__name__)
 
@@ -18,17 +21,127 @@ VECTOR_SIZE = 1536  # OpenAI ada-002 dimensions
 DISTANCE_METRIC = models.Distance.COSINE
 
 # Connection configuration to prevent "too many open files" errors
-GRPC_OPTIONS = [
+# (qdrant-client takes channel options as a dict)
+GRPC_OPTIONS = {
     # Limit concurrent streams per connection
-    ("grpc.max_concurrent_streams", 100),
+    "grpc.max_concurrent_streams": 100,
     # Enable keepalive to detect dead connections
-    ("grpc.keepalive_time_ms", 30000),
-    ("grpc.keepalive_timeout_ms", 10000),
-    ("grpc.keepalive_permit_without_calls", 1),
+    "grpc.keepalive_time_ms": 30000,
+    "grpc.keepalive_timeout_ms": 10000,
+    "grpc.keepalive_permit_without_calls": 1,
     # HTTP/2 flow control
-    ("grpc.http2.max_pings_without_data", 0),
-    ("grpc.http2.min_time_between_pings_ms", 10000),
-]
+    "grpc.http2.max_pings_without_data": 0,
+    "grpc.http2.min_time_between_pings_ms": 10000,
+}
+
+# Points per scroll page when listing point IDs
+SCROLL_PAGE_SIZE = 1000
+
+# Memory estimate constants (bytes)
+FLOAT32_BYTES = 4
+HNSW_LINK_BYTES = 4  # one point ID per graph edge
+
+
+def _quantization_config(
+    index: KBVectorIndexSettings,
+) -> models.ScalarQuantization | models.BinaryQuantization | None:
+    """Build the collection quantization config for a KB (None = disabled)."""
+    if index.quantization == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=index.quantization_always_ram,
+            )
+        )
+    if index.quantization == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(
+                always_ram=index.quantization_always_ram
+            )
+        )
+    return None
+
+
+def _hnsw_config(index: KBVectorIndexSettings) -> models.HnswConfigDiff | None:
+    """Build the HNSW config diff for a KB (None = keep Qdrant's values)."""
+    if index.hnsw_m is None and index.hnsw_ef_construct is None:
+        return None
+    return models.HnswConfigDiff(m=index.hnsw_m, ef_construct=index.hnsw_ef_construct)
+
+
+def build_search_params(index: KBVectorIndexSettings) -> models.SearchParams | None:
+    """Build search-time parameters for a KB's collection.
+
+    Args:
+        index: The KB's vector index settings.
+
+    Returns:
+        SearchParams, or None if the KB uses Qdrant's search defaults.
+    """
+    quantization = None
+    if index.quantization != "none":
+        quantization = models.QuantizationSearchParams(
+            rescore=index.quantization_rescore,
+            oversampling=index.quantization_oversampling,
+        )
+    if quantization is None and index.hnsw_ef is None:
+        return None
+    return models.SearchParams(hnsw_ef=index.hnsw_ef, quantization=quantization)
+
+
+def _memory_footprint(info: models.CollectionInfo) -> dict[str, Any] | None:
+    """Estimate a collection's RAM and disk use from its config and size.
+
+    Qdrant does not report per-collection memory, so this derives it from
+    point count, vector size, quantization, HNSW `m` and on-disk flags.
+    Payload size is not included.
+    """
+    config = info.config
+    vectors = config.params.vectors
+    if not isinstance(vectors, models.VectorParams):
+        return None
+
+    points = info.points_count or 0
+    original_bytes = points * vectors.size * FLOAT32_BYTES
+    hnsw_bytes = points * config.hnsw_config.m * 2 * HNSW_LINK_BYTES
+
+    quantization = config.quantization_config
+    quantized_bytes = 0
+    quantized_in_ram = False
+    quantization_type = "none"
+    if isinstance(quantization, models.ScalarQuantization):
+        quantization_type = "scalar"
+        quantized_bytes = points * vectors.size
+        quantized_in_ram = bool(quantization.scalar.always_ram)
+    elif isinstance(quantization, models.BinaryQuantization):
+        quantization_type = "binary"
+        quantized_bytes = points * math.ceil(vectors.size / 8)
+        quantized_in_ram = bool(quantization.binary.always_ram)
+
+    vectors_on_disk = bool(vectors.on_disk)
+    ram_bytes = hnsw_bytes
+    disk_bytes = 0
+    if vectors_on_disk:
+        disk_bytes += original_bytes
+    else:
+        ram_bytes += original_bytes
+    if quantized_in_ram:
+        ram_bytes += quantized_bytes
+    else:
+        disk_bytes += quantized_bytes
+
+    return {
+        "quantization": quantization_type,
+        "vectors_on_disk": vectors_on_disk,
+        "payload_on_disk": bool(config.params.on_disk_payload),
+        "hnsw_m": config.hnsw_config.m,
+        "original_vectors_bytes": original_bytes,
+        "quantized_vectors_bytes": quantized_bytes,
+        "hnsw_bytes": hnsw_bytes,
+        "estimated_ram_bytes": ram_bytes,
+        "estimated_disk_bytes": disk_bytes,
+    }
 
 
 class QdrantService:
@@ -39,19 +152,27 @@ class QdrantService:
 
     Connection Management:
     - Uses lazy initialization with singleton pattern
+    - Async methods use a non-blocking AsyncQdrantClient (one per event loop)
     - Includes gRPC options for connection limits and keepalive
-    - Provides close() method for explicit cleanup
+    - Provides close()/aclose() methods for explicit cleanup
     - Registers atexit handler for graceful shutdown
     """
 
     def __init__(self) -> None:
         """Initialize Qdrant client with settings."""
         self._client: QdrantClient | None = None
+        self._async_client: AsyncQdrantClient | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
+        # Closes of clients left behind by finished loops (Celery tasks)
+        self._closing_tasks: set[asyncio.Task[None]] = set()
         self._closed: bool = False
 
     @property
     def client(self) -> QdrantClient:
-        """Lazy initialization of Qdrant client with connection management.
+        """Lazy initialization of the synchronous Qdrant client.
+
+        Only for sync contexts (scripts, shutdown hooks). Code running on an
+        event loop must use `async_client` so Qdrant calls never block it.
 
         Returns:
             QdrantClient: The Qdrant client instance.
@@ -78,6 +199,91 @@ class QdrantService:
             )
         return self._client
 
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Lazy initialization of the async Qdrant client.
+
+        gRPC aio channels are bound to the event loop they were created on.
+        The API process has a single long-lived loop, but Celery tasks run
+        each coroutine via asyncio.run(), so a new client is created whenever
+        the running loop changes.
+
+        Returns:
+            AsyncQdrantClient: The async Qdrant client for the running loop.
+
+        Raises:
+            RuntimeError: If service has been closed or no event loop is running.
+        """
+        if self._closed:
+            raise RuntimeError("QdrantService has been closed")
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            if self._async_client is not None:
+                self._close_stale_async_client(self._async_client, loop)
+            self._async_client = AsyncQdrantClient(
+                host=settings.qdrant_host,
+                port=settings.qdrant_port,
+                grpc_port=settings.qdrant_grpc_port,
+                prefer_grpc=True,
+                grpc_options=GRPC_OPTIONS,
+            )
+            self._async_client_loop = loop
+            logger.info(
+                "qdrant_async_client_initialized",
+                host=settings.qdrant_host,
+                port=settings.qdrant_port,
+                grpc_port=settings.qdrant_grpc_port,
+            )
+        return self._async_client
+
+    def _close_stale_async_client(
+        self, client: AsyncQdrantClient, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Close a client left behind by a previous event loop.
+
+        The client cannot be reused, but its gRPC channel still holds a
+        socket until closed. Closing without a grace period awaits nothing
+        bound to the old loop, so it runs as a task on the current loop.
+
+        Args:
+            client: Client created on a previous loop.
+            loop: The running loop.
+        """
+
+        async def _close() -> None:
+            try:
+                await client.close()
+                logger.debug("qdrant_stale_async_client_closed")
+            except Exception as e:
+                logger.warning("qdrant_async_client_close_error", error=str(e))
+
+        task = loop.create_task(_close())
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def aclose(self, grpc_grace: float | None = None) -> None:
+        """Close the async Qdrant client.
+
+        Must be awaited on the loop the client was created on (e.g. in the
+        FastAPI lifespan shutdown handler), before the loop stops.
+
+        Args:
+            grpc_grace: Grace period in seconds for gRPC channel shutdown.
+        """
+        if self._async_client is None:
+            return
+        try:
+            if self._async_client_loop is asyncio.get_running_loop():
+                await self._async_client.close(grpc_grace=grpc_grace)
+                logger.info("qdrant_async_client_closed")
+        except Exception as e:
+            # Log but don't raise - shutdown should be best-effort
+            logger.warning("qdrant_async_client_close_error", error=str(e))
+        finally:
+            self._async_client = None
+            self._async_client_loop = None
+
     def close(self, grpc_grace: float | None = None) -> None:
         """Close the Qdrant client and release connections.
 
@@ -98,6 +304,10 @@ class QdrantService:
             finally:
                 self._client = None
                 self._closed = True
+        # The async client can only be closed on its loop (see aclose());
+        # drop the reference so it is not reused after close().
+        self._async_client = None
+        self._async_client_loop = None
 
     def reset(self) -> None:
         """Reset the service for reuse (e.g., in tests).
@@ -118,15 +328,19 @@ class QdrantService:
         """
         return f"kb_{kb_id}"
 
-    async def create_collection(self, kb_id: UUID) -> None:
+    async def create_collection(
+        self, kb_id: UUID, index: KBVectorIndexSettings | None = None
+    ) -> None:
         """Create a Qdrant collection for a Knowledge Base.
 
         Creates a collection with:
         - Vector size: 1536 (OpenAI ada-002)
         - Distance metric: Cosine similarity
+        - HNSW, quantization and on-disk storage from the KB's settings
 
         Args:
             kb_id: The Knowledge Base UUID.
+            index: The KB's vector index settings (default: Qdrant defaults).
 
         Raises:
             Exception: If collection creation fails.
@@ -144,12 +358,17 @@ class QdrantService:
                 return
 
             # Create collection with vector configuration
-            self.client.create_collection(
+            index = index or KBVectorIndexSettings()
+            await self.async_client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=VECTOR_SIZE,
                     distance=DISTANCE_METRIC,
+                    on_disk=index.on_disk_vectors,
                 ),
+                hnsw_config=_hnsw_config(index),
+                quantization_config=_quantization_config(index),
+                on_disk_payload=index.on_disk_payload,
             )
 
             logger.info(
@@ -158,6 +377,8 @@ class QdrantService:
                 kb_id=str(kb_id),
                 vector_size=VECTOR_SIZE,
                 distance=DISTANCE_METRIC.value,
+                quantization=index.quantization,
+                on_disk_vectors=index.on_disk_vectors,
             )
 
         except Exception as e:
@@ -169,6 +390,56 @@ class QdrantService:
             )
             raise
 
+    async def update_collection_config(
+        self, kb_id: UUID, index: KBVectorIndexSettings
+    ) -> None:
+        """Apply a KB's vector index settings to its existing collection.
+
+        Qdrant rebuilds the affected indexes (e.g. quantized vectors) in the
+        background; searches keep working meanwhile.
+
+        Args:
+            kb_id: The Knowledge Base UUID.
+            index: The KB's vector index settings.
+
+        Raises:
+            Exception: If the update fails.
+        """
+        collection_name = self._collection_name(kb_id)
+
+        try:
+            await self.async_client.update_collection(
+                collection_name=collection_name,
+                # "" addresses the collection's single unnamed vector
+                vectors_config={
+                    "": models.VectorParamsDiff(on_disk=index.on_disk_vectors)
+                },
+                hnsw_config=_hnsw_config(index),
+                quantization_config=(
+                    _quantization_config(index) or models.Disabled.DISABLED
+                ),
+                collection_params=models.CollectionParamsDiff(
+                    on_disk_payload=index.on_disk_payload
+                ),
+            )
+
+            logger.info(
+                "qdrant_collection_config_updated",
+                collection_name=collection_name,
+                kb_id=str(kb_id),
+                quantization=index.quantization,
+                on_disk_vectors=index.on_disk_vectors,
+            )
+
+        except Exception as e:
+            logger.error(
+                "qdrant_collection_config_update_failed",
+                collection_name=collection_name,
+                kb_id=str(kb_id),
+                error=str(e),
+            )
+            raise
+
     async def delete_collection(self, kb_id: UUID) -> bool:
         """Delete a Qdrant collection for a Knowledge Base.
 
@@ -190,7 +461,7 @@ class QdrantService:
                 )
                 return False
 
-            self.client.delete_collection(collection_name=collection_name)
+            await self.async_client.delete_collection(collection_name=collection_name)
 
             logger.info(
                 "qdrant_collection_deleted",
@@ -220,7 +491,7 @@ class QdrantService:
         collection_name = self._collection_name(kb_id)
 
         try:
-            self.client.get_collection(collection_name=collection_name)
+            await self.async_client.get_collection(collection_name=collection_name)
             return True
         except UnexpectedResponse as e:
             if e.status_code == 404:
@@ -252,7 +523,7 @@ class QdrantService:
         collection_name = self._collection_name(kb_id)
 
         try:
-            self.client.upsert(
+            await self.async_client.upsert(
                 collection_name=collection_name,
                 points=points,
                 wait=True,  # Wait for operation to complete
@@ -277,6 +548,38 @@ class QdrantService:
             )
             raise
 
+    async def list_point_ids(
+        self,
+        kb_id: UUID,
+        filter_conditions: models.Filter | None = None,
+    ) -> list[str]:
+        """List the IDs of points in a collection, optionally filtered.
+
+        Scrolls IDs only (no payloads or vectors), a page at a time.
+
+        Args:
+            kb_id: The Knowledge Base UUID.
+            filter_conditions: Optional Qdrant filter (default: all points).
+
+        Returns:
+            Point IDs as strings.
+        """
+        collection_name = self._collection_name(kb_id)
+        point_ids: list[str] = []
+        offset = None
+        while True:
+            points, offset = await self.async_client.scroll(
+                collection_name=collection_name,
+                scroll_filter=filter_conditions,
+                limit=SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            point_ids.extend(str(point.id) for point in points)
+            if offset is None:
+                return point_ids
+
     async def delete_points_by_filter(
         self,
         kb_id: UUID,
@@ -300,7 +603,7 @@ class QdrantService:
 
         try:
             # Get count before deletion for logging
-            count_result = self.client.count(
+            count_result = await self.async_client.count(
                 collection_name=collection_name,
                 count_filter=filter_conditions,
             )
@@ -314,7 +617,7 @@ class QdrantService:
                 )
                 return 0
 
-            self.client.delete(
+            await self.async_client.delete(
                 collection_name=collection_name,
                 points_selector=models.FilterSelector(filter=filter_conditions),
                 wait=True,
@@ -345,12 +648,15 @@ class QdrantService:
             kb_id: The Knowledge Base UUID.
 
         Returns:
-            Dict with collection info, or None if not found.
+            Dict with collection info (including an estimated memory
+            footprint), or None if not found.
         """
         collection_name = self._collection_name(kb_id)
 
         try:
-            info = self.client.get_collection(collection_name=collection_name)
+            info = await self.async_client.get_collection(
+                collection_name=collection_name
+            )
             return {
                 "name": collection_name,
                 "vectors_count": info.vectors_count,
@@ -358,6 +664,7 @@ class QdrantService:
                 "status": info.status.value if info.status else None,
                 "vector_size": VECTOR_SIZE,
                 "distance": DISTANCE_METRIC.value,
+                "memory": _memory_footprint(info),
             }
         except UnexpectedResponse as e:
             if e.status_code == 404:
@@ -374,7 +681,7 @@ class QdrantService:
         """
         try:
             # Try to list collections as a health check
-            self.client.get_collections()
+            await self.async_client.get_collections()
             return True
         except Exception as e:
             logger.warning("qdrant_health_check_failed", error=str(e))
@@ -3,7 +3,7 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.admin import router as admin_router
@@ -15,7 +15,8 @@ from app.api.v1.search import router as search_router
 from app.api.v1.users import router as users_router
 from app.core.config import settings
 from app.core.logging import configure_logging
-from app.core.redis import RedisClient
+from app.core.metrics import render_metrics
+from app.core.redis import BinaryRedisClient, RedisClient
 from app.integrations.litellm_client import close_litellm_clients
 from app.integrations.qdrant_client import qdrant_service
 from app.middleware import RequestContextMiddleware
@@ -44,7 +45,10 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     await close_litellm_clients()
     # 2. Close Redis
     await RedisClient.close()
-    # 3. Close Qdrant client with grace period to allow pending requests
+    await BinaryRedisClient.close()
+    # 3. Close Qdrant clients with grace period to allow pending requests
+    #    (async client first - it is bound to the running event loop)
+    await qdrant_service.aclose(grpc_grace=2.0)
     qdrant_service.close(grpc_grace=2.0)
 
 
@@ -90,3 +94,10 @@ async def health_check() -> dict[str, str]:
 async def root() -> dict[str, str]:
     """API root endpoint."""
     return {"message": f"Welcome to {settings.app_name} API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint (stage latency histograms)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
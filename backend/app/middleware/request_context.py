@@ -1,8 +1,11 @@
 """Request context middleware for request ID generation and structlog integration.
 
-Adds request_id to each request for correlation across logs and audit events.
+Adds request_id to each request for correlation across logs and audit events,
+and reports StageTimer stages recorded while handling the request in the
+Server-Timing response header.
 """
 
+import time
 import uuid
 from collections.abc import Callable
 
@@ -12,6 +15,7 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from app.core.logging import request_context
+from app.core.timing import format_server_timing, server_timings
 
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
@@ -31,7 +35,7 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             call_next: The next middleware/route handler.
 
         Returns:
-            The HTTP response with X-Request-ID header.
+            The HTTP response with X-Request-ID and Server-Timing headers.
         """
         # Generate or extract request ID
         request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
@@ -43,6 +47,10 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             "path": request.url.path,
         }
         token = request_context.set(ctx)
+        # Shared with the handler's context, which StageTimer writes into
+        timings: dict[str, float] = {}
+        timings_token = server_timings.set(timings)
+        start = time.perf_counter()
 
         # Bind to structlog contextvars for automatic inclusion
         structlog.contextvars.clear_contextvars()
@@ -52,8 +60,12 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             # Add request ID to response headers for client correlation
             response.headers["X-Request-ID"] = request_id
+            # Streaming responses only include stages finished before the body
+            timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+            response.headers["Server-Timing"] = format_server_timing(timings)
             return response
         finally:
             # Reset context
+            server_timings.reset(timings_token)
             request_context.reset(token)
             structlog.contextvars.clear_contextvars()
@@ -52,3 +52,27 @@ class AuditRepository:
         )
         await self._session.execute(stmt)
         await self._session.commit()
+
+    async def create_events(self, events: list[dict[str, Any]]) -> None:
+        """Create several audit events in one multi-row INSERT.
+
+        Args:
+            events: Dicts with the keyword arguments of create_event().
+        """
+        if not events:
+            return
+        stmt = insert(AuditEvent).values(
+            [
+                {
+                    "user_id": event.get("user_id"),
+                    "action": event["action"],
+                    "resource_type": event["resource_type"],
+                    "resource_id": event.get("resource_id"),
+                    "details": event.get("details"),
+                    "ip_address": event.get("ip_address"),
+                }
+                for event in events
+            ]
+        )
+        await self._session.execute(stmt)
+        await self._session.commit()
@@ -1,6 +1,7 @@
 """Knowledge Base Pydantic schemas."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -8,12 +9,69 @@ from pydantic import BaseModel, ConfigDict, Field
 from app.models.permission import PermissionLevel
 
 
+class KBVectorIndexSettings(BaseModel):
+    """Qdrant collection tuning for a KB (defaults match Qdrant's own).
+
+    Applied when the collection is created, and to the existing collection
+    when changed via KB update. HNSW fields left unset keep the current value.
+    """
+
+    quantization: Literal["none", "scalar", "binary"] = Field(
+        default="none",
+        description="Compress vectors: scalar=int8 (4x), binary=1 bit/dim (32x)",
+    )
+    quantization_oversampling: float = Field(
+        default=2.0,
+        ge=1.0,
+        le=16.0,
+        description="Candidates fetched per result before rescoring",
+    )
+    quantization_rescore: bool = Field(
+        default=True, description="Rescore candidates with the original vectors"
+    )
+    quantization_always_ram: bool = Field(
+        default=True, description="Keep quantized vectors in RAM"
+    )
+    on_disk_vectors: bool = Field(
+        default=False, description="Store original vectors on disk (mmap)"
+    )
+    on_disk_payload: bool = Field(default=False, description="Store payloads on disk")
+    hnsw_m: int | None = Field(
+        default=None, ge=4, le=128, description="HNSW edges per node"
+    )
+    hnsw_ef_construct: int | None = Field(
+        default=None, ge=4, le=1000, description="HNSW build-time beam width"
+    )
+    hnsw_ef: int | None = Field(
+        default=None, ge=1, le=1000, description="HNSW search-time beam width"
+    )
+
+
+class KBSettings(BaseModel):
+    """Per-KB settings stored in KnowledgeBase.settings (JSONB).
+
+    Unknown keys already present in the column are preserved on update.
+    """
+
+    semantic_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse answers synthesized for near-duplicate questions",
+    )
+    vector_index: KBVectorIndexSettings = Field(
+        default_factory=KBVectorIndexSettings,
+        description="Qdrant HNSW, quantization and on-disk storage settings",
+    )
+
+
 # Request schemas
 class KBCreate(BaseModel):
     """Request schema for creating a Knowledge Base."""
 
     name: str = Field(..., min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=2000)
+    settings: KBSettings | None = Field(
+        default=None, description="Initial settings (only fields provided)"
+    )
 
 
 class KBUpdate(BaseModel):
@@ -21,6 +79,9 @@ class KBUpdate(BaseModel):
 
     name: str | None = Field(default=None, min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=2000)
+    settings: KBSettings | None = Field(
+        default=None, description="Settings to change (only fields provided)"
+    )
 
 
 # Response schemas
@@ -54,6 +115,7 @@ class KBResponse(BaseModel):
         default=0, description="Count of non-archived documents"
     )
     total_size_bytes: int = Field(default=0, description="Sum of document file sizes")
+    settings: KBSettings = Field(default_factory=KBSettings)
     created_at: datetime
     updated_at: datetime
 
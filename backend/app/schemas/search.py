@@ -1,8 +1,9 @@
 """Search request and response schemas."""
 
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StringConstraints
 
 from app.schemas.citation import Citation
 
@@ -21,6 +22,13 @@ class SearchRequest(BaseModel):
         le=50,
         description="Maximum number of results to return",
     )
+    deadline_ms: int | None = Field(
+        default=None,
+        ge=100,
+        le=60000,
+        description="Latency budget in milliseconds (default: server setting). "
+        "KBs that miss the retrieval cutoff are skipped and listed in partial_kbs.",
+    )
 
 
 class SearchResultSchema(BaseModel):
@@ -54,6 +62,17 @@ class SearchResponse(BaseModel):
     results: list[SearchResultSchema]
     result_count: int
     message: str | None = None  # For empty state messaging
+    partial_kbs: list[str] = Field(
+        default_factory=list,
+        description="KBs whose results are missing (timed out or failed)",
+    )
+    synthesis_skipped: str | None = Field(
+        default=None,
+        description=(
+            "Why no answer was synthesized, e.g. 'overloaded' (LLM shed) or "
+            "'deadline_exceeded' (latency budget spent)"
+        ),
+    )
 
 
 class QuickSearchRequest(BaseModel):
@@ -66,6 +85,17 @@ class QuickSearchRequest(BaseModel):
     )
 
 
+# QuickSearchResult.excerpt length; also precomputed into chunk payloads
+EXCERPT_MAX_CHARS = 100
+
+
+def make_excerpt(text: str) -> str:
+    """Truncate chunk text to a quick-search excerpt."""
+    if len(text) > EXCERPT_MAX_CHARS:
+        return text[:EXCERPT_MAX_CHARS] + "..."
+    return text
+
+
 class QuickSearchResult(BaseModel):
     """Individual quick search result (lightweight version)."""
 
@@ -86,10 +116,57 @@ class QuickSearchResponse(BaseModel):
     response_time_ms: int
 
 
+# Maximum queries accepted by POST /search/batch
+BATCH_SEARCH_MAX_QUERIES = 50
+
+BatchQuery = Annotated[str, StringConstraints(min_length=1, max_length=500)]
+
+
+class BatchSearchRequest(BaseModel):
+    """Batch search request schema: many queries over the same KBs."""
+
+    queries: list[BatchQuery] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_SEARCH_MAX_QUERIES,
+        description="Search queries (answered in the same order)",
+    )
+    kb_ids: list[str] | None = Field(
+        default=None,
+        description="List of Knowledge Base IDs to search. If None, searches all permitted KBs.",
+    )
+    limit: int = Field(
+        default=10,
+        ge=1,
+        le=50,
+        description="Maximum number of results to return per query",
+    )
+    synthesize: bool = Field(
+        default=False, description="Generate an answer with citations per query"
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response schema."""
+
+    responses: list[SearchResponse] = Field(
+        ..., description="One response per query, in request order"
+    )
+    kb_count: int = Field(..., description="Number of KBs searched")
+    partial_kbs: list[str] = Field(
+        default_factory=list,
+        description="KBs whose results are missing (failed)",
+    )
+
+
 class SimilarSearchRequest(BaseModel):
     """Similar search request schema (Story 3.8)."""
 
     chunk_id: str = Field(..., description="Qdrant point ID of source chunk")
+    kb_id: str | None = Field(
+        default=None,
+        description="Knowledge Base holding the source chunk, if known.",
+    )
     kb_ids: list[str] | None = Field(
         default=None,
         description="List of Knowledge Base IDs to search. If None, searches all permitted KBs.",
@@ -134,3 +211,36 @@ class ExplanationResponse(BaseModel):
         default_factory=list, description="Related docs (max 3)"
     )
     section_context: str = Field(default="N/A", description="Document section context")
+
+
+# Max results explained per batch request (one search page)
+EXPLAIN_BATCH_MAX_RESULTS = 20
+
+
+class ExplainBatchItem(BaseModel):
+    """A single search result to explain in a batch request."""
+
+    chunk_id: UUID = Field(..., description="Chunk UUID")
+    chunk_text: str = Field(..., description="Text content of the chunk")
+    relevance_score: float = Field(..., ge=0.0, le=1.0, description="Similarity score")
+    kb_id: UUID = Field(..., description="Knowledge base UUID")
+
+
+class ExplainBatchRequest(BaseModel):
+    """Batch explanation request schema: all results of one search."""
+
+    query: str = Field(..., min_length=1, max_length=500, description="Search query")
+    results: list[ExplainBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=EXPLAIN_BATCH_MAX_RESULTS,
+        description="Search results to explain",
+    )
+
+
+class ExplainBatchResponse(BaseModel):
+    """Batch explanation response schema."""
+
+    explanations: list[ExplanationResponse] = Field(
+        ..., description="One explanation per requested result, in request order"
+    )
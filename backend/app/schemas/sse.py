@@ -4,11 +4,13 @@ This module defines SSE event types for streaming search results and AI-generate
 answers with citations. Events are emitted in sequence:
 
 1. StatusEvent - "Searching knowledge bases..."
-2. StatusEvent - "Generating answer..."
-3. TokenEvent* - Word-by-word answer tokens
-4. CitationEvent* - Citation metadata when [n] markers detected
-5. DoneEvent - Completion signal with confidence
-6. ErrorEvent - If errors occur during streaming
+2. SourcesEvent - Retrieved results, before synthesis (coalesced mode only)
+3. StatusEvent - "Generating answer..."
+4. TokenEvent* - Word-by-word answer tokens (coalesced into larger frames
+   unless legacy per-token mode is requested)
+5. CitationEvent* - Citation metadata when [n] markers detected
+6. DoneEvent - Completion signal with confidence
+7. ErrorEvent - If errors occur during streaming
 
 *These events repeat as needed during the streaming process.
 """
@@ -23,6 +25,7 @@ class SSEEventType(str, Enum):
     """SSE event types for streaming responses."""
 
     STATUS = "status"
+    SOURCES = "sources"
     TOKEN = "token"
     CITATION = "citation"
     DONE = "done"
@@ -70,6 +73,26 @@ class StatusEvent(SSEEvent):
     )
 
 
+class SourcesEvent(SSEEvent):
+    """Retrieved search results, sent before answer synthesis starts.
+
+    Lets the UI render sources while the LLM produces its first tokens.
+
+    Example:
+        {
+          "type": "sources",
+          "results": [{"document_id": "doc-uuid", "kb_name": "Security", ...}],
+          "result_count": 1
+        }
+    """
+
+    type: SSEEventType = SSEEventType.SOURCES
+    results: list[dict[str, Any]] = Field(
+        ..., description="Search results (matches SearchResultSchema)"
+    )
+    result_count: int = Field(..., ge=0, description="Number of results")
+
+
 class TokenEvent(SSEEvent):
     """Answer token event for streaming text.
 
@@ -139,6 +162,17 @@ class DoneEvent(SSEEvent):
     result_count: int = Field(
         ..., ge=0, description="Total number of search results", examples=[5]
     )
+    partial_kbs: list[str] = Field(
+        default_factory=list,
+        description="KBs whose results are missing (timed out or failed)",
+    )
+    synthesis_skipped: str | None = Field(
+        default=None,
+        description=(
+            "Why the answer was not streamed or cut short: 'overloaded' (LLM "
+            "shed) or 'deadline_exceeded' (latency budget spent)"
+        ),
+    )
 
 
 class ErrorEvent(SSEEvent):
@@ -0,0 +1,181 @@
+"""Admission control for LLM answer synthesis.
+
+When LiteLLM slows down, every search holding an LLM call keeps its
+connection, memory and deadline tied up, and new searches pile up behind
+them. An AdmissionController caps concurrent synthesis calls; callers beyond
+the cap wait in a bounded queue for a limited time. When the queue is full or
+the wait times out the call is shed with AdmissionRejectedError, and search
+returns retrieval-only results flagged synthesis_skipped="overloaded"
+instead of waiting.
+
+Limits are read from settings on every acquire, so they can be tuned
+without restarting the controller.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_SHED,
+    ADMISSION_WAITING,
+)
+
+logger = structlog.get_logger(__name__)
+
+# SearchResponse.synthesis_skipped value for shed requests
+SYNTHESIS_OVERLOADED = "overloaded"
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a call is shed instead of admitted."""
+
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(f"{name} overloaded ({reason})")
+        self.reason = reason
+
+
+@dataclass
+class AdmissionStats:
+    """Counters for one admission controller."""
+
+    admitted: int = 0
+    queued: int = 0  # admitted after waiting
+    shed_queue_full: int = 0
+    shed_timeout: int = 0
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+        queue_timeout_ms: int | None = None,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            name: Controller name, used in metrics and logs.
+            max_concurrency: Concurrent calls (default: settings).
+            max_queue: Callers allowed to wait (default: settings).
+            queue_timeout_ms: Max wait for a slot (default: settings).
+        """
+        self.name = name
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout_ms = queue_timeout_ms
+        self.stats = AdmissionStats()
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def max_concurrency(self) -> int:
+        if self._max_concurrency is not None:
+            return self._max_concurrency
+        return settings.synthesis_max_concurrency
+
+    @property
+    def max_queue(self) -> int:
+        if self._max_queue is not None:
+            return self._max_queue
+        return settings.synthesis_max_queue
+
+    @property
+    def queue_timeout(self) -> float:
+        if self._queue_timeout_ms is not None:
+            return self._queue_timeout_ms / 1000
+        return settings.synthesis_queue_timeout_ms / 1000
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait timed out.
+        """
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_stats(self) -> dict[str, int]:
+        """Snapshot of counters plus current load."""
+        return {
+            **asdict(self.stats),
+            "in_flight": self._active,
+            "waiting": len(self._waiters),
+        }
+
+    async def _acquire(self) -> None:
+        max_concurrency, max_queue = self.max_concurrency, self.max_queue
+        ADMISSION_LIMIT.labels(self.name, "concurrency").set(max_concurrency)
+        ADMISSION_LIMIT.labels(self.name, "queue").set(max_queue)
+        if self._active < max_concurrency and not self._waiters:
+            self._admit()
+            return
+        if len(self._waiters) >= max_queue:
+            self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_WAITING.labels(self.name).inc()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self._release()
+            if isinstance(e, TimeoutError):
+                self._shed("timeout")
+            raise
+        finally:
+            ADMISSION_WAITING.labels(self.name).dec()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        # _release() handed its slot to us; _active already counts it
+        self.stats.queued += 1
+        self.stats.admitted += 1
+
+    def _admit(self) -> None:
+        self._active += 1
+        self.stats.admitted += 1
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self._active)
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self._active)
+
+    def _shed(self, reason: str) -> None:
+        if reason == "queue_full":
+            self.stats.shed_queue_full += 1
+        else:
+            self.stats.shed_timeout += 1
+        ADMISSION_SHED.labels(self.name, reason).inc()
+        logger.warning(
+            "admission_shed",
+            name=self.name,
+            reason=reason,
+            in_flight=self._active,
+            waiting=len(self._waiters),
+        )
+        raise AdmissionRejectedError(self.name, reason)
+
+
+# Singleton instance for use across the application
+synthesis_admission = AdmissionController("synthesis")
@@ -95,6 +95,52 @@ class AuditService:
             },
         )
 
+    async def log_searches(
+        self,
+        user_id: str,
+        searches: list[dict[str, Any]],
+    ) -> None:
+        """Log several search queries (e.g. a batch search) in one INSERT.
+
+        Never raises, like log_event().
+
+        Args:
+            user_id: User ID who performed the searches
+            searches: Dicts with query, kb_ids, result_count and latency_ms
+        """
+        try:
+            async with async_session_factory() as session:
+                repo = AuditRepository(session)
+                await repo.create_events(
+                    [
+                        {
+                            "action": "search",
+                            "resource_type": "search",
+                            "user_id": UUID(user_id),
+                            "details": {
+                                "query": search["query"][:500],
+                                "kb_ids": search["kb_ids"],
+                                "result_count": search["result_count"],
+                                "latency_ms": search["latency_ms"],
+                            },
+                        }
+                        for search in searches
+                    ]
+                )
+                logger.info(
+                    "audit_events_logged",
+                    action="search",
+                    count=len(searches),
+                    user_id=user_id,
+                )
+        except Exception as e:
+            logger.error(
+                "audit_event_failed",
+                action="search",
+                count=len(searches),
+                error=str(e),
+            )
+
 
 # Singleton instance for use across the application
 audit_service = AuditService()
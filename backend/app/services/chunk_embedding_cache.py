@@ -0,0 +1,173 @@
+"""Content-addressed store for document chunk embeddings.
+
+Reprocessing a document (reconciliation, manual retry, replace_document)
+re-chunks mostly unchanged text. Vectors are stored in Redis under a key
+derived from sha256(model, chunk text) as packed float32 bytes, so
+generate_embeddings only sends chunks it has never seen to LiteLLM.
+
+Eviction:
+- Every entry has a TTL that is refreshed on each hit (sliding expiry).
+- A sorted set of key -> last use time bounds the total size: after each
+  write the least recently used entries beyond max_bytes are deleted.
+  Redis' own maxmemory policy is not relied on because the same instance
+  holds the Celery broker and session keys.
+"""
+
+import hashlib
+import time
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+from app.services.embedding_cache import pack_vector, unpack_vector
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefix for chunk embeddings
+CHUNK_EMBEDDING_PREFIX = "cemb:"
+
+# Sorted set of chunk embedding key -> last use (unix seconds)
+CHUNK_EMBEDDING_LRU_KEY = "cemb:lru"
+
+# Storage dtype; reprocessed documents must get the vectors LiteLLM returned
+_DTYPE = "float32"
+
+
+class ChunkEmbeddingCache:
+    """Bulk get/set of chunk embeddings keyed by content hash.
+
+    Called from Celery workers, which run each task in a fresh event loop, so
+    every call uses a short-lived binary connection instead of the shared
+    BinaryRedisClient. Redis failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Sliding TTL (default: settings.chunk_embedding_cache_ttl).
+            max_bytes: Total vector bytes kept
+                (default: settings.chunk_embedding_cache_max_mb).
+        """
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return settings.chunk_embedding_cache_enabled
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return settings.chunk_embedding_cache_ttl
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.chunk_embedding_cache_max_mb * 1024 * 1024
+
+    def key_for(self, text: str, model: str) -> str:
+        """Build the cache key for a chunk under a given embedding model.
+
+        Args:
+            text: Exact chunk text (not normalized; whitespace changes the vector).
+            model: Embedding model name.
+
+        Returns:
+            Redis key.
+        """
+        digest = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+        return f"{CHUNK_EMBEDDING_PREFIX}{digest}"
+
+    async def get_many(self, texts: list[str], model: str) -> list[list[float] | None]:
+        """Look up embeddings for many chunks in one round trip.
+
+        Hits have their TTL and LRU position refreshed.
+
+        Args:
+            texts: Chunk texts.
+            model: Embedding model name.
+
+        Returns:
+            One embedding or None per text, in input order.
+        """
+        if not texts or not self.enabled:
+            return [None] * len(texts)
+
+        keys = [self.key_for(text, model) for text in texts]
+        client = redis.from_url(settings.redis_url, decode_responses=False)
+        try:
+            values = await client.mget(keys)
+            hit_keys = {key for key, value in zip(keys, values, strict=True) if value}
+            if hit_keys:
+                pipe = client.pipeline(transaction=False)
+                for key in hit_keys:
+                    pipe.expire(key, self.ttl_seconds)
+                pipe.zadd(CHUNK_EMBEDDING_LRU_KEY, dict.fromkeys(hit_keys, time.time()))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("chunk_embedding_cache_get_failed", error=str(e))
+            return [None] * len(texts)
+        finally:
+            await client.aclose()
+
+        return [unpack_vector(value, _DTYPE) if value else None for value in values]
+
+    async def set_many(
+        self, texts: list[str], model: str, vectors: list[list[float]]
+    ) -> None:
+        """Store embeddings and evict least recently used entries over budget.
+
+        Args:
+            texts: Chunk texts.
+            model: Embedding model name.
+            vectors: Embeddings, aligned with texts.
+        """
+        if not texts or not self.enabled:
+            return
+
+        entries = {
+            self.key_for(text, model): pack_vector(vector, _DTYPE)
+            for text, vector in zip(texts, vectors, strict=True)
+        }
+        entry_bytes = max(len(value) for value in entries.values())
+        max_entries = max(1, self.max_bytes // max(entry_bytes, 1))
+        now = time.time()
+
+        client = redis.from_url(settings.redis_url, decode_responses=False)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in entries.items():
+                pipe.setex(key, self.ttl_seconds, value)
+            pipe.zadd(CHUNK_EMBEDDING_LRU_KEY, dict.fromkeys(entries, now))
+            # Drop index entries whose keys have already expired
+            pipe.zremrangebyscore(CHUNK_EMBEDDING_LRU_KEY, 0, now - self.ttl_seconds)
+            pipe.zcard(CHUNK_EMBEDDING_LRU_KEY)
+            size = (await pipe.execute())[-1]
+
+            if size > max_entries:
+                evicted = await client.zpopmin(
+                    CHUNK_EMBEDDING_LRU_KEY, size - max_entries
+                )
+                if evicted:
+                    await client.delete(*(key for key, _score in evicted))
+                logger.info(
+                    "chunk_embedding_cache_evicted",
+                    evicted=len(evicted),
+                    max_entries=max_entries,
+                )
+        except Exception as e:
+            logger.warning("chunk_embedding_cache_set_failed", error=str(e))
+        finally:
+            await client.aclose()
+
+
+# Singleton instance for use across the application
+chunk_embedding_cache = ChunkEmbeddingCache()
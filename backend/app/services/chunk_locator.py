@@ -0,0 +1,108 @@
+"""Chunk -> Knowledge Base lookup for similar search.
+
+Qdrant point IDs don't say which KB collection holds them, so the indexing
+worker records each point's KB in a Redis hash after upserting it. Similar
+search uses the map to go straight to the source collection instead of
+probing every permitted KB.
+
+Entries are removed when their vectors are deleted (document delete, orphan
+cleanup after a re-upload, KB delete), so the hash only holds live chunks.
+A missed removal is harmless: the entry points at a collection where the
+chunk no longer exists, which similar search reports as "Source content no
+longer available".
+"""
+
+from uuid import UUID
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+from app.core.redis import RedisClient
+
+logger = structlog.get_logger(__name__)
+
+# Redis hash of point_id -> kb_id
+CHUNK_KB_KEY = "chunk:kb"
+
+# Fields per HDEL when forgetting many points (keeps each command short)
+FORGET_BATCH_SIZE = 1000
+
+
+async def record_chunk_locations(kb_id: UUID | str, point_ids: list[str]) -> None:
+    """Record the KB of freshly indexed points.
+
+    Called from Celery workers, which run each task in a fresh event loop, so
+    a short-lived connection is used instead of the shared RedisClient.
+    Failures are logged; similar search then falls back to probing KBs.
+
+    Args:
+        kb_id: Knowledge Base ID (UUID or string).
+        point_ids: Qdrant point IDs written to the KB's collection.
+    """
+    if not point_ids:
+        return
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.hset(CHUNK_KB_KEY, mapping=dict.fromkeys(point_ids, str(kb_id)))
+    except Exception as e:
+        logger.warning("chunk_location_record_failed", kb_id=str(kb_id), error=str(e))
+    finally:
+        await client.aclose()
+
+
+async def forget_chunk_locations(point_ids: list[str]) -> None:
+    """Remove deleted points from the map.
+
+    Called from Celery workers after the points are deleted from Qdrant, with
+    a short-lived connection like record_chunk_locations. Failures are logged;
+    a leftover entry only sends similar search to a stale collection.
+
+    Args:
+        point_ids: Qdrant point IDs that no longer exist.
+    """
+    if not point_ids:
+        return
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        for start in range(0, len(point_ids), FORGET_BATCH_SIZE):
+            await client.hdel(
+                CHUNK_KB_KEY, *point_ids[start : start + FORGET_BATCH_SIZE]
+            )
+    except Exception as e:
+        logger.warning(
+            "chunk_location_forget_failed", point_count=len(point_ids), error=str(e)
+        )
+    finally:
+        await client.aclose()
+
+
+async def lookup_chunk_kb(chunk_id: str) -> str | None:
+    """Look up the KB holding a chunk.
+
+    Args:
+        chunk_id: Qdrant point ID.
+
+    Returns:
+        KB ID, or None if unknown or Redis is unavailable.
+    """
+    try:
+        client = await RedisClient.get_client()
+        return await client.hget(CHUNK_KB_KEY, chunk_id)
+    except Exception as e:
+        logger.warning("chunk_location_lookup_failed", error=str(e))
+        return None
+
+
+async def remember_chunk_kb(chunk_id: str, kb_id: str) -> None:
+    """Record a chunk's KB found by probing (chunks indexed before the map).
+
+    Args:
+        chunk_id: Qdrant point ID.
+        kb_id: KB whose collection holds the point.
+    """
+    try:
+        client = await RedisClient.get_client()
+        await client.hset(CHUNK_KB_KEY, chunk_id, kb_id)
+    except Exception as e:
+        logger.warning("chunk_location_record_failed", kb_id=kb_id, error=str(e))
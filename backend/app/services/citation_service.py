@@ -11,6 +11,58 @@ logger = structlog.get_logger()
 
 # Pattern for matching [n] citation markers
 CITATION_PATTERN = r"\[(\d+)\]"
+_CITATION_RE = re.compile(CITATION_PATTERN)
+
+# Unterminated marker prefix ("[", "[1", "[12") at the end of a fragment
+_PARTIAL_MARKER_RE = re.compile(r"\[\d*$")
+
+# Longest partial marker carried across fragments ("[" + 8 digits)
+MAX_PARTIAL_MARKER_LENGTH = 9
+
+
+class CitationMarkerParser:
+    """
+    Incremental [n] marker tokenizer for streamed LLM output.
+
+    Feeds arbitrary text fragments (LLM token deltas) and returns the markers
+    completed by each fragment. Only an unterminated marker prefix such as
+    "[1" is carried over to the next fragment, so each feed() costs
+    O(len(fragment)) regardless of how long the answer already is.
+
+    Example:
+        parser = CitationMarkerParser()
+        parser.feed("OAuth [")   # []
+        parser.feed("1")         # []
+        parser.feed("] and [2]") # [1, 2]
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+
+    def feed(self, fragment: str) -> list[int]:
+        """
+        Consume a text fragment and return markers completed within it.
+
+        Args:
+            fragment: Next piece of the streamed text
+
+        Returns:
+            Marker numbers in order of appearance (duplicates included)
+        """
+        # Fast path: no marker in flight and none starting in this fragment
+        if not self._pending and "[" not in fragment:
+            return []
+
+        text = self._pending + fragment
+        markers = [int(n) for n in _CITATION_RE.findall(text)]
+
+        partial = _PARTIAL_MARKER_RE.search(text)
+        if partial and len(partial.group()) <= MAX_PARTIAL_MARKER_LENGTH:
+            self._pending = partial.group()
+        else:
+            self._pending = ""
+
+        return markers
 
 
 class CitationService:
@@ -97,7 +149,8 @@ class CitationService:
         """
         Extract all [n] citation markers from text.
 
-        Uses regex pattern to find all markers, then returns sorted unique numbers.
+        Runs the same tokenizer used for SSE streaming over the full text,
+        then returns sorted unique numbers.
 
         Args:
             text: Text containing [1], [2], etc. markers
@@ -109,8 +162,7 @@ class CitationService:
             _find_markers("OAuth [1] and MFA [2] with backup [1]")
             # Returns [1, 2]
         """
-        matches = re.findall(CITATION_PATTERN, text)
-        return sorted({int(n) for n in matches})
+        return sorted(set(CitationMarkerParser().feed(text)))
 
     def _map_marker_to_chunk(
         self, marker_num: int, chunks: list[SearchResultSchema]
@@ -0,0 +1,158 @@
+"""Token-budgeted source packing for answer synthesis.
+
+Top-ranked chunks are turned into the numbered "[n]" sources of the
+synthesis prompt:
+- chunks of the same document whose character ranges overlap or touch are
+  merged into one source, dropping the repeated chunk_overlap text;
+- sources are added in relevance order until settings.synthesis_context_max_tokens
+  is reached, and the lowest-ranked source that does not fit is trimmed.
+
+The returned sources are what the prompt numbers, so the same list must be
+passed to CitationService to map [n] markers back to documents.
+"""
+
+import structlog
+
+from app.core.config import settings
+from app.core.tokenizer import get_token_encoder
+from app.schemas.search import SearchResultSchema
+
+logger = structlog.get_logger(__name__)
+
+# Chunks further apart than this (whitespace stripped by the splitter) stay separate
+MERGE_MAX_GAP_CHARS = 2
+
+# A trimmed tail shorter than this is dropped instead
+MIN_TRIMMED_SOURCE_TOKENS = 32
+
+
+def format_source(number: int, source: SearchResultSchema) -> str:
+    """Render one numbered source as it appears in the synthesis prompt."""
+    return (
+        f"[{number}] {source.chunk_text}\n"
+        f"   (Source: {source.document_name}"
+        + (f", page {source.page_number}" if source.page_number else "")
+        + ")"
+    )
+
+
+def format_context(sources: list[SearchResultSchema]) -> str:
+    """Render numbered sources for the synthesis prompt."""
+    return "\n\n".join(
+        format_source(number, source) for number, source in enumerate(sources, 1)
+    )
+
+
+def _merge(
+    first: SearchResultSchema, second: SearchResultSchema
+) -> SearchResultSchema | None:
+    """Merge two chunks of one document if their ranges overlap or touch.
+
+    Args:
+        first: Chunk starting first in the document.
+        second: Chunk starting at or after first.char_start.
+
+    Returns:
+        Merged chunk, or None if the chunks aren't contiguous.
+    """
+    gap = second.char_start - first.char_end
+    if gap > MERGE_MAX_GAP_CHARS:
+        return None
+    if gap >= 0:
+        text = f"{first.chunk_text} {second.chunk_text}"
+    elif second.char_end <= first.char_end:
+        text = first.chunk_text  # second lies inside first
+    else:
+        overlap = -gap
+        # Offsets are best-effort, so only trust them if the texts agree
+        if first.chunk_text[-overlap:] != second.chunk_text[:overlap]:
+            return None
+        text = first.chunk_text + second.chunk_text[overlap:]
+    return first.model_copy(
+        update={
+            "chunk_text": text,
+            "char_end": max(first.char_end, second.char_end),
+            "relevance_score": max(first.relevance_score, second.relevance_score),
+        }
+    )
+
+
+def _merge_contiguous(chunks: list[SearchResultSchema]) -> list[SearchResultSchema]:
+    """Merge contiguous chunks per document, keeping the best-ranked order."""
+    # rank = position of a source's best-ranked chunk in the input
+    merged: list[tuple[int, SearchResultSchema]] = []
+    by_document: dict[str, list[tuple[int, SearchResultSchema]]] = {}
+    for rank, chunk in enumerate(chunks):
+        by_document.setdefault(chunk.document_id, []).append((rank, chunk))
+
+    for document_chunks in by_document.values():
+        document_chunks.sort(key=lambda item: item[1].char_start)
+        rank, current = document_chunks[0]
+        for next_rank, chunk in document_chunks[1:]:
+            combined = _merge(current, chunk)
+            if combined is None:
+                merged.append((rank, current))
+                rank, current = next_rank, chunk
+            else:
+                rank, current = min(rank, next_rank), combined
+        merged.append((rank, current))
+
+    merged.sort(key=lambda item: item[0])
+    return [source for _, source in merged]
+
+
+def pack_sources(
+    chunks: list[SearchResultSchema], max_tokens: int | None = None
+) -> list[SearchResultSchema]:
+    """Build the numbered sources for a synthesis prompt within a token budget.
+
+    Args:
+        chunks: Search results in relevance order.
+        max_tokens: Budget for the rendered sources
+            (default: settings.synthesis_context_max_tokens).
+
+    Returns:
+        Sources in prompt order: [1] is the first element.
+    """
+    if not chunks:
+        return []
+    max_tokens = max_tokens or settings.synthesis_context_max_tokens
+    encoder = get_token_encoder()
+
+    sources: list[SearchResultSchema] = []
+    used_tokens = 0
+    for source in _merge_contiguous(chunks):
+        number = len(sources) + 1
+        tokens = len(encoder.encode(format_source(number, source))) + 1
+        if used_tokens + tokens <= max_tokens:
+            sources.append(source)
+            used_tokens += tokens
+            continue
+        # Trim the tail of the first source that doesn't fit, then stop
+        text_budget = (
+            max_tokens - used_tokens - (tokens - len(encoder.encode(source.chunk_text)))
+        )
+        if text_budget >= MIN_TRIMMED_SOURCE_TOKENS or not sources:
+            text_budget = max(text_budget, MIN_TRIMMED_SOURCE_TOKENS)
+            text = encoder.decode(encoder.encode(source.chunk_text)[:text_budget])
+            sources.append(
+                source.model_copy(
+                    update={
+                        "chunk_text": text,
+                        "char_end": source.char_start + len(text),
+                    }
+                )
+            )
+            used_tokens += len(encoder.encode(format_source(number, sources[-1]))) + 1
+        break
+
+    unpacked_tokens = len(encoder.encode(format_context(chunks)))
+    logger.info(
+        "context_packed",
+        chunk_count=len(chunks),
+        source_count=len(sources),
+        unpacked_tokens=unpacked_tokens,
+        packed_tokens=used_tokens,
+        prompt_tokens_saved=max(unpacked_tokens - used_tokens, 0),
+    )
+    return sources
@@ -10,6 +10,7 @@ from fastapi import UploadFile
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.timing import StageTimer
 from app.integrations.minio_client import compute_checksum, minio_service
 from app.models.document import Document, DocumentStatus
 from app.models.knowledge_base import KnowledgeBase
@@ -90,8 +91,12 @@ class DocumentService:
         Raises:
             DocumentValidationError: If validation fails.
         """
+        timer = StageTimer("document_upload")
+
         # 1. Check KB exists and user has WRITE permission
-        has_permission = await self._check_kb_permission(kb_id, user)
+        has_permission = await timer.run(
+            "permission", self._check_kb_permission(kb_id, user)
+        )
         if not has_permission:
             # AC6, AC7: Return 404 to not leak KB existence
             raise DocumentValidationError(
@@ -101,15 +106,16 @@ class DocumentService:
             )
 
         # 2. Read file content for validation
-        content = await file.read()
+        content = await timer.run("read", file.read())
         file_size = len(content)
 
         # 3. Validate file
-        await self._validate_file(file, file_size)
+        await timer.run("validate", self._validate_file(file, file_size))
 
         # 4. Compute checksum
         file_stream = BytesIO(content)
-        checksum = compute_checksum(file_stream)
+        with timer.measure("checksum"):
+            checksum = compute_checksum(file_stream)
         file_stream.seek(0)
 
         # 5. Generate document record (get ID for storage path)
@@ -124,17 +130,20 @@ class DocumentService:
             uploaded_by=user.id,
         )
         self.session.add(document)
-        await self.session.flush()  # Get the document ID
+        await timer.run("flush", self.session.flush())  # Get the document ID
 
         # 6. Upload to MinIO
         # Path format: {doc_id}/{original_filename}
         object_path = f"{document.id}/{file.filename}"
         try:
-            full_path = await minio_service.upload_file(
-                kb_id=kb_id,
-                object_path=object_path,
-                file=file_stream,
-                content_type=file.content_type or "application/octet-stream",
+            full_path = await timer.run(
+                "storage",
+                minio_service.upload_file(
+                    kb_id=kb_id,
+                    object_path=object_path,
+                    file=file_stream,
+                    content_type=file.content_type or "application/octet-stream",
+                ),
             )
             document.file_path = full_path
         except Exception as e:
@@ -167,17 +176,20 @@ class DocumentService:
         self.session.add(outbox_event)
 
         # 8. Audit log (async, fire-and-forget)
-        await audit_service.log_event(
-            action="document.uploaded",
-            resource_type="document",
-            user_id=user.id,
-            resource_id=document.id,
-            details={
-                "kb_id": str(kb_id),
-                "filename": file.filename,
-                "mime_type": file.content_type,
-                "file_size_bytes": file_size,
-            },
+        await timer.run(
+            "audit",
+            audit_service.log_event(
+                action="document.uploaded",
+                resource_type="document",
+                user_id=user.id,
+                resource_id=document.id,
+                details={
+                    "kb_id": str(kb_id),
+                    "filename": file.filename,
+                    "mime_type": file.content_type,
+                    "file_size_bytes": file_size,
+                },
+            ),
         )
 
         logger.info(
@@ -187,6 +199,7 @@ class DocumentService:
             filename=file.filename,
             file_size=file_size,
             user_id=str(user.id),
+            stage_ms=timer.as_dict(),
         )
 
         return document
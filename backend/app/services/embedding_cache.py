@@ -0,0 +1,218 @@
+"""Two-tier cache for query embeddings.
+
+Tier 1 is a bounded in-process LRU (no network). Tier 2 is Redis. Both
+store vectors as packed little-endian float32 (or float16) bytes - roughly
+6KB per 1536-dim vector instead of ~49KB as a list of Python floats or ~30KB
+of JSON text. LRU hits are unpacked on read, which costs microseconds.
+
+Keys are derived from the normalized query text (Unicode NFKC, case-folded,
+whitespace collapsed) and include the embedding model name and storage dtype,
+so switching models never returns vectors from the previous one.
+"""
+
+import hashlib
+import re
+import struct
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import structlog
+
+from app.core.config import settings
+from app.core.redis import BinaryRedisClient
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefix for binary query embeddings
+QUERY_EMBEDDING_PREFIX = "qemb:"
+
+# struct format characters for supported storage dtypes
+_DTYPE_FORMATS = {"float32": "f", "float16": "e"}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different variants share an entry.
+
+    Args:
+        query: Raw query text.
+
+    Returns:
+        NFKC-normalized, case-folded text with whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def pack_vector(vector: list[float], dtype: str = "float32") -> bytes:
+    """Pack a vector into little-endian bytes.
+
+    Args:
+        vector: Embedding values.
+        dtype: "float32" or "float16".
+
+    Returns:
+        Packed bytes (4 or 2 bytes per dimension).
+    """
+    return struct.pack(f"<{len(vector)}{_DTYPE_FORMATS[dtype]}", *vector)
+
+
+def unpack_vector(data: bytes, dtype: str = "float32") -> list[float]:
+    """Unpack bytes produced by pack_vector().
+
+    Args:
+        data: Packed vector bytes.
+        dtype: "float32" or "float16".
+
+    Returns:
+        Embedding values.
+    """
+    fmt = _DTYPE_FORMATS[dtype]
+    return list(struct.unpack(f"<{len(data) // struct.calcsize(fmt)}{fmt}", data))
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for the query embedding cache."""
+
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        return (self.memory_hits + self.redis_hits) / lookups if lookups else 0.0
+
+
+class QueryEmbeddingCache:
+    """In-process LRU in front of a binary Redis store.
+
+    Redis failures are logged and treated as misses; the in-process tier keeps
+    working without Redis.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: int | None = None,
+        dtype: str | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: LRU capacity (default: settings.query_embedding_lru_size).
+            ttl_seconds: Redis TTL (default: settings.query_embedding_cache_ttl).
+            dtype: Storage dtype (default: settings.query_embedding_cache_dtype).
+
+        Raises:
+            ValueError: If dtype is not "float32" or "float16".
+        """
+        self.max_entries = max_entries or settings.query_embedding_lru_size
+        self.ttl_seconds = ttl_seconds or settings.query_embedding_cache_ttl
+        self.dtype = dtype or settings.query_embedding_cache_dtype
+        if self.dtype not in _DTYPE_FORMATS:
+            raise ValueError(f"Unsupported embedding cache dtype: {self.dtype}")
+
+        self._lru: OrderedDict[str, bytes] = OrderedDict()
+        self.stats = EmbeddingCacheStats()
+
+    def key_for(self, query: str, model: str) -> str:
+        """Build the cache key for a query under a given embedding model.
+
+        Args:
+            query: Raw query text (normalized here).
+            model: Embedding model name.
+
+        Returns:
+            Redis key, also used as the LRU key.
+        """
+        digest = hashlib.sha256(normalize_query(query).encode()).hexdigest()
+        return f"{QUERY_EMBEDDING_PREFIX}{model}:{self.dtype}:{digest}"
+
+    async def get(
+        self, query: str, model: str, *, record_stats: bool = True
+    ) -> list[float] | None:
+        """Look up a query embedding (LRU first, then Redis).
+
+        Args:
+            query: Raw query text.
+            model: Embedding model name.
+            record_stats: Count the lookup as a hit or miss. Off for repeated
+                polls of a key whose miss was already counted.
+
+        Returns:
+            Cached embedding or None on miss.
+        """
+        key = self.key_for(query, model)
+
+        data = self._lru.get(key)
+        if data is not None:
+            self._lru.move_to_end(key)
+            if record_stats:
+                self.stats.memory_hits += 1
+            return unpack_vector(data, self.dtype)
+
+        try:
+            redis = await BinaryRedisClient.get_client()
+            data = await redis.get(key)
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("query_embedding_cache_get_failed", error=str(e))
+            data = None
+
+        if not data:
+            if record_stats:
+                self.stats.misses += 1
+            return None
+
+        self._remember(key, data)
+        if record_stats:
+            self.stats.redis_hits += 1
+        return unpack_vector(data, self.dtype)
+
+    async def set(self, query: str, model: str, vector: list[float]) -> None:
+        """Store a query embedding in both tiers.
+
+        Args:
+            query: Raw query text.
+            model: Embedding model name.
+            vector: Embedding values.
+        """
+        key = self.key_for(query, model)
+        data = pack_vector(vector, self.dtype)
+        self._remember(key, data)
+
+        try:
+            redis = await BinaryRedisClient.get_client()
+            await redis.setex(key, self.ttl_seconds, data)
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning("query_embedding_cache_set_failed", error=str(e))
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Snapshot of hit/miss counters and LRU occupancy."""
+        return {
+            **asdict(self.stats),
+            "hit_ratio": round(self.stats.hit_ratio, 4),
+            "lru_entries": len(self._lru),
+            "lru_capacity": self.max_entries,
+        }
+
+    def clear(self) -> None:
+        """Drop the in-process tier and reset counters (Redis is untouched)."""
+        self._lru.clear()
+        self.stats = EmbeddingCacheStats()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._lru[key] = data
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+# Singleton instance for use across the application
+query_embedding_cache = QueryEmbeddingCache()
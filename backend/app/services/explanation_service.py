@@ -2,17 +2,21 @@
 
 import asyncio
 import hashlib
+import json
 import re
+from collections import defaultdict
+from typing import Any
 from uuid import UUID
 
 import nltk
 import structlog
-from nltk.stem.porter import PorterStemmer
+from qdrant_client.http import models
 
 from app.core.redis import RedisClient
-from app.integrations.litellm_client import acompletion
+from app.integrations.litellm_client import rate_limited_acompletion
 from app.integrations.qdrant_client import QdrantService
-from app.schemas.search import ExplanationResponse, RelatedDocument
+from app.schemas.search import ExplainBatchItem, ExplanationResponse, RelatedDocument
+from app.services.stemming import stem_tokens, stem_word
 
 logger = structlog.get_logger(__name__)
 
@@ -30,6 +34,10 @@ EXPLANATION_TTL = 3600
 EXPLANATION_MAX_TOKENS = 50
 EXPLANATION_TEMPERATURE = 0.3
 EXPLANATION_TIMEOUT = 5.0
+EXPLANATION_BATCH_TIMEOUT = 10.0
+
+# Related documents listed per explanation
+RELATED_DOCUMENTS_LIMIT = 3
 
 
 class ExplanationService:
@@ -57,7 +65,6 @@ class ExplanationService:
         """
         self.qdrant = qdrant_service
         self.redis = redis_client
-        self.stemmer = PorterStemmer()
 
     async def explain(  # noqa: ARG002
         self,
@@ -94,8 +101,6 @@ class ExplanationService:
                 cached = await redis_client.get(cache_key)
                 if cached:
                     logger.info("Explanation cache hit", cache_key=cache_key)
-                    import json
-
                     return ExplanationResponse(**json.loads(cached))
             except Exception as e:
                 logger.warning("Cache lookup failed", error=str(e))
@@ -105,7 +110,9 @@ class ExplanationService:
 
         # 3 & 4. Generate explanation and find related documents in parallel
         explanation_task = self._generate_explanation(query, chunk_text, keywords)
-        related_task = self._find_related_documents(str(chunk_id), str(kb_id), limit=3)
+        related_task = self._find_related_documents(
+            str(chunk_id), str(kb_id), limit=RELATED_DOCUMENTS_LIMIT
+        )
 
         try:
             explanation, related_docs = await asyncio.gather(
@@ -133,8 +140,6 @@ class ExplanationService:
         if self.redis:
             try:
                 redis_client = await self.redis.get_client()
-                import json
-
                 await redis_client.setex(
                     cache_key, EXPLANATION_TTL, json.dumps(response.model_dump())
                 )
@@ -144,6 +149,234 @@ class ExplanationService:
 
         return response
 
+    async def explain_batch(
+        self,
+        query: str,
+        items: list[ExplainBatchItem],
+    ) -> list[ExplanationResponse]:
+        """Generate relevance explanations for all results of a search.
+
+        Cached explanations are read with one MGET. For the rest, stored chunk
+        stems and related documents are fetched with one retrieve and one
+        recommend_batch per KB, all sentences come from a single LLM call with
+        JSON output, and new entries are cached with one pipeline.
+
+        Args:
+            query: User's search query
+            items: Search results to explain
+
+        Returns:
+            ExplanationResponse per item, in request order
+        """
+        cache_keys = [self._cache_key(query, str(item.chunk_id)) for item in items]
+        cached = await self._get_cached_many(cache_keys)
+        missing = [i for i, response in enumerate(cached) if response is None]
+        if not missing:
+            return [response for response in cached if response is not None]
+
+        missing_items = [items[i] for i in missing]
+        chunk_stems, related_docs = await self._fetch_chunk_context(missing_items)
+        keywords = [
+            self._extract_keywords(
+                query, item.chunk_text, chunk_stems.get(str(item.chunk_id))
+            )
+            for item in missing_items
+        ]
+        explanations = await self._generate_explanations(
+            query, [item.chunk_text for item in missing_items], keywords
+        )
+
+        fresh: dict[str, ExplanationResponse] = {}
+        for i, item, item_keywords, explanation in zip(
+            missing, missing_items, keywords, explanations, strict=True
+        ):
+            fresh[cache_keys[i]] = ExplanationResponse(
+                keywords=item_keywords,
+                explanation=explanation,
+                concepts=self._extract_concepts(explanation),
+                related_documents=related_docs.get(str(item.chunk_id), []),
+                section_context="N/A",
+            )
+        await self._cache_many(fresh)
+
+        logger.info(
+            "Batch explanations generated",
+            result_count=len(items),
+            cache_hits=len(items) - len(missing),
+        )
+        return [
+            response or fresh[key]
+            for response, key in zip(cached, cache_keys, strict=True)
+        ]
+
+    async def _get_cached_many(
+        self, cache_keys: list[str]
+    ) -> list[ExplanationResponse | None]:
+        """Read cached explanations in one round trip (misses on Redis errors)."""
+        if self.redis:
+            try:
+                redis_client = await self.redis.get_client()
+                cached = await redis_client.mget(cache_keys)
+                return [
+                    ExplanationResponse(**json.loads(raw)) if raw else None
+                    for raw in cached
+                ]
+            except Exception as e:
+                logger.warning("Cache lookup failed", error=str(e))
+        return [None] * len(cache_keys)
+
+    async def _cache_many(self, responses: dict[str, ExplanationResponse]) -> None:
+        """Cache explanations for 1 hour in one pipeline."""
+        if not self.redis or not responses:
+            return
+        try:
+            redis_client = await self.redis.get_client()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for cache_key, response in responses.items():
+                    pipe.setex(
+                        cache_key, EXPLANATION_TTL, json.dumps(response.model_dump())
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Cache write failed", error=str(e))
+
+    async def _fetch_chunk_context(
+        self, items: list[ExplainBatchItem]
+    ) -> tuple[dict[str, set[str]], dict[str, list[RelatedDocument]]]:
+        """Fetch stored stems and related documents, batched per KB.
+
+        Args:
+            items: Search results to explain
+
+        Returns:
+            Tuple of (chunk_id -> stems, chunk_id -> related documents). Chunks
+            indexed before stems were stored, or in KBs whose lookup failed,
+            are left out and fall back to stemming chunk_text.
+        """
+        chunk_ids_by_kb: dict[str, list[str]] = defaultdict(list)
+        for item in items:
+            chunk_ids_by_kb[str(item.kb_id)].append(str(item.chunk_id))
+
+        async def fetch_kb(
+            kb_id: str, chunk_ids: list[str]
+        ) -> tuple[list[models.Record], list[list[models.ScoredPoint]]]:
+            collection_name = f"kb_{kb_id}"
+            return await asyncio.gather(
+                self.qdrant.async_client.retrieve(
+                    collection_name=collection_name,
+                    ids=chunk_ids,
+                    with_payload=["stems"],
+                ),
+                # Recommend keeps vectors in Qdrant and excludes the chunk itself
+                self.qdrant.async_client.recommend_batch(
+                    collection_name=collection_name,
+                    requests=[
+                        models.RecommendRequest(
+                            positive=[chunk_id],
+                            limit=RELATED_DOCUMENTS_LIMIT,
+                            with_payload=["document_id", "document_name"],
+                        )
+                        for chunk_id in chunk_ids
+                    ],
+                ),
+            )
+
+        results = await asyncio.gather(
+            *(fetch_kb(kb, ids) for kb, ids in chunk_ids_by_kb.items()),
+            return_exceptions=True,
+        )
+
+        chunk_stems: dict[str, set[str]] = {}
+        related_docs: dict[str, list[RelatedDocument]] = {}
+        for (kb_id, chunk_ids), result in zip(
+            chunk_ids_by_kb.items(), results, strict=True
+        ):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Chunk context lookup failed", kb_id=kb_id, error=str(result)
+                )
+                continue
+            points, recommendations = result
+            for point in points:
+                stems = (point.payload or {}).get("stems")
+                if stems is not None:
+                    chunk_stems[str(point.id)] = set(stems)
+            for chunk_id, similar in zip(chunk_ids, recommendations, strict=True):
+                related_docs[chunk_id] = [
+                    RelatedDocument(
+                        doc_id=UUID(point.payload["document_id"]),
+                        doc_name=point.payload.get("document_name", "Unknown"),
+                        relevance=min(max(point.score, 0.0), 1.0),
+                    )
+                    for point in similar
+                ]
+
+        return chunk_stems, related_docs
+
+    async def _generate_explanations(
+        self,
+        query: str,
+        chunk_texts: list[str],
+        keywords: list[list[str]],
+    ) -> list[str]:
+        """Generate one-sentence explanations for several chunks in one LLM call.
+
+        Falls back to keyword-only explanations for any chunk the model
+        skipped, or for all of them on error or timeout.
+
+        Args:
+            query: User's search query
+            chunk_texts: Text content of each chunk
+            keywords: Matching keywords per chunk
+
+        Returns:
+            One explanation per chunk, in order
+        """
+        passages = "\n\n".join(
+            f"[{n}] Matching keywords: "
+            f"{', '.join(chunk_keywords) if chunk_keywords else 'none'}\n"
+            f"Text: {chunk_text[:500]}..."
+            for n, (chunk_text, chunk_keywords) in enumerate(
+                zip(chunk_texts, keywords, strict=True), start=1
+            )
+        )
+        prompt = f"""For each numbered text, explain in ONE sentence why it is relevant
+to the query. Focus on semantic similarity beyond just keyword matches.
+Respond with JSON: {{"explanations": ["<sentence for [1]>", "<sentence for [2]>", ...]}}
+
+Query: {query}
+
+{passages}"""
+
+        explanations: list[Any] = []
+        try:
+            response = await asyncio.wait_for(
+                rate_limited_acompletion(
+                    model="gpt-3.5-turbo",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=EXPLANATION_MAX_TOKENS * len(chunk_texts),
+                    temperature=EXPLANATION_TEMPERATURE,
+                    response_format={"type": "json_object"},
+                ),
+                timeout=EXPLANATION_BATCH_TIMEOUT,
+            )
+            explanations = json.loads(response.choices[0].message.content)[
+                "explanations"
+            ]
+        except TimeoutError:
+            logger.warning("LLM batch explanation timeout, using fallback")
+        except Exception as e:
+            logger.error("LLM batch explanation failed", error=str(e))
+
+        results = []
+        for i, chunk_keywords in enumerate(keywords):
+            explanation = explanations[i] if i < len(explanations) else None
+            if isinstance(explanation, str) and explanation.strip():
+                results.append(explanation.strip())
+            else:
+                results.append(self._fallback_explanation(chunk_keywords))
+        return results
+
     def _cache_key(self, query: str, chunk_id: str) -> str:
         """Generate cache key from query and chunk ID.
 
@@ -157,7 +390,12 @@ class ExplanationService:
         query_hash = hashlib.sha256(query.encode()).hexdigest()[:16]
         return f"explain:{query_hash}:{chunk_id}"
 
-    def _extract_keywords(self, query: str, chunk_text: str) -> list[str]:
+    def _extract_keywords(
+        self,
+        query: str,
+        chunk_text: str,
+        chunk_stems: set[str] | None = None,
+    ) -> list[str]:
         """Extract keywords that appear in both query and chunk.
 
         Uses Porter stemming for fuzzy matching (e.g., "authenticate" matches "authentication").
@@ -165,17 +403,18 @@ class ExplanationService:
         Args:
             query: User's search query
             chunk_text: Text content of the chunk
+            chunk_stems: Stems precomputed at index time (stemmed here if None)
 
         Returns:
             List of matching keywords from the query
         """
         # Tokenize and stem query
         query_words = query.split()
-        query_stems = {self.stemmer.stem(word.lower()): word for word in query_words}
+        query_stems = {stem_word(word): word for word in query_words}
 
         # Tokenize and stem chunk
-        chunk_words = chunk_text.split()
-        chunk_stems = {self.stemmer.stem(word.lower()) for word in chunk_words}
+        if chunk_stems is None:
+            chunk_stems = stem_tokens(chunk_text)
 
         # Find intersection (stemmed matches)
         matching_stems = set(query_stems.keys()) & chunk_stems
@@ -220,9 +459,9 @@ Text: {chunk_text[:500]}...
 Explanation (1 sentence):"""
 
         try:
-            # Use acompletion from litellm_client
+            # Use the rate-limited acompletion from litellm_client
             response = await asyncio.wait_for(
-                acompletion(
+                rate_limited_acompletion(
                     model="gpt-3.5-turbo",
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=EXPLANATION_MAX_TOKENS,
@@ -277,9 +516,10 @@ Explanation (1 sentence):"""
             collection_name = f"kb_{kb_id}"
 
             # Get chunk from Qdrant
-            chunks = await self.qdrant.client.retrieve(
+            chunks = await self.qdrant.async_client.retrieve(
                 collection_name=collection_name,
                 ids=[chunk_id],
+                with_payload=False,
                 with_vectors=True,
             )
 
@@ -288,10 +528,11 @@ Explanation (1 sentence):"""
                 return []
 
             # Search for similar chunks in same KB
-            similar = await self.qdrant.client.search(
+            similar = await self.qdrant.async_client.search(
                 collection_name=collection_name,
                 query_vector=chunks[0].vector,
                 limit=limit + 1,  # +1 to exclude self
+                with_payload=["document_id", "document_name"],
             )
 
             # Exclude original chunk and build response
@@ -1,9 +1,10 @@
 """Knowledge Base service for business logic."""
 
+from typing import Any
 from uuid import UUID
 
 import structlog
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.document import Document, DocumentStatus
@@ -14,6 +15,7 @@ from app.models.user import User
 from app.schemas.knowledge_base import KBCreate, KBSummary, KBUpdate
 from app.schemas.permission import PermissionResponse
 from app.services.audit_service import audit_service
+from app.services.permission_cache import permission_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -25,6 +27,15 @@ PERMISSION_HIERARCHY = {
     PermissionLevel.READ: 1,
 }
 
+# String -> PermissionLevel mapping for callers passing plain strings
+_PERMISSION_LEVEL_MAP = {level.value: level for level in PermissionLevel}
+
+
+def _required_level(permission_level: str) -> int:
+    """Map a permission level string to its hierarchy rank (default: READ)."""
+    level = _PERMISSION_LEVEL_MAP.get(permission_level, PermissionLevel.READ)
+    return PERMISSION_HIERARCHY[level]
+
 
 class KBService:
     """Service for Knowledge Base operations.
@@ -45,7 +56,7 @@ class KBService:
         """Create a new Knowledge Base.
 
         Args:
-            data: KB creation data (name, description).
+            data: KB creation data (name, description, optional settings).
             user: The user creating the KB.
 
         Returns:
@@ -54,7 +65,7 @@ class KBService:
         Note:
             - Sets owner_id to the creating user
             - Sets status to 'active'
-            - Sets settings to empty dict
+            - Sets settings to the fields provided (empty dict if none)
             - Creates ADMIN permission for the creator
             - Qdrant collection creation is handled by the API layer
         """
@@ -64,7 +75,9 @@ class KBService:
             description=data.description,
             owner_id=user.id,
             status="active",
-            settings={},
+            settings=(
+                data.settings.model_dump(exclude_unset=True) if data.settings else {}
+            ),
         )
         self.session.add(kb)
         await self.session.flush()  # Get the ID
@@ -77,6 +90,9 @@ class KBService:
         )
         self.session.add(permission)
 
+        # Creator's ACL snapshot now includes the new KB
+        permission_cache.invalidate_user_on_commit(self.session, user.id)
+
         logger.info(
             "kb_created",
             kb_id=str(kb.id),
@@ -196,7 +212,7 @@ class KBService:
 
         Args:
             kb_id: The KB UUID.
-            data: Update data (name and/or description).
+            data: Update data (name, description and/or settings).
             user: The user performing the update.
 
         Returns:
@@ -223,7 +239,7 @@ class KBService:
             return None
 
         # Track changes for audit
-        changes: dict[str, dict[str, str | None]] = {}
+        changes: dict[str, dict[str, Any]] = {}
 
         # Update fields if provided
         if data.name is not None and data.name != kb.name:
@@ -234,6 +250,19 @@ class KBService:
             changes["description"] = {"old": kb.description, "new": data.description}
             kb.description = data.description
 
+        if data.settings is not None:
+            current = kb.settings or {}
+            updated = {**current}
+            for key, value in data.settings.model_dump(exclude_unset=True).items():
+                # Nested groups (e.g. vector_index) merge field by field
+                if isinstance(value, dict) and isinstance(current.get(key), dict):
+                    value = {**current[key], **value}
+                updated[key] = value
+            if updated != current:
+                changes["settings"] = {"old": current, "new": updated}
+                # Reassign (not mutate) so SQLAlchemy detects the JSONB change
+                kb.settings = updated
+
         if changes:
             # Audit log (AC4)
             await audit_service.log_event(
@@ -302,6 +331,9 @@ class KBService:
         )
         self.session.add(outbox_event)
 
+        # Archived KBs drop out of every user's ACL snapshot
+        permission_cache.invalidate_all_on_commit(self.session)
+
         # Audit log (AC5)
         await audit_service.log_event(
             action="kb.archived",
@@ -495,6 +527,7 @@ class KBService:
             action_detail = f"granted {level.value}"
 
         await self.session.flush()
+        permission_cache.invalidate_user_on_commit(self.session, user_id)
 
         # Audit log (AC1)
         await audit_service.log_event(
@@ -650,6 +683,7 @@ class KBService:
         # Delete the permission
         await self.session.delete(permission)
         await self.session.flush()
+        permission_cache.invalidate_user_on_commit(self.session, user_id)
 
         # Audit log (AC3)
         await audit_service.log_event(
@@ -686,10 +720,72 @@ class KBPermissionService:
         """
         self.session = session
 
+    async def get_acl_snapshot(self, user_id: str) -> dict[str, str]:
+        """Get the user's ACL snapshot: every active KB they can access.
+
+        Resolved with a single query (owner bypass, explicit KBPermission rows
+        and superuser access combined) and cached in Redis with a short TTL.
+
+        Args:
+            user_id: User ID (string)
+
+        Returns:
+            Mapping of kb_id (string) -> effective permission level value
+        """
+        cached, version = await permission_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        from app.models.user import User as UserModel
+
+        user_uuid = UUID(user_id)
+        is_superuser = (
+            select(UserModel.is_superuser)
+            .where(UserModel.id == user_uuid)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(
+                KnowledgeBase.id,
+                KnowledgeBase.owner_id,
+                KBPermission.permission_level,
+                is_superuser.label("is_superuser"),
+            )
+            .outerjoin(
+                KBPermission,
+                and_(
+                    KBPermission.kb_id == KnowledgeBase.id,
+                    KBPermission.user_id == user_uuid,
+                ),
+            )
+            .where(
+                KnowledgeBase.status == "active",
+                or_(
+                    KnowledgeBase.owner_id == user_uuid,
+                    KBPermission.id.is_not(None),
+                    is_superuser.is_(True),
+                ),
+            )
+        )
+
+        snapshot: dict[str, str] = {}
+        for row in result.all():
+            # Superusers and owners have implicit ADMIN permission
+            if row.is_superuser or row.owner_id == user_uuid:
+                level = PermissionLevel.ADMIN
+            else:
+                level = row.permission_level
+            snapshot[str(row.id)] = level.value
+
+        if version is not None:
+            await permission_cache.set(user_id, snapshot, version)
+
+        return snapshot
+
     async def get_permitted_kb_ids(
         self,
         user_id: str,
-        permission_level: str = "READ",  # noqa: ARG002 - Reserved for future permission filtering
+        permission_level: str = "READ",
     ) -> list[str]:
         """Get list of KB IDs the user has access to.
 
@@ -700,47 +796,38 @@ class KBPermissionService:
         Returns:
             List of KB IDs as strings
         """
-        from app.models.user import User as UserModel
+        snapshot = await self.get_acl_snapshot(user_id)
+        required_level = _required_level(permission_level)
+        return [
+            kb_id
+            for kb_id, level in snapshot.items()
+            if PERMISSION_HIERARCHY[PermissionLevel(level)] >= required_level
+        ]
 
-        # Get user
-        user_result = await self.session.execute(
-            select(UserModel).where(UserModel.id == UUID(user_id))
-        )
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return []
+    async def check_permissions(
+        self, user_id: str, kb_ids: list[str], permission_level: str = "READ"
+    ) -> bool:
+        """Check if user has permission on every KB in a list.
 
-        # Superusers have access to all KBs
-        if user.is_superuser:
-            result = await self.session.execute(
-                select(KnowledgeBase.id).where(KnowledgeBase.status == "active")
-            )
-            return [str(kb_id) for kb_id in result.scalars().all()]
+        Uses the cached ACL snapshot, so checking N KBs costs at most one
+        query instead of N permission lookups. IDs are compared in canonical
+        UUID form; an ID that is not a UUID is never permitted.
 
-        # Get KBs where user has permission
-        result = await self.session.execute(
-            select(KnowledgeBase.id)
-            .join(KBPermission, KnowledgeBase.id == KBPermission.kb_id)
-            .where(
-                KBPermission.user_id == UUID(user_id),
-                KnowledgeBase.status == "active",
-            )
-        )
-        kb_ids = result.scalars().all()
-
-        # Also include KBs where user is owner (implicit ADMIN)
-        owner_result = await self.session.execute(
-            select(KnowledgeBase.id).where(
-                KnowledgeBase.owner_id == UUID(user_id),
-                KnowledgeBase.status == "active",
-            )
-        )
-        owner_kb_ids = owner_result.scalars().all()
+        Args:
+            user_id: User ID (string)
+            kb_ids: KB IDs (strings)
+            permission_level: Required permission level
 
-        # Combine and deduplicate
-        all_kb_ids = set(kb_ids) | set(owner_kb_ids)
+        Returns:
+            True if user has permission on all KBs, False otherwise
+        """
+        try:
+            requested = {str(UUID(kb_id)) for kb_id in kb_ids}
+        except ValueError:
+            return False
 
-        return [str(kb_id) for kb_id in all_kb_ids]
+        permitted = await self.get_permitted_kb_ids(user_id, permission_level)
+        return requested <= set(permitted)
 
     async def check_permission(
         self, user_id: str, kb_id: str, permission_level: str = "READ"
@@ -766,12 +853,7 @@ class KBPermissionService:
             return False
 
         # Map string to PermissionLevel
-        perm_map = {
-            "READ": PermissionLevel.READ,
-            "WRITE": PermissionLevel.WRITE,
-            "ADMIN": PermissionLevel.ADMIN,
-        }
-        required = perm_map.get(permission_level, PermissionLevel.READ)
+        required = _PERMISSION_LEVEL_MAP.get(permission_level, PermissionLevel.READ)
 
         # Use KBService check_permission
         kb_service = KBService(self.session)
@@ -0,0 +1,208 @@
+"""Per-user ACL snapshot cache for Knowledge Base permission checks.
+
+An ACL snapshot is the set of active KBs a user can access, mapped to the
+effective permission level (owner and superuser bypass already applied).
+Snapshots are cached in Redis with a short TTL so multi-KB searches can
+authorize every requested KB with a single set-subset test.
+
+Invalidation:
+- Per user: grant/revoke and KB creation bump that user's version counter
+  and delete the snapshot.
+- Global: KB archive bumps a global version counter.
+Snapshots written under an older global or user version are ignored on read.
+
+Invalidations run after the session commits (see invalidate_user_on_commit).
+Invalidating before the commit would let a concurrent search re-cache the
+pre-commit rows; the version check then rejects any snapshot that was read
+from the database before the commit but written to Redis after it.
+"""
+
+import asyncio
+import json
+from uuid import UUID
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import RedisClient
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefixes
+ACL_SNAPSHOT_PREFIX = "acl:user:"
+ACL_VERSION_KEY = "acl:version"
+ACL_USER_VERSION_PREFIX = "acl:uver:"
+
+# User versions must outlive any snapshot written under an older version
+_USER_VERSION_TTL_SECONDS = 24 * 60 * 60
+
+# Session.info key holding invalidations waiting for commit (None = global)
+_PENDING_KEY = "acl_cache_pending"
+
+
+class PermissionCache:
+    """Redis-backed cache of per-user ACL snapshots.
+
+    All operations are best-effort: Redis failures are logged and treated
+    as cache misses so permission checks always fall back to the database.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Snapshot TTL (default: settings.acl_cache_ttl_seconds).
+        """
+        self.ttl_seconds = ttl_seconds or settings.acl_cache_ttl_seconds
+        # Post-commit invalidations in flight (keeps the tasks referenced)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _key(self, user_id: str | UUID) -> str:
+        return f"{ACL_SNAPSHOT_PREFIX}{user_id}"
+
+    def _version_key(self, user_id: str | UUID) -> str:
+        return f"{ACL_USER_VERSION_PREFIX}{user_id}"
+
+    async def get(
+        self, user_id: str | UUID
+    ) -> tuple[dict[str, str] | None, tuple[int, int] | None]:
+        """Get a cached snapshot if it is still current (one round trip).
+
+        Args:
+            user_id: The user's UUID.
+
+        Returns:
+            Tuple of (kb_id -> permission level mapping or None on miss/stale,
+            current (global, user) versions or None if Redis is unavailable).
+            Pass the versions to set() so a snapshot computed before a
+            concurrent invalidation is never stored as current.
+        """
+        try:
+            redis = await RedisClient.get_client()
+            raw, raw_version, raw_user_version = await redis.mget(
+                self._key(user_id), ACL_VERSION_KEY, self._version_key(user_id)
+            )
+        except Exception as e:
+            logger.warning("acl_cache_get_failed", user_id=str(user_id), error=str(e))
+            return None, None
+
+        version = (int(raw_version or 0), int(raw_user_version or 0))
+        if not raw:
+            return None, version
+
+        cached = json.loads(raw)
+        if (cached.get("version"), cached.get("user_version", 0)) != version:
+            return None, version
+        return cached["kbs"], version
+
+    async def set(
+        self, user_id: str | UUID, snapshot: dict[str, str], version: tuple[int, int]
+    ) -> None:
+        """Store a snapshot computed under the given versions.
+
+        Args:
+            user_id: The user's UUID.
+            snapshot: Mapping of kb_id -> permission level.
+            version: (global, user) versions returned by get() before the
+                DB read.
+        """
+        global_version, user_version = version
+        try:
+            redis = await RedisClient.get_client()
+            await redis.setex(
+                self._key(user_id),
+                self.ttl_seconds,
+                json.dumps(
+                    {
+                        "version": global_version,
+                        "user_version": user_version,
+                        "kbs": snapshot,
+                    }
+                ),
+            )
+        except Exception as e:
+            logger.warning("acl_cache_set_failed", user_id=str(user_id), error=str(e))
+
+    async def invalidate_user(self, user_id: str | UUID) -> None:
+        """Drop one user's snapshot (permission granted/revoked, KB created).
+
+        Args:
+            user_id: The user's UUID.
+        """
+        try:
+            redis = await RedisClient.get_client()
+            pipe = redis.pipeline(transaction=False)
+            pipe.incr(self._version_key(user_id))
+            pipe.expire(self._version_key(user_id), _USER_VERSION_TTL_SECONDS)
+            pipe.delete(self._key(user_id))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(
+                "acl_cache_invalidate_failed", user_id=str(user_id), error=str(e)
+            )
+
+    async def invalidate_all(self) -> None:
+        """Invalidate every snapshot (KB archived)."""
+        try:
+            redis = await RedisClient.get_client()
+            await redis.incr(ACL_VERSION_KEY)
+        except Exception as e:
+            logger.warning("acl_cache_invalidate_all_failed", error=str(e))
+
+    def invalidate_user_on_commit(
+        self, session: AsyncSession, user_id: str | UUID
+    ) -> None:
+        """Invalidate one user's snapshot once the session commits.
+
+        Args:
+            session: Session holding the permission change.
+            user_id: The user's UUID.
+        """
+        self._defer(session, str(user_id))
+
+    def invalidate_all_on_commit(self, session: AsyncSession) -> None:
+        """Invalidate every snapshot once the session commits.
+
+        Args:
+            session: Session holding the KB status change.
+        """
+        self._defer(session, None)
+
+    def _defer(self, session: AsyncSession, user_id: str | None) -> None:
+        pending: set[str | None] | None = session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = session.info[_PENDING_KEY] = set()
+            event.listen(session.sync_session, "after_commit", self._after_commit)
+            event.listen(session.sync_session, "after_rollback", self._discard)
+        pending.add(user_id)
+
+    def _after_commit(self, session: Session) -> None:
+        pending: set[str | None] = session.info.get(_PENDING_KEY, set())
+        if not pending:
+            return
+        targets = frozenset(pending)
+        pending.clear()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("acl_cache_invalidate_skipped", reason="no event loop")
+            return
+        task = loop.create_task(self._invalidate(targets))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _discard(self, session: Session) -> None:
+        session.info.get(_PENDING_KEY, set()).clear()
+
+    async def _invalidate(self, targets: frozenset[str | None]) -> None:
+        if None in targets:
+            await self.invalidate_all()
+        for user_id in targets - {None}:
+            await self.invalidate_user(user_id)
+
+
+# Singleton instance for use across the application
+permission_cache = PermissionCache()
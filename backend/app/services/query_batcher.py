@@ -0,0 +1,184 @@
+"""Micro-batching of query embeddings in the API.
+
+At peak traffic every query embedding cache miss would be its own one-text
+LiteLLM request. QueryEmbeddingBatcher collects misses that arrive within a
+short window (or until the batch is full), sends them as one request and
+resolves each caller's future with its vector.
+
+Batching only engages while traffic is high: below
+query_embedding_batch_min_qps a query is embedded immediately, so
+single-query latency never pays for the window.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+EmbedMany = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+@dataclass
+class QueryBatcherStats:
+    """Counters for the query embedding batcher."""
+
+    direct: int = 0  # embedded immediately (low traffic)
+    batched: int = 0  # joined a batch
+    flushes: int = 0  # batched requests sent
+
+
+@dataclass
+class _PendingBatch:
+    loop: asyncio.AbstractEventLoop
+    embed_many: EmbedMany
+    waiters: dict[str, list[asyncio.Future[list[float]]]] = field(default_factory=dict)
+    timer: asyncio.TimerHandle | None = None
+
+
+class QueryEmbeddingBatcher:
+    """Collects concurrent single-query embeddings into one request."""
+
+    def __init__(
+        self,
+        window_ms: float | None = None,
+        max_size: int | None = None,
+        min_qps: int | None = None,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            window_ms: Max wait for more queries (default: settings).
+            max_size: Queries per request (default: settings).
+            min_qps: Arrival rate at which batching engages (default: settings).
+        """
+        self._window_ms = window_ms
+        self._max_size = max_size
+        self._min_qps = min_qps
+        self.stats = QueryBatcherStats()
+        self._pending: _PendingBatch | None = None
+        self._flushing: set[asyncio.Task[None]] = set()
+        # Arrivals per whole second of loop time, for the low-traffic bypass
+        self._second = 0
+        self._second_count = 0
+        self._last_second_count = 0
+
+    @property
+    def window(self) -> float:
+        if self._window_ms is not None:
+            return self._window_ms / 1000
+        return settings.query_embedding_batch_window_ms / 1000
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return settings.query_embedding_batch_max_size
+
+    @property
+    def min_qps(self) -> int:
+        if self._min_qps is not None:
+            return self._min_qps
+        return settings.query_embedding_batch_min_qps
+
+    async def embed(
+        self, text: str, embed_many: EmbedMany, batch: bool = False
+    ) -> list[float]:
+        """Embed one query, batched with concurrent ones under high traffic.
+
+        Args:
+            text: Query text.
+            embed_many: Embeds a list of texts in one request (e.g.
+                embedding_client.get_embeddings). The first caller's function
+                is used for the whole batch.
+            batch: Join a batch even at low traffic or with batching turned
+                off. For callers submitting many queries at once (batch
+                search), which would otherwise send them as single requests.
+
+        Returns:
+            Embedding vector.
+        """
+        if not settings.query_embedding_batch_enabled and not batch:
+            return (await embed_many([text]))[0]
+
+        loop = asyncio.get_running_loop()
+        busy = self._observe(loop.time())
+        if self._pending is not None and self._pending.loop is not loop:
+            self._pending = None  # left behind by a closed event loop
+        if self._pending is None and not busy and not batch:
+            self.stats.direct += 1
+            return (await embed_many([text]))[0]
+
+        if self._pending is None:
+            self._pending = _PendingBatch(loop=loop, embed_many=embed_many)
+            self._pending.timer = loop.call_later(self.window, self._flush)
+        batch = self._pending
+        waiter: asyncio.Future[list[float]] = loop.create_future()
+        batch.waiters.setdefault(text, []).append(waiter)
+        self.stats.batched += 1
+        if len(batch.waiters) >= self.max_size:
+            self._flush()
+        return await waiter
+
+    def get_stats(self) -> dict[str, int]:
+        """Snapshot of counters."""
+        return asdict(self.stats)
+
+    def _observe(self, now: float) -> bool:
+        """Count an arrival; True if traffic is high enough to batch."""
+        second = int(now)
+        if second != self._second:
+            self._last_second_count = (
+                self._second_count if second == self._second + 1 else 0
+            )
+            self._second = second
+            self._second_count = 0
+        self._second_count += 1
+        return max(self._last_second_count, self._second_count) >= self.min_qps
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, None
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = batch.loop.create_task(self._run(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        texts = list(batch.waiters)
+        self.stats.flushes += 1
+        try:
+            vectors = await batch.embed_many(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(
+                    f"Expected {len(texts)} embeddings, got {len(vectors)}"
+                )
+            for text, vector in zip(texts, vectors, strict=True):
+                for waiter in batch.waiters[text]:
+                    if not waiter.done():
+                        waiter.set_result(vector)
+        except BaseException as e:
+            # Every caller is parked on a future; none may be left pending,
+            # including when the flush task itself is cancelled
+            for waiters in batch.waiters.values():
+                for waiter in waiters:
+                    if waiter.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        waiter.cancel()
+                    else:
+                        waiter.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        logger.debug("query_embedding_batch_flushed", batch_size=len(texts))
+
+
+# Singleton instance for use across the application
+query_embedding_batcher = QueryEmbeddingBatcher()
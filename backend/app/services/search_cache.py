@@ -0,0 +1,154 @@
+"""Versioned search-result cache.
+
+Caches complete SearchResponse payloads (results + synthesized answer +
+citations) keyed by:
+- normalized query text and result limit
+- sorted KB IDs
+- each KB's index generation counter
+- the embedding and synthesis model names
+
+Any change to a KB's vectors (document indexed, document vectors deleted,
+orphan cleanup, KB deleted) bumps that KB's generation. Entries built on an
+older generation are simply never looked up again and expire via TTL, so no
+flush is needed.
+"""
+
+import hashlib
+import json
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+from app.core.redis import RedisClient
+from app.schemas.search import SearchResponse
+from app.services.embedding_cache import normalize_query
+
+logger = structlog.get_logger(__name__)
+
+# Redis key prefixes
+KB_INDEX_GENERATION_PREFIX = "kb:index_gen:"
+SEARCH_RESULT_PREFIX = "search:result:"
+
+
+def _generation_key(kb_id: str) -> str:
+    return f"{KB_INDEX_GENERATION_PREFIX}{kb_id}"
+
+
+async def get_index_generations(kb_ids: list[str]) -> dict[str, str]:
+    """Read the current index generation of each KB in one round trip.
+
+    Args:
+        kb_ids: KB IDs (duplicates and order are ignored).
+
+    Returns:
+        Mapping of kb_id -> generation ("0" if never bumped), sorted by kb_id.
+
+    Raises:
+        Exception: If Redis is unavailable (callers treat this as a miss).
+    """
+    sorted_kb_ids = sorted(set(kb_ids))
+    if not sorted_kb_ids:
+        return {}
+    client = await RedisClient.get_client()
+    values = await client.mget([_generation_key(kb) for kb in sorted_kb_ids])
+    return {kb: gen or "0" for kb, gen in zip(sorted_kb_ids, values, strict=True)}
+
+
+class SearchResultCache:
+    """Redis-backed cache of search responses, invalidated by index generation.
+
+    All operations are best-effort: Redis failures are logged and treated as
+    cache misses so search always falls back to the full pipeline.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Entry TTL (default: settings.search_result_cache_ttl).
+        """
+        self.ttl_seconds = ttl_seconds or settings.search_result_cache_ttl
+
+    async def lookup(
+        self, query: str, kb_ids: list[str], limit: int
+    ) -> tuple[SearchResponse | None, str | None]:
+        """Look up a cached response for the current index generations.
+
+        Args:
+            query: Raw query text (normalized here).
+            kb_ids: KB IDs being searched (already permission-checked).
+            limit: Result limit.
+
+        Returns:
+            Tuple of (cached response or None, cache key or None if Redis is
+            unavailable). Pass the key to store() so a response computed while
+            a KB was being re-indexed is stored under the generation it was
+            computed against, not the newer one.
+        """
+        if not settings.search_result_cache_enabled:
+            return None, None
+
+        try:
+            generations = await get_index_generations(kb_ids)
+            key = self._key(query, generations, limit)
+            client = await RedisClient.get_client()
+            raw = await client.get(key)
+        except Exception as e:
+            logger.warning("search_cache_get_failed", error=str(e))
+            return None, None
+
+        if not raw:
+            return None, key
+        return SearchResponse.model_validate_json(raw), key
+
+    async def store(self, key: str | None, response: SearchResponse) -> None:
+        """Store a response under a key returned by lookup().
+
+        Args:
+            key: Cache key from lookup() (no-op if None).
+            response: Response to cache.
+        """
+        if key is None:
+            return
+        try:
+            client = await RedisClient.get_client()
+            await client.setex(key, self.ttl_seconds, response.model_dump_json())
+        except Exception as e:
+            logger.warning("search_cache_set_failed", error=str(e))
+
+    def _key(self, query: str, generations: dict[str, str], limit: int) -> str:
+        material = json.dumps(
+            [
+                normalize_query(query),
+                limit,
+                list(generations.items()),
+                settings.embedding_model,
+                settings.llm_model,
+            ]
+        )
+        digest = hashlib.sha256(material.encode()).hexdigest()
+        return f"{SEARCH_RESULT_PREFIX}{digest}"
+
+
+async def bump_index_generation(kb_id: str) -> None:
+    """Mark a KB's index as changed so cached search results for it go stale.
+
+    Called from Celery workers, which run each task in a fresh event loop, so
+    a short-lived connection is used instead of the shared RedisClient.
+    Failures are logged; cached entries then expire via TTL.
+
+    Args:
+        kb_id: Knowledge Base ID (UUID or string).
+    """
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.incr(_generation_key(str(kb_id)))
+    except Exception as e:
+        logger.warning("index_generation_bump_failed", kb_id=str(kb_id), error=str(e))
+    finally:
+        await client.aclose()
+
+
+# Singleton instance for use across the application
+search_result_cache = SearchResultCache()
@@ -1,43 +1,81 @@
 """Search service for semantic search and answer synthesis."""
 
+import asyncio
 import hashlib
-import json
 import re
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
 from fastapi import Depends
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_async_session
 from app.core.logging import get_logger
-from app.core.redis import RedisClient
+from app.core.timing import Deadline, StageTimer
 from app.integrations.litellm_client import embedding_client
-from app.integrations.qdrant_client import qdrant_service
+from app.integrations.llm_rate_limiter import RateLimitWaitExceededError
+from app.integrations.qdrant_client import build_search_params, qdrant_service
 from app.schemas.citation import Citation
+from app.schemas.knowledge_base import KBSettings
 from app.schemas.search import (
+    BatchSearchResponse,
     QuickSearchResponse,
     QuickSearchResult,
     SearchResponse,
     SearchResultSchema,
+    make_excerpt,
 )
 from app.schemas.sse import (
     CitationEvent,
     DoneEvent,
     ErrorEvent,
+    SourcesEvent,
     SSEEvent,
     StatusEvent,
     TokenEvent,
 )
+from app.services.admission import (
+    SYNTHESIS_OVERLOADED,
+    AdmissionRejectedError,
+    synthesis_admission,
+)
 from app.services.audit_service import AuditService, get_audit_service
-from app.services.citation_service import CitationService
+from app.services.chunk_locator import lookup_chunk_kb, remember_chunk_kb
+from app.services.citation_service import CitationMarkerParser, CitationService
+from app.services.context_packer import format_context, pack_sources
+from app.services.embedding_cache import pack_vector, query_embedding_cache
 from app.services.kb_service import KBPermissionService, get_kb_permission_service
+from app.services.query_batcher import query_embedding_batcher
+from app.services.search_cache import search_result_cache
+from app.services.semantic_cache import (
+    SEMANTIC_CACHE_SETTING,
+    CachedAnswer,
+    SemanticCacheKey,
+    semantic_answer_cache,
+)
+from app.services.single_flight import embedding_flight, vector_search_flight
 
 logger = get_logger()
 
-# Pattern for detecting [n] markers in token stream
-CITATION_MARKER_PATTERN = r"\[(\d+)\]"
+NO_RESULTS_MESSAGE = "No relevant documents found for your query. Try rephrasing or searching across all Knowledge Bases."
+
+# synthesis_skipped value for an answer cut off by the latency budget
+SYNTHESIS_DEADLINE_EXCEEDED = "deadline_exceeded"
+
+# Payload fields quick search needs (the precomputed excerpt, not chunk_text)
+QUICK_SEARCH_PAYLOAD_FIELDS = ["document_id", "document_name", "excerpt"]
+
+# Full-result payload: everything except the index-time stems (hundreds of
+# strings per chunk, only read by the explanation service)
+SEARCH_RESULT_PAYLOAD = models.PayloadSelectorExclude(exclude=["stems"])
+
+# Splits a cached answer into word-sized tokens for SSE replay
+_REPLAY_TOKEN_RE = re.compile(r"\S+\s*|\s+")
 
 # LLM System Prompt for Citation Instructions (from tech-spec-epic-3.md)
 CITATION_SYSTEM_PROMPT = """You are a helpful assistant answering questions based on provided source documents.
@@ -55,6 +93,17 @@ Example:
 Sources will be provided below with their numbers."""
 
 
+@dataclass
+class KBMetadata:
+    """Display names and search settings of the KBs being searched."""
+
+    names: dict[str, str] = field(default_factory=dict)  # kb_id -> kb_name
+    # kb_id -> SearchParams, only for KBs that override the Qdrant defaults
+    search_params: dict[str, models.SearchParams] = field(default_factory=dict)
+    # No searched KB has opted out (unknown, e.g. on fetch failure, is False)
+    semantic_cache_allowed: bool = False
+
+
 class SearchService:
     """Service for semantic search operations.
 
@@ -82,7 +131,17 @@ class SearchService:
         self.permission_service = permission_service
         self.audit_service = audit_service
         self.citation_service = citation_service or CitationService()
-        self.qdrant_client = qdrant_service.client
+        self._qdrant_client: AsyncQdrantClient | None = None
+
+    @property
+    def qdrant_client(self) -> AsyncQdrantClient:
+        """Async Qdrant client (shared, event-loop bound) unless overridden."""
+        return self._qdrant_client or qdrant_service.async_client
+
+    @qdrant_client.setter
+    def qdrant_client(self, client: AsyncQdrantClient) -> None:
+        """Override the Qdrant client (e.g. with a local or in-memory instance)."""
+        self._qdrant_client = client
 
     async def search(
         self,
@@ -91,6 +150,8 @@ class SearchService:
         user_id: str,
         limit: int = 10,
         stream: bool = False,
+        deadline_ms: int | None = None,
+        include_sources: bool = False,
     ) -> SearchResponse | AsyncGenerator[SSEEvent, None]:
         """Execute semantic search.
 
@@ -100,6 +161,8 @@ class SearchService:
             user_id: User ID for permission checks
             limit: Maximum number of results
             stream: If True, return SSE stream generator
+            deadline_ms: Latency budget (default: settings.search_deadline_ms)
+            include_sources: Stream only - emit a SourcesEvent before synthesis
 
         Returns:
             SearchResponse with results, or AsyncGenerator[SSEEvent, None]
@@ -109,10 +172,13 @@ class SearchService:
             ConnectionError: If Qdrant or LiteLLM unavailable
         """
         # Branch to streaming or non-streaming mode (AC8)
+        deadline = Deadline(deadline_ms or settings.search_deadline_ms)
         if stream:
-            return self._search_stream(query, kb_ids, user_id, limit)
+            return self._search_stream(
+                query, kb_ids, user_id, limit, deadline, include_sources
+            )
         else:
-            return await self._search_sync(query, kb_ids, user_id, limit)
+            return await self._search_sync(query, kb_ids, user_id, limit, deadline)
 
     async def _search_sync(
         self,
@@ -120,6 +186,7 @@ class SearchService:
         kb_ids: list[str] | None,
         user_id: str,
         limit: int = 10,
+        deadline: Deadline | None = None,
     ) -> SearchResponse:
         """Execute non-streaming search (backward compatible).
 
@@ -130,6 +197,8 @@ class SearchService:
             kb_ids: List of KB IDs to search, or None for all permitted KBs
             user_id: User ID for permission checks
             limit: Maximum number of results
+            deadline: Latency budget; KBs that miss the retrieval share of it
+                are dropped and synthesis is bounded by what is left
 
         Returns:
             SearchResponse with complete results
@@ -139,72 +208,136 @@ class SearchService:
             ConnectionError: If Qdrant or LiteLLM unavailable
         """
         start_time = time.time()
+        timer = StageTimer("search")
+        deadline = deadline or Deadline(settings.search_deadline_ms)
+        retrieval_deadline = deadline.share(settings.search_retrieval_share)
+        partial_kbs: list[str] = []
+        # KB metadata (if kb_ids are known) starts alongside ACL; embedding
+        # waits for a result cache miss
+        stages = _SearchStages(
+            self,
+            query,
+            kb_ids,
+            user_id,
+            timer,
+            defer_embed=settings.search_result_cache_enabled,
+        )
 
         try:
-            # Get permitted KBs if not specified
-            if kb_ids is None:
-                kb_ids = await self.permission_service.get_permitted_kb_ids(
-                    user_id, "READ"
-                )
+            kb_ids = await stages.resolve_kb_ids()
 
-            # Check permissions for all specified KBs
-            for kb_id in kb_ids:
-                has_access = await self.permission_service.check_permission(
-                    user_id, kb_id, "READ"
+            # Serve repeated searches from the versioned result cache
+            cached, cache_key = await timer.run(
+                "result_cache", search_result_cache.lookup(query, kb_ids, limit)
+            )
+            if cached is not None:
+                latency_ms = int((time.time() - start_time) * 1000)
+                await timer.run(
+                    "audit",
+                    self.audit_service.log_search(
+                        user_id=user_id,
+                        query=query,
+                        kb_ids=kb_ids,
+                        result_count=cached.result_count,
+                        latency_ms=latency_ms,
+                    ),
                 )
-                if not has_access:
-                    raise PermissionError("Knowledge Base not found")
-
-            # Generate query embedding
-            embedding = await self._embed_query(query)
+                logger.info(
+                    "search_completed",
+                    query_length=len(query),
+                    kb_count=len(kb_ids),
+                    result_count=cached.result_count,
+                    latency_ms=latency_ms,
+                    cache_hit=True,
+                    stage_ms=timer.as_dict(),
+                )
+                return cached.model_copy(update={"query": query})
 
-            # Fetch KB names for display (graceful fallback)
-            try:
-                kb_name_map = await self._get_kb_names(kb_ids)
-            except Exception as e:
-                logger.warning("kb_name_fetch_failed", error=str(e))
-                kb_name_map = {}
-
-            # Search Qdrant collections
-            chunks = await self._search_collections(
-                embedding, kb_ids, limit, kb_name_map
+            # Qdrant search starts once both embedding and KB names are ready
+            embedding, kb_metadata = await stages.retrieval_inputs(
+                kb_ids, retrieval_deadline
+            )
+            chunks = await timer.run(
+                "qdrant",
+                self._search_collections(
+                    embedding,
+                    kb_ids,
+                    limit,
+                    kb_metadata.names,
+                    deadline=retrieval_deadline,
+                    partial_kbs=partial_kbs,
+                    kb_search_params=kb_metadata.search_params,
+                ),
             )
 
             # Assemble response
-            results = [
-                SearchResultSchema(
-                    document_id=chunk["document_id"],
-                    document_name=chunk["document_name"],
-                    kb_id=chunk["kb_id"],
-                    kb_name=chunk.get("kb_name", "Unknown"),
-                    chunk_text=chunk["chunk_text"],
-                    relevance_score=chunk["score"],
-                    page_number=chunk.get("page_number"),
-                    section_header=chunk.get("section_header"),
-                    char_start=chunk["char_start"],
-                    char_end=chunk["char_end"],
-                )
-                for chunk in chunks
-            ]
+            results = [_result_from_chunk(chunk) for chunk in chunks]
 
             # Story 3.2: Answer Synthesis with Citations
             answer = ""
             citations: list[Citation] = []
             confidence = 0.0
+            synthesis_failed = False
+            synthesis_skipped: str | None = None
 
             if results:
                 try:
-                    # Synthesize answer using top-5 chunks (AC1)
-                    answer = await self._synthesize_answer(query, results[:5])
-
-                    # Extract citations (AC2, AC3)
-                    answer, citations = self.citation_service.extract_citations(
-                        answer, results[:5]
+                    # Reuse an answer synthesized for a near-duplicate question
+                    cached_answer, semantic_key = await self._lookup_semantic_answer(
+                        embedding, kb_ids, kb_metadata
                     )
 
-                    # Calculate confidence (AC4)
-                    confidence = self._calculate_confidence(results[:5], query)
+                    if cached_answer is not None:
+                        answer = cached_answer.answer
+                        citations = cached_answer.citations
+                        confidence = cached_answer.confidence
+                    elif deadline.expired:
+                        # Retrieval used the whole budget: don't start the LLM
+                        raise TimeoutError
+                    else:
+                        # Synthesize answer from the top chunks (AC1), within
+                        # whatever is left of the latency budget
+                        sources = pack_sources(
+                            results[: settings.synthesis_max_sources]
+                        )
+                        answer = await timer.run(
+                            "synthesis",
+                            asyncio.wait_for(
+                                self._synthesize_answer(query, sources),
+                                timeout=deadline.remaining(),
+                            ),
+                        )
+
+                        # Extract citations (AC2, AC3)
+                        answer, citations = self.citation_service.extract_citations(
+                            answer, sources
+                        )
+
+                        # Calculate confidence (AC4)
+                        confidence = self._calculate_confidence(sources, query)
 
+                        if not partial_kbs:
+                            await semantic_answer_cache.store(
+                                semantic_key, embedding, answer, citations, confidence
+                            )
+
+                except AdmissionRejectedError:
+                    # LLM overloaded: return retrieval-only results right away
+                    synthesis_failed = True
+                    synthesis_skipped = SYNTHESIS_OVERLOADED
+                except TimeoutError:
+                    # Budget spent: return the results without an answer
+                    logger.warning(
+                        "answer_synthesis_deadline_exceeded",
+                        budget_ms=deadline.budget_ms,
+                        query_length=len(query),
+                        chunk_count=len(results),
+                    )
+                    answer = ""
+                    citations = []
+                    confidence = 0.0
+                    synthesis_failed = True
+                    synthesis_skipped = SYNTHESIS_DEADLINE_EXCEEDED
                 except Exception as e:
                     # Graceful degradation (AC7, AC8)
                     logger.warning(
@@ -217,6 +350,7 @@ class SearchService:
                     answer = ""
                     citations = []
                     confidence = 0.0
+                    synthesis_failed = True
 
             response = SearchResponse(
                 query=query,
@@ -225,21 +359,26 @@ class SearchService:
                 confidence=confidence,
                 results=results,
                 result_count=len(results),
-                message=(
-                    None
-                    if results
-                    else "No relevant documents found for your query. Try rephrasing or searching across all Knowledge Bases."
-                ),
+                message=None if results else NO_RESULTS_MESSAGE,
+                partial_kbs=partial_kbs,
+                synthesis_skipped=synthesis_skipped,
             )
 
+            # Degraded (unsynthesized or partial) responses are not cached
+            if not synthesis_failed and not partial_kbs:
+                await search_result_cache.store(cache_key, response)
+
             # Log search query (async, non-blocking)
             latency_ms = int((time.time() - start_time) * 1000)
-            await self.audit_service.log_search(
-                user_id=user_id,
-                query=query,
-                kb_ids=kb_ids,
-                result_count=len(results),
-                latency_ms=latency_ms,
+            await timer.run(
+                "audit",
+                self.audit_service.log_search(
+                    user_id=user_id,
+                    query=query,
+                    kb_ids=kb_ids,
+                    result_count=len(results),
+                    latency_ms=latency_ms,
+                ),
             )
 
             logger.info(
@@ -248,6 +387,8 @@ class SearchService:
                 kb_count=len(kb_ids),
                 result_count=len(results),
                 latency_ms=latency_ms,
+                stage_ms=timer.as_dict(),
+                partial_kbs=partial_kbs,
             )
 
             return response
@@ -259,9 +400,11 @@ class SearchService:
         except Exception as e:
             logger.error("search_failed", error=str(e), query=query[:100])
             raise
+        finally:
+            stages.cancel()
 
     async def _embed_query(self, query: str) -> list[float]:
-        """Generate query embedding with Redis caching.
+        """Generate query embedding with two-tier (LRU + binary Redis) caching.
 
         Args:
             query: Query text
@@ -272,22 +415,65 @@ class SearchService:
         Raises:
             ConnectionError: If LiteLLM unavailable after retries
         """
-        # Check Redis cache
-        redis = await RedisClient.get_client()
-        cache_key = f"embedding:{hashlib.sha256(query.encode()).hexdigest()}"
-
-        cached = await redis.get(cache_key)
-        if cached:
+        # Check cache (keyed by normalized query + embedding model)
+        model = embedding_client.model
+        cached = await query_embedding_cache.get(query, model)
+        if cached is not None:
             logger.debug("embedding_cache_hit", query_length=len(query))
-            return json.loads(cached)
+            return cached
+
+        return await self._embed_miss(query, model)
+
+    async def _embed_miss(
+        self, query: str, model: str, batch: bool = False
+    ) -> list[float]:
+        """Embed a query that missed the cache, coalescing identical calls.
+
+        Identical concurrent misses share one LiteLLM call; other API workers
+        wait for it to land in the Redis cache.
+
+        Args:
+            query: Query text
+            model: Embedding model name (cache key component)
+            batch: Join a batcher batch even at low traffic (see
+                QueryEmbeddingBatcher.embed)
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            ConnectionError: If LiteLLM unavailable after retries
+        """
+        return await embedding_flight.do(
+            query_embedding_cache.key_for(query, model),
+            lambda: self._generate_embedding(query, model, batch=batch),
+            lookup=lambda: query_embedding_cache.get(query, model, record_stats=False),
+        )
 
+    async def _generate_embedding(
+        self, query: str, model: str, batch: bool = False
+    ) -> list[float]:
+        """Embed a query via LiteLLM and store it in the embedding cache.
+
+        Args:
+            query: Query text
+            model: Embedding model name (cache key component)
+            batch: Join a batcher batch even at low traffic
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            ConnectionError: If LiteLLM unavailable after retries
+        """
         # Generate embedding via LiteLLM with retry logic
         try:
-            embeddings = await embedding_client.get_embeddings([query])
-            embedding = embeddings[0]
+            # Under load, concurrent misses share one LiteLLM request
+            embedding = await query_embedding_batcher.embed(
+                query, embedding_client.get_embeddings, batch=batch
+            )
 
-            # Cache for 1 hour
-            await redis.setex(cache_key, 3600, json.dumps(embedding))
+            await query_embedding_cache.set(query, model, embedding)
 
             logger.debug("embedding_generated", query_length=len(query))
             return embedding
@@ -296,14 +482,86 @@ class SearchService:
             logger.error("embedding_failed", error=str(e))
             raise ConnectionError(f"Embedding service unavailable: {str(e)}") from e
 
-    async def _get_kb_names(self, kb_ids: list[str]) -> dict[str, str]:
-        """Fetch KB names from database (Story 3.6).
+    async def _embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries, batching all cache misses together.
+
+        Misses take the same single-flight and micro-batcher path as single
+        queries, so they share LiteLLM requests with concurrent searches.
+
+        Args:
+            queries: Query texts (duplicates are embedded once)
+
+        Returns:
+            Embedding vectors in query order
+
+        Raises:
+            ConnectionError: If LiteLLM unavailable after retries
+        """
+        model = embedding_client.model
+        cached = await asyncio.gather(
+            *(query_embedding_cache.get(query, model) for query in queries)
+        )
+        missing = list(
+            dict.fromkeys(q for q, e in zip(queries, cached, strict=True) if e is None)
+        )
+
+        fresh: dict[str, list[float]] = {}
+        if missing:
+            vectors = await asyncio.gather(
+                *(self._embed_miss(query, model, batch=True) for query in missing)
+            )
+            fresh = dict(zip(missing, vectors, strict=True))
+
+        logger.debug(
+            "batch_embeddings_resolved",
+            query_count=len(queries),
+            cache_hits=len(queries) - len(missing),
+        )
+        return [
+            embedding if embedding is not None else fresh[query]
+            for query, embedding in zip(queries, cached, strict=True)
+        ]
+
+    async def _resolve_kb_ids(
+        self, kb_ids: list[str] | None, user_id: str
+    ) -> list[str]:
+        """Resolve the KBs to search and enforce READ access (single ACL lookup).
+
+        Args:
+            kb_ids: Requested KB IDs, or None for all permitted KBs
+            user_id: User ID for permission checks
+
+        Returns:
+            KB IDs to search
+
+        Raises:
+            PermissionError: If user lacks READ access to any specified KB
+        """
+        if kb_ids is None:
+            return await self.permission_service.get_permitted_kb_ids(user_id, "READ")
+        if not await self.permission_service.check_permissions(user_id, kb_ids, "READ"):
+            raise PermissionError("Knowledge Base not found")
+        return kb_ids
+
+    async def _fetch_kb_metadata(self, kb_ids: list[str]) -> KBMetadata:
+        """Fetch KB names and search params, falling back to defaults."""
+        try:
+            return await self._get_kb_metadata(kb_ids)
+        except Exception as e:
+            logger.warning("kb_metadata_fetch_failed", error=str(e))
+            return KBMetadata()
+
+    async def _get_kb_metadata(self, kb_ids: list[str]) -> KBMetadata:
+        """Fetch KB names (Story 3.6) and search settings in one query.
+
+        Search params (hnsw_ef, quantization) and the semantic cache toggle
+        (default: enabled) come from each KB's settings.
 
         Args:
             kb_ids: List of KB IDs
 
         Returns:
-            Mapping of kb_id -> kb_name
+            KBMetadata for the KBs found
         """
         from sqlalchemy import select
 
@@ -312,11 +570,45 @@ class SearchService:
 
         async with async_session_factory() as session:
             result = await session.execute(
-                select(KnowledgeBase.id, KnowledgeBase.name).where(
-                    KnowledgeBase.id.in_(kb_ids)
-                )
+                select(
+                    KnowledgeBase.id, KnowledgeBase.name, KnowledgeBase.settings
+                ).where(KnowledgeBase.id.in_(kb_ids))
+            )
+            rows = result.all()
+
+        metadata = KBMetadata(
+            semantic_cache_allowed=all(
+                (row.settings or {}).get(SEMANTIC_CACHE_SETTING, True) for row in rows
             )
-            return {str(row.id): row.name for row in result.all()}
+        )
+        for row in rows:
+            kb_id = str(row.id)
+            metadata.names[kb_id] = row.name
+            index = KBSettings.model_validate(row.settings or {}).vector_index
+            search_params = build_search_params(index)
+            if search_params is not None:
+                metadata.search_params[kb_id] = search_params
+        return metadata
+
+    async def _lookup_semantic_answer(
+        self, embedding: list[float], kb_ids: list[str], kb_metadata: KBMetadata
+    ) -> tuple[CachedAnswer | None, SemanticCacheKey | None]:
+        """Look up a cached answer for a near-duplicate question.
+
+        The semantic cache is skipped when disabled globally or when any
+        searched KB has opted out via its settings.
+
+        Args:
+            embedding: Query embedding
+            kb_ids: KB IDs being searched
+            kb_metadata: Settings of the searched KBs
+
+        Returns:
+            Tuple of (cached answer or None, key to store a new answer under)
+        """
+        if not (settings.semantic_cache_enabled and kb_metadata.semantic_cache_allowed):
+            return None, None
+        return await semantic_answer_cache.lookup(embedding, kb_ids)
 
     async def _search_collections(
         self,
@@ -324,6 +616,10 @@ class SearchService:
         kb_ids: list[str],
         limit: int,
         kb_name_map: dict[str, str] | None = None,
+        deadline: Deadline | None = None,
+        partial_kbs: list[str] | None = None,
+        payload_fields: list[str] | None = None,
+        kb_search_params: dict[str, models.SearchParams] | None = None,
     ) -> list[dict[str, Any]]:
         """Search Qdrant collections in parallel (Story 3.6).
 
@@ -332,6 +628,14 @@ class SearchService:
             kb_ids: List of KB IDs to search
             limit: Max results per KB
             kb_name_map: Optional mapping of kb_id -> kb_name for display (default: Unknown for all)
+            deadline: Optional cutoff; KBs still searching when it expires are
+                cancelled and treated like failed KBs
+            partial_kbs: Optional list extended with KBs that timed out or
+                failed, so callers can report incomplete results
+            payload_fields: Payload fields to fetch (default: all but stems). Callers
+                that don't need chunk_text should leave it out to cut transfer
+            kb_search_params: Optional per-KB search params (hnsw_ef,
+                quantization rescoring) from the KB's settings
 
         Returns:
             List of matching chunks with metadata including kb_name
@@ -341,20 +645,35 @@ class SearchService:
         """
         if kb_name_map is None:
             kb_name_map = {}
+        if kb_search_params is None:
+            kb_search_params = {}
         try:
             import asyncio
 
+            qdrant_client = self.qdrant_client
+            embedding_digest = hashlib.sha256(pack_vector(embedding)).hexdigest()
+
             # Define async search function for single collection
             async def search_single_kb(kb_id: str) -> list[dict[str, Any]]:
                 collection_name = f"kb_{kb_id}"
 
-                # Qdrant client's search is sync, run in thread pool
-                search_results = await asyncio.to_thread(
-                    self.qdrant_client.search,
-                    collection_name=collection_name,
-                    query_vector=embedding,
-                    limit=limit,
-                    with_payload=True,
+                search_params = kb_search_params.get(kb_id)
+                # Identical concurrent searches share one Qdrant call
+                search_results = await vector_search_flight.do(
+                    _vector_search_key(
+                        collection_name,
+                        embedding_digest,
+                        limit,
+                        payload_fields,
+                        search_params,
+                    ),
+                    lambda: qdrant_client.search(
+                        collection_name=collection_name,
+                        query_vector=embedding,
+                        limit=limit,
+                        with_payload=payload_fields or SEARCH_RESULT_PAYLOAD,
+                        search_params=search_params,
+                    ),
                 )
 
                 # Extract and enrich results with KB metadata
@@ -369,21 +688,47 @@ class SearchService:
                     chunks.append(chunk)
                 return chunks
 
-            # Query all collections in parallel (AC2, AC4)
+            # Query all collections in parallel (AC2, AC4), up to the deadline
             all_results = []
-            tasks = [search_single_kb(kb_id) for kb_id in kb_ids]
-            results_per_kb = await asyncio.gather(*tasks, return_exceptions=True)
+            tasks = {
+                asyncio.create_task(search_single_kb(kb_id)): kb_id for kb_id in kb_ids
+            }
+            pending: set[asyncio.Task[list[dict[str, Any]]]] = set()
+            try:
+                if tasks:
+                    _, pending = await asyncio.wait(
+                        tasks, timeout=deadline.remaining() if deadline else None
+                    )
+            finally:
+                stragglers = [task for task in tasks if not task.done()]
+                for task in stragglers:
+                    task.cancel()
+                # Let the cancellations land so every task has a final state
+                await asyncio.gather(*stragglers, return_exceptions=True)
 
             # Merge results, handle exceptions gracefully (AC partial failure handling)
             failed_kbs = []
-            for kb_id, kb_results in zip(kb_ids, results_per_kb, strict=False):
-                if isinstance(kb_results, Exception):
+            straggler_kbs = []
+            for task, kb_id in tasks.items():
+                if task in pending or task.cancelled():
+                    straggler_kbs.append(kb_id)
+                    failed_kbs.append(kb_id)
+                    continue
+                error = task.exception()
+                if error is not None:
                     logger.warning(
-                        "collection_search_failed", kb_id=kb_id, error=str(kb_results)
+                        "collection_search_failed", kb_id=kb_id, error=str(error)
                     )
                     failed_kbs.append(kb_id)
                     continue
-                all_results.extend(kb_results)
+                all_results.extend(task.result())
+
+            if straggler_kbs:
+                logger.warning(
+                    "collection_search_deadline_exceeded",
+                    kb_ids=straggler_kbs,
+                    budget_ms=deadline.budget_ms if deadline else None,
+                )
 
             # If ALL collections failed, raise ConnectionError
             if len(failed_kbs) == len(kb_ids):
@@ -391,6 +736,8 @@ class SearchService:
                 raise ConnectionError(
                     f"Vector search unavailable for all {len(kb_ids)} KBs"
                 )
+            if partial_kbs is not None:
+                partial_kbs.extend(failed_kbs)
 
             # Sort by relevance score (descending) - AC3
             all_results.sort(key=lambda x: x["score"], reverse=True)
@@ -402,6 +749,86 @@ class SearchService:
             logger.error("qdrant_search_failed", error=str(e))
             raise ConnectionError(f"Vector search unavailable: {str(e)}") from e
 
+    async def _search_collections_batch(
+        self,
+        embeddings: list[list[float]],
+        kb_ids: list[str],
+        limit: int,
+        kb_name_map: dict[str, str] | None = None,
+        kb_search_params: dict[str, models.SearchParams] | None = None,
+        partial_kbs: list[str] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search many query vectors with one search_batch call per collection.
+
+        Args:
+            embeddings: Query embedding vectors
+            kb_ids: List of KB IDs to search
+            limit: Max results per query
+            kb_name_map: Optional mapping of kb_id -> kb_name for display
+            kb_search_params: Optional per-KB search params
+            partial_kbs: Optional list extended with KBs that failed
+
+        Returns:
+            For each embedding, its top-`limit` chunks across all KBs
+
+        Raises:
+            ConnectionError: If Qdrant unavailable for every KB
+        """
+        kb_name_map = kb_name_map or {}
+        kb_search_params = kb_search_params or {}
+        qdrant_client = self.qdrant_client
+
+        async def search_single_kb(kb_id: str) -> list[list[Any]]:
+            return await qdrant_client.search_batch(
+                collection_name=f"kb_{kb_id}",
+                requests=[
+                    models.SearchRequest(
+                        vector=embedding,
+                        limit=limit,
+                        with_payload=SEARCH_RESULT_PAYLOAD,
+                        params=kb_search_params.get(kb_id),
+                    )
+                    for embedding in embeddings
+                ],
+            )
+
+        results_per_kb = await asyncio.gather(
+            *(search_single_kb(kb_id) for kb_id in kb_ids), return_exceptions=True
+        )
+
+        chunks_per_query: list[list[dict[str, Any]]] = [[] for _ in embeddings]
+        failed_kbs = []
+        for kb_id, kb_results in zip(kb_ids, results_per_kb, strict=True):
+            if isinstance(kb_results, Exception):
+                logger.warning(
+                    "collection_search_failed", kb_id=kb_id, error=str(kb_results)
+                )
+                failed_kbs.append(kb_id)
+                continue
+            for chunks, points in zip(chunks_per_query, kb_results, strict=True):
+                chunks.extend(
+                    {
+                        "kb_id": kb_id,
+                        "kb_name": kb_name_map.get(kb_id, "Unknown"),
+                        "score": point.score,
+                        **point.payload,
+                    }
+                    for point in points
+                )
+
+        if len(failed_kbs) == len(kb_ids):
+            logger.error("all_collections_failed", kb_count=len(kb_ids))
+            raise ConnectionError(
+                f"Vector search unavailable for all {len(kb_ids)} KBs"
+            )
+        if partial_kbs is not None:
+            partial_kbs.extend(failed_kbs)
+
+        for chunks in chunks_per_query:
+            chunks.sort(key=lambda x: x["score"], reverse=True)
+            del chunks[limit:]
+        return chunks_per_query
+
     async def _synthesize_answer(
         self, query: str, chunks: list[SearchResultSchema]
     ) -> str:
@@ -409,7 +836,7 @@ class SearchService:
 
         Args:
             query: User's natural language query
-            chunks: Top-k search chunks to use as context (typically 5)
+            chunks: Packed sources (see pack_sources), numbered [1]..[n]
 
         Returns:
             LLM-generated answer with inline [1], [2], [3] markers
@@ -418,16 +845,7 @@ class SearchService:
             Exception: If LLM call fails (caught by caller for graceful degradation)
         """
         # Build context from chunks with citation numbers
-        context_parts = []
-        for i, chunk in enumerate(chunks, start=1):
-            context_parts.append(
-                f"[{i}] {chunk.chunk_text}\n"
-                f"   (Source: {chunk.document_name}"
-                + (f", page {chunk.page_number}" if chunk.page_number else "")
-                + ")"
-            )
-
-        context = "\n\n".join(context_parts)
+        context = format_context(chunks)
 
         # Build LLM messages
         messages = [
@@ -435,12 +853,18 @@ class SearchService:
             {"role": "user", "content": f"Query: {query}\n\nSources:\n{context}"},
         ]
 
-        # Call LiteLLM with lower temperature for deterministic citations
-        response = await embedding_client.chat_completion(
-            messages=messages,
-            temperature=0.3,  # Low temperature for consistent citation format
-            max_tokens=500,
-        )
+        # Call LiteLLM with lower temperature for deterministic citations; shed
+        # (AdmissionRejectedError) instead of queueing behind a slow LLM or an
+        # exhausted provider quota
+        async with synthesis_admission.slot():
+            try:
+                response = await embedding_client.chat_completion(
+                    messages=messages,
+                    temperature=0.3,  # Low temperature for consistent citation format
+                    max_tokens=500,
+                )
+            except RateLimitWaitExceededError as e:
+                raise AdmissionRejectedError("synthesis", "rate_limited") from e
 
         answer = response.choices[0].message.content
 
@@ -500,21 +924,27 @@ class SearchService:
         kb_ids: list[str] | None,
         user_id: str,
         limit: int,
+        deadline: Deadline | None = None,
+        include_sources: bool = False,
     ) -> AsyncGenerator[SSEEvent, None]:
         """Stream search results and answer synthesis via SSE (AC1, AC3, AC4, AC5, AC6).
 
         Yields SSE events in sequence:
         1. StatusEvent - "Searching knowledge bases..."
-        2. StatusEvent - "Generating answer..."
-        3. TokenEvent* - Answer tokens word-by-word
-        4. CitationEvent* - Citation metadata when [n] detected
-        5. DoneEvent - Confidence and result_count
+        2. SourcesEvent - Retrieved results (only if include_sources)
+        3. StatusEvent - "Generating answer..."
+        4. TokenEvent* - Answer tokens word-by-word
+        5. CitationEvent* - Citation metadata when [n] detected
+        6. DoneEvent - Confidence and result_count
 
         Args:
             query: Natural language query
             kb_ids: KB IDs to search or None for all permitted
             user_id: User ID for permissions
             limit: Max results
+            deadline: Latency budget; KBs that miss the retrieval share of it
+                are dropped and listed in the DoneEvent
+            include_sources: Emit a SourcesEvent before synthesis starts
 
         Yields:
             SSE events (StatusEvent, TokenEvent, CitationEvent, DoneEvent, ErrorEvent)
@@ -523,109 +953,219 @@ class SearchService:
             PermissionError: If user lacks READ access
         """
         start_time = time.time()
+        timer = StageTimer("search_stream")
+        deadline = deadline or Deadline(settings.search_deadline_ms)
+        retrieval_deadline = deadline.share(settings.search_retrieval_share)
+        partial_kbs: list[str] = []
+        # KB metadata (if kb_ids are known) starts alongside ACL; embedding
+        # waits for a result cache miss
+        stages = _SearchStages(
+            self,
+            query,
+            kb_ids,
+            user_id,
+            timer,
+            defer_embed=settings.search_result_cache_enabled,
+        )
 
         try:
-            # Permission checks
-            if kb_ids is None:
-                kb_ids = await self.permission_service.get_permitted_kb_ids(
-                    user_id, "READ"
-                )
+            kb_ids = await stages.resolve_kb_ids()
 
-            for kb_id in kb_ids:
-                has_access = await self.permission_service.check_permission(
-                    user_id, kb_id, "READ"
+            # Replay repeated searches from the versioned result cache
+            cached, cache_key = await timer.run(
+                "result_cache", search_result_cache.lookup(query, kb_ids, limit)
+            )
+            if cached is not None:
+                async for event in self._replay_cached_stream(cached, include_sources):
+                    yield event
+
+                latency_ms = int((time.time() - start_time) * 1000)
+                await timer.run(
+                    "audit",
+                    self.audit_service.log_search(
+                        user_id=user_id,
+                        query=query,
+                        kb_ids=kb_ids,
+                        result_count=cached.result_count,
+                        latency_ms=latency_ms,
+                    ),
                 )
-                if not has_access:
-                    raise PermissionError("Knowledge Base not found")
+                logger.info(
+                    "search_stream_completed",
+                    query_length=len(query),
+                    kb_count=len(kb_ids),
+                    result_count=cached.result_count,
+                    latency_ms=latency_ms,
+                    cache_hit=True,
+                    stage_ms=timer.as_dict(),
+                )
+                return
 
             # Status: searching (AC2)
             yield StatusEvent(content="Searching knowledge bases...")
 
-            # Generate embedding
-            embedding = await self._embed_query(query)
-
-            # Fetch KB names (graceful fallback)
-            try:
-                kb_name_map = await self._get_kb_names(kb_ids)
-            except Exception as e:
-                logger.warning("kb_name_fetch_failed", error=str(e))
-                kb_name_map = {}
-
-            # Search collections
-            chunks = await self._search_collections(
-                embedding, kb_ids, limit, kb_name_map
+            # Qdrant search starts once both embedding and KB names are ready
+            embedding, kb_metadata = await stages.retrieval_inputs(
+                kb_ids, retrieval_deadline
+            )
+            chunks = await timer.run(
+                "qdrant",
+                self._search_collections(
+                    embedding,
+                    kb_ids,
+                    limit,
+                    kb_metadata.names,
+                    deadline=retrieval_deadline,
+                    partial_kbs=partial_kbs,
+                    kb_search_params=kb_metadata.search_params,
+                ),
             )
 
             # Assemble results
-            results = [
-                SearchResultSchema(
-                    document_id=chunk["document_id"],
-                    document_name=chunk["document_name"],
-                    kb_id=chunk["kb_id"],
-                    kb_name=chunk.get("kb_name", "Unknown"),
-                    chunk_text=chunk["chunk_text"],
-                    relevance_score=chunk["score"],
-                    page_number=chunk.get("page_number"),
-                    section_header=chunk.get("section_header"),
-                    char_start=chunk["char_start"],
-                    char_end=chunk["char_end"],
-                )
-                for chunk in chunks
-            ]
+            results = [_result_from_chunk(chunk) for chunk in chunks]
 
             if not results:
                 # No results - emit done event immediately
-                yield DoneEvent(confidence=0.0, result_count=0)
+                yield DoneEvent(confidence=0.0, result_count=0, partial_kbs=partial_kbs)
+                if not partial_kbs:
+                    await search_result_cache.store(
+                        cache_key,
+                        SearchResponse(
+                            query=query,
+                            results=[],
+                            result_count=0,
+                            message=NO_RESULTS_MESSAGE,
+                        ),
+                    )
                 return
 
+            # Let the UI render sources while the LLM warms up
+            if include_sources:
+                yield _sources_event(results)
+
             # Status: generating (AC2)
             yield StatusEvent(content="Generating answer...")
 
             # Stream answer synthesis with citations (AC3, AC4)
-            answer_buffer = []
+            marker_parser = CitationMarkerParser()  # Carries partial "[n" fragments
             citation_buffer: set[int] = set()  # Track emitted citations
+            answer_parts: list[str] = []  # Full answer, for the result cache
 
-            async for token in self._synthesize_answer_stream(query, results[:5]):
-                answer_buffer.append(token)
-
-                # Emit token event (AC3)
-                yield TokenEvent(content=token)
-
-                # Check for citation markers in accumulated text
-                full_text = "".join(answer_buffer)
-                markers = re.findall(CITATION_MARKER_PATTERN, full_text)
-                detected_markers = sorted({int(n) for n in markers})
-
-                # Emit citation events for new markers (AC4)
-                for marker_num in detected_markers:
-                    if marker_num not in citation_buffer and marker_num <= len(
-                        results[:5]
-                    ):
-                        # Build citation from source chunk
-                        citation = self.citation_service._map_marker_to_chunk(
-                            marker_num, results[:5]
-                        )
+            sources = pack_sources(results[: settings.synthesis_max_sources])
+            synthesis_skipped: str | None = None
 
-                        # Emit citation event immediately (AC4)
-                        yield CitationEvent(data=citation.model_dump())
-
-                        # Mark as emitted
-                        citation_buffer.add(marker_num)
-
-            # Calculate confidence after full answer (AC5)
-            confidence = self._calculate_confidence(results[:5], query)
+            # Reuse an answer synthesized for a near-duplicate question
+            cached_answer, semantic_key = await self._lookup_semantic_answer(
+                embedding, kb_ids, kb_metadata
+            )
+            if cached_answer is not None:
+                for event in _answer_events(
+                    cached_answer.answer, cached_answer.citations
+                ):
+                    yield event
+                answer = cached_answer.answer
+                citations = cached_answer.citations
+                confidence = cached_answer.confidence
+            else:
+                answer_stream = self._synthesize_answer_stream(query, sources)
+                try:
+                    while True:
+                        # Bound each wait for the LLM by what is left of the
+                        # latency budget
+                        try:
+                            async with asyncio.timeout(deadline.remaining()):
+                                token = await anext(answer_stream)
+                        except StopAsyncIteration:
+                            break
+
+                        # Emit token event (AC3)
+                        yield TokenEvent(content=token)
+                        answer_parts.append(token)
+
+                        # Emit citation events for markers completed by this
+                        # token (AC4)
+                        for marker_num in marker_parser.feed(token):
+                            if marker_num in citation_buffer or marker_num > len(
+                                sources
+                            ):
+                                continue
+                            # Build citation from source chunk
+                            citation = self.citation_service._map_marker_to_chunk(
+                                marker_num, sources
+                            )
+
+                            # Emit citation event immediately (AC4)
+                            yield CitationEvent(data=citation.model_dump())
+
+                            # Mark as emitted
+                            citation_buffer.add(marker_num)
+                except AdmissionRejectedError:
+                    # LLM overloaded: finish with the retrieved sources, no answer
+                    synthesis_skipped = SYNTHESIS_OVERLOADED
+                    if not include_sources:
+                        yield _sources_event(results)
+                except TimeoutError:
+                    # Budget spent: end the answer here and keep the sources
+                    logger.warning(
+                        "answer_stream_deadline_exceeded",
+                        budget_ms=deadline.budget_ms,
+                        answer_tokens=len(answer_parts),
+                    )
+                    synthesis_skipped = SYNTHESIS_DEADLINE_EXCEEDED
+                    if not include_sources:
+                        yield _sources_event(results)
+                finally:
+                    await answer_stream.aclose()
+
+                answer = "".join(answer_parts)
+                citations = [
+                    self.citation_service._map_marker_to_chunk(n, sources)
+                    for n in sorted(citation_buffer)
+                ]
+                # Calculate confidence after full answer (AC5)
+                confidence = (
+                    0.0
+                    if synthesis_skipped
+                    else self._calculate_confidence(sources, query)
+                )
 
             # Emit done event (AC5)
-            yield DoneEvent(confidence=confidence, result_count=len(results))
+            yield DoneEvent(
+                confidence=confidence,
+                result_count=len(results),
+                partial_kbs=partial_kbs,
+                synthesis_skipped=synthesis_skipped,
+            )
+
+            # Cache the completed answer so the sync and SSE paths can reuse it
+            if not partial_kbs and not synthesis_skipped:
+                if cached_answer is None:
+                    await semantic_answer_cache.store(
+                        semantic_key, embedding, answer, citations, confidence
+                    )
+                await search_result_cache.store(
+                    cache_key,
+                    SearchResponse(
+                        query=query,
+                        answer=answer,
+                        citations=citations,
+                        confidence=confidence,
+                        results=results,
+                        result_count=len(results),
+                    ),
+                )
 
             # Background audit logging (async, non-blocking)
             latency_ms = int((time.time() - start_time) * 1000)
-            await self.audit_service.log_search(
-                user_id=user_id,
-                query=query,
-                kb_ids=kb_ids,
-                result_count=len(results),
-                latency_ms=latency_ms,
+            await timer.run(
+                "audit",
+                self.audit_service.log_search(
+                    user_id=user_id,
+                    query=query,
+                    kb_ids=kb_ids,
+                    result_count=len(results),
+                    latency_ms=latency_ms,
+                ),
             )
 
             logger.info(
@@ -634,6 +1174,7 @@ class SearchService:
                 kb_count=len(kb_ids),
                 result_count=len(results),
                 latency_ms=latency_ms,
+                stage_ms=timer.as_dict(),
             )
 
         except PermissionError:
@@ -646,6 +1187,35 @@ class SearchService:
                 message="Search service temporarily unavailable",
                 code="SERVICE_ERROR",
             )
+        finally:
+            stages.cancel()
+
+    async def _replay_cached_stream(
+        self, cached: SearchResponse, include_sources: bool = False
+    ) -> AsyncGenerator[SSEEvent, None]:
+        """Replay a cached response as the SSE sequence a live search emits.
+
+        Args:
+            cached: Cached search response
+            include_sources: Emit a SourcesEvent before the answer
+
+        Yields:
+            StatusEvent, TokenEvent and CitationEvent in live order, then DoneEvent
+        """
+        yield StatusEvent(content="Searching knowledge bases...")
+
+        if not cached.results:
+            yield DoneEvent(confidence=0.0, result_count=0)
+            return
+
+        if include_sources:
+            yield _sources_event(cached.results)
+        yield StatusEvent(content="Generating answer...")
+
+        for event in _answer_events(cached.answer, cached.citations):
+            yield event
+
+        yield DoneEvent(confidence=cached.confidence, result_count=cached.result_count)
 
     async def _synthesize_answer_stream(
         self, query: str, chunks: list[SearchResultSchema]
@@ -657,7 +1227,7 @@ class SearchService:
 
         Args:
             query: User's natural language query
-            chunks: Top-k search chunks to use as context (typically 5)
+            chunks: Packed sources (see pack_sources), numbered [1]..[n]
 
         Yields:
             Answer tokens (words/phrases) as they're generated
@@ -666,16 +1236,7 @@ class SearchService:
             Exception: If LLM call fails (caught by caller)
         """
         # Build context from chunks with citation numbers
-        context_parts = []
-        for i, chunk in enumerate(chunks, start=1):
-            context_parts.append(
-                f"[{i}] {chunk.chunk_text}\n"
-                f"   (Source: {chunk.document_name}"
-                + (f", page {chunk.page_number}" if chunk.page_number else "")
-                + ")"
-            )
-
-        context = "\n\n".join(context_parts)
+        context = format_context(chunks)
 
         # Build LLM messages
         messages = [
@@ -683,19 +1244,24 @@ class SearchService:
             {"role": "user", "content": f"Query: {query}\n\nSources:\n{context}"},
         ]
 
-        # Call LiteLLM with streaming enabled (AC3)
-        stream = await embedding_client.chat_completion(
-            messages=messages,
-            temperature=0.3,  # Low temperature for consistent citation format
-            max_tokens=500,
-            stream=True,  # Enable streaming
-        )
+        # The admission slot is held until the stream ends or is closed
+        async with synthesis_admission.slot():
+            # Call LiteLLM with streaming enabled (AC3)
+            try:
+                stream = await embedding_client.chat_completion(
+                    messages=messages,
+                    temperature=0.3,  # Low temperature for consistent citation format
+                    max_tokens=500,
+                    stream=True,  # Enable streaming
+                )
+            except RateLimitWaitExceededError as e:
+                raise AdmissionRejectedError("synthesis", "rate_limited") from e
 
-        # Yield tokens as they arrive
-        async for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                yield token
+            # Yield tokens as they arrive
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    token = chunk.choices[0].delta.content
+                    yield token
 
         logger.info(
             "answer_stream_complete", query_length=len(query), chunk_count=len(chunks)
@@ -732,38 +1298,31 @@ class SearchService:
             user_id=user_id,
         )
 
+        timer = StageTimer("quick_search")
+        # Embedding (and KB metadata, if kb_ids are known) start alongside ACL
+        stages = _SearchStages(self, query, kb_ids, user_id, timer)
+
         try:
             # 1. Permission check and KB resolution
-            if kb_ids is None:
-                target_kb_ids = await self.permission_service.get_permitted_kb_ids(
-                    user_id, "READ"
-                )
-            else:
-                # Check permissions for all specified KBs
-                for kb_id in kb_ids:
-                    has_access = await self.permission_service.check_permission(
-                        user_id, kb_id, "READ"
-                    )
-                    if not has_access:
-                        raise PermissionError("Knowledge Base not found")
-                target_kb_ids = kb_ids
+            target_kb_ids = await stages.resolve_kb_ids()
 
             if not target_kb_ids:
                 raise PermissionError("No permitted Knowledge Bases found")
 
-            # 2. Generate embedding (with caching)
-            embedding = await self._embed_query(query)
-
-            # Fetch KB names for display (graceful fallback)
-            try:
-                kb_name_map = await self._get_kb_names(target_kb_ids)
-            except Exception as e:
-                logger.warning("kb_name_fetch_failed", error=str(e))
-                kb_name_map = {}
+            # 2. Embedding (with caching) and KB names, started concurrently
+            embedding, kb_metadata = await stages.retrieval_inputs(target_kb_ids)
 
             # 3. Search collections (top 5 only for quick search)
-            chunks = await self._search_collections(
-                embedding, target_kb_ids, limit=5, kb_name_map=kb_name_map
+            chunks = await timer.run(
+                "qdrant",
+                self._search_collections(
+                    embedding,
+                    target_kb_ids,
+                    limit=5,
+                    kb_name_map=kb_metadata.names,
+                    payload_fields=QUICK_SEARCH_PAYLOAD_FIELDS,
+                    kb_search_params=kb_metadata.search_params,
+                ),
             )
 
             # 4. Build lightweight results
@@ -773,9 +1332,10 @@ class SearchService:
                     document_name=chunk["document_name"],
                     kb_id=chunk["kb_id"],
                     kb_name=chunk.get("kb_name", "Unknown"),
-                    excerpt=chunk["chunk_text"][:100] + "..."
-                    if len(chunk["chunk_text"]) > 100
-                    else chunk["chunk_text"],
+                    # Points indexed before excerpts existed carry neither
+                    # field until backfill_chunk_excerpts has run
+                    excerpt=chunk.get("excerpt")
+                    or make_excerpt(chunk.get("chunk_text", "")),
                     relevance_score=chunk["score"],
                 )
                 for chunk in chunks
@@ -788,6 +1348,7 @@ class SearchService:
                 result_count=len(results),
                 kb_count=len(target_kb_ids),
                 response_time_ms=response_time_ms,
+                stage_ms=timer.as_dict(),
             )
 
             return QuickSearchResponse(
@@ -805,6 +1366,292 @@ class SearchService:
                 error_type=type(e).__name__,
             )
             raise
+        finally:
+            stages.cancel()
+
+    async def batch_search(
+        self,
+        queries: list[str],
+        kb_ids: list[str] | None,
+        user_id: str,
+        limit: int = 10,
+        synthesize: bool = False,
+    ) -> BatchSearchResponse:
+        """Run many searches over the same KBs in one pass.
+
+        Permissions are resolved once, before any embedding work, so callers
+        without access spend no LiteLLM quota. Query cache misses are embedded
+        together through the query batcher, and each collection gets one
+        search_batch call
+        instead of one search per query. Optional synthesis runs with at most
+        settings.search_batch_synthesis_concurrency LLM calls in flight.
+
+        Args:
+            queries: Natural language search queries
+            kb_ids: List of KB IDs to search, or None for all permitted KBs
+            user_id: User ID for permission checks
+            limit: Maximum number of results per query
+            synthesize: If True, generate an answer with citations per query
+
+        Returns:
+            BatchSearchResponse with one SearchResponse per query, in order
+
+        Raises:
+            PermissionError: If user lacks READ access to any specified KB
+            ConnectionError: If Qdrant or LiteLLM unavailable
+        """
+        start_time = time.time()
+        timer = StageTimer("batch_search")
+
+        # ACL first (cached snapshot): a denied caller spends no LiteLLM quota
+        kb_ids = await timer.run("acl", self._resolve_kb_ids(kb_ids, user_id))
+        if not kb_ids:
+            raise PermissionError("No permitted Knowledge Bases found")
+
+        embeddings, kb_metadata = await asyncio.gather(
+            timer.run("embed", self._embed_queries(queries)),
+            timer.run("kb_metadata", self._fetch_kb_metadata(kb_ids)),
+        )
+
+        partial_kbs: list[str] = []
+        chunks_per_query = await timer.run(
+            "qdrant",
+            self._search_collections_batch(
+                embeddings,
+                kb_ids,
+                limit,
+                kb_name_map=kb_metadata.names,
+                kb_search_params=kb_metadata.search_params,
+                partial_kbs=partial_kbs,
+            ),
+        )
+
+        responses = []
+        for query, chunks in zip(queries, chunks_per_query, strict=True):
+            results = [_result_from_chunk(chunk) for chunk in chunks]
+            responses.append(
+                SearchResponse(
+                    query=query,
+                    results=results,
+                    result_count=len(results),
+                    message=None if results else NO_RESULTS_MESSAGE,
+                    partial_kbs=partial_kbs,
+                )
+            )
+
+        if synthesize:
+            semaphore = asyncio.Semaphore(settings.search_batch_synthesis_concurrency)
+
+            async def synthesize_one(response: SearchResponse) -> SearchResponse:
+                if not response.results:
+                    return response
+                sources = pack_sources(
+                    response.results[: settings.synthesis_max_sources]
+                )
+                async with semaphore:
+                    try:
+                        answer = await self._synthesize_answer(response.query, sources)
+                    except AdmissionRejectedError:
+                        return response.model_copy(
+                            update={"synthesis_skipped": SYNTHESIS_OVERLOADED}
+                        )
+                    except Exception as e:
+                        # Graceful degradation: keep raw results for this query
+                        logger.warning(
+                            "answer_synthesis_failed_fallback_to_raw_results",
+                            error=str(e),
+                            query_length=len(response.query),
+                            chunk_count=len(response.results),
+                        )
+                        return response
+                answer, citations = self.citation_service.extract_citations(
+                    answer, sources
+                )
+                return response.model_copy(
+                    update={
+                        "answer": answer,
+                        "citations": citations,
+                        "confidence": self._calculate_confidence(
+                            sources, response.query
+                        ),
+                    }
+                )
+
+            responses = await timer.run(
+                "synthesis", asyncio.gather(*(synthesize_one(r) for r in responses))
+            )
+
+        latency_ms = int((time.time() - start_time) * 1000)
+        await timer.run(
+            "audit",
+            self.audit_service.log_searches(
+                user_id=user_id,
+                searches=[
+                    {
+                        "query": response.query,
+                        "kb_ids": kb_ids,
+                        "result_count": response.result_count,
+                        "latency_ms": latency_ms,
+                    }
+                    for response in responses
+                ],
+            ),
+        )
+
+        logger.info(
+            "batch_search_completed",
+            query_count=len(queries),
+            kb_count=len(kb_ids),
+            latency_ms=latency_ms,
+            synthesized=synthesize,
+            stage_ms=timer.as_dict(),
+            partial_kbs=partial_kbs,
+        )
+
+        return BatchSearchResponse(
+            responses=list(responses), kb_count=len(kb_ids), partial_kbs=partial_kbs
+        )
+
+    async def _locate_chunk(
+        self,
+        chunk_id: str,
+        source_kb_id: str | None,
+        target_kb_ids: list[str],
+        user_id: str,
+    ) -> tuple[str, dict[str, Any]]:
+        """Find the KB holding a chunk and the chunk's payload.
+
+        The KB comes from the caller, else the chunk -> KB map written at
+        index time, else a concurrent probe of the target KBs (chunks indexed
+        before the map existed; the hit is recorded for next time).
+
+        Args:
+            chunk_id: Qdrant point ID of source chunk
+            source_kb_id: KB holding the chunk, if known by the caller
+            target_kb_ids: KBs being searched (already permission-checked)
+            user_id: User ID for permission checks
+
+        Returns:
+            Tuple of (kb_id, payload) for the source chunk
+
+        Raises:
+            PermissionError: If user lacks READ access to the chunk's KB
+            ValueError: If chunk not found
+        """
+        kb_id = source_kb_id or await lookup_chunk_kb(chunk_id)
+        if kb_id is not None:
+            # The source may live outside the KBs being searched
+            if kb_id not in target_kb_ids:
+                await self._resolve_kb_ids([kb_id], user_id)
+            try:
+                points = await self.qdrant_client.retrieve(
+                    collection_name=f"kb_{kb_id}",
+                    ids=[chunk_id],
+                    with_payload=["document_name"],
+                )
+            except Exception:
+                # Collection might not exist (KB deleted)
+                points = []
+            if not points:
+                raise ValueError("Source content no longer available")
+            return kb_id, points[0].payload or {}
+
+        async def probe(kb_id: str) -> list[Any]:
+            return await self.qdrant_client.retrieve(
+                collection_name=f"kb_{kb_id}",
+                ids=[chunk_id],
+                with_payload=["document_name"],
+            )
+
+        found = await asyncio.gather(
+            *(probe(kb_id) for kb_id in target_kb_ids), return_exceptions=True
+        )
+        for kb_id, points in zip(target_kb_ids, found, strict=True):
+            # Exceptions: collection might not exist or chunk not in this KB
+            if points and not isinstance(points, Exception):
+                await remember_chunk_kb(chunk_id, kb_id)
+                return kb_id, points[0].payload or {}
+        raise ValueError("Source content no longer available")
+
+    async def _recommend_collections(
+        self,
+        chunk_id: str,
+        source_kb_id: str,
+        kb_ids: list[str],
+        limit: int,
+        kb_name_map: dict[str, str] | None = None,
+        kb_search_params: dict[str, models.SearchParams] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search KBs for points similar to a stored point.
+
+        Other collections read the example vector from the source collection
+        via lookup_from, so it is never sent through this process.
+
+        Args:
+            chunk_id: Qdrant point ID used as the positive example
+            source_kb_id: KB whose collection holds the example point
+            kb_ids: List of KB IDs to search
+            limit: Max results to return
+            kb_name_map: Optional mapping of kb_id -> kb_name for display
+            kb_search_params: Optional per-KB search params
+
+        Returns:
+            List of chunk dicts sorted by score (desc), excluding the example
+
+        Raises:
+            ConnectionError: If Qdrant unavailable for every KB
+        """
+        kb_name_map = kb_name_map or {}
+        kb_search_params = kb_search_params or {}
+        qdrant_client = self.qdrant_client
+        source_collection = f"kb_{source_kb_id}"
+
+        async def recommend_single_kb(kb_id: str) -> list[Any]:
+            collection_name = f"kb_{kb_id}"
+            return await qdrant_client.recommend(
+                collection_name=collection_name,
+                positive=[chunk_id],
+                limit=limit,
+                with_payload=SEARCH_RESULT_PAYLOAD,
+                search_params=kb_search_params.get(kb_id),
+                lookup_from=(
+                    None
+                    if collection_name == source_collection
+                    else models.LookupLocation(collection=source_collection)
+                ),
+            )
+
+        results_per_kb = await asyncio.gather(
+            *(recommend_single_kb(kb_id) for kb_id in kb_ids), return_exceptions=True
+        )
+
+        chunks: list[dict[str, Any]] = []
+        failed_kbs = []
+        for kb_id, points in zip(kb_ids, results_per_kb, strict=True):
+            if isinstance(points, Exception):
+                logger.warning(
+                    "collection_search_failed", kb_id=kb_id, error=str(points)
+                )
+                failed_kbs.append(kb_id)
+                continue
+            chunks.extend(
+                {
+                    "kb_id": kb_id,
+                    "kb_name": kb_name_map.get(kb_id, "Unknown"),
+                    "score": point.score,
+                    **point.payload,
+                }
+                for point in points
+            )
+
+        if kb_ids and len(failed_kbs) == len(kb_ids):
+            logger.error("all_collections_failed", kb_count=len(kb_ids))
+            raise ConnectionError(
+                f"Vector search unavailable for all {len(kb_ids)} KBs"
+            )
+
+        chunks.sort(key=lambda x: x["score"], reverse=True)
+        return chunks[:limit]
 
     async def similar_search(
         self,
@@ -812,17 +1659,20 @@ class SearchService:
         kb_ids: list[str] | None,
         user_id: str,
         limit: int = 10,
+        source_kb_id: str | None = None,
     ) -> SearchResponse:
         """Find content similar to a given chunk (Story 3.8).
 
-        Uses the chunk's pre-computed embedding for similarity search.
-        Excludes the original chunk from results.
+        Uses Qdrant's recommend API with the chunk's stored vector as the
+        positive example, so the vector never leaves Qdrant. The original
+        chunk is excluded server-side.
 
         Args:
             chunk_id: Qdrant point ID of source chunk
             kb_ids: List of KB IDs to search, or None for all permitted KBs
             user_id: User ID for permission checks
             limit: Maximum number of results
+            source_kb_id: KB holding the source chunk, if known by the caller
 
         Returns:
             SearchResponse with similar chunks
@@ -832,6 +1682,7 @@ class SearchService:
             ValueError: If chunk not found (404)
         """
         start_time = time.time()
+        timer = StageTimer("similar_search")
 
         logger.info(
             "similar_search_started",
@@ -842,109 +1693,68 @@ class SearchService:
         )
 
         try:
-            # 1. Retrieve original chunk from Qdrant to get its embedding
-            # Extract KB ID from chunk_id (format: kb_{kb_id})
-            # We need to search across all collections to find the chunk
-            if kb_ids is None:
-                target_kb_ids = await self.permission_service.get_permitted_kb_ids(
-                    user_id, "READ"
-                )
-            else:
-                # Check permissions for all specified KBs
-                for kb_id in kb_ids:
-                    has_access = await self.permission_service.check_permission(
-                        user_id, kb_id, "READ"
-                    )
-                    if not has_access:
-                        raise PermissionError("Knowledge Base not found")
-                target_kb_ids = kb_ids
-
+            target_kb_ids = await timer.run(
+                "acl", self._resolve_kb_ids(kb_ids, user_id)
+            )
             if not target_kb_ids:
                 raise PermissionError("No permitted Knowledge Bases found")
 
-            # Try to retrieve chunk from each permitted KB collection
-            original_chunk = None
-            for kb_id in target_kb_ids:
-                collection_name = f"kb_{kb_id}"
-                try:
-                    points = self.qdrant_client.retrieve(
-                        collection_name=collection_name,
-                        ids=[chunk_id],
-                        with_vectors=True,
-                        with_payload=True,
-                    )
-                    if points:
-                        original_chunk = points[0]
-                        break
-                except Exception:
-                    # Collection might not exist or chunk not in this KB
-                    continue
-
-            if not original_chunk:
-                # Chunk not found in any permitted KB (AC6)
-                raise ValueError("Source content no longer available")
+            # 1. Find the source chunk's KB (no vectors leave Qdrant)
+            source_kb_id, source_payload = await timer.run(
+                "locate",
+                self._locate_chunk(chunk_id, source_kb_id, target_kb_ids, user_id),
+            )
 
-            # 2. Extract embedding vector from chunk
-            embedding = original_chunk.vector
+            # 2. Get document name for query text
+            document_name = source_payload.get("document_name", "Unknown Document")
 
-            # 3. Get document name for query text
-            document_name = original_chunk.payload.get(
-                "document_name", "Unknown Document"
+            # Fetch KB names for display and per-KB search params
+            kb_metadata = await timer.run(
+                "kb_metadata", self._fetch_kb_metadata(target_kb_ids)
             )
 
-            # Fetch KB names for display
-            try:
-                kb_name_map = await self._get_kb_names(target_kb_ids)
-            except Exception as e:
-                logger.warning("kb_name_fetch_failed", error=str(e))
-                kb_name_map = {}
-
-            # 4. Search using chunk's embedding (request limit+1 to account for filtering original)
-            chunks = await self._search_collections(
-                embedding, target_kb_ids, limit=limit + 1, kb_name_map=kb_name_map
+            # 3. Recommend from each KB with the source point as the positive
+            # example; Qdrant excludes the source point itself (AC5)
+            filtered_chunks = await timer.run(
+                "recommend",
+                self._recommend_collections(
+                    chunk_id,
+                    source_kb_id,
+                    target_kb_ids,
+                    limit,
+                    kb_name_map=kb_metadata.names,
+                    kb_search_params=kb_metadata.search_params,
+                ),
             )
 
-            # 5. Exclude original chunk from results (AC5)
-            filtered_chunks = [
-                chunk for chunk in chunks if chunk.get("chunk_id") != chunk_id
-            ][:limit]
-
-            # 6. Assemble response
-            results = [
-                SearchResultSchema(
-                    document_id=chunk["document_id"],
-                    document_name=chunk["document_name"],
-                    kb_id=chunk["kb_id"],
-                    kb_name=chunk.get("kb_name", "Unknown"),
-                    chunk_text=chunk["chunk_text"],
-                    relevance_score=chunk["score"],
-                    page_number=chunk.get("page_number"),
-                    section_header=chunk.get("section_header"),
-                    char_start=chunk["char_start"],
-                    char_end=chunk["char_end"],
-                )
-                for chunk in filtered_chunks
-            ]
+            # 4. Assemble response
+            results = [_result_from_chunk(chunk) for chunk in filtered_chunks]
 
-            # 7. Generate answer synthesis for similar content (optional)
+            # 5. Generate answer synthesis for similar content (optional)
             answer = ""
             citations: list[Citation] = []
             confidence = 0.0
+            synthesis_skipped: str | None = None
 
             if results:
                 try:
-                    # Synthesize answer using top-5 similar chunks
+                    # Synthesize answer using the top similar chunks
                     query = f"Similar to: {document_name}"
-                    answer = await self._synthesize_answer(query, results[:5])
+                    sources = pack_sources(results[: settings.synthesis_max_sources])
+                    answer = await timer.run(
+                        "synthesis", self._synthesize_answer(query, sources)
+                    )
 
                     # Extract citations
                     answer, citations = self.citation_service.extract_citations(
-                        answer, results[:5]
+                        answer, sources
                     )
 
                     # Calculate confidence
-                    confidence = self._calculate_confidence(results[:5], query)
+                    confidence = self._calculate_confidence(sources, query)
 
+                except AdmissionRejectedError:
+                    synthesis_skipped = SYNTHESIS_OVERLOADED
                 except Exception as e:
                     # Graceful degradation - return results without synthesis
                     logger.warning(
@@ -968,16 +1778,20 @@ class SearchService:
                     if results
                     else "No similar content found. Try broadening your search."
                 ),
+                synthesis_skipped=synthesis_skipped,
             )
 
             # Log similar search (async, non-blocking)
             latency_ms = int((time.time() - start_time) * 1000)
-            await self.audit_service.log_search(
-                user_id=user_id,
-                query=f"Similar to: {document_name}",
-                kb_ids=target_kb_ids,
-                result_count=len(results),
-                latency_ms=latency_ms,
+            await timer.run(
+                "audit",
+                self.audit_service.log_search(
+                    user_id=user_id,
+                    query=f"Similar to: {document_name}",
+                    kb_ids=target_kb_ids,
+                    result_count=len(results),
+                    latency_ms=latency_ms,
+                ),
             )
 
             logger.info(
@@ -986,6 +1800,7 @@ class SearchService:
                 kb_count=len(target_kb_ids),
                 result_count=len(results),
                 latency_ms=latency_ms,
+                stage_ms=timer.as_dict(),
             )
 
             return response
@@ -1007,6 +1822,163 @@ class SearchService:
             raise
 
 
+def _vector_search_key(
+    collection_name: str,
+    embedding_digest: str,
+    limit: int,
+    payload_fields: list[str] | None,
+    search_params: models.SearchParams | None,
+) -> str:
+    params = search_params.model_dump_json() if search_params else ""
+    return f"{collection_name}:{embedding_digest}:{limit}:{payload_fields}:{params}"
+
+
+def _result_from_chunk(chunk: dict[str, Any]) -> SearchResultSchema:
+    return SearchResultSchema(
+        document_id=chunk["document_id"],
+        document_name=chunk["document_name"],
+        kb_id=chunk["kb_id"],
+        kb_name=chunk.get("kb_name", "Unknown"),
+        chunk_text=chunk["chunk_text"],
+        relevance_score=chunk["score"],
+        page_number=chunk.get("page_number"),
+        section_header=chunk.get("section_header"),
+        char_start=chunk["char_start"],
+        char_end=chunk["char_end"],
+    )
+
+
+def _answer_events(
+    answer: str, citations: list[Citation]
+) -> Iterator[TokenEvent | CitationEvent]:
+    """Split a finished answer into the token and citation events of a live one.
+
+    Each citation is emitted right after the token that completes its marker.
+    """
+    pending_citations = {c.number: c for c in citations}
+    marker_parser = CitationMarkerParser()
+    for token in _REPLAY_TOKEN_RE.findall(answer):
+        yield TokenEvent(content=token)
+        for marker_num in marker_parser.feed(token):
+            citation = pending_citations.pop(marker_num, None)
+            if citation is not None:
+                yield CitationEvent(data=citation.model_dump())
+
+
+def _sources_event(results: list[SearchResultSchema]) -> SourcesEvent:
+    return SourcesEvent(
+        results=[r.model_dump(mode="json") for r in results],
+        result_count=len(results),
+    )
+
+
+class _SearchStages:
+    """Stage DAG for the retrieval inputs of a single search.
+
+    embed ──────────────────────────────┐
+    acl ──> (kb_ids=None) kb_metadata ──┴──> qdrant search (caller)
+
+    Embedding never depends on permissions, and KB metadata only does when
+    the KBs to search come from the ACL. Both therefore start immediately
+    (metadata as soon as kb_ids are known), so ACL resolution, the LiteLLM
+    round trip and the KB-name query overlap instead of adding up.
+
+    Searches that check the result cache first pass defer_embed=True: the
+    embedding then starts in retrieval_inputs(), after the cache missed, so
+    a cache hit never pays for an embedding call. That call runs in a
+    shared single-flight task, so cancelling it later would not stop it.
+
+    Callers must call cancel() when done (e.g. in a finally block) so work
+    for a request that failed or was served from cache is not left running.
+    """
+
+    def __init__(
+        self,
+        service: SearchService,
+        query: str,
+        kb_ids: list[str] | None,
+        user_id: str,
+        timer: StageTimer,
+        defer_embed: bool = False,
+    ) -> None:
+        self._service = service
+        self._query = query
+        self._kb_ids = kb_ids
+        self._user_id = user_id
+        self._timer = timer
+        self._embed_task: asyncio.Task[list[float]] | None = None
+        self._metadata_task: asyncio.Task[KBMetadata] | None = None
+        if not defer_embed:
+            self._start_embed()
+        if kb_ids is not None:
+            self._start_kb_metadata(kb_ids)
+
+    def _start_embed(self) -> None:
+        self._embed_task = self._timer.start(
+            "embed", self._service._embed_query(self._query)
+        )
+
+    def _start_kb_metadata(self, kb_ids: list[str]) -> None:
+        self._metadata_task = self._timer.start(
+            "kb_metadata", self._service._fetch_kb_metadata(kb_ids)
+        )
+
+    async def resolve_kb_ids(self) -> list[str]:
+        """Run the ACL stage.
+
+        Raises:
+            PermissionError: If user lacks READ access to any specified KB
+        """
+        return await self._timer.run(
+            "acl", self._service._resolve_kb_ids(self._kb_ids, self._user_id)
+        )
+
+    async def retrieval_inputs(
+        self, kb_ids: list[str], deadline: Deadline | None = None
+    ) -> tuple[list[float], KBMetadata]:
+        """Wait for the query embedding and KB metadata.
+
+        Args:
+            kb_ids: KB IDs resolved by the ACL stage
+            deadline: Optional cutoff for all stages; KB metadata is optional,
+                so a late metadata query falls back to "Unknown" names and
+                default search params
+
+        Returns:
+            Tuple of (query embedding, KB names and search params)
+
+        Raises:
+            ConnectionError: If the embedding is not ready before the deadline
+        """
+        if self._embed_task is None:
+            self._start_embed()
+        if self._metadata_task is None:
+            self._start_kb_metadata(kb_ids)
+        metadata_task = self._metadata_task
+        timeout = deadline.remaining() if deadline else None
+        try:
+            embedding = await asyncio.wait_for(self._embed_task, timeout)
+        except TimeoutError as e:
+            raise ConnectionError("Embedding service timed out") from e
+
+        timeout = deadline.remaining() if deadline else None
+        await asyncio.wait({metadata_task}, timeout=timeout)
+        if not metadata_task.done():
+            logger.warning("kb_metadata_deadline_exceeded", kb_count=len(kb_ids))
+            return embedding, KBMetadata()
+        return embedding, metadata_task.result()
+
+    def cancel(self) -> None:
+        """Cancel unfinished stages and consume exceptions of finished ones."""
+        for task in (self._embed_task, self._metadata_task):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+
 def get_search_service(
     audit_service: AuditService = Depends(get_audit_service),
     session: AsyncSession = Depends(get_async_session),
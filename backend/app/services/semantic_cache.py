@@ -0,0 +1,286 @@
+"""Semantic answer cache for near-duplicate questions.
+
+Synthesized answers are stored as points in a dedicated Qdrant collection,
+with the query embedding as the vector. A new query reuses a cached answer
+when its embedding is within a cosine similarity threshold of a cached query
+for the same KB set, and none of those KBs has been re-indexed since (same
+index generations, see app.services.search_cache).
+
+Every store deletes, in one filtered delete, the points for that KB set
+written under an older generation and the expired points of any KB set.
+Until then lookups skip expired points via a created_at filter.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+from uuid import uuid4
+
+import structlog
+from qdrant_client.http import models
+
+from app.core.config import settings
+from app.integrations.qdrant_client import DISTANCE_METRIC, qdrant_service
+from app.schemas.citation import Citation
+from app.services.search_cache import get_index_generations
+
+logger = structlog.get_logger(__name__)
+
+# KnowledgeBase.settings key for the per-KB admin toggle (default: enabled)
+SEMANTIC_CACHE_SETTING = "semantic_cache_enabled"
+
+
+@dataclass
+class CachedAnswer:
+    """A synthesized answer served from the semantic cache."""
+
+    answer: str
+    citations: list[Citation]
+    confidence: float
+    similarity: float
+
+
+@dataclass
+class SemanticCacheKey:
+    """Identifies the KB set and index state an answer was synthesized from."""
+
+    kb_set: str
+    generation: str
+
+
+@dataclass
+class SemanticCacheStats:
+    """Hit/miss counters for the semantic answer cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    errors: int = 0
+    similarity_sum: float = field(default=0.0, repr=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value).encode()).hexdigest()[:32]
+
+
+class SemanticAnswerCache:
+    """Qdrant-backed cache of synthesized answers keyed by query similarity.
+
+    All operations are best-effort: failures are logged and treated as misses
+    so search always falls back to live synthesis.
+    """
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        threshold: float | None = None,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            collection_name: Qdrant collection (default: settings).
+            threshold: Minimum cosine similarity for a hit (default: settings).
+            ttl_seconds: Max age of reusable answers (default: settings).
+        """
+        self.collection_name = collection_name or settings.semantic_cache_collection
+        self.threshold = threshold or settings.semantic_cache_threshold
+        self.ttl_seconds = ttl_seconds or settings.semantic_cache_ttl
+        self.stats = SemanticCacheStats()
+        self._collection_ready = False
+
+    async def lookup(
+        self, embedding: list[float], kb_ids: list[str]
+    ) -> tuple[CachedAnswer | None, SemanticCacheKey | None]:
+        """Find a cached answer for a semantically equivalent query.
+
+        Args:
+            embedding: Query embedding.
+            kb_ids: KB IDs being searched (already permission-checked).
+
+        Returns:
+            Tuple of (cached answer or None, cache key or None if the cache is
+            unavailable). Pass the key to store() so an answer synthesized
+            while a KB was being re-indexed is stored under the generation it
+            was computed against.
+        """
+        try:
+            key = await self._key(kb_ids)
+            await self._ensure_collection(len(embedding))
+            points = await qdrant_service.async_client.search(
+                collection_name=self.collection_name,
+                query_vector=embedding,
+                query_filter=self._filter(key),
+                score_threshold=self.threshold,
+                limit=1,
+                with_payload=True,
+            )
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning("semantic_cache_lookup_failed", error=str(e))
+            return None, None
+
+        if not points:
+            self.stats.misses += 1
+            return None, key
+
+        point = points[0]
+        payload = point.payload or {}
+        self.stats.hits += 1
+        self.stats.similarity_sum += point.score
+        logger.info("semantic_cache_hit", similarity=round(point.score, 4))
+        return (
+            CachedAnswer(
+                answer=payload["answer"],
+                citations=[Citation(**c) for c in payload.get("citations", [])],
+                confidence=payload.get("confidence", 0.0),
+                similarity=point.score,
+            ),
+            key,
+        )
+
+    async def store(
+        self,
+        key: SemanticCacheKey | None,
+        embedding: list[float],
+        answer: str,
+        citations: list[Citation],
+        confidence: float,
+    ) -> None:
+        """Store a synthesized answer and drop answers from older generations.
+
+        Args:
+            key: Cache key from lookup() (no-op if None).
+            embedding: Query embedding.
+            answer: Synthesized answer with [n] markers.
+            citations: Citations extracted from the answer.
+            confidence: Answer confidence score.
+        """
+        if key is None or not answer:
+            return
+
+        try:
+            client = qdrant_service.async_client
+            await self._ensure_collection(len(embedding))
+            await client.upsert(
+                collection_name=self.collection_name,
+                points=[
+                    models.PointStruct(
+                        id=str(uuid4()),
+                        vector=embedding,
+                        payload={
+                            **asdict(key),
+                            "answer": answer,
+                            "citations": [c.model_dump() for c in citations],
+                            "confidence": confidence,
+                            "created_at": time.time(),
+                        },
+                    )
+                ],
+            )
+            # Answers built on a superseded index state, and expired answers,
+            # can never hit again
+            await client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(
+                        should=[
+                            models.Filter(
+                                must=[_match("kb_set", key.kb_set)],
+                                must_not=[_match("generation", key.generation)],
+                            ),
+                            models.FieldCondition(
+                                key="created_at",
+                                range=models.Range(lt=time.time() - self.ttl_seconds),
+                            ),
+                        ]
+                    )
+                ),
+            )
+            self.stats.stores += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning("semantic_cache_store_failed", error=str(e))
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Snapshot of hit/miss counters."""
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "stores": self.stats.stores,
+            "errors": self.stats.errors,
+            "hit_ratio": round(self.stats.hit_ratio, 4),
+            "avg_hit_similarity": (
+                round(self.stats.similarity_sum / self.stats.hits, 4)
+                if self.stats.hits
+                else 0.0
+            ),
+        }
+
+    async def _key(self, kb_ids: list[str]) -> SemanticCacheKey:
+        generations = await get_index_generations(kb_ids)
+        return SemanticCacheKey(
+            kb_set=_digest([list(generations), settings.embedding_model]),
+            generation=_digest([list(generations.items()), settings.llm_model]),
+        )
+
+    def _filter(self, key: SemanticCacheKey) -> models.Filter:
+        return models.Filter(
+            must=[
+                _match("kb_set", key.kb_set),
+                _match("generation", key.generation),
+                models.FieldCondition(
+                    key="created_at",
+                    range=models.Range(gte=time.time() - self.ttl_seconds),
+                ),
+            ]
+        )
+
+    async def _ensure_collection(self, vector_size: int) -> None:
+        if self._collection_ready:
+            return
+        client = qdrant_service.async_client
+        if not await client.collection_exists(self.collection_name):
+            try:
+                await client.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config=models.VectorParams(
+                        size=vector_size, distance=DISTANCE_METRIC
+                    ),
+                )
+            except Exception:
+                # Another worker created it between the check and the create
+                if not await client.collection_exists(self.collection_name):
+                    raise
+            else:
+                logger.info(
+                    "semantic_cache_collection_created",
+                    collection_name=self.collection_name,
+                )
+            # Idempotent, so a worker that lost the race still ensures them
+            for field_name, schema in (
+                ("kb_set", models.PayloadSchemaType.KEYWORD),
+                ("generation", models.PayloadSchemaType.KEYWORD),
+                ("created_at", models.PayloadSchemaType.FLOAT),
+            ):
+                await client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=schema,
+                )
+        self._collection_ready = True
+
+
+def _match(key: str, value: str) -> models.FieldCondition:
+    return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+
+
+# Singleton instance for use across the application
+semantic_answer_cache = SemanticAnswerCache()
@@ -0,0 +1,182 @@
+"""Single-flight coalescing of identical concurrent calls.
+
+When many users ask the same popular question at once, every request misses
+the caches together and would call LiteLLM and Qdrant separately. A
+SingleFlight runs one call per key and lets every concurrent caller with the
+same key await that call's result.
+
+Within a process, callers share an asyncio task. Across API workers, callers
+that provide a `lookup` for a shared cache (e.g. the Redis query-embedding
+cache) take a short Redis lock: the holder makes the call and fills the
+cache, while the others poll the cache instead of repeating the call. Lock
+failures fall back to making the call.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+from uuid import uuid4
+
+import structlog
+
+from app.core.config import settings
+from app.core.redis import RedisClient
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Redis key prefix for cross-process single-flight locks
+SINGLE_FLIGHT_LOCK_PREFIX = "singleflight:"
+
+# Delete the lock only if this process still holds it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for one single-flight group."""
+
+    calls: int = 0  # calls actually made
+    coalesced: int = 0  # joined an in-flight call in this process
+    remote_coalesced: int = 0  # served by another worker's call via the cache
+    lock_errors: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize a single-flight group.
+
+        Args:
+            name: Group name, used in lock keys and logs.
+        """
+        self.name = name
+        self.stats = SingleFlightStats()
+        self._in_flight: dict[str, asyncio.Task[Any]] = {}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        """Run fn once for all concurrent callers with the same key.
+
+        The shared call keeps running if a caller is cancelled (e.g. by a
+        search deadline), so the other callers still get the result.
+
+        Args:
+            key: Identifies identical calls.
+            fn: Makes the call. Its result or exception goes to every caller.
+            lookup: Reads the shared cache that fn fills. Enables the Redis
+                lock across workers.
+
+        Returns:
+            The result of fn (or of lookup, if another worker made the call).
+        """
+        if not settings.single_flight_enabled:
+            return await fn()
+
+        task = self._in_flight.get(key)
+        # Tasks left behind by a closed event loop (e.g. a finished Celery
+        # task's loop) can't be awaited here
+        if task is not None and task.get_loop() is not asyncio.get_running_loop():
+            task = None
+        if task is None:
+            task = asyncio.create_task(self._run(key, fn, lookup))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats.coalesced += 1
+            logger.debug("single_flight_coalesced", group=self.name)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[T | None]] | None,
+    ) -> T:
+        if lookup is None or not settings.single_flight_distributed:
+            self.stats.calls += 1
+            return await fn()
+
+        lock_key = f"{SINGLE_FLIGHT_LOCK_PREFIX}{self.name}:{key}"
+        token = uuid4().hex
+        try:
+            client = await RedisClient.get_client()
+            acquired = await client.set(
+                lock_key, token, nx=True, px=settings.single_flight_lock_ttl_ms
+            )
+        except Exception as e:
+            self.stats.lock_errors += 1
+            logger.warning("single_flight_lock_failed", group=self.name, error=str(e))
+            self.stats.calls += 1
+            return await fn()
+
+        if acquired:
+            try:
+                self.stats.calls += 1
+                return await fn()
+            finally:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    self.stats.lock_errors += 1
+                    logger.warning(
+                        "single_flight_unlock_failed", group=self.name, error=str(e)
+                    )
+
+        # Another worker holds the lock: wait for it to fill the shared cache
+        result = await self._wait_for_remote(client, lock_key, lookup)
+        if result is not None:
+            self.stats.remote_coalesced += 1
+            return result
+        self.stats.calls += 1
+        return await fn()
+
+    async def _wait_for_remote(
+        self,
+        client: Any,
+        lock_key: str,
+        lookup: Callable[[], Awaitable[T | None]],
+    ) -> T | None:
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + settings.single_flight_lock_ttl_ms / 1000
+        try:
+            while loop.time() < give_up_at:
+                await asyncio.sleep(settings.single_flight_poll_interval_ms / 1000)
+                result = await lookup()
+                if result is not None:
+                    return result
+                if not await client.exists(lock_key):
+                    # Holder finished (or failed) without filling the cache
+                    return await lookup()
+        except Exception as e:
+            self.stats.lock_errors += 1
+            logger.warning("single_flight_wait_failed", group=self.name, error=str(e))
+        return None
+
+    def get_stats(self) -> dict[str, int]:
+        """Snapshot of call/coalescing counters."""
+        return {**asdict(self.stats), "in_flight": len(self._in_flight)}
+
+
+# Singleton instances for use across the application
+embedding_flight = SingleFlight("embedding")
+vector_search_flight = SingleFlight("vector_search")
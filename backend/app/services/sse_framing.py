@@ -0,0 +1,115 @@
+"""SSE framing: token coalescing and fast event encoding.
+
+The LLM streams many tiny deltas. Sending each as its own SSE event costs a
+JSON encode, a frame and a socket write per delta. coalesce_token_events()
+merges consecutive TokenEvents into one frame that is flushed every
+settings.sse_flush_interval_ms or once settings.sse_flush_chars are
+buffered, whichever comes first. Any other event (citation, done, error)
+flushes pending text first, so citations still follow the text that
+contains their [n] marker.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+
+import orjson
+
+from app.core.config import settings
+from app.schemas.sse import SSEEvent, TokenEvent
+
+
+def encode_sse_frame(event: SSEEvent) -> bytes:
+    """Encode an event as an SSE `data:` frame using orjson.
+
+    Args:
+        event: Event to encode.
+
+    Returns:
+        Frame bytes, including the terminating blank line.
+    """
+    if isinstance(event, TokenEvent):
+        # Hot path: skip pydantic serialization for the most frequent event
+        payload = {"type": event.type.value, "content": event.content}
+    else:
+        payload = event.model_dump(mode="json")
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _next_event(events: AsyncIterator[SSEEvent]) -> SSEEvent | None:
+    try:
+        return await anext(events)
+    except StopAsyncIteration:
+        return None
+
+
+async def coalesce_token_events(
+    events: AsyncIterator[SSEEvent],
+    flush_interval_ms: int | None = None,
+    flush_chars: int | None = None,
+) -> AsyncGenerator[SSEEvent, None]:
+    """Merge consecutive TokenEvents into larger, time-bounded frames.
+
+    Buffered text is flushed when the interval since the first buffered
+    token elapses (even if the LLM stalls), when the buffer reaches
+    flush_chars, or before any non-token event.
+
+    Args:
+        events: Source event stream (e.g. SearchService._search_stream).
+        flush_interval_ms: Max time text waits in the buffer (default: settings).
+        flush_chars: Buffer size that forces a flush (default: settings).
+
+    Yields:
+        Events in source order, with runs of tokens merged.
+    """
+    interval = (flush_interval_ms or settings.sse_flush_interval_ms) / 1000
+    max_chars = flush_chars or settings.sse_flush_chars
+    loop = asyncio.get_running_loop()
+
+    buffer: list[str] = []
+    buffered_chars = 0
+    flush_at = 0.0
+    pending: asyncio.Task[SSEEvent | None] | None = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(_next_event(events))
+            timeout = max(0.0, flush_at - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                # Interval elapsed while waiting for the next token
+                yield TokenEvent(content="".join(buffer))
+                buffer, buffered_chars = [], 0
+                continue
+
+            event = pending.result()
+            pending = None
+            if event is None:
+                break
+
+            if isinstance(event, TokenEvent):
+                if not buffer:
+                    flush_at = loop.time() + interval
+                buffer.append(event.content)
+                buffered_chars += len(event.content)
+                if buffered_chars >= max_chars:
+                    yield TokenEvent(content="".join(buffer))
+                    buffer, buffered_chars = [], 0
+                continue
+
+            if buffer:
+                yield TokenEvent(content="".join(buffer))
+                buffer, buffered_chars = [], 0
+            yield event
+
+        if buffer:
+            yield TokenEvent(content="".join(buffer))
+    finally:
+        # Client disconnected or stream failed: stop the producer too
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.wait({pending})
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,31 @@
+"""Porter-stemmed token sets for keyword-overlap explanations.
+
+Chunk stems are computed once at index time and stored in the Qdrant payload
+("stems"), so explaining a result only stems the query and intersects sets.
+Older collections get the field from the backfill_chunk_stems task. Search
+results never fetch it.
+"""
+
+from functools import lru_cache
+
+from nltk.stem.porter import PorterStemmer
+
+_stemmer = PorterStemmer()
+
+
+@lru_cache(maxsize=50_000)
+def stem_word(word: str) -> str:
+    """Lower-case and Porter-stem a single word."""
+    return _stemmer.stem(word.lower())
+
+
+def stem_tokens(text: str) -> set[str]:
+    """Stem every whitespace-separated token of a text.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        Set of distinct stems.
+    """
+    return {stem_word(word) for word in text.split()}
@@ -12,13 +12,13 @@ import tiktoken
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.core.config import settings
+from app.core.tokenizer import get_token_encoder
+from app.schemas.search import make_excerpt
+from app.services.stemming import stem_tokens
 from app.workers.parsing import ParsedContent, ParsedElement
 
 logger = structlog.get_logger(__name__)
 
-# Tiktoken encoding for OpenAI ada-002 model
-ENCODING_NAME = "cl100k_base"
-
 
 @dataclass
 class DocumentChunk:
@@ -58,6 +58,10 @@ class DocumentChunk:
             "page_number": self.page_number,
             "section_header": self.section_header,
             "chunk_text": self.text,
+            # Lets quick search skip fetching chunk_text
+            "excerpt": make_excerpt(self.text),
+            # Lets relevance explanations match keywords by set intersection
+            "stems": sorted(stem_tokens(self.text)),
             "char_start": self.char_start,
             "char_end": self.char_end,
             "chunk_index": self.chunk_index,
@@ -68,15 +72,6 @@ class ChunkingError(Exception):
     """Error during document chunking."""
 
 
-def _get_token_encoder() -> tiktoken.Encoding:
-    """Get tiktoken encoder for token counting.
-
-    Returns:
-        Tiktoken encoder for cl100k_base (ada-002).
-    """
-    return tiktoken.get_encoding(ENCODING_NAME)
-
-
 def _count_tokens(text: str, encoder: tiktoken.Encoding | None = None) -> int:
     """Count tokens in text using tiktoken.
 
@@ -88,7 +83,7 @@ def _count_tokens(text: str, encoder: tiktoken.Encoding | None = None) -> int:
         Number of tokens.
     """
     if encoder is None:
-        encoder = _get_token_encoder()
+        encoder = get_token_encoder()
     return len(encoder.encode(text))
 
 
@@ -230,7 +225,7 @@ def chunk_document(
         return []
 
     try:
-        encoder = _get_token_encoder()
+        encoder = get_token_encoder()
 
         # Create text splitter with token-based length function
         splitter = RecursiveCharacterTextSplitter(
@@ -25,6 +25,7 @@ from sqlalchemy import select, update
 
 from app.core.config import settings
 from app.core.database import async_session_factory
+from app.core.timing import StageTimer
 from app.integrations.minio_client import minio_service
 from app.models.document import Document, DocumentStatus
 from app.models.outbox import Outbox
@@ -176,9 +177,11 @@ async def _chunk_embed_index(
         kb_id=str(kb_id),
         is_replacement=is_replacement,
     )
+    # Stage durations go to the completion log (worker metrics are not scraped)
+    timer = StageTimer()
 
     # 1. Load parsed content from MinIO
-    parsed_content = await load_parsed_content(kb_id, UUID(doc_id))
+    parsed_content = await timer.run("load", load_parsed_content(kb_id, UUID(doc_id)))
     if not parsed_content:
         raise DocumentProcessingError(
             "Parsed content not found in MinIO",
@@ -187,11 +190,12 @@ async def _chunk_embed_index(
 
     # 2. Chunk the document
     try:
-        chunks = chunk_document(
-            parsed_content=parsed_content,
-            document_id=doc_id,
-            document_name=document_name,
-        )
+        with timer.measure("chunk"):
+            chunks = chunk_document(
+                parsed_content=parsed_content,
+                document_id=doc_id,
+                document_name=document_name,
+            )
     except ChunkingError as e:
         raise DocumentProcessingError(f"Chunking failed: {e}", retryable=True) from e
 
@@ -204,7 +208,7 @@ async def _chunk_embed_index(
 
     # 3. Generate embeddings
     try:
-        embeddings = await generate_embeddings(chunks)
+        embeddings = await timer.run("embed", generate_embeddings(chunks))
     except EmbeddingGenerationError as e:
         # Check if rate limit error (non-retryable after max retries)
         if "rate limit exceeded" in str(e).lower():
@@ -219,7 +223,9 @@ async def _chunk_embed_index(
             document_id=doc_id,
             kb_id=str(kb_id),
         )
-        deleted_count = await delete_document_vectors(doc_id, kb_id)
+        deleted_count = await timer.run(
+            "delete_old", delete_document_vectors(doc_id, kb_id)
+        )
         logger.info(
             "replacement_old_vectors_deleted",
             document_id=doc_id,
@@ -229,10 +235,9 @@ async def _chunk_embed_index(
 
     # 5. Index in Qdrant (upsert new vectors)
     try:
-        chunk_count = await index_document(
-            doc_id=doc_id,
-            kb_id=kb_id,
-            embeddings=embeddings,
+        chunk_count = await timer.run(
+            "index",
+            index_document(doc_id=doc_id, kb_id=kb_id, embeddings=embeddings),
         )
     except IndexingError as e:
         raise DocumentProcessingError(f"Indexing failed: {e}", retryable=False) from e
@@ -241,7 +246,9 @@ async def _chunk_embed_index(
     # For replacements, we already deleted all old vectors, so skip this
     if not is_replacement:
         max_chunk_index = len(chunks) - 1
-        await cleanup_orphan_chunks(doc_id, kb_id, max_chunk_index)
+        await timer.run(
+            "cleanup", cleanup_orphan_chunks(doc_id, kb_id, max_chunk_index)
+        )
 
     logger.info(
         "chunk_embed_index_completed",
@@ -249,6 +256,7 @@ async def _chunk_embed_index(
         kb_id=str(kb_id),
         chunk_count=chunk_count,
         is_replacement=is_replacement,
+        stage_ms=timer.as_dict(),
     )
 
     return chunk_count
@@ -291,6 +299,7 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
     """
     task_id = self.request.id or "unknown"
     temp_dir = None
+    timer = StageTimer()
 
     logger.info(
         "document_processing_started",
@@ -355,7 +364,8 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
         )
 
         try:
-            file_data = run_async(minio_service.download_file(kb_id, object_path))
+            with timer.measure("download"):
+                file_data = run_async(minio_service.download_file(kb_id, object_path))
         except Exception as e:
             raise DocumentProcessingError(
                 f"Failed to download file: {e}",
@@ -386,7 +396,8 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
 
         # 6. Parse document based on MIME type
         try:
-            parsed_content = parse_document(local_path, mime_type)
+            with timer.measure("parse"):
+                parsed_content = parse_document(local_path, mime_type)
         except PasswordProtectedError:
             run_async(
                 _update_document_status(
@@ -437,13 +448,14 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
             raise DocumentProcessingError(str(e), retryable=True) from e
 
         # 7. Store parsed content temporarily
-        run_async(
-            store_parsed_content(
-                kb_id=kb_id,
-                document_id=UUID(doc_id),
-                parsed=parsed_content,
+        with timer.measure("store_parsed"):
+            run_async(
+                store_parsed_content(
+                    kb_id=kb_id,
+                    document_id=UUID(doc_id),
+                    parsed=parsed_content,
+                )
             )
-        )
 
         logger.info(
             "document_parsing_completed",
@@ -455,14 +467,15 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
 
         # 8. Chunk, embed, and index the document
         # For replacement flow, performs atomic vector switch (delete old, upsert new)
-        chunk_count = run_async(
-            _chunk_embed_index(
-                doc_id=doc_id,
-                kb_id=kb_id,
-                document_name=filename,
-                is_replacement=is_replacement,
+        with timer.measure("chunk_embed_index"):
+            chunk_count = run_async(
+                _chunk_embed_index(
+                    doc_id=doc_id,
+                    kb_id=kb_id,
+                    document_name=filename,
+                    is_replacement=is_replacement,
+                )
             )
-        )
 
         # 9. Update document status to READY
         run_async(
@@ -485,6 +498,7 @@ def process_document(self, doc_id: str, is_replacement: bool = False) -> dict:
             document_id=doc_id,
             chunk_count=chunk_count,
             status="READY",
+            stage_ms=timer.as_dict(),
         )
 
         return {
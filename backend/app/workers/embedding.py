@@ -1,11 +1,13 @@
 """Embedding generation for document chunks.
 
 Orchestrates embedding generation using LiteLLM client with
-batching, retry logic, and oversized chunk handling.
+a content-addressed vector cache, batching, retry logic, and oversized
+chunk handling.
 """
 
 from dataclasses import dataclass
 
+import numpy as np
 import structlog
 
 from app.integrations.litellm_client import (
@@ -13,7 +15,9 @@ from app.integrations.litellm_client import (
     TokenLimitExceededError,
     embedding_client,
 )
+from app.services.chunk_embedding_cache import chunk_embedding_cache
 from app.workers.chunking import DocumentChunk
+from app.workers.embedding_batcher import embedding_microbatcher
 
 logger = structlog.get_logger(__name__)
 
@@ -52,9 +56,12 @@ async def generate_embeddings(
     """Generate embeddings for a list of document chunks.
 
     Handles:
+    - Reuse of cached vectors for unchanged chunk text
+    - Pooling of small documents' chunks with concurrent tasks
     - Batched API calls for efficiency
     - Exponential backoff on rate limits
-    - Oversized chunk splitting for token limit errors
+    - Bisection of batches rejected for token limits; oversized chunks are
+      split and their embeddings averaged
 
     Args:
         chunks: List of DocumentChunk objects to embed.
@@ -78,8 +85,28 @@ async def generate_embeddings(
         # Extract texts for embedding
         texts = [chunk.text for chunk in chunks]
 
-        # Generate embeddings with retry handling
-        embeddings = await _generate_with_retry(texts, chunks)
+        # Reuse vectors of unchanged chunks; only embed the rest
+        model = embedding_client.model
+        embeddings = await chunk_embedding_cache.get_many(texts, model)
+        missing: dict[str, int] = {}  # text -> first chunk index, deduplicated
+        for i, (text, embedding) in enumerate(zip(texts, embeddings, strict=True)):
+            if embedding is None:
+                missing.setdefault(text, i)
+        hit_count = len(texts) - sum(1 for e in embeddings if e is None)
+
+        if missing:
+            miss_texts = list(missing)
+            # Generate embeddings with retry handling
+            # Small documents share requests with concurrent tasks
+            fresh = await embedding_microbatcher.submit(miss_texts, model)
+            if fresh is None:
+                fresh = await _generate_with_retry(miss_texts)
+            fresh_by_text = dict(zip(miss_texts, fresh, strict=True))
+            embeddings = [
+                embedding if embedding is not None else fresh_by_text[text]
+                for text, embedding in zip(texts, embeddings, strict=True)
+            ]
+            await chunk_embedding_cache.set_many(miss_texts, model, fresh)
 
         # Combine chunks with embeddings
         results = []
@@ -100,6 +127,9 @@ async def generate_embeddings(
             chunk_count=len(results),
             document_id=chunks[0].document_id if chunks else None,
             tokens_used=embedding_client.total_tokens_used,
+            cache_hits=hit_count,
+            cache_hit_ratio=round(hit_count / len(chunks), 4),
+            tokens_saved=_count_saved_tokens(texts, missing),
         )
 
         return results
@@ -121,95 +151,100 @@ async def generate_embeddings(
         raise EmbeddingGenerationError(f"Failed to generate embeddings: {e}") from e
 
 
-async def _generate_with_retry(
-    texts: list[str],
-    chunks: list[DocumentChunk],
-) -> list[list[float]]:
-    """Generate embeddings with token limit error handling.
+def _count_saved_tokens(texts: list[str], missing: dict[str, int]) -> int:
+    """Count tokens that were not sent to the embedding API.
 
-    If a chunk exceeds token limits, it's split further and re-embedded.
+    Covers cache hits and repeated chunk texts embedded only once.
+
+    Args:
+        texts: All chunk texts.
+        missing: Texts that were embedded, mapped to their first index.
+
+    Returns:
+        Token count of the texts that were not embedded.
+    """
+    from app.core.tokenizer import get_token_encoder
+    from app.workers.chunking import _count_tokens
+
+    saved = [text for i, text in enumerate(texts) if missing.get(text) != i]
+    if not saved:
+        return 0
+    encoder = get_token_encoder()
+    return sum(_count_tokens(text, encoder) for text in saved)
+
+
+async def _generate_with_retry(texts: list[str]) -> list[list[float]]:
+    """Generate embeddings, recovering from token limit errors.
+
+    The provider rejects a whole batch when one of its texts is too long.
+    Vectors of the batches that succeeded are kept; the failing batch is
+    bisected until the offending texts are isolated, and each offender is
+    split and its sub-chunk embeddings averaged. Any other batch that was
+    rejected too is recovered the same way.
 
     Args:
         texts: Texts to embed.
-        chunks: Corresponding chunks (for re-chunking metadata).
 
     Returns:
-        List of embedding vectors.
+        List of embedding vectors, in input order.
     """
     try:
         return await embedding_client.get_embeddings(texts)
 
     except TokenLimitExceededError as e:
-        # Handle oversized chunk by splitting
+        start = e.chunk_index
+        end = min(start + e.batch_size, len(texts))
         logger.warning(
             "token_limit_handling",
-            chunk_index=e.chunk_index,
+            batch_start=start,
+            batch_size=end - start,
             error=str(e),
         )
 
-        # Re-chunk the oversized text
-        return await _handle_oversized_chunks(texts, chunks, e.chunk_index)
+        embeddings = e.embeddings or [None] * len(texts)
+        if end - start == 1:
+            embeddings[start] = await _embed_oversized_text(texts[start])
+        else:
+            mid = (start + end) // 2
+            embeddings[start:end] = await _generate_with_retry(
+                texts[start:mid]
+            ) + await _generate_with_retry(texts[mid:end])
 
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = await _generate_with_retry([texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh, strict=True):
+                embeddings[i] = embedding
+        return embeddings
 
-async def _handle_oversized_chunks(
-    texts: list[str],
-    chunks: list[DocumentChunk],
-    problem_index: int,
-) -> list[list[float]]:
-    """Handle token limit errors by splitting oversized chunks.
 
-    Splits the problematic chunk into smaller pieces, embeds them,
-    and averages the embeddings.
+async def _embed_oversized_text(text: str) -> list[float]:
+    """Embed a text over the token limit by splitting and averaging.
 
     Args:
-        texts: Original texts.
-        chunks: Original chunks.
-        problem_index: Index of the chunk that exceeded limits.
+        text: Text rejected by the provider on its own.
 
     Returns:
-        List of embedding vectors.
+        Mean of the sub-chunk embeddings.
     """
     from app.core.config import settings
-    from app.workers.chunking import (
-        _count_tokens,
-        _get_token_encoder,
-        _split_oversized_chunk,
-    )
+    from app.core.tokenizer import get_token_encoder
+    from app.workers.chunking import _count_tokens, _split_oversized_chunk
 
-    encoder = _get_token_encoder()
-    results: list[list[float]] = []
-
-    for i, (text, _chunk) in enumerate(zip(texts, chunks, strict=True)):
-        if i == problem_index:
-            # Split this chunk and average embeddings
-            sub_texts = _split_oversized_chunk(text, settings.chunk_size, encoder)
-
-            logger.info(
-                "splitting_oversized_chunk",
-                chunk_index=i,
-                original_tokens=_count_tokens(text, encoder),
-                sub_chunk_count=len(sub_texts),
-            )
-
-            # Embed sub-chunks
-            sub_embeddings = await embedding_client.get_embeddings(sub_texts)
-
-            # Average the embeddings
-            if sub_embeddings:
-                avg_embedding = [
-                    sum(e[j] for e in sub_embeddings) / len(sub_embeddings)
-                    for j in range(len(sub_embeddings[0]))
-                ]
-                results.append(avg_embedding)
-            else:
-                # Fallback: zero embedding (should not happen)
-                results.append([0.0] * EMBEDDING_DIMENSIONS)
-        else:
-            # Embed normally
-            embeddings = await embedding_client.get_embeddings([text])
-            results.append(embeddings[0])
+    encoder = get_token_encoder()
+    sub_texts = _split_oversized_chunk(text, settings.chunk_size, encoder)
+
+    logger.info(
+        "splitting_oversized_chunk",
+        original_tokens=_count_tokens(text, encoder),
+        sub_chunk_count=len(sub_texts),
+    )
 
-    return results
+    sub_embeddings = await embedding_client.get_embeddings(sub_texts)
+    if not sub_embeddings:
+        # Fallback: zero embedding (should not happen)
+        return [0.0] * EMBEDDING_DIMENSIONS
+    return np.asarray(sub_embeddings, dtype=np.float64).mean(axis=0).tolist()
 
 
 async def embed_document_chunks(
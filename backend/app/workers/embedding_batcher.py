@@ -0,0 +1,297 @@
+"""Cross-document micro-batching of embedding requests in workers.
+
+Small documents (a one-page note is 2-5 chunks) each send an under-filled
+embedding request. Celery's prefork workers run one task per process, so the
+tasks that could share a request live in different processes and are
+coordinated through Redis:
+
+1. A task with a small submission pushes it onto a shared queue.
+2. Whichever waiting task takes the short leader lock collects submissions
+   for up to embedding_microbatch_window_ms (or until a full token budget
+   is queued), atomically takes them off the queue and releases the lock.
+   A leader whose own submission is alone in the queue (no other worker is
+   embedding) takes it at once, so a lone upload never waits the window.
+3. The leader sends one embedding request for all of them and pushes each
+   submission's vectors (packed float32) to that submission's result list.
+   If the provider rejects the batch for its token limit, the submissions
+   are bisected until the offending one is isolated; only that one falls
+   back.
+4. Every submitter waits on its own result list, taking the lead itself
+   whenever the lock is free.
+
+Any failure - Redis unavailable, a failed flush, no result in time - makes
+the submitter embed its texts directly, so batching never loses work.
+"""
+
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+from app.core.tokenizer import get_token_encoder
+from app.integrations.litellm_client import TokenLimitExceededError, get_embeddings
+from app.services.embedding_cache import pack_vector, unpack_vector
+
+logger = structlog.get_logger(__name__)
+
+# Redis keys for the shared submission queue
+MICROBATCH_QUEUE_KEY = "embed_microbatch:queue"
+MICROBATCH_TOKENS_KEY = "embed_microbatch:tokens"  # tokens currently queued
+MICROBATCH_LEADER_KEY = "embed_microbatch:leader"
+MICROBATCH_RESULT_PREFIX = "embed_microbatch:result:"
+
+# Unclaimed results expire (e.g. when the submitter already gave up)
+_RESULT_TTL_SECONDS = 120
+
+# Result payload telling the submitter to embed its texts itself
+_FAILED = b""
+
+# Delete the leader lock only if this task still holds it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Take submissions off the head of the queue within a token and text budget,
+# in one step so a submitter withdrawing its own (LREM) never races the leader
+# KEYS[1]: queue, KEYS[2]: queued token count
+# ARGV: max_tokens, max_texts
+# Returns: the taken submissions (JSON)
+_TAKE_SCRIPT = """
+local budget, max_texts = tonumber(ARGV[1]), tonumber(ARGV[2])
+local items = redis.call("LRANGE", KEYS[1], 0, max_texts - 1)
+local taken, tokens, texts = {}, 0, 0
+for _, item in ipairs(items) do
+    local request = cjson.decode(item)
+    local count = #request["texts"]
+    if #taken > 0 and (tokens + request["tokens"] > budget
+            or texts + count > max_texts) then
+        break
+    end
+    taken[#taken + 1] = item
+    tokens = tokens + request["tokens"]
+    texts = texts + count
+end
+redis.call("LTRIM", KEYS[1], #taken, -1)
+if redis.call("LLEN", KEYS[1]) == 0 then
+    -- Resync the early-flush hint with the (now empty) queue
+    redis.call("SET", KEYS[2], 0)
+else
+    redis.call("DECRBY", KEYS[2], tokens)
+end
+return taken
+"""
+
+
+class EmbeddingMicroBatcher:
+    """Pools small embedding submissions from concurrent document tasks."""
+
+    def __init__(self) -> None:
+        """Initialize the batcher (Redis client created lazily per loop)."""
+        self._client: redis.Redis | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._closing_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def window(self) -> float:
+        return settings.embedding_microbatch_window_ms / 1000
+
+    async def submit(self, texts: list[str], model: str) -> list[list[float]] | None:
+        """Embed texts as part of a shared batch.
+
+        Args:
+            texts: Texts to embed.
+            model: Embedding model name.
+
+        Returns:
+            One vector per text, or None if the submission is too large to
+            pool or could not be batched (the caller then embeds directly).
+        """
+        if not (
+            settings.embedding_microbatch_enabled
+            and 0 < len(texts) < settings.embedding_batch_size
+        ):
+            return None
+        encoder = get_token_encoder()
+        tokens = sum(len(t) for t in encoder.encode_ordinary_batch(texts))
+        if tokens >= settings.embedding_microbatch_max_tokens:
+            return None
+
+        request_id = uuid4().hex
+        request = json.dumps(
+            {"id": request_id, "model": model, "texts": texts, "tokens": tokens}
+        )
+        result_key = f"{MICROBATCH_RESULT_PREFIX}{request_id}"
+        try:
+            client = self._get_client()
+            pipe = client.pipeline(transaction=False)
+            pipe.rpush(MICROBATCH_QUEUE_KEY, request)
+            pipe.incrby(MICROBATCH_TOKENS_KEY, tokens)
+            await pipe.execute()
+
+            give_up_at = time.monotonic() + self.window + 2 * settings.embedding_timeout
+            while time.monotonic() < give_up_at:
+                await self._try_lead(client)
+                item = await client.blpop([result_key], timeout=max(self.window, 0.01))
+                if item is not None:
+                    payload = item[1]
+                    if payload == _FAILED:
+                        return None
+                    return _split_vectors(payload, len(texts))
+
+            # Withdraw the submission unless a leader already took it
+            if await client.lrem(MICROBATCH_QUEUE_KEY, 1, request):
+                await client.decrby(MICROBATCH_TOKENS_KEY, tokens)
+            logger.warning("embedding_microbatch_timeout", texts=len(texts))
+            return None
+        except Exception as e:
+            logger.warning("embedding_microbatch_failed", error=str(e))
+            return None
+
+    async def _try_lead(self, client: redis.Redis) -> None:
+        token = uuid4().hex
+        # The lock only covers collecting; the flush runs after release
+        lease_ms = int(self.window * 1000) + 5000
+        if not await client.set(MICROBATCH_LEADER_KEY, token, nx=True, px=lease_ms):
+            return
+        try:
+            requests = await self._collect(client)
+        finally:
+            await client.eval(_RELEASE_LOCK_SCRIPT, 1, MICROBATCH_LEADER_KEY, token)
+        if requests:
+            await self._flush(client, requests)
+
+    async def _collect(self, client: redis.Redis) -> list[dict]:
+        """Wait out the window (or a full budget) and take queued submissions.
+
+        The window is skipped while the queue holds at most the leader's own
+        submission: with no other worker embedding, waiting only adds latency.
+        """
+        budget = settings.embedding_batch_max_tokens
+        flush_at = time.monotonic() + self.window
+        if await client.llen(MICROBATCH_QUEUE_KEY) <= 1:
+            flush_at = time.monotonic()
+        while time.monotonic() < flush_at:
+            if int(await client.get(MICROBATCH_TOKENS_KEY) or 0) >= budget:
+                break
+            remaining = flush_at - time.monotonic()
+            await asyncio.sleep(max(0.0, min(self.window / 5, remaining)))
+
+        taken = await client.eval(
+            _TAKE_SCRIPT,
+            2,
+            MICROBATCH_QUEUE_KEY,
+            MICROBATCH_TOKENS_KEY,
+            budget,
+            settings.embedding_batch_size,
+        )
+        return [json.loads(item) for item in taken]
+
+    async def _flush(self, client: redis.Redis, requests: list[dict]) -> None:
+        """Embed the collected submissions and route vectors to each caller."""
+        payloads: dict[str, bytes] = {}
+        by_model: dict[str, list[dict]] = {}
+        for request in requests:
+            by_model.setdefault(request["model"], []).append(request)
+
+        for model, group in by_model.items():
+            payloads.update(await self._embed_group(group, model))
+
+        pipe = client.pipeline(transaction=False)
+        for request_id, payload in payloads.items():
+            result_key = f"{MICROBATCH_RESULT_PREFIX}{request_id}"
+            pipe.rpush(result_key, payload)
+            pipe.expire(result_key, _RESULT_TTL_SECONDS)
+        await pipe.execute()
+
+        logger.info(
+            "embedding_microbatch_flushed",
+            submissions=len(requests),
+            texts=sum(len(r["texts"]) for r in requests),
+            tokens=sum(r["tokens"] for r in requests),
+        )
+
+    async def _embed_group(self, group: list[dict], model: str) -> dict[str, bytes]:
+        """Embed submissions for one model, isolating token limit failures.
+
+        A batch rejected for its token limit is bisected by submission. A
+        single submission that is still rejected gets _FAILED, so its own
+        task embeds it directly (where oversized texts are split).
+
+        Args:
+            group: Submissions for this model.
+            model: Embedding model name.
+
+        Returns:
+            Payload (packed vectors or _FAILED) per submission id.
+        """
+        texts = [text for request in group for text in request["texts"]]
+        try:
+            vectors = await get_embeddings(texts, model=model)
+        except TokenLimitExceededError as e:
+            if len(group) == 1:
+                logger.warning("embedding_microbatch_token_limit", error=str(e))
+                return {group[0]["id"]: _FAILED}
+            mid = len(group) // 2
+            return {
+                **await self._embed_group(group[:mid], model),
+                **await self._embed_group(group[mid:], model),
+            }
+        except Exception as e:
+            logger.warning("embedding_microbatch_flush_failed", error=str(e))
+            return dict.fromkeys((r["id"] for r in group), _FAILED)
+
+        payloads = {}
+        offset = 0
+        for request in group:
+            count = len(request["texts"])
+            payloads[request["id"]] = b"".join(
+                pack_vector(vector) for vector in vectors[offset : offset + count]
+            )
+            offset += count
+        return payloads
+
+    def _get_client(self) -> redis.Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                self._close_stale_client(self._client)
+            self._client = redis.from_url(settings.redis_url, decode_responses=False)
+            self._client_loop = loop
+        return self._client
+
+    def _close_stale_client(self, client: redis.Redis) -> None:
+        """Close a client left behind by a previous event loop.
+
+        Each Celery task runs in a fresh loop. The old client cannot be
+        reused there, so its pooled sockets are closed from the current loop.
+
+        Args:
+            client: Client created on a previous loop.
+        """
+
+        async def close() -> None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("embedding_microbatch_client_close_error", error=str(e))
+
+        task = asyncio.get_running_loop().create_task(close())
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+
+def _split_vectors(payload: bytes, count: int) -> list[list[float]]:
+    """Unpack `count` equal-length float32 vectors from one payload."""
+    size = len(payload) // count
+    return [unpack_vector(payload[i * size : (i + 1) * size]) for i in range(count)]
+
+
+# Singleton instance for use across the application
+embedding_microbatcher = EmbeddingMicroBatcher()
@@ -8,8 +8,17 @@ from uuid import UUID
 
 import structlog
 from qdrant_client.http import models
+from sqlalchemy import select
 
+from app.core.database import async_session_factory
 from app.integrations.qdrant_client import qdrant_service
+from app.models.knowledge_base import KnowledgeBase
+from app.schemas.knowledge_base import KBSettings, KBVectorIndexSettings
+from app.services.chunk_locator import (
+    forget_chunk_locations,
+    record_chunk_locations,
+)
+from app.services.search_cache import bump_index_generation
 from app.workers.embedding import ChunkEmbedding
 
 logger = structlog.get_logger(__name__)
@@ -60,13 +69,21 @@ async def index_document(
 
     for attempt in range(max_retries):
         try:
-            # Ensure collection exists
+            # Ensure collection exists, with the KB's index settings (KB
+            # creation may have failed to create it)
             if not await qdrant_service.collection_exists(kb_id):
-                await qdrant_service.create_collection(kb_id)
+                await qdrant_service.create_collection(
+                    kb_id, await _get_vector_index_settings(kb_id)
+                )
 
             # Upsert points
             count = await qdrant_service.upsert_points(kb_id, points)
 
+            # Cached search results for this KB are now stale
+            await bump_index_generation(kb_id)
+            # Lets similar search find the source chunk's collection directly
+            await record_chunk_locations(kb_id, [str(p.id) for p in points])
+
             logger.info(
                 "indexing_completed",
                 document_id=doc_id,
@@ -102,6 +119,23 @@ async def index_document(
     )
 
 
+async def _get_vector_index_settings(kb_id: UUID) -> KBVectorIndexSettings:
+    """Load the KB's HNSW, quantization and on-disk settings.
+
+    Args:
+        kb_id: Knowledge Base UUID.
+
+    Returns:
+        The KB's vector index settings (defaults if the KB row is missing).
+    """
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(KnowledgeBase.settings).where(KnowledgeBase.id == kb_id)
+        )
+        kb_settings = result.scalar_one_or_none()
+    return KBSettings.model_validate(kb_settings or {}).vector_index
+
+
 def _create_points(embeddings: list[ChunkEmbedding]) -> list[models.PointStruct]:
     """Create Qdrant PointStruct objects from embeddings.
 
@@ -165,10 +199,13 @@ async def cleanup_orphan_chunks(
             ]
         )
 
+        point_ids = await qdrant_service.list_point_ids(kb_id, filter_conditions)
         deleted_count = await qdrant_service.delete_points_by_filter(
             kb_id=kb_id,
             filter_conditions=filter_conditions,
         )
+        await bump_index_generation(kb_id)
+        await forget_chunk_locations(point_ids)
 
         logger.info(
             "orphan_cleanup_completed",
@@ -222,10 +259,13 @@ async def delete_document_vectors(
             ]
         )
 
+        point_ids = await qdrant_service.list_point_ids(kb_id, filter_conditions)
         deleted_count = await qdrant_service.delete_points_by_filter(
             kb_id=kb_id,
             filter_conditions=filter_conditions,
         )
+        await bump_index_generation(kb_id)
+        await forget_chunk_locations(point_ids)
 
         logger.info(
             "document_vectors_deleted",
@@ -270,7 +310,7 @@ async def get_document_chunk_count(
             ]
         )
 
-        count_result = qdrant_service.client.count(
+        count_result = await qdrant_service.async_client.count(
             collection_name=f"kb_{kb_id}",
             count_filter=filter_conditions,
         )
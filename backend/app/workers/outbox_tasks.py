@@ -1,7 +1,9 @@
 """Outbox processor task for reliable event processing."""
 
 import asyncio
+from collections.abc import Callable
 from datetime import UTC, datetime
+from typing import Any
 
 import structlog
 from sqlalchemy import select, update
@@ -292,6 +294,8 @@ async def _handle_kb_delete(kb_id: str, event_id: str) -> None:
     from app.integrations.minio_client import minio_service
     from app.integrations.qdrant_client import qdrant_service
     from app.models.document import Document, DocumentStatus
+    from app.services.chunk_locator import forget_chunk_locations
+    from app.services.search_cache import bump_index_generation
 
     kb_uuid = UUID(kb_id)
 
@@ -314,10 +318,16 @@ async def _handle_kb_delete(kb_id: str, event_id: str) -> None:
         )
         document_count = doc_count_result.scalar() or 0
 
-    # 2. Delete Qdrant collection
+    # 2. Delete Qdrant collection, then its points from the chunk -> KB map
     vector_collection_deleted = False
     try:
+        point_ids = (
+            await qdrant_service.list_point_ids(kb_uuid)
+            if await qdrant_service.collection_exists(kb_uuid)
+            else []
+        )
         vector_collection_deleted = await qdrant_service.delete_collection(kb_uuid)
+        await forget_chunk_locations(point_ids)
     except Exception as e:
         logger.warning(
             "kb_delete_qdrant_cleanup_failed",
@@ -326,6 +336,9 @@ async def _handle_kb_delete(kb_id: str, event_id: str) -> None:
             error=str(e),
         )
 
+    # Invalidate cached search results for this KB
+    await bump_index_generation(kb_id)
+
     # 3. Delete all MinIO files for this KB
     files_deleted = 0
     try:
@@ -577,7 +590,7 @@ async def _detect_ready_docs_without_vectors(session, qdrant_service) -> list[di
             # Check if document has any points in the collection
             from qdrant_client.http import models as qdrant_models
 
-            count_result = qdrant_service.client.count(
+            count_result = await qdrant_service.async_client.count(
                 collection_name=f"kb_{kb_id}",
                 count_filter=qdrant_models.Filter(
                     must=[
@@ -650,7 +663,7 @@ async def _detect_orphan_vectors(session, qdrant_service) -> list[dict]:
                 continue
 
             # Get unique document_ids from Qdrant
-            points, _ = qdrant_service.client.scroll(
+            points, _ = await qdrant_service.async_client.scroll(
                 collection_name=f"kb_{kb_id}",
                 limit=10000,
                 with_payload=["document_id"],
@@ -844,3 +857,149 @@ async def _run_cleanup() -> dict:
         "processed_deleted": processed_deleted,
         "failed_deleted": failed_deleted,
     }
+
+
+# =============================================================================
+# Payload Backfill
+# =============================================================================
+
+# Points updated per Qdrant round trip during backfill
+BACKFILL_BATCH_SIZE = 256
+
+
+@celery_app.task(name="app.workers.outbox_tasks.backfill_chunk_excerpts")
+def backfill_chunk_excerpts() -> dict:
+    """One-off job adding the precomputed `excerpt` payload field.
+
+    Chunks indexed before excerpts were stored at index time lack the field
+    quick search projects. Safe to re-run: only points without an excerpt
+    are touched.
+
+    Returns:
+        Dict with the number of points updated.
+    """
+    logger.info("excerpt_backfill_started")
+
+    try:
+        result = run_async(_run_excerpt_backfill())
+        return result
+    except Exception as e:
+        logger.error("excerpt_backfill_failed", error=str(e))
+        return {"error": str(e)}
+
+
+@celery_app.task(name="app.workers.outbox_tasks.backfill_chunk_stems")
+def backfill_chunk_stems() -> dict:
+    """One-off job adding the index-time `stems` payload field.
+
+    Chunks indexed before stems were stored make every explanation stem
+    chunk_text again. Safe to re-run: only points without stems are touched.
+
+    Returns:
+        Dict with the number of points updated.
+    """
+    logger.info("stems_backfill_started")
+
+    try:
+        result = run_async(_run_stems_backfill())
+        return result
+    except Exception as e:
+        logger.error("stems_backfill_failed", error=str(e))
+        return {"error": str(e)}
+
+
+async def _run_excerpt_backfill() -> dict:
+    """Set missing excerpts on every active KB collection."""
+    from app.schemas.search import make_excerpt
+
+    return await _backfill_payload_field("excerpt", make_excerpt)
+
+
+async def _run_stems_backfill() -> dict:
+    """Set missing stems on every active KB collection."""
+    from app.services.stemming import stem_tokens
+
+    return await _backfill_payload_field(
+        "stems", lambda chunk_text: sorted(stem_tokens(chunk_text))
+    )
+
+
+async def _backfill_payload_field(field: str, compute: Callable[[str], Any]) -> dict:
+    """Scroll each active KB collection and set a missing field in batches.
+
+    Args:
+        field: Payload field to set on points that lack it.
+        compute: Derives the field's value from the point's chunk_text.
+
+    Returns:
+        Dict with the number of points updated.
+    """
+    from qdrant_client.http import models
+
+    from app.integrations.qdrant_client import qdrant_service
+    from app.models.knowledge_base import KnowledgeBase
+
+    async with async_session_factory() as session:
+        kb_result = await session.execute(
+            select(KnowledgeBase.id).where(KnowledgeBase.status == "active")
+        )
+        kb_ids = [kb_id for (kb_id,) in kb_result.all()]
+
+    missing_field = models.Filter(
+        must=[models.IsEmptyCondition(is_empty=models.PayloadField(key=field))]
+    )
+    points_updated = 0
+
+    for kb_id in kb_ids:
+        try:
+            if not await qdrant_service.collection_exists(kb_id):
+                continue
+
+            collection_name = f"kb_{kb_id}"
+            offset = None
+            while True:
+                points, offset = await qdrant_service.async_client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=missing_field,
+                    limit=BACKFILL_BATCH_SIZE,
+                    offset=offset,
+                    with_payload=["chunk_text"],
+                    with_vectors=False,
+                )
+                if points:
+                    await qdrant_service.async_client.batch_update_points(
+                        collection_name=collection_name,
+                        update_operations=[
+                            models.SetPayloadOperation(
+                                set_payload=models.SetPayload(
+                                    payload={
+                                        field: compute(
+                                            (p.payload or {}).get("chunk_text", "")
+                                        )
+                                    },
+                                    points=[p.id],
+                                )
+                            )
+                            for p in points
+                        ],
+                    )
+                    points_updated += len(points)
+                if offset is None:
+                    break
+
+        except Exception as e:
+            logger.warning(
+                "payload_backfill_kb_failed",
+                field=field,
+                kb_id=str(kb_id),
+                error=str(e),
+            )
+
+    logger.info(
+        "payload_backfill_completed",
+        field=field,
+        kb_count=len(kb_ids),
+        points_updated=points_updated,
+    )
+
+    return {"points_updated": points_updated}
@@ -0,0 +1 @@
+"""Offline performance benchmarks for the backend (not part of the app package)."""
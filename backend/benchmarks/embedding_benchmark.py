@@ -0,0 +1,147 @@
+"""Benchmark LiteLLMEmbeddingClient batching against a fake provider.
+
+Embeds a synthetic document (2,000 chunks of ~500 tokens by default) through
+a fake aembedding with injected latency: a fixed per-request cost plus a
+per-token cost. It compares the old behavior (batches of 20 texts sent one
+after another) with token-budgeted batches, first sent one at a time (the
+effect of packing alone, visible in the request count) and then concurrently.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_benchmark
+    python -m benchmarks.embedding_benchmark --chunks 500 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import structlog
+
+from app.core.config import settings
+from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+# Batch size before token-aware batching; max_batch_tokens is effectively off
+SERIAL_BATCH_SIZE = 20
+
+CHUNK_TEXT = (
+    "The access control service evaluates every request against the policy "
+    "set attached to the knowledge base, caching decisions per user. "
+)
+
+
+class FakeEmbeddingProvider:
+    """Stand-in for litellm.aembedding with size-dependent latency."""
+
+    def __init__(self, request_latency_ms: float, per_1k_tokens_ms: float) -> None:
+        self.request_latency_ms = request_latency_ms
+        self.per_1k_tokens_ms = per_1k_tokens_ms
+        self.requests = 0
+
+    async def aembedding(self, **kwargs: Any) -> SimpleNamespace:
+        texts = kwargs["input"]
+        # ~4 characters per token is close enough for latency modelling
+        tokens = sum(len(text) for text in texts) // 4
+        self.requests += 1
+        await asyncio.sleep(
+            (self.request_latency_ms + self.per_1k_tokens_ms * tokens / 1000) / 1000
+        )
+        return SimpleNamespace(
+            data=[{"embedding": [0.0] * 8} for _ in texts],
+            usage=SimpleNamespace(total_tokens=tokens),
+        )
+
+
+@dataclass
+class RunResult:
+    label: str
+    requests: int
+    seconds: float
+
+
+async def _run(
+    label: str,
+    client: LiteLLMEmbeddingClient,
+    texts: list[str],
+    args: argparse.Namespace,
+) -> RunResult:
+    provider = FakeEmbeddingProvider(args.request_latency_ms, args.per_1k_tokens_ms)
+    with (
+        patch("app.integrations.litellm_client.aembedding", provider.aembedding),
+        # The fake provider has no quota; no shared Redis limiter either
+        patch.object(settings, "llm_rate_limit_enabled", False),
+    ):
+        start = time.perf_counter()
+        embeddings = await client.get_embeddings(texts)
+        seconds = time.perf_counter() - start
+    assert len(embeddings) == len(texts)
+    return RunResult(label, provider.requests, seconds)
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[RunResult]:
+    # Repeat the sentence to reach roughly --chunk-tokens tokens per chunk
+    repeats = max(1, args.chunk_tokens * 4 // len(CHUNK_TEXT))
+    texts = [f"Chunk {n}. " + CHUNK_TEXT * repeats for n in range(args.chunks)]
+    serial = LiteLLMEmbeddingClient(
+        batch_size=SERIAL_BATCH_SIZE,
+        max_batch_tokens=sys.maxsize,
+        max_concurrent_batches=1,
+        max_retries=1,
+    )
+    packed = LiteLLMEmbeddingClient(
+        batch_size=settings.embedding_batch_size,
+        max_batch_tokens=args.max_batch_tokens,
+        max_concurrent_batches=1,
+        max_retries=1,
+    )
+    batched = LiteLLMEmbeddingClient(
+        batch_size=settings.embedding_batch_size,
+        max_batch_tokens=args.max_batch_tokens,
+        max_concurrent_batches=args.concurrency,
+        max_retries=1,
+    )
+    return [
+        await _run(f"serial, {SERIAL_BATCH_SIZE} texts/batch", serial, texts, args),
+        await _run(f"{args.max_batch_tokens} tokens/batch x1", packed, texts, args),
+        await _run(
+            f"{args.max_batch_tokens} tokens/batch x{args.concurrency}",
+            batched,
+            texts,
+            args,
+        ),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--chunk-tokens", type=int, default=500)
+    parser.add_argument("--request-latency-ms", type=float, default=150.0)
+    parser.add_argument("--per-1k-tokens-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--max-batch-tokens", type=int, default=settings.embedding_batch_max_tokens
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.embedding_max_concurrent_batches
+    )
+    args = parser.parse_args(argv)
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    runs = asyncio.run(run_benchmark(args))
+    baseline, result = runs[0], runs[-1]
+
+    for run in runs:
+        print(f"{run.label:<32}{run.requests:>6} requests{run.seconds:>9.2f} s")
+    print(f"speedup: {baseline.seconds / result.seconds:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,691 @@
+"""Offline throughput and latency benchmark for SearchService.
+
+Runs quick, sync and streaming search over 1-100 KBs against local stand-ins,
+so it needs no network and no running services:
+
+- Qdrant: in-memory AsyncQdrantClient(":memory:") seeded with synthetic points
+- LiteLLM: fake aembedding/acompletion with deterministic embeddings (same
+  scheme as generate_placeholder_embedding in
+  infrastructure/scripts/generate-embeddings.py) and canned streamed tokens
+  with configurable delays
+- Redis: fakeredis
+- PostgreSQL (permissions, KB names and settings, audit): in-process fakes
+
+In-memory Qdrant scores by brute force in the benchmark process, so absolute
+numbers are not server numbers: compare against a baseline recorded on the
+same machine with the same options.
+
+Usage (from backend/):
+    python -m benchmarks.search_benchmark
+    python -m benchmarks.search_benchmark --kb-counts 1,10 --modes quick,sync
+    python -m benchmarks.search_benchmark --save-baseline
+    python -m benchmarks.search_benchmark --timer-overhead --kb-counts 1
+
+--timer-overhead measures what StageTimer adds to quick search instead: the
+time spent recording stages per request, against the median latency with a
+no-op timer (budget: TIMER_OVERHEAD_BUDGET_PCT). The latency difference
+between the two timers is shown as a cross-check.
+
+Exits with status 1 if a scenario regressed beyond --tolerance, and with
+status 2 if there is no baseline to compare against (record one first with
+--save-baseline; baselines are machine-specific and not committed).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sys
+import time
+from collections.abc import AsyncGenerator, Awaitable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, TypeVar
+from unittest.mock import patch
+from uuid import UUID
+
+import fakeredis
+import numpy as np
+import structlog
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from app.core.config import settings
+from app.core.redis import BinaryRedisClient, RedisClient
+from app.core.timing import StageTimer, server_timings
+from app.integrations.qdrant_client import DISTANCE_METRIC, VECTOR_SIZE
+from app.services.search_service import KBMetadata, SearchService
+
+MODES = ("quick", "sync", "stream")
+DEFAULT_KB_COUNTS = (1, 10, 100)
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "search.json"
+USER_ID = "benchmark-user"
+
+# StageTimer may add at most this much to quick search latency (percent)
+TIMER_OVERHEAD_BUDGET_PCT = 1.0
+# Runs per query and timer in --timer-overhead (the fastest one counts)
+TIMER_OVERHEAD_REPEATS = 3
+
+T = TypeVar("T")
+
+# Canned LLM answer; citation markers exercise citation extraction
+ANSWER = (
+    "Authentication uses OAuth 2.0 with PKCE [1], and sessions expire after "
+    "one hour of inactivity [2]. Refresh tokens are rotated on every use [1]."
+)
+CHUNK_FILLER = (
+    "Access tokens are short-lived and refresh tokens rotate on every use. "
+    "Sessions are stored server-side and revoked on logout or password reset. "
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Workload and stand-in latency settings (stored with baselines)."""
+
+    dimension: int = VECTOR_SIZE
+    points_per_kb: int = 200
+    requests: int = 200
+    concurrency: int = 8
+    embed_delay_ms: float = 20.0
+    first_token_delay_ms: float = 150.0
+    token_delay_ms: float = 5.0
+    result_cache: bool = False
+
+
+@dataclass
+class ScenarioResult:
+    """Throughput and latency percentiles for one mode and KB count."""
+
+    mode: str
+    kb_count: int
+    requests: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.mode}/{self.kb_count}"
+
+    @classmethod
+    def from_latencies(
+        cls, mode: str, kb_count: int, latencies: list[float], elapsed: float
+    ) -> "ScenarioResult":
+        return cls(
+            mode=mode,
+            kb_count=kb_count,
+            requests=len(latencies),
+            rps=round(len(latencies) / elapsed, 1),
+            p50_ms=round(percentile(latencies, 50) * 1000, 1),
+            p95_ms=round(percentile(latencies, 95) * 1000, 1),
+            p99_ms=round(percentile(latencies, 99) * 1000, 1),
+        )
+
+
+@dataclass
+class TimerOverhead:
+    """Quick search latency with and without StageTimer bookkeeping."""
+
+    kb_count: int
+    requests: int
+    timed_p50_ms: float
+    untimed_p50_ms: float
+    # Median over queries of (timed - untimed) for the same query; end to
+    # end, but only resolves ~1-2% of latency
+    delta_p50_ms: float
+    # Median time per request spent recording stages (logs, histogram,
+    # Server-Timing), measured directly
+    bookkeeping_p50_ms: float
+
+    @property
+    def overhead_pct(self) -> float:
+        return self.bookkeeping_p50_ms / self.untimed_p50_ms * 100
+
+    @property
+    def delta_pct(self) -> float:
+        return self.delta_p50_ms / self.untimed_p50_ms * 100
+
+
+class CountingStageTimer(StageTimer):
+    """StageTimer that also adds the time spent recording stages to .spent."""
+
+    spent = 0.0
+
+    def _record(self, stage: str, seconds: float) -> None:
+        start = time.perf_counter()
+        super()._record(stage, seconds)
+        CountingStageTimer.spent += time.perf_counter() - start
+
+
+class NullStageTimer(StageTimer):
+    """StageTimer that awaits stages without recording them (the baseline)."""
+
+    async def run(self, stage: str, awaitable: Awaitable[T]) -> T:  # noqa: ARG002
+        return await awaitable
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:  # noqa: ARG002
+        yield
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        values: Samples (non-empty).
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        Smallest sample with at least pct% of samples at or below it.
+    """
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def placeholder_embedding(text: str, dimension: int) -> list[float]:
+    """Deterministic unit vector seeded from the text hash (not semantic).
+
+    Components are non-negative, like the seeded points, so every cosine
+    score is >= 0 as relevance_score requires.
+
+    Args:
+        text: Text to embed.
+        dimension: Embedding dimension.
+
+    Returns:
+        Normalized embedding; the same text always gives the same vector.
+    """
+    seed = int(hashlib.sha256(text.encode()).hexdigest()[:16], 16)
+    vector = np.abs(np.random.default_rng(seed).standard_normal(dimension))
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeLiteLLM:
+    """Stand-in for litellm.aembedding and litellm.acompletion."""
+
+    def __init__(self, config: BenchmarkConfig) -> None:
+        self.config = config
+
+    async def aembedding(self, **kwargs: Any) -> SimpleNamespace:
+        texts = kwargs["input"]
+        await asyncio.sleep(self.config.embed_delay_ms / 1000)
+        return SimpleNamespace(
+            data=[
+                {"embedding": placeholder_embedding(text, self.config.dimension)}
+                for text in texts
+            ],
+            usage=SimpleNamespace(total_tokens=sum(len(t.split()) for t in texts)),
+        )
+
+    async def acompletion(self, **kwargs: Any) -> Any:
+        tokens = [f"{word} " for word in ANSWER.split(" ")]
+        await asyncio.sleep(self.config.first_token_delay_ms / 1000)
+        if kwargs.get("stream"):
+            return self._stream(tokens)
+        await asyncio.sleep(self.config.token_delay_ms * len(tokens) / 1000)
+        message = SimpleNamespace(content=ANSWER)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self, tokens: list[str]) -> AsyncGenerator[Any, None]:
+        for token in tokens:
+            await asyncio.sleep(self.config.token_delay_ms / 1000)
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakePermissionService:
+    """Grants READ on every benchmark KB."""
+
+    def __init__(self, kb_ids: list[str]) -> None:
+        self.kb_ids = kb_ids
+
+    async def check_permissions(
+        self,
+        user_id: str,  # noqa: ARG002
+        kb_ids: list[str],  # noqa: ARG002
+        permission: str,  # noqa: ARG002
+    ) -> bool:
+        return True
+
+    async def get_permitted_kb_ids(
+        self,
+        user_id: str,  # noqa: ARG002
+        permission: str,  # noqa: ARG002
+    ) -> list[str]:
+        return list(self.kb_ids)
+
+
+class FakeAuditService:
+    """Discards audit events."""
+
+    async def log_search(self, **kwargs: Any) -> None:  # noqa: ARG002
+        return None
+
+    async def log_searches(self, **kwargs: Any) -> None:  # noqa: ARG002
+        return None
+
+
+def _payload(kb_index: int, index: int) -> dict[str, Any]:
+    text = f"Chunk {index} of benchmark KB {kb_index}. " + CHUNK_FILLER * 3
+    char_start = index * 1000
+    return {
+        "document_id": f"doc-{kb_index}-{index % 20}",
+        "document_name": f"Document {index % 20}.pdf",
+        "page_number": index // 10 + 1,
+        "section_header": f"Section {index % 7}",
+        "chunk_text": text,
+        "excerpt": text[:200],
+        "char_start": char_start,
+        "char_end": char_start + len(text),
+        "chunk_index": index,
+    }
+
+
+async def seed_qdrant(
+    client: AsyncQdrantClient, kb_ids: list[str], config: BenchmarkConfig
+) -> None:
+    """Create one collection per KB with random non-negative unit vectors."""
+    rng = np.random.default_rng(0)
+    for kb_index, kb_id in enumerate(kb_ids):
+        collection_name = f"kb_{kb_id}"
+        await client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=config.dimension, distance=DISTANCE_METRIC
+            ),
+        )
+        vectors = np.abs(rng.standard_normal((config.points_per_kb, config.dimension)))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        await client.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(
+                    id=index, vector=vector.tolist(), payload=_payload(kb_index, index)
+                )
+                for index, vector in enumerate(vectors)
+            ],
+        )
+
+
+def build_service(client: AsyncQdrantClient, kb_ids: list[str]) -> SearchService:
+    """SearchService wired to the stand-ins instead of PostgreSQL and Qdrant."""
+    service = SearchService(
+        permission_service=FakePermissionService(kb_ids),
+        audit_service=FakeAuditService(),
+    )
+    service.qdrant_client = client
+    kb_names = {kb_id: f"Benchmark KB {n}" for n, kb_id in enumerate(kb_ids)}
+
+    async def get_kb_metadata(ids: list[str]) -> KBMetadata:
+        return KBMetadata(names={kb_id: kb_names[kb_id] for kb_id in ids})
+
+    service._get_kb_metadata = get_kb_metadata
+    return service
+
+
+@contextmanager
+def offline_environment(config: BenchmarkConfig) -> Iterator[None]:
+    """Route LiteLLM and Redis to the stand-ins for the duration of a run."""
+    fake_llm = FakeLiteLLM(config)
+    server = fakeredis.FakeServer()
+    RedisClient._client = fakeredis.aioredis.FakeRedis(
+        server=server, decode_responses=True
+    )
+    BinaryRedisClient._client = fakeredis.aioredis.FakeRedis(server=server)
+    overrides = {
+        "search_result_cache_enabled": config.result_cache,
+        # Needs KB settings from PostgreSQL; measured separately if at all
+        "semantic_cache_enabled": False,
+        "single_flight_distributed": False,
+        # The fake provider has no quota; measure our own overhead only
+        "llm_rate_limit_enabled": False,
+    }
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        with (
+            patch("app.integrations.litellm_client.aembedding", fake_llm.aembedding),
+            patch("app.integrations.litellm_client.acompletion", fake_llm.acompletion),
+        ):
+            yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+        RedisClient._client = None
+        BinaryRedisClient._client = None
+
+
+async def _run_one(
+    service: SearchService, mode: str, query: str, kb_ids: list[str]
+) -> float:
+    start = time.perf_counter()
+    if mode == "quick":
+        await service.quick_search(query, kb_ids, USER_ID)
+    elif mode == "sync":
+        await service.search(query, kb_ids, USER_ID)
+    else:
+        events = await service.search(query, kb_ids, USER_ID, stream=True)
+        async for _ in events:
+            pass
+    return time.perf_counter() - start
+
+
+async def run_scenario(
+    service: SearchService, mode: str, kb_ids: list[str], config: BenchmarkConfig
+) -> ScenarioResult:
+    """Run config.requests distinct queries with config.concurrency workers."""
+    # Distinct queries so the embedding (and result) caches do not flatter
+    queries = iter(
+        f"{mode} benchmark query {n} over {len(kb_ids)} knowledge bases"
+        for n in range(config.requests)
+    )
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        for query in queries:
+            latencies.append(await _run_one(service, mode, query, kb_ids))
+
+    await _run_one(service, mode, f"{mode} warmup", kb_ids)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    elapsed = time.perf_counter() - start
+    return ScenarioResult.from_latencies(mode, len(kb_ids), latencies, elapsed)
+
+
+async def measure_timer_overhead(
+    service: SearchService, kb_ids: list[str], config: BenchmarkConfig
+) -> TimerOverhead:
+    """Compare quick search with the real StageTimer and with NullStageTimer.
+
+    Each query is run once to warm the embedding cache, then
+    TIMER_OVERHEAD_REPEATS times with each timer, alternating, one request at
+    a time. The fastest run per timer is kept. Two runs of the same timer
+    differ by ~2% at p50, more than the budget, so the overhead is the time
+    CountingStageTimer spends recording stages; the median per-query
+    difference is reported as an end-to-end cross-check. Each measured
+    request gets a Server-Timing dict, as inside the HTTP middleware.
+    """
+    timed: list[float] = []
+    untimed: list[float] = []
+    bookkeeping: list[float] = []
+
+    async def run(query: str, timer_cls: type[StageTimer]) -> float:
+        token = server_timings.set({})
+        try:
+            with patch("app.services.search_service.StageTimer", timer_cls):
+                return await _run_one(service, "quick", query, kb_ids)
+        finally:
+            server_timings.reset(token)
+
+    async def run_timed(query: str) -> float:
+        CountingStageTimer.spent = 0.0
+        latency = await run(query, CountingStageTimer)
+        bookkeeping.append(CountingStageTimer.spent)
+        return latency
+
+    for n in range(config.requests):
+        query = f"timer overhead query {n} over {len(kb_ids)} knowledge bases"
+        # Cache hits are the cheapest path, so the worst case in relative terms
+        await _run_one(service, "quick", query, kb_ids)
+        timed_runs, untimed_runs = [], []
+        for repeat in range(TIMER_OVERHEAD_REPEATS):
+            if (n + repeat) % 2:
+                untimed_runs.append(await run(query, NullStageTimer))
+                timed_runs.append(await run_timed(query))
+            else:
+                timed_runs.append(await run_timed(query))
+                untimed_runs.append(await run(query, NullStageTimer))
+        timed.append(min(timed_runs))
+        untimed.append(min(untimed_runs))
+
+    deltas = [t - u for t, u in zip(timed, untimed, strict=True)]
+    return TimerOverhead(
+        kb_count=len(kb_ids),
+        requests=config.requests,
+        timed_p50_ms=round(percentile(timed, 50) * 1000, 3),
+        untimed_p50_ms=round(percentile(untimed, 50) * 1000, 3),
+        delta_p50_ms=round(percentile(deltas, 50) * 1000, 4),
+        bookkeeping_p50_ms=round(percentile(bookkeeping, 50) * 1000, 4),
+    )
+
+
+async def run_timer_overhead(
+    config: BenchmarkConfig, kb_counts: list[int]
+) -> list[TimerOverhead]:
+    """Seed the in-memory Qdrant and measure StageTimer overhead per KB count."""
+    kb_ids = [str(UUID(int=n + 1)) for n in range(max(kb_counts))]
+    client = AsyncQdrantClient(location=":memory:")
+    try:
+        await seed_qdrant(client, kb_ids, config)
+        service = build_service(client, kb_ids)
+        with offline_environment(config):
+            return [
+                await measure_timer_overhead(service, kb_ids[:kb_count], config)
+                for kb_count in kb_counts
+            ]
+    finally:
+        await client.close()
+
+
+async def run_benchmark(
+    config: BenchmarkConfig, modes: list[str], kb_counts: list[int]
+) -> list[ScenarioResult]:
+    """Seed the in-memory Qdrant and run every (KB count, mode) scenario."""
+    kb_ids = [str(UUID(int=n + 1)) for n in range(max(kb_counts))]
+    client = AsyncQdrantClient(location=":memory:")
+    try:
+        await seed_qdrant(client, kb_ids, config)
+        service = build_service(client, kb_ids)
+        results = []
+        with offline_environment(config):
+            for kb_count in kb_counts:
+                for mode in modes:
+                    results.append(
+                        await run_scenario(service, mode, kb_ids[:kb_count], config)
+                    )
+        return results
+    finally:
+        await client.close()
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(
+    path: Path, config: BenchmarkConfig, results: list[ScenarioResult]
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "config": asdict(config),
+        "results": {result.key: asdict(result) for result in results},
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def compare(
+    results: list[ScenarioResult], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Scenarios whose throughput fell or p95 rose beyond the tolerance.
+
+    Args:
+        results: Current results.
+        baseline: Baseline loaded with load_baseline().
+        tolerance: Allowed relative change, e.g. 0.15 for 15%.
+
+    Returns:
+        One message per regression (empty if none).
+    """
+    regressions = []
+    for result in results:
+        base = baseline["results"].get(result.key)
+        if base is None:
+            continue
+        if result.rps < base["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: {result.rps} req/s vs baseline {base['rps']}"
+            )
+        if result.p95_ms > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: p95 {result.p95_ms} ms vs baseline {base['p95_ms']}"
+            )
+    return regressions
+
+
+def format_report(
+    results: list[ScenarioResult], baseline: dict[str, Any] | None
+) -> str:
+    """Render results as a table, with p95 change vs. baseline if present."""
+    base_results = baseline["results"] if baseline else {}
+    lines = [
+        f"{'scenario':<14}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'p95 vs base':>13}"
+    ]
+    for result in results:
+        base = base_results.get(result.key)
+        change = (
+            f"{(result.p95_ms / base['p95_ms'] - 1) * 100:+.1f}%"
+            if base and base["p95_ms"]
+            else "-"
+        )
+        lines.append(
+            f"{result.key:<14}{result.rps:>9.1f}{result.p50_ms:>10.1f}"
+            f"{result.p95_ms:>10.1f}{result.p99_ms:>10.1f}{change:>13}"
+        )
+    return "\n".join(lines)
+
+
+def format_timer_overhead(overheads: list[TimerOverhead]) -> str:
+    """Render StageTimer overhead per KB count."""
+    lines = [
+        f"{'scenario':<14}{'untimed p50':>14}{'bookkeeping':>14}{'overhead':>10}"
+        f"{'timed - untimed':>22}"
+    ]
+    for overhead in overheads:
+        lines.append(
+            f"{'quick/' + str(overhead.kb_count):<14}"
+            f"{overhead.untimed_p50_ms:>11.3f} ms"
+            f"{overhead.bookkeeping_p50_ms * 1000:>11.1f} us"
+            f"{overhead.overhead_pct:>9.2f}%"
+            f"{overhead.delta_p50_ms * 1000:>+11.1f} us ({overhead.delta_pct:+.2f}%)"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument(
+        "--kb-counts", default=",".join(str(n) for n in DEFAULT_KB_COUNTS)
+    )
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--points-per-kb", type=int, default=defaults.points_per_kb)
+    parser.add_argument("--dimension", type=int, default=defaults.dimension)
+    parser.add_argument("--embed-delay-ms", type=float, default=defaults.embed_delay_ms)
+    parser.add_argument(
+        "--first-token-delay-ms", type=float, default=defaults.first_token_delay_ms
+    )
+    parser.add_argument("--token-delay-ms", type=float, default=defaults.token_delay_ms)
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="Enable the Redis result cache (fakeredis)",
+    )
+    parser.add_argument(
+        "--timer-overhead",
+        action="store_true",
+        help="Measure StageTimer overhead on quick search instead",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's results to --baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed relative regression vs. baseline (default: 0.15)",
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.modes.split(",")) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    config = BenchmarkConfig(
+        dimension=args.dimension,
+        points_per_kb=args.points_per_kb,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        embed_delay_ms=args.embed_delay_ms,
+        first_token_delay_ms=args.first_token_delay_ms,
+        token_delay_ms=args.token_delay_ms,
+        result_cache=args.result_cache,
+    )
+    modes = args.modes.split(",")
+    kb_counts = [int(n) for n in args.kb_counts.split(",")]
+
+    # Per-request info logs would dominate the measurement
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    if args.timer_overhead:
+        overheads = asyncio.run(run_timer_overhead(config, kb_counts))
+        print(format_timer_overhead(overheads))
+        over_budget = [
+            overhead
+            for overhead in overheads
+            if overhead.overhead_pct > TIMER_OVERHEAD_BUDGET_PCT
+        ]
+        for overhead in over_budget:
+            print(
+                f"OVER BUDGET quick/{overhead.kb_count}: StageTimer adds "
+                f"{overhead.overhead_pct:.2f}% (budget "
+                f"{TIMER_OVERHEAD_BUDGET_PCT}%)"
+            )
+        return 1 if over_budget else 0
+
+    results = asyncio.run(run_benchmark(config, modes, kb_counts))
+
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+    regressions = []
+    if baseline is None:
+        if not args.save_baseline:
+            print(
+                f"\nNo baseline at {args.baseline}; record one on this machine "
+                "with --save-baseline",
+                file=sys.stderr,
+            )
+            return 2
+    else:
+        if baseline["config"] != asdict(config):
+            print("\nWarning: baseline was recorded with different options")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    if args.save_baseline:
+        save_baseline(args.baseline, config, results)
+        print(f"\nBaseline written to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
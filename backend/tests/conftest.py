@@ -65,3 +65,13 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
+
+
+@pytest.fixture(autouse=True)
+def _clear_query_embedding_cache():
+    """Reset the in-process query embedding LRU so tests stay independent."""
+    from app.services.embedding_cache import query_embedding_cache
+
+    query_embedding_cache.clear()
+    yield
+    query_embedding_cache.clear()
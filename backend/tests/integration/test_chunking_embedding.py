@@ -20,8 +20,8 @@ def mock_qdrant_service():
         mock.create_collection = AsyncMock()
         mock.upsert_points = AsyncMock(return_value=10)
         mock.delete_points_by_filter = AsyncMock(return_value=0)
-        mock.client = MagicMock()
-        mock.client.count = MagicMock(return_value=MagicMock(count=10))
+        mock.async_client = MagicMock()
+        mock.async_client.count = AsyncMock(return_value=MagicMock(count=10))
         yield mock
 
 
@@ -126,3 +126,26 @@ async def test_explain_endpoint_validation(
     )
 
     assert response.status_code == 422  # Validation error
+
+
+async def test_explain_batch_rejects_kb_without_read_access(
+    authenticated_client: AsyncClient,
+):
+    """Batch explain checks READ access to every result's KB first."""
+    response = await authenticated_client.post(
+        "/api/v1/search/explain/batch",
+        json={
+            "query": "test query",
+            "results": [
+                {
+                    "chunk_id": str(uuid4()),
+                    "chunk_text": "test text",
+                    "relevance_score": 0.5,
+                    "kb_id": str(uuid4()),  # Not shared with this user
+                }
+            ],
+        },
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Knowledge Base not found"
@@ -143,12 +143,12 @@ class TestDetectReadyDocsWithoutVectors:
         mock_count_result = MagicMock()
         mock_count_result.count = 0  # No vectors
 
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.count.return_value = mock_count_result
 
         mock_qdrant = AsyncMock()
         mock_qdrant.collection_exists.return_value = True
-        mock_qdrant.client = mock_client
+        mock_qdrant.async_client = mock_client
 
         from app.workers.outbox_tasks import _detect_ready_docs_without_vectors
 
@@ -177,12 +177,12 @@ class TestDetectReadyDocsWithoutVectors:
         mock_count_result = MagicMock()
         mock_count_result.count = 10  # Has vectors
 
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.count.return_value = mock_count_result
 
         mock_qdrant = AsyncMock()
         mock_qdrant.collection_exists.return_value = True
-        mock_qdrant.client = mock_client
+        mock_qdrant.async_client = mock_client
 
         from app.workers.outbox_tasks import _detect_ready_docs_without_vectors
 
@@ -287,12 +287,12 @@ class TestDetectOrphanedVectors:
         mock_point = MagicMock()
         mock_point.payload = {"document_id": orphan_doc_id}
 
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.scroll.return_value = ([mock_point], None)
 
         mock_qdrant = AsyncMock()
         mock_qdrant.collection_exists.return_value = True
-        mock_qdrant.client = mock_client
+        mock_qdrant.async_client = mock_client
 
         from app.workers.outbox_tasks import _detect_orphan_vectors
 
@@ -318,12 +318,12 @@ class TestDetectOrphanedVectors:
         mock_point = MagicMock()
         mock_point.payload = {"document_id": str(doc.id)}
 
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.scroll.return_value = ([mock_point], None)
 
         mock_qdrant = AsyncMock()
         mock_qdrant.collection_exists.return_value = True
-        mock_qdrant.client = mock_client
+        mock_qdrant.async_client = mock_client
 
         from app.workers.outbox_tasks import _detect_orphan_vectors
 
@@ -8,3 +8,64 @@ import pytest
 
 # Register unit marker for all tests in this directory
 pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _disable_search_caches(monkeypatch):
+    """Keep SearchService unit tests off Redis/Qdrant; cache tests opt back in."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "search_result_cache_enabled", False)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def _default_kb_metadata(monkeypatch):
+    """Keep SearchService unit tests off the DB for KB names and search params."""
+    from unittest.mock import AsyncMock
+
+    from app.services.search_service import KBMetadata, SearchService
+
+    monkeypatch.setattr(
+        SearchService, "_get_kb_metadata", AsyncMock(return_value=KBMetadata())
+    )
+
+
+@pytest.fixture(autouse=True)
+def _local_single_flight(monkeypatch):
+    """Keep single-flight coalescing in-process (no Redis locks)."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "single_flight_distributed", False)
+
+
+@pytest.fixture(autouse=True)
+def _disable_chunk_embedding_cache(monkeypatch):
+    """Keep embedding worker unit tests off Redis; cache tests opt back in."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "chunk_embedding_cache_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def _disable_llm_rate_limiter(monkeypatch):
+    """Keep LiteLLM callers off the shared Redis rate limiter."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def _disable_embedding_microbatcher(monkeypatch):
+    """Embed directly in worker unit tests; batcher tests opt back in."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "embedding_microbatch_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def _disable_query_embedding_batching(monkeypatch):
+    """Embed each query in its own call; batcher tests opt back in."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "query_embedding_batch_enabled", False)
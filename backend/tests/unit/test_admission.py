@@ -0,0 +1,105 @@
+"""Unit tests for synthesis admission control."""
+
+import asyncio
+
+import pytest
+
+from app.services.admission import AdmissionController, AdmissionRejectedError
+
+pytestmark = pytest.mark.unit
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.slot():
+        await release.wait()
+
+
+async def test_admits_up_to_limit_without_waiting():
+    controller = AdmissionController("test", max_concurrency=2, max_queue=0)
+    release = asyncio.Event()
+    holders = [asyncio.create_task(_hold(controller, release)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    assert controller.get_stats()["in_flight"] == 2
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert controller.get_stats()["in_flight"] == 0
+
+
+async def test_queued_caller_gets_released_slot():
+    controller = AdmissionController(
+        "test", max_concurrency=1, max_queue=1, queue_timeout_ms=1000
+    )
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_hold(controller, asyncio.Event()))
+    await asyncio.sleep(0)
+
+    assert controller.get_stats()["waiting"] == 1
+
+    release.set()
+    await holder
+    await asyncio.sleep(0.01)
+    stats = controller.get_stats()
+    assert stats["in_flight"] == 1
+    assert stats["queued"] == 1
+    waiter.cancel()
+
+
+async def test_sheds_when_queue_is_full():
+    controller = AdmissionController("test", max_concurrency=1, max_queue=0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.slot():
+            pass
+
+    assert exc_info.value.reason == "queue_full"
+    assert controller.get_stats()["shed_queue_full"] == 1
+    release.set()
+    await holder
+
+
+async def test_sheds_when_wait_times_out():
+    controller = AdmissionController(
+        "test", max_concurrency=1, max_queue=5, queue_timeout_ms=10
+    )
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.slot():
+            pass
+
+    assert exc_info.value.reason == "timeout"
+    stats = controller.get_stats()
+    assert stats["shed_timeout"] == 1
+    assert stats["waiting"] == 0
+    release.set()
+    await holder
+    assert controller.get_stats()["in_flight"] == 0
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    controller = AdmissionController(
+        "test", max_concurrency=1, max_queue=1, queue_timeout_ms=1000
+    )
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_hold(controller, asyncio.Event()))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    release.set()
+    await holder
+
+    assert controller.get_stats()["in_flight"] == 0
+    async with controller.slot():
+        assert controller.get_stats()["in_flight"] == 1
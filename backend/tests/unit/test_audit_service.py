@@ -112,6 +112,25 @@ class TestAuditService:
         mock_session.execute.assert_called_once()
         mock_session.commit.assert_called_once()
 
+    async def test_log_searches_uses_one_insert(
+        self, mock_session_factory, mock_session
+    ):
+        """Test that a batch of searches is logged with a single statement."""
+        service = AuditService()
+        searches = [
+            {"query": f"q{i}", "kb_ids": ["kb-1"], "result_count": i, "latency_ms": 5}
+            for i in range(3)
+        ]
+
+        with patch(
+            "app.services.audit_service.async_session_factory",
+            return_value=mock_session_factory,
+        ):
+            await service.log_searches(str(uuid.uuid4()), searches)
+
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_called_once()
+
     async def test_singleton_instance_exists(self):
         """Test that audit_service singleton is available."""
         assert audit_service is not None
@@ -147,6 +166,22 @@ class TestAuditRepository:
 
         mock_session.commit.assert_called_once()
 
+    async def test_create_events_single_statement(self):
+        """Test that create_events writes all rows with one execute."""
+        mock_session = AsyncMock()
+
+        repo = AuditRepository(mock_session)
+        events = [
+            {"action": "search", "resource_type": "search", "details": {"q": i}}
+            for i in range(3)
+        ]
+
+        await repo.create_events(events)
+        await repo.create_events([])
+
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_called_once()
+
 
 class TestAuditEventModel:
     """Test suite for AuditEvent model structure."""
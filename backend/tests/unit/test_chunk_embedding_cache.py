@@ -0,0 +1,106 @@
+"""Unit tests for the content-addressed chunk embedding cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import pytest
+
+from app.core.config import settings
+from app.services.chunk_embedding_cache import (
+    CHUNK_EMBEDDING_LRU_KEY,
+    ChunkEmbeddingCache,
+)
+
+pytestmark = pytest.mark.unit
+
+MODEL = "text-embedding-ada-002"
+
+
+@pytest.fixture(autouse=True)
+def _enable_cache(monkeypatch):
+    monkeypatch.setattr(settings, "chunk_embedding_cache_enabled", True)
+
+
+@pytest.fixture
+def fake_server():
+    """Shared in-memory Redis behind every short-lived client."""
+    server = fakeredis.FakeServer()
+    with patch(
+        "app.services.chunk_embedding_cache.redis.from_url",
+        side_effect=lambda *_args, **_kwargs: fakeredis.aioredis.FakeRedis(
+            server=server
+        ),
+    ):
+        yield server
+
+
+def test_key_depends_on_model_and_exact_text():
+    cache = ChunkEmbeddingCache()
+
+    key = cache.key_for("Some text", MODEL)
+
+    assert key == cache.key_for("Some text", MODEL)
+    assert key != cache.key_for("Some text ", MODEL)
+    assert key != cache.key_for("Some text", "other-model")
+
+
+async def test_round_trip_returns_hits_in_input_order(fake_server):  # noqa: ARG001
+    cache = ChunkEmbeddingCache()
+    await cache.set_many(["a", "b"], MODEL, [[0.5, 1.0], [0.25, -2.0]])
+
+    result = await cache.get_many(["b", "missing", "a"], MODEL)
+
+    assert result == [[0.25, -2.0], None, [0.5, 1.0]]
+
+
+async def test_other_model_misses(fake_server):  # noqa: ARG001
+    cache = ChunkEmbeddingCache()
+    await cache.set_many(["a"], MODEL, [[0.5, 1.0]])
+
+    assert await cache.get_many(["a"], "other-model") == [None]
+
+
+async def test_least_recently_used_entries_are_evicted_over_budget(fake_server):
+    # 2-dim float32 vectors are 8 bytes each; the budget holds two of them
+    cache = ChunkEmbeddingCache(max_bytes=16)
+    await cache.set_many(["a"], MODEL, [[1.0, 1.0]])
+    await cache.set_many(["b"], MODEL, [[2.0, 2.0]])
+    await cache.get_many(["a"], MODEL)  # "a" is now more recent than "b"
+    await cache.set_many(["c"], MODEL, [[3.0, 3.0]])
+
+    result = await cache.get_many(["a", "b", "c"], MODEL)
+
+    assert result == [[1.0, 1.0], None, [3.0, 3.0]]
+    client = fakeredis.aioredis.FakeRedis(server=fake_server)
+    assert await client.zcard(CHUNK_EMBEDDING_LRU_KEY) == 2
+    assert not await client.exists(cache.key_for("b", MODEL))
+
+
+async def test_entries_get_ttl(fake_server):
+    cache = ChunkEmbeddingCache(ttl_seconds=600)
+    await cache.set_many(["a"], MODEL, [[1.0]])
+
+    client = fakeredis.aioredis.FakeRedis(server=fake_server)
+    assert 0 < await client.ttl(cache.key_for("a", MODEL)) <= 600
+
+
+async def test_redis_errors_are_misses():
+    client = AsyncMock()
+    client.mget.side_effect = ConnectionError("redis down")
+    with patch(
+        "app.services.chunk_embedding_cache.redis.from_url", return_value=client
+    ):
+        result = await ChunkEmbeddingCache().get_many(["a", "b"], MODEL)
+
+    assert result == [None, None]
+    client.aclose.assert_awaited_once()
+
+
+async def test_disabled_cache_does_not_connect(monkeypatch):
+    monkeypatch.setattr(settings, "chunk_embedding_cache_enabled", False)
+    with patch("app.services.chunk_embedding_cache.redis.from_url") as from_url:
+        cache = ChunkEmbeddingCache()
+        assert await cache.get_many(["a"], MODEL) == [None]
+        await cache.set_many(["a"], MODEL, [[1.0]])
+
+    from_url.assert_not_called()
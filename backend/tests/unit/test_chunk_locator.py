@@ -0,0 +1,65 @@
+"""Unit tests for the chunk -> KB map used by similar search."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.chunk_locator import (
+    CHUNK_KB_KEY,
+    FORGET_BATCH_SIZE,
+    forget_chunk_locations,
+    lookup_chunk_kb,
+    record_chunk_locations,
+)
+
+pytestmark = pytest.mark.unit
+
+
+async def test_record_chunk_locations_writes_one_hash_update():
+    client = AsyncMock()
+    with patch("app.services.chunk_locator.redis.from_url", return_value=client):
+        await record_chunk_locations("kb-a", ["p1", "p2"])
+
+    client.hset.assert_awaited_once_with(
+        CHUNK_KB_KEY, mapping={"p1": "kb-a", "p2": "kb-a"}
+    )
+    client.aclose.assert_awaited_once()
+
+
+async def test_record_chunk_locations_swallows_redis_errors():
+    client = AsyncMock()
+    client.hset.side_effect = ConnectionError("redis down")
+    with patch("app.services.chunk_locator.redis.from_url", return_value=client):
+        await record_chunk_locations("kb-a", ["p1"])
+
+    client.aclose.assert_awaited_once()
+
+
+async def test_lookup_chunk_kb_is_none_when_redis_unavailable():
+    with patch(
+        "app.services.chunk_locator.RedisClient.get_client",
+        AsyncMock(side_effect=ConnectionError("redis down")),
+    ):
+        assert await lookup_chunk_kb("p1") is None
+
+
+async def test_forget_chunk_locations_deletes_in_batches():
+    client = AsyncMock()
+    point_ids = [f"p{i}" for i in range(FORGET_BATCH_SIZE + 1)]
+    with patch("app.services.chunk_locator.redis.from_url", return_value=client):
+        await forget_chunk_locations(point_ids)
+
+    assert [call.args for call in client.hdel.await_args_list] == [
+        (CHUNK_KB_KEY, *point_ids[:FORGET_BATCH_SIZE]),
+        (CHUNK_KB_KEY, point_ids[-1]),
+    ]
+    client.aclose.assert_awaited_once()
+
+
+async def test_forget_chunk_locations_swallows_redis_errors():
+    client = AsyncMock()
+    client.hdel.side_effect = ConnectionError("redis down")
+    with patch("app.services.chunk_locator.redis.from_url", return_value=client):
+        await forget_chunk_locations(["p1"])
+
+    client.aclose.assert_awaited_once()
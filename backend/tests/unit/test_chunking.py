@@ -227,6 +227,7 @@ class TestChunkDocument:
 
     def test_chunk_to_payload_format(self):
         """Test that chunk.to_payload() returns correct format."""
+        from app.services.stemming import stem_tokens
         from app.workers.chunking import chunk_document
         from app.workers.parsing import ParsedContent, ParsedElement
 
@@ -252,6 +253,8 @@ class TestChunkDocument:
         assert payload["document_id"] == "doc-123"
         assert payload["document_name"] == "report.pdf"
         assert payload["chunk_text"] == text
+        assert payload["excerpt"] == text
+        assert payload["stems"] == sorted(stem_tokens(text))
         assert payload["chunk_index"] == 0
         assert "char_start" in payload
         assert "char_end" in payload
@@ -282,9 +285,10 @@ class TestOversizedChunkHandling:
 
     def test_split_oversized_chunk_basic(self):
         """Test splitting an oversized chunk."""
-        from app.workers.chunking import _get_token_encoder, _split_oversized_chunk
+        from app.core.tokenizer import get_token_encoder
+        from app.workers.chunking import _split_oversized_chunk
 
-        encoder = _get_token_encoder()
+        encoder = get_token_encoder()
 
         # Create a long text
         long_text = "This is a sentence. " * 100
@@ -301,9 +305,10 @@ class TestOversizedChunkHandling:
 
     def test_split_oversized_chunk_preserves_all_content(self):
         """Test that splitting preserves all content."""
-        from app.workers.chunking import _get_token_encoder, _split_oversized_chunk
+        from app.core.tokenizer import get_token_encoder
+        from app.workers.chunking import _split_oversized_chunk
 
-        encoder = _get_token_encoder()
+        encoder = get_token_encoder()
         text = "Word one. Word two. Word three. " * 20
 
         sub_chunks = _split_oversized_chunk(text, max_tokens=30, encoder=encoder)
@@ -317,9 +322,10 @@ class TestOversizedChunkHandling:
 
     def test_small_text_not_split(self):
         """Test that small text is not split."""
-        from app.workers.chunking import _get_token_encoder, _split_oversized_chunk
+        from app.core.tokenizer import get_token_encoder
+        from app.workers.chunking import _split_oversized_chunk
 
-        encoder = _get_token_encoder()
+        encoder = get_token_encoder()
         text = "Short text."
 
         sub_chunks = _split_oversized_chunk(text, max_tokens=500, encoder=encoder)
@@ -1,10 +1,12 @@
 """Unit tests for CitationService."""
 
+import time
+
 import pytest
 
 from app.schemas.citation import Citation, CitationMappingError
 from app.schemas.search import SearchResultSchema
-from app.services.citation_service import CitationService
+from app.services.citation_service import CitationMarkerParser, CitationService
 
 pytestmark = pytest.mark.unit
 
@@ -135,6 +137,78 @@ class TestFindMarkers:
         assert markers == []
 
 
+class TestCitationMarkerParser:
+    """Test incremental CitationMarkerParser used for SSE streaming."""
+
+    def test_markers_in_single_fragment(self):
+        """Complete markers in one fragment are returned in order."""
+        parser = CitationMarkerParser()
+
+        assert parser.feed("OAuth [2] with MFA [1] and [2].") == [2, 1, 2]
+
+    def test_marker_split_across_fragments(self):
+        """Partial "[12" fragments are carried to the next token."""
+        parser = CitationMarkerParser()
+
+        assert parser.feed("See [") == []
+        assert parser.feed("1") == []
+        assert parser.feed("2") == []
+        assert parser.feed("] for details") == [12]
+
+    def test_broken_partial_marker_is_discarded(self):
+        """A partial marker followed by a non-digit never completes."""
+        parser = CitationMarkerParser()
+
+        assert parser.feed("array[1") == []
+        assert parser.feed("x] then [3]") == [3]
+
+    def test_nested_bracket_restarts_marker(self):
+        """ "[[1]" yields [1], matching the non-streaming regex behaviour."""
+        parser = CitationMarkerParser()
+
+        assert parser.feed("[") == []
+        assert parser.feed("[1]") == [1]
+
+    def test_matches_non_streaming_extraction(self, citation_service):
+        """Token-by-token parsing finds the same markers as whole-text parsing."""
+        answer = "OAuth 2.0 [1] uses PKCE [2][3]; MFA via TOTP [10] and [2]."
+        parser = CitationMarkerParser()
+
+        streamed = []
+        for i in range(0, len(answer), 3):
+            streamed.extend(parser.feed(answer[i : i + 3]))
+
+        assert sorted(set(streamed)) == citation_service._find_markers(answer)
+
+    def test_per_token_cost_flat_up_to_4k_tokens(self):
+        """Micro-benchmark: per-token cost does not grow with answer length.
+
+        The old streaming loop re-scanned the whole answer on every token
+        (quadratic). Compare the cost of the first and last 500 tokens of a
+        4k-token answer; with O(1) amortized cost per token they are equal.
+        """
+        tokens = ["Claim ", "about ", "OAuth ", "[", "1", "] ", "and ", "MFA [2]. "]
+        stream = [tokens[i % len(tokens)] for i in range(4000)]
+
+        def time_window(start: int, end: int) -> float:
+            best = float("inf")
+            for _ in range(5):
+                parser = CitationMarkerParser()
+                for token in stream[:start]:
+                    parser.feed(token)
+                t0 = time.perf_counter()
+                for token in stream[start:end]:
+                    parser.feed(token)
+                best = min(best, time.perf_counter() - t0)
+            return best / (end - start)
+
+        first = time_window(0, 500)
+        last = time_window(3500, 4000)
+
+        # Quadratic scanning would make the last window ~8x slower
+        assert last < first * 3
+
+
 class TestMapMarkerToChunk:
     """Test CitationService._map_marker_to_chunk()."""
 
@@ -0,0 +1,89 @@
+"""Unit tests for token-budgeted context packing."""
+
+import pytest
+
+from app.core.tokenizer import get_token_encoder
+from app.schemas.search import SearchResultSchema
+from app.services.citation_service import CitationService
+from app.services.context_packer import format_context, pack_sources
+
+pytestmark = pytest.mark.unit
+
+DOCUMENT = (
+    "OAuth 2.0 with PKCE is required for all clients. "
+    "Refresh tokens rotate on every use. "
+    "MFA is enforced for administrators."
+)
+
+
+def _chunk(
+    start: int, end: int, score: float, document_id: str = "doc-1"
+) -> SearchResultSchema:
+    return SearchResultSchema(
+        document_id=document_id,
+        document_name=f"{document_id}.pdf",
+        kb_id="kb-1",
+        kb_name="Security",
+        chunk_text=DOCUMENT[start:end],
+        relevance_score=score,
+        char_start=start,
+        char_end=end,
+    )
+
+
+def test_overlapping_chunks_of_same_document_are_merged():
+    chunks = [_chunk(0, 60, 0.9), _chunk(40, 90, 0.8)]
+
+    sources = pack_sources(chunks)
+
+    assert len(sources) == 1
+    assert sources[0].chunk_text == DOCUMENT[0:90]
+    assert sources[0].relevance_score == 0.9
+    assert (sources[0].char_start, sources[0].char_end) == (0, 90)
+
+
+def test_separate_documents_keep_relevance_order():
+    chunks = [
+        _chunk(49, 84, 0.9, "doc-b"),
+        _chunk(0, 48, 0.8, "doc-a"),
+        _chunk(0, 48, 0.7, "doc-b"),
+    ]
+
+    sources = pack_sources(chunks)
+
+    # doc-b's chunks touch (gap of one space), so they merge and keep rank 1
+    assert [s.document_id for s in sources] == ["doc-b", "doc-a"]
+    assert sources[0].char_start == 0
+
+
+def test_budget_trims_lowest_ranked_tail():
+    long_text = " ".join([DOCUMENT] * 5)
+    chunks = [
+        _chunk(0, len(DOCUMENT), 0.9, "doc-a"),
+        _chunk(0, len(DOCUMENT), 0.8, "doc-b").model_copy(
+            update={"chunk_text": long_text, "char_end": len(long_text)}
+        ),
+    ]
+    encoder = get_token_encoder()
+    budget = len(encoder.encode(format_context(chunks[:1]))) + 60
+
+    sources = pack_sources(chunks, max_tokens=budget)
+
+    assert len(sources) == 2
+    assert sources[0].chunk_text == DOCUMENT
+    assert long_text.startswith(sources[1].chunk_text)
+    assert len(sources[1].chunk_text) < len(long_text)
+    assert len(encoder.encode(format_context(sources))) <= budget
+
+
+def test_citation_numbers_follow_packed_sources():
+    chunks = [_chunk(0, 60, 0.9), _chunk(40, 90, 0.8), _chunk(0, 40, 0.7, "doc-2")]
+
+    sources = pack_sources(chunks)
+    _, citations = CitationService().extract_citations("PKCE [1]. Docs [2].", sources)
+
+    assert [c.document_id for c in citations] == ["doc-1", "doc-2"]
+
+
+def test_empty_input():
+    assert pack_sources([]) == []
@@ -118,6 +118,168 @@ class TestGenerateEmbeddings:
 
         assert "Rate limit exceeded" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_cached_chunks_are_not_re_embedded(
+        self, mock_embedding_client, sample_chunks
+    ):
+        """Only cache misses are sent to the API, and then stored."""
+        from app.workers.embedding import generate_embeddings
+
+        cached = [0.5] * 1536
+        fresh = [0.2] * 1536
+        mock_embedding_client.model = "text-embedding-ada-002"
+        mock_embedding_client.get_embeddings.return_value = [fresh]
+
+        with patch("app.workers.embedding.chunk_embedding_cache") as cache:
+            cache.get_many = AsyncMock(return_value=[cached, None])
+            cache.set_many = AsyncMock()
+            result = await generate_embeddings(sample_chunks)
+
+        mock_embedding_client.get_embeddings.assert_awaited_once_with(
+            [sample_chunks[1].text]
+        )
+        cache.set_many.assert_awaited_once_with(
+            [sample_chunks[1].text], "text-embedding-ada-002", [fresh]
+        )
+        assert [r.embedding for r in result] == [cached, fresh]
+
+    @pytest.mark.asyncio
+    async def test_small_documents_use_the_microbatcher(
+        self, mock_embedding_client, sample_chunks
+    ):
+        """Pooled vectors are used as-is; no direct API call is made."""
+        from app.workers.embedding import generate_embeddings
+
+        pooled = [[0.1] * 1536, [0.2] * 1536]
+        with patch("app.workers.embedding.embedding_microbatcher") as batcher:
+            batcher.submit = AsyncMock(return_value=pooled)
+            result = await generate_embeddings(sample_chunks)
+
+        mock_embedding_client.get_embeddings.assert_not_called()
+        assert [r.embedding for r in result] == pooled
+
+    @pytest.mark.asyncio
+    async def test_repeated_chunk_text_is_embedded_once(self, mock_embedding_client):
+        """Identical chunk texts in one document share a single API input."""
+        from app.workers.chunking import DocumentChunk
+        from app.workers.embedding import generate_embeddings
+
+        chunks = [
+            DocumentChunk(
+                text=text, chunk_index=i, document_id="doc-1", document_name="a.md"
+            )
+            for i, text in enumerate(["Footer", "Body", "Footer"])
+        ]
+        mock_embedding_client.get_embeddings.return_value = [
+            [0.1] * 1536,
+            [0.2] * 1536,
+        ]
+
+        result = await generate_embeddings(chunks)
+
+        mock_embedding_client.get_embeddings.assert_awaited_once_with(
+            ["Footer", "Body"]
+        )
+        assert result[2].embedding == result[0].embedding == [0.1] * 1536
+        assert result[1].embedding == [0.2] * 1536
+
+
+class TestTokenLimitRecovery:
+    """Bisection recovery when a batch is rejected for its token count."""
+
+    @pytest.fixture
+    def provider(self):
+        """Fake provider rejecting any request that contains a long text."""
+        from collections import Counter
+        from types import SimpleNamespace
+
+        provider = SimpleNamespace(calls=0, texts=0, sent=Counter())
+
+        async def fake_aembedding(**kwargs):
+            provider.calls += 1
+            provider.texts += len(kwargs["input"])
+            provider.sent.update(kwargs["input"])
+            if any(len(text) > 3000 for text in kwargs["input"]):
+                raise Exception("This model's maximum context length is 8191 tokens")
+            return MockEmbeddingResponse(
+                [[float(len(text)), 1.0] for text in kwargs["input"]]
+            )
+
+        with patch("app.integrations.litellm_client.aembedding", fake_aembedding):
+            yield provider
+
+    @pytest.mark.asyncio
+    async def test_oversized_chunk_is_isolated_without_per_chunk_calls(self, provider):
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+        from app.workers.chunking import DocumentChunk
+        from app.workers.embedding import generate_embeddings
+
+        texts = [f"Chunk {i}" for i in range(100)]
+        texts[55] = "word " * 1500  # ~7500 chars, split into 500-token parts
+        chunks = [
+            DocumentChunk(
+                text=text, chunk_index=i, document_id="doc-1", document_name="a.md"
+            )
+            for i, text in enumerate(texts)
+        ]
+        client = LiteLLMEmbeddingClient(
+            batch_size=10, max_concurrent_batches=1, max_retries=1
+        )
+
+        with patch("app.workers.embedding.embedding_client", client):
+            result = await generate_embeddings(chunks)
+
+        # 10 batches, then only batch 50-59 is recovered: halves [50:55] ok
+        # and [55:60] rejected; [55:57] rejected, [55] rejected and split
+        # into 4 sub-chunks (1 call), [56] ok, [57:60] ok
+        assert provider.calls == 17
+        assert provider.texts == 100 + 5 + 5 + 2 + 1 + 4 + 1 + 3
+        assert [r.chunk.chunk_index for r in result] == list(range(100))
+        assert result[54].embedding == [float(len(texts[54])), 1.0]
+        assert result[56].embedding == [float(len(texts[56])), 1.0]
+        # Average of the sub-chunk embeddings
+        assert 0 < result[55].embedding[0] <= 3000
+        assert result[55].embedding[1] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_each_offender_in_a_batch_is_recovered(self, provider):
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+        from app.workers.embedding import _generate_with_retry
+
+        texts = ["a", "word " * 1500, "b", "word " * 1200, "c"]
+        client = LiteLLMEmbeddingClient(batch_size=10, max_retries=1)
+
+        with patch("app.workers.embedding.embedding_client", client):
+            result = await _generate_with_retry(texts)
+
+        assert len(result) == 5
+        assert result[0] == [1.0, 1.0]
+        assert result[2] == [1.0, 1.0]
+        assert result[4] == [1.0, 1.0]
+        assert provider.calls > 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_batches_do_not_resend_successful_ones(self, provider):
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+        from app.workers.embedding import _generate_with_retry
+
+        texts = [f"Chunk {i}" for i in range(40)]
+        texts[5] = "word " * 1500
+        texts[35] = "text " * 1500
+        client = LiteLLMEmbeddingClient(
+            batch_size=10, max_concurrent_batches=4, max_retries=1
+        )
+
+        with patch("app.workers.embedding.embedding_client", client):
+            result = await _generate_with_retry(texts)
+
+        assert result[10:30] == [[float(len(t)), 1.0] for t in texts[10:30]]
+        # Batches 10-19 and 20-29 succeed first time and are never resent
+        assert all(provider.sent[t] == 1 for t in texts[10:30])
+        # 40 + batch 0-9 bisected (5 + 5 + 2 + 1 + 4 + 1 + 3) + batch 30-39
+        # retried whole once, then bisected the same way
+        assert provider.texts == 40 + 21 + 10 + 21
+
 
 class TestChunkEmbedding:
     """Tests for ChunkEmbedding dataclass."""
@@ -258,6 +420,87 @@ class TestLiteLLMEmbeddingClient:
         assert result == []
 
 
+class TestTokenAwareBatching:
+    """Tests for token-budgeted, concurrent batching."""
+
+    def test_batches_packed_by_token_budget(self):
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+        client = LiteLLMEmbeddingClient(batch_size=100, max_batch_tokens=20)
+        # 8 tokens each ("the" + 7 x " the"), then a 1-token text
+        texts = [" ".join([word] * 8) for word in ("the", "and", "for")] + ["to"]
+
+        batches = client._pack_batches(texts)
+
+        assert [start for start, _, _ in batches] == [0, 2]
+        assert [len(batch) for _, batch, _ in batches] == [2, 2]
+        assert [tokens for _, _, tokens in batches] == [16, 9]
+
+    def test_oversized_text_gets_own_batch(self):
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+        client = LiteLLMEmbeddingClient(batch_size=100, max_batch_tokens=10)
+        texts = ["a", "word " * 50, "b"]
+
+        assert [batch for _, batch, _ in client._pack_batches(texts)] == [
+            ["a"],
+            ["word " * 50],
+            ["b"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_batches_preserve_order(self):
+        import asyncio
+
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_aembedding(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            index = int(kwargs["input"][0].split()[1])
+            # Later batches finish first
+            await asyncio.sleep(0.01 * (10 - index) / 10)
+            in_flight -= 1
+            return MockEmbeddingResponse(
+                [[float(t.split()[1])] for t in kwargs["input"]]
+            )
+
+        with patch("app.integrations.litellm_client.aembedding", fake_aembedding):
+            client = LiteLLMEmbeddingClient(
+                batch_size=2, max_retries=1, max_concurrent_batches=3
+            )
+            result = await client.get_embeddings([f"Text {i}" for i in range(10)])
+
+        assert result == [[float(i)] for i in range(10)]
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_token_limit_error_reports_failed_batch_start(self):
+        from app.integrations.litellm_client import (
+            LiteLLMEmbeddingClient,
+            TokenLimitExceededError,
+        )
+
+        async def fake_aembedding(**kwargs):
+            if any("huge" in text for text in kwargs["input"]):
+                raise Exception("This model's maximum context length is 8191 tokens")
+            return MockEmbeddingResponse([[0.1]] * len(kwargs["input"]))
+
+        with patch("app.integrations.litellm_client.aembedding", fake_aembedding):
+            client = LiteLLMEmbeddingClient(batch_size=2, max_retries=1)
+            texts = ["Text 0", "Text 1", "Text 2", "huge 3", "Text 4"]
+
+            with pytest.raises(TokenLimitExceededError) as exc_info:
+                await client.get_embeddings(texts)
+
+        assert exc_info.value.chunk_index == 2
+        assert exc_info.value.batch_size == 2
+
+
 class TestRetryLogic:
     """Tests for retry and backoff logic."""
 
@@ -288,6 +531,87 @@ class TestRetryLogic:
 
             assert len(result) == 1
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_without_header_keeps_long_backoff(self):
+        """With the limiter off, header-less 429s wait the full schedule."""
+        from litellm.exceptions import RateLimitError
+
+        from app.integrations.litellm_client import (
+            RETRY_DELAYS,
+            LiteLLMEmbeddingClient,
+            RateLimitExceededError,
+        )
+        from app.integrations.llm_rate_limiter import embedding_rate_limiter
+
+        assert not embedding_rate_limiter.enabled
+
+        with (
+            patch("app.integrations.litellm_client.aembedding") as mock_aembedding,
+            patch("asyncio.sleep") as mock_sleep,
+        ):
+            mock_aembedding.side_effect = RateLimitError("Rate limited", "", "")
+
+            client = LiteLLMEmbeddingClient(max_retries=len(RETRY_DELAYS) + 1)
+            with pytest.raises(RateLimitExceededError):
+                await client.get_embeddings(["test"])
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == RETRY_DELAYS
+        assert sum(RETRY_DELAYS) >= 600
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_uses_short_backoff_with_quota(self):
+        """With a quota enforced by the limiter, backoff starts at 1s."""
+        from litellm.exceptions import RateLimitError
+
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+        with (
+            patch("app.integrations.litellm_client.aembedding") as mock_aembedding,
+            patch("asyncio.sleep") as mock_sleep,
+            patch("app.integrations.litellm_client.embedding_rate_limiter") as limiter,
+        ):
+            limiter.enabled = True
+            limiter.acquire = AsyncMock(return_value=0.0)
+            limiter.penalize = AsyncMock()
+            mock_aembedding.side_effect = [
+                RateLimitError("Rate limited", "", ""),
+                MockEmbeddingResponse([[0.1] * 1536]),
+            ]
+
+            client = LiteLLMEmbeddingClient(max_retries=2)
+            await client.get_embeddings(["test"])
+
+        mock_sleep.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_honors_retry_after(self):
+        """Retry-After from the provider replaces the backoff delay."""
+        from litellm.exceptions import RateLimitError
+
+        from app.integrations.litellm_client import LiteLLMEmbeddingClient
+
+        error = RateLimitError("Rate limited", "", "")
+        error.response = MagicMock(headers={"Retry-After": "7"})
+
+        with (
+            patch("app.integrations.litellm_client.aembedding") as mock_aembedding,
+            patch("asyncio.sleep") as mock_sleep,
+            patch("app.integrations.litellm_client.embedding_rate_limiter") as limiter,
+        ):
+            limiter.acquire = AsyncMock(return_value=0.0)
+            limiter.penalize = AsyncMock()
+            mock_aembedding.side_effect = [
+                error,
+                MockEmbeddingResponse([[0.1] * 1536]),
+            ]
+
+            client = LiteLLMEmbeddingClient(max_retries=2)
+            await client.get_embeddings(["test"])
+
+        limiter.penalize.assert_awaited_once_with(7.0, model=client.model)
+        mock_sleep.assert_called_once_with(7.0)
+        assert limiter.acquire.await_count == 2
+
     @pytest.mark.asyncio
     async def test_max_retries_exceeded_raises(self):
         """Test that exceeding max retries raises RateLimitExceededError."""
@@ -0,0 +1,163 @@
+"""Unit tests for cross-document embedding micro-batching."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import pytest
+
+from app.core.config import settings
+from app.integrations.litellm_client import TokenLimitExceededError
+from app.workers.embedding_batcher import (
+    MICROBATCH_QUEUE_KEY,
+    MICROBATCH_TOKENS_KEY,
+    EmbeddingMicroBatcher,
+)
+
+pytestmark = pytest.mark.unit
+
+MODEL = "text-embedding-ada-002"
+
+
+@pytest.fixture(autouse=True)
+def _enable_batching(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_microbatch_enabled", True)
+    monkeypatch.setattr(settings, "embedding_microbatch_window_ms", 50)
+
+
+@pytest.fixture
+def fake_server():
+    """Shared in-memory Redis behind every task's short-lived client."""
+    server = fakeredis.FakeServer()
+    with patch(
+        "app.workers.embedding_batcher.redis.from_url",
+        side_effect=lambda *_args, **_kwargs: fakeredis.aioredis.FakeRedis(
+            server=server
+        ),
+    ):
+        yield server
+
+
+@pytest.fixture
+def provider():
+    """Embedding call returning [len(text), 0.5] per text."""
+
+    async def fake_get_embeddings(texts, model=None):  # noqa: ARG001
+        return [[float(len(text)), 0.5] for text in texts]
+
+    mock = AsyncMock(side_effect=fake_get_embeddings)
+    with patch("app.workers.embedding_batcher.get_embeddings", mock):
+        yield mock
+
+
+async def test_concurrent_submissions_share_one_request(fake_server, provider):
+    documents = [[f"doc {n} chunk {i}" * (n + 1) for i in range(3)] for n in range(5)]
+    batcher = EmbeddingMicroBatcher()
+
+    results = await asyncio.gather(
+        *(batcher.submit(texts, MODEL) for texts in documents)
+    )
+
+    assert provider.await_count == 1
+    for texts, vectors in zip(documents, results, strict=True):
+        assert vectors == [[float(len(text)), 0.5] for text in texts]
+    client = fakeredis.aioredis.FakeRedis(server=fake_server)
+    assert await client.llen(MICROBATCH_QUEUE_KEY) == 0
+
+
+async def test_failed_flush_makes_every_submitter_fall_back(fake_server, provider):
+    provider.side_effect = RuntimeError("provider down")
+    batcher = EmbeddingMicroBatcher()
+
+    results = await asyncio.gather(
+        batcher.submit(["a"], MODEL), batcher.submit(["b"], MODEL)
+    )
+
+    assert results == [None, None]
+
+
+async def test_token_limit_only_fails_the_offending_submission(
+    fake_server,  # noqa: ARG001
+    provider,
+):
+    async def reject_oversized(texts, model=None):  # noqa: ARG001
+        if "huge" in texts:
+            raise TokenLimitExceededError("too long", texts.index("huge"))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    provider.side_effect = reject_oversized
+    batcher = EmbeddingMicroBatcher()
+
+    results = await asyncio.gather(
+        batcher.submit(["a"], MODEL),
+        batcher.submit(["huge"], MODEL),
+        batcher.submit(["ccc"], MODEL),
+    )
+
+    assert results == [[[1.0, 0.5]], None, [[3.0, 0.5]]]
+
+
+async def test_collect_takes_submissions_within_budget(fake_server, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_microbatch_window_ms", 0)
+    monkeypatch.setattr(settings, "embedding_batch_max_tokens", 10)
+    client = fakeredis.aioredis.FakeRedis(server=fake_server)
+    for n, tokens in enumerate([4, 5, 3]):
+        request = json.dumps(
+            {"id": str(n), "model": MODEL, "texts": ["x"], "tokens": tokens}
+        )
+        await client.rpush(MICROBATCH_QUEUE_KEY, request)
+    await client.set(MICROBATCH_TOKENS_KEY, 12)
+
+    taken = await EmbeddingMicroBatcher()._collect(client)
+
+    assert [request["id"] for request in taken] == ["0", "1"]
+    assert await client.llen(MICROBATCH_QUEUE_KEY) == 1
+    assert int(await client.get(MICROBATCH_TOKENS_KEY)) == 3
+
+
+async def test_large_submission_is_not_pooled(monkeypatch, provider):
+    monkeypatch.setattr(settings, "embedding_microbatch_max_tokens", 10)
+    with patch("app.workers.embedding_batcher.redis.from_url") as from_url:
+        result = await EmbeddingMicroBatcher().submit(["word " * 50], MODEL)
+
+    assert result is None
+    from_url.assert_not_called()
+    provider.assert_not_awaited()
+
+
+async def test_redis_failure_falls_back():
+    client = AsyncMock()
+    client.pipeline.side_effect = ConnectionError("redis down")
+    with patch("app.workers.embedding_batcher.redis.from_url", return_value=client):
+        assert await EmbeddingMicroBatcher().submit(["a"], MODEL) is None
+
+
+async def test_client_is_reused_across_submissions(fake_server, provider):
+    batcher = EmbeddingMicroBatcher()
+    with patch(
+        "app.workers.embedding_batcher.redis.from_url",
+        side_effect=lambda *_args, **_kwargs: fakeredis.aioredis.FakeRedis(
+            server=fake_server
+        ),
+    ) as from_url:
+        await batcher.submit(["a"], MODEL)
+        await batcher.submit(["b"], MODEL)
+
+    assert from_url.call_count == 1
+    assert provider.await_count == 2
+
+
+async def test_lone_submission_does_not_wait_the_window(
+    fake_server,  # noqa: ARG001
+    provider,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "embedding_microbatch_window_ms", 10_000)
+
+    result = await asyncio.wait_for(
+        EmbeddingMicroBatcher().submit(["abc"], MODEL), timeout=1
+    )
+
+    assert result == [[3.0, 0.5]]
+    provider.assert_awaited_once()
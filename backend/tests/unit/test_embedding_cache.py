@@ -0,0 +1,150 @@
+"""Unit tests for the two-tier query embedding cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.embedding_cache import (
+    QueryEmbeddingCache,
+    normalize_query,
+    pack_vector,
+    unpack_vector,
+)
+
+pytestmark = pytest.mark.unit
+
+MODEL = "text-embedding-ada-002"
+
+
+@pytest.fixture
+def mock_binary_redis():
+    """In-memory stand-in for the binary Redis client."""
+    store: dict[str, bytes] = {}
+    redis = AsyncMock()
+    redis.get.side_effect = lambda key: store.get(key)
+
+    async def setex(key, _ttl, value):
+        store[key] = value
+
+    redis.setex.side_effect = setex
+    redis.store = store
+
+    with patch(
+        "app.services.embedding_cache.BinaryRedisClient.get_client",
+        AsyncMock(return_value=redis),
+    ):
+        yield redis
+
+
+def test_normalize_query_collapses_case_and_whitespace():
+    """Case and whitespace variants normalize to the same text."""
+    assert normalize_query("  OAuth   2.0\tflow \n") == "oauth 2.0 flow"
+    assert normalize_query("ＯＡｕｔｈ") == "oauth"  # NFKC full-width folding
+
+
+@pytest.mark.parametrize(("dtype", "size"), [("float32", 4), ("float16", 2)])
+def test_pack_vector_is_compact_and_round_trips(dtype, size):
+    """Packed vectors use 4 (or 2) bytes per dimension."""
+    vector = [0.25, -0.5, 1.0] * 512
+
+    data = pack_vector(vector, dtype)
+
+    assert len(data) == len(vector) * size
+    assert unpack_vector(data, dtype) == vector
+
+
+def test_unsupported_dtype_rejected():
+    with pytest.raises(ValueError, match="Unsupported"):
+        QueryEmbeddingCache(dtype="float64")
+
+
+def test_key_includes_model_and_normalized_query():
+    cache = QueryEmbeddingCache()
+
+    assert cache.key_for("Hello  World", MODEL) == cache.key_for("hello world", MODEL)
+    assert cache.key_for("hello", MODEL) != cache.key_for("hello", "other-model")
+    assert MODEL in cache.key_for("hello", MODEL)
+
+
+async def test_miss_then_memory_hit(mock_binary_redis):
+    """A stored vector is served from the LRU without touching Redis."""
+    cache = QueryEmbeddingCache()
+
+    assert await cache.get("query", MODEL) is None
+    await cache.set("query", MODEL, [0.5, 0.25])
+    mock_binary_redis.get.reset_mock()
+
+    assert await cache.get("  QUERY ", MODEL) == [0.5, 0.25]
+    mock_binary_redis.get.assert_not_called()
+    assert cache.get_stats()["memory_hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+async def test_redis_hit_populates_memory_tier(mock_binary_redis):
+    """A Redis hit (e.g. from another worker) is promoted into the LRU."""
+    writer = QueryEmbeddingCache()
+    await writer.set("query", MODEL, [0.5, 0.25])
+
+    reader = QueryEmbeddingCache()
+    assert await reader.get("query", MODEL) == [0.5, 0.25]
+    assert await reader.get("query", MODEL) == [0.5, 0.25]
+
+    stats = reader.get_stats()
+    assert stats["redis_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["hit_ratio"] == 1.0
+
+
+async def test_polling_lookups_leave_stats_alone(mock_binary_redis):
+    """Waiting for another worker's embedding doesn't count extra misses."""
+    cache = QueryEmbeddingCache()
+    assert await cache.get("query", MODEL) is None
+
+    for _ in range(3):
+        assert await cache.get("query", MODEL, record_stats=False) is None
+    await QueryEmbeddingCache().set("query", MODEL, [0.5])
+    assert await cache.get("query", MODEL, record_stats=False) == [0.5]
+
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["redis_hits"], stats["memory_hits"]) == (1, 0, 0)
+
+
+async def test_model_switch_misses(mock_binary_redis):
+    cache = QueryEmbeddingCache()
+    await cache.set("query", MODEL, [0.5])
+
+    assert await cache.get("query", "text-embedding-3-small") is None
+
+
+async def test_lru_is_bounded(mock_binary_redis):
+    cache = QueryEmbeddingCache(max_entries=2)
+
+    for i in range(3):
+        await cache.set(f"q{i}", MODEL, [float(i)])
+
+    assert cache.get_stats()["lru_entries"] == 2
+
+
+async def test_lru_holds_packed_vectors(mock_binary_redis):
+    """The in-process tier keeps packed bytes, not lists of Python floats."""
+    cache = QueryEmbeddingCache()
+    vector = [0.5] * 1536
+    await cache.set("query", MODEL, vector)
+
+    (entry,) = cache._lru.values()
+    assert entry == pack_vector(vector)
+    assert await cache.get("query", MODEL) == vector
+
+
+async def test_redis_failure_degrades_to_memory_tier():
+    """Redis errors are counted and treated as misses."""
+    with patch(
+        "app.services.embedding_cache.BinaryRedisClient.get_client",
+        AsyncMock(side_effect=ConnectionError("redis down")),
+    ):
+        cache = QueryEmbeddingCache()
+        assert await cache.get("query", MODEL) is None
+        await cache.set("query", MODEL, [0.5])
+        assert await cache.get("query", MODEL) == [0.5]
+
+    assert cache.get_stats()["redis_errors"] == 2
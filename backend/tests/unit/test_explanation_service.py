@@ -5,14 +5,16 @@ from uuid import uuid4
 
 import pytest
 
+from app.schemas.search import ExplainBatchItem, ExplanationResponse
 from app.services.explanation_service import ExplanationService
+from app.services.stemming import stem_word
 
 
 @pytest.fixture
 def mock_qdrant():
     """Mock Qdrant service."""
     mock = MagicMock()
-    mock.client = AsyncMock()
+    mock.async_client = AsyncMock()
     return mock
 
 
@@ -65,7 +67,9 @@ async def test_generate_explanation_fallback_on_timeout(service):
     keywords = ["OAuth", "authentication"]
 
     # Mock acompletion to raise timeout
-    with patch("app.services.explanation_service.acompletion") as mock_complete:
+    with patch(
+        "app.services.explanation_service.rate_limited_acompletion"
+    ) as mock_complete:
         mock_complete.side_effect = TimeoutError()
 
         explanation = await service._generate_explanation(
@@ -91,7 +95,7 @@ async def test_find_related_documents_excludes_original(service, mock_qdrant):
     # Mock Qdrant retrieve (get original chunk)
     mock_chunk = MagicMock()
     mock_chunk.vector = [0.1] * 1536
-    mock_qdrant.client.retrieve = AsyncMock(return_value=[mock_chunk])
+    mock_qdrant.async_client.retrieve = AsyncMock(return_value=[mock_chunk])
 
     # Mock Qdrant search (similar chunks including original)
     mock_result_original = MagicMock()
@@ -110,7 +114,7 @@ async def test_find_related_documents_excludes_original(service, mock_qdrant):
         "document_name": "Similar Doc",
     }
 
-    mock_qdrant.client.search = AsyncMock(
+    mock_qdrant.async_client.search = AsyncMock(
         return_value=[mock_result_original, mock_result_similar]
     )
 
@@ -119,6 +123,12 @@ async def test_find_related_documents_excludes_original(service, mock_qdrant):
     # Should exclude original chunk
     assert len(related) == 1
     assert related[0].doc_name == "Similar Doc"
+    # Only the fields needed for RelatedDocument are transferred (no stems)
+    assert mock_qdrant.async_client.retrieve.call_args.kwargs["with_payload"] is False
+    assert mock_qdrant.async_client.search.call_args.kwargs["with_payload"] == [
+        "document_id",
+        "document_name",
+    ]
 
 
 @pytest.mark.unit
@@ -181,3 +191,89 @@ async def test_explain_uses_cache(service, mock_redis):
     # Should return cached data
     assert result.explanation == "Cached explanation"
     mock_redis_client.get.assert_called_once()
+
+
+def _batch_item(chunk_text: str, kb_id=None) -> ExplainBatchItem:
+    return ExplainBatchItem(
+        chunk_id=uuid4(),
+        chunk_text=chunk_text,
+        relevance_score=0.8,
+        kb_id=kb_id or uuid4(),
+    )
+
+
+def _llm_response(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+
+@pytest.mark.unit
+async def test_explain_batch_uses_one_llm_call_and_one_mget(
+    service, mock_redis, mock_qdrant
+):
+    """All uncached results are explained by a single structured LLM call."""
+    kb_id = uuid4()
+    items = [_batch_item("OAuth flow", kb_id), _batch_item("PKCE", kb_id)]
+    redis_client = await mock_redis.get_client()
+    redis_client.mget = AsyncMock(return_value=[None, None])
+    redis_client.pipeline = MagicMock()
+    mock_qdrant.async_client.retrieve = AsyncMock(return_value=[])
+    mock_qdrant.async_client.recommend_batch = AsyncMock(return_value=[[], []])
+
+    with patch(
+        "app.services.explanation_service.rate_limited_acompletion",
+        AsyncMock(
+            return_value=_llm_response('{"explanations": ["First.", "Second."]}')
+        ),
+    ) as mock_complete:
+        results = await service.explain_batch("OAuth PKCE", items)
+
+    mock_complete.assert_awaited_once()
+    redis_client.mget.assert_awaited_once()
+    mock_qdrant.async_client.recommend_batch.assert_awaited_once()
+    assert [r.explanation for r in results] == ["First.", "Second."]
+
+
+@pytest.mark.unit
+async def test_explain_batch_skips_cached_results(service, mock_redis):
+    cached = ExplanationResponse(explanation="Cached explanation")
+    redis_client = await mock_redis.get_client()
+    redis_client.mget = AsyncMock(return_value=[cached.model_dump_json()])
+
+    with patch(
+        "app.services.explanation_service.rate_limited_acompletion"
+    ) as mock_complete:
+        results = await service.explain_batch("OAuth", [_batch_item("OAuth")])
+
+    mock_complete.assert_not_called()
+    assert results == [cached]
+
+
+@pytest.mark.unit
+async def test_explain_batch_matches_keywords_with_stored_stems(
+    service, mock_redis, mock_qdrant
+):
+    """Stems from the chunk payload are used instead of re-stemming chunk_text."""
+    item = _batch_item("text not containing the word")
+    redis_client = await mock_redis.get_client()
+    redis_client.mget = AsyncMock(return_value=[None])
+    redis_client.pipeline = MagicMock()
+    mock_qdrant.async_client.retrieve = AsyncMock(
+        return_value=[
+            MagicMock(
+                id=str(item.chunk_id),
+                payload={"stems": [stem_word("authentication")]},
+            )
+        ]
+    )
+    mock_qdrant.async_client.recommend_batch = AsyncMock(return_value=[[]])
+
+    with patch(
+        "app.services.explanation_service.rate_limited_acompletion",
+        AsyncMock(side_effect=TimeoutError()),
+    ):
+        results = await service.explain_batch("authentication", [item])
+
+    assert results[0].keywords == ["authentication"]
+    assert "authentication" in results[0].explanation
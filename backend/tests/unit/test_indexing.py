@@ -20,8 +20,36 @@ def mock_qdrant_service():
         mock.create_collection = AsyncMock()
         mock.upsert_points = AsyncMock(return_value=2)
         mock.delete_points_by_filter = AsyncMock(return_value=0)
-        mock.client = MagicMock()
-        mock.client.count = MagicMock(return_value=MagicMock(count=5))
+        mock.list_point_ids = AsyncMock(return_value=[])
+        mock.async_client = MagicMock()
+        mock.async_client.count = AsyncMock(return_value=MagicMock(count=5))
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_bump_index_generation():
+    """Stub out the Redis index-generation bump."""
+    with patch(
+        "app.workers.indexing.bump_index_generation", new_callable=AsyncMock
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_record_chunk_locations():
+    """Stub out the Redis chunk -> KB map update."""
+    with patch(
+        "app.workers.indexing.record_chunk_locations", new_callable=AsyncMock
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_forget_chunk_locations():
+    """Stub out the Redis chunk -> KB map removal."""
+    with patch(
+        "app.workers.indexing.forget_chunk_locations", new_callable=AsyncMock
+    ) as mock:
         yield mock
 
 
@@ -79,23 +107,80 @@ class TestIndexDocument:
         assert result == 2
         mock_qdrant_service.upsert_points.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_index_document_bumps_index_generation(
+        self, mock_qdrant_service, sample_embeddings, mock_bump_index_generation
+    ):
+        """Indexing invalidates cached search results for the KB."""
+        from app.workers.indexing import index_document
+
+        kb_id = UUID("12345678-1234-1234-1234-123456789abc")
+
+        await index_document(
+            doc_id="doc-abc-123", kb_id=kb_id, embeddings=sample_embeddings
+        )
+
+        # Bumped after the points are written, so no search caches stale results
+        mock_qdrant_service.upsert_points.assert_awaited_once()
+        mock_bump_index_generation.assert_awaited_once_with(kb_id)
+
+    @pytest.mark.asyncio
+    async def test_index_document_records_chunk_locations(
+        self, mock_qdrant_service, sample_embeddings, mock_record_chunk_locations
+    ):
+        """Indexed point IDs are mapped to their KB for similar search."""
+        from app.workers.indexing import index_document
+
+        kb_id = UUID("12345678-1234-1234-1234-123456789abc")
+
+        await index_document(
+            doc_id="doc-abc-123", kb_id=kb_id, embeddings=sample_embeddings
+        )
+
+        # The recorded IDs are exactly the points that were upserted
+        _, points = mock_qdrant_service.upsert_points.call_args.args
+        mock_record_chunk_locations.assert_awaited_once_with(
+            kb_id, [str(point.id) for point in points]
+        )
+        assert [str(point.id) for point in points] == [
+            "doc-abc-123_0",
+            "doc-abc-123_1",
+        ]
+
     @pytest.mark.asyncio
     async def test_index_document_creates_collection_if_missing(
         self, mock_qdrant_service, sample_embeddings
     ):
         """Test that collection is created if it doesn't exist."""
+        from app.schemas.knowledge_base import KBSettings
         from app.workers.indexing import index_document
 
         mock_qdrant_service.collection_exists.return_value = False
         kb_id = UUID("12345678-1234-1234-1234-123456789abc")
-
-        await index_document(
-            doc_id="doc-abc-123",
-            kb_id=kb_id,
-            embeddings=sample_embeddings,
+        kb_settings = {
+            "vector_index": {
+                "hnsw_m": 32,
+                "quantization": "scalar",
+                "on_disk_vectors": True,
+            }
+        }
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(
+            scalar_one_or_none=MagicMock(return_value=kb_settings)
         )
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+
+        with patch("app.workers.indexing.async_session_factory", session_factory):
+            await index_document(
+                doc_id="doc-abc-123",
+                kb_id=kb_id,
+                embeddings=sample_embeddings,
+            )
 
-        mock_qdrant_service.create_collection.assert_called_once_with(kb_id)
+        mock_qdrant_service.create_collection.assert_called_once_with(
+            kb_id, KBSettings.model_validate(kb_settings).vector_index
+        )
 
     @pytest.mark.asyncio
     async def test_index_document_empty_embeddings(self, mock_qdrant_service):
@@ -211,11 +296,14 @@ class TestOrphanCleanup:
     """Tests for orphan chunk cleanup."""
 
     @pytest.mark.asyncio
-    async def test_cleanup_orphan_chunks_basic(self, mock_qdrant_service):
+    async def test_cleanup_orphan_chunks_basic(
+        self, mock_qdrant_service, mock_forget_chunk_locations
+    ):
         """Test orphan chunk cleanup."""
         from app.workers.indexing import cleanup_orphan_chunks
 
         mock_qdrant_service.delete_points_by_filter.return_value = 5
+        mock_qdrant_service.list_point_ids.return_value = ["doc-abc-123_10"]
 
         kb_id = UUID("12345678-1234-1234-1234-123456789abc")
 
@@ -231,6 +319,7 @@ class TestOrphanCleanup:
         # Check filter was constructed correctly
         call_args = mock_qdrant_service.delete_points_by_filter.call_args
         assert call_args.kwargs["kb_id"] == kb_id
+        mock_forget_chunk_locations.assert_awaited_once_with(["doc-abc-123_10"])
 
     @pytest.mark.asyncio
     async def test_cleanup_orphan_chunks_no_orphans(self, mock_qdrant_service):
@@ -274,7 +363,9 @@ class TestDeleteDocumentVectors:
     """Tests for document vector deletion."""
 
     @pytest.mark.asyncio
-    async def test_delete_document_vectors(self, mock_qdrant_service):
+    async def test_delete_document_vectors(
+        self, mock_qdrant_service, mock_bump_index_generation
+    ):
         """Test deleting all vectors for a document."""
         from app.workers.indexing import delete_document_vectors
 
@@ -289,6 +380,24 @@ class TestDeleteDocumentVectors:
 
         assert result == 10
         mock_qdrant_service.delete_points_by_filter.assert_called_once()
+        mock_bump_index_generation.assert_awaited_once_with(kb_id)
+
+    @pytest.mark.asyncio
+    async def test_delete_document_vectors_forgets_chunk_locations(
+        self, mock_qdrant_service, mock_forget_chunk_locations
+    ):
+        """Deleted points are removed from the chunk -> KB map."""
+        from app.workers.indexing import delete_document_vectors
+
+        mock_qdrant_service.list_point_ids.return_value = ["doc_0", "doc_1"]
+        kb_id = UUID("12345678-1234-1234-1234-123456789abc")
+
+        await delete_document_vectors(doc_id="doc", kb_id=kb_id)
+
+        list_args = mock_qdrant_service.list_point_ids.call_args.args
+        delete_kwargs = mock_qdrant_service.delete_points_by_filter.call_args.kwargs
+        assert list_args == (kb_id, delete_kwargs["filter_conditions"])
+        mock_forget_chunk_locations.assert_awaited_once_with(["doc_0", "doc_1"])
 
     @pytest.mark.asyncio
     async def test_delete_document_vectors_raises_on_error(self, mock_qdrant_service):
@@ -316,7 +425,7 @@ class TestGetDocumentChunkCount:
         """Test getting chunk count for a document."""
         from app.workers.indexing import get_document_chunk_count
 
-        mock_qdrant_service.client.count.return_value = MagicMock(count=15)
+        mock_qdrant_service.async_client.count.return_value = MagicMock(count=15)
 
         kb_id = UUID("12345678-1234-1234-1234-123456789abc")
 
@@ -332,7 +441,7 @@ class TestGetDocumentChunkCount:
         """Test that errors return 0."""
         from app.workers.indexing import get_document_chunk_count
 
-        mock_qdrant_service.client.count.side_effect = Exception("Qdrant error")
+        mock_qdrant_service.async_client.count.side_effect = Exception("Qdrant error")
 
         kb_id = UUID("12345678-1234-1234-1234-123456789abc")
 
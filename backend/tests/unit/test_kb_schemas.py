@@ -4,7 +4,7 @@ import pytest
 from pydantic import ValidationError
 
 from app.models.permission import PermissionLevel
-from app.schemas.knowledge_base import KBCreate, KBUpdate
+from app.schemas.knowledge_base import KBCreate, KBSettings, KBUpdate
 
 pytestmark = pytest.mark.unit
 
@@ -111,6 +111,39 @@ class TestKBUpdate:
             KBUpdate(description="a" * 2001)
         assert "String should have at most 2000 characters" in str(exc_info.value)
 
+    def test_settings_partial_update(self) -> None:
+        """Test that only explicitly provided settings are applied."""
+        schema = KBUpdate(settings={"semantic_cache_enabled": False})
+        assert schema.settings.model_dump(exclude_unset=True) == {
+            "semantic_cache_enabled": False
+        }
+        assert KBUpdate(settings={}).settings.model_dump(exclude_unset=True) == {}
+
+
+class TestKBSettings:
+    """Tests for KBSettings defaults."""
+
+    def test_semantic_cache_enabled_by_default(self) -> None:
+        """Test that KBs without stored settings keep the semantic cache on."""
+        assert KBSettings.model_validate({}).semantic_cache_enabled is True
+
+    def test_unknown_keys_ignored(self) -> None:
+        """Test that extra keys stored in the JSONB column don't break reads."""
+        settings = KBSettings.model_validate({"legacy": 1})
+        assert settings.semantic_cache_enabled is True
+
+    def test_vector_index_defaults_to_qdrant_defaults(self) -> None:
+        """Test that KBs without index settings get unquantized in-RAM vectors."""
+        index = KBSettings.model_validate({}).vector_index
+        assert index.quantization == "none"
+        assert index.on_disk_vectors is False
+        assert index.hnsw_m is None
+
+    def test_vector_index_rejects_unknown_quantization(self) -> None:
+        """Test that only scalar/binary quantization are accepted."""
+        with pytest.raises(ValidationError):
+            KBSettings.model_validate({"vector_index": {"quantization": "pq"}})
+
 
 class TestPermissionHierarchy:
     """Tests for permission level hierarchy logic."""
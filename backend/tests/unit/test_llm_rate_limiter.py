@@ -0,0 +1,195 @@
+"""Unit tests for the shared LiteLLM rate limiter."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.core.config import settings
+from app.integrations.llm_rate_limiter import (
+    LLMRateLimiter,
+    RateLimitWaitExceededError,
+    retry_after_seconds,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class _Slept(Exception):
+    """Stops the acquire loop at its first wait."""
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """Limiter on an in-memory Redis: 60 requests/min, 600 tokens/min, 1s burst."""
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "embedding_rate_limit_rpm", 60)
+    monkeypatch.setattr(settings, "embedding_rate_limit_tpm", 600)
+    monkeypatch.setattr(settings, "llm_rate_limit_burst_seconds", 1.0)
+    monkeypatch.setattr(settings, "llm_rate_limit_min_scale", 0.1)
+    server = fakeredis.FakeServer()
+    with patch(
+        "app.integrations.llm_rate_limiter.redis.from_url",
+        side_effect=lambda *_args, **_kwargs: fakeredis.aioredis.FakeRedis(
+            server=server, decode_responses=True
+        ),
+    ):
+        yield LLMRateLimiter("embedding")
+
+
+async def _first_wait(limiter: LLMRateLimiter, tokens: int = 0) -> float:
+    """Seconds the limiter would sleep before admitting the call."""
+    sleep = AsyncMock(side_effect=_Slept)
+    with patch("app.integrations.llm_rate_limiter.asyncio.sleep", sleep):
+        try:
+            await limiter.acquire(tokens)
+        except _Slept:
+            return sleep.await_args.args[0]
+    return 0.0
+
+
+async def test_calls_within_the_burst_do_not_wait(limiter):
+    assert await _first_wait(limiter, tokens=5) == 0.0
+
+
+async def test_request_limit_waits_for_refill(limiter):
+    await limiter.acquire()
+
+    # One request per second; up to 10% jitter is added
+    assert 0.9 < await _first_wait(limiter) <= 1.1
+
+
+async def test_token_limit_waits_for_missing_tokens(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_rate_limit_rpm", 0)
+    await limiter.acquire(tokens=5)
+
+    # 10 tokens/s refill; 3 more tokens are needed for a cost of 8
+    assert 0.25 < await _first_wait(limiter, tokens=8) <= 0.35
+
+
+async def test_oversized_cost_does_not_leave_the_bucket_in_debt(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_rate_limit_rpm", 0)
+
+    # 10 tokens/s with a 10-token burst; a 1000-token call still fits a
+    # fresh bucket, and the next call waits for its own cost only
+    assert await _first_wait(limiter, tokens=1000) == 0.0
+    assert 0 < await _first_wait(limiter, tokens=1) <= 0.12
+
+
+async def test_oversized_cost_waits_for_its_full_cost(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_rate_limit_rpm", 0)
+    await limiter.acquire(tokens=10)
+
+    assert 9.9 < await _first_wait(limiter, tokens=100) <= 11.0
+
+
+async def test_models_have_separate_buckets(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_rate_limit_rpm", 0)
+    await limiter.acquire(tokens=10, model="gpt-4")
+
+    sleep = AsyncMock(side_effect=_Slept)
+    with patch("app.integrations.llm_rate_limiter.asyncio.sleep", sleep):
+        assert await limiter.acquire(tokens=10, model="gpt-3.5-turbo") == 0.0
+        with pytest.raises(_Slept):
+            await limiter.acquire(tokens=10, model="gpt-4")
+
+
+async def test_penalize_pauses_callers_and_halves_rate_once(limiter):
+    await limiter.penalize(2.0)
+    await limiter.penalize(2.0)  # same 429 storm: no second cut
+
+    assert 1.8 < await _first_wait(limiter) <= 2.2
+    client = limiter._get_client()
+    assert float(await client.hget(limiter.key, "scale")) == pytest.approx(
+        0.5, abs=0.01
+    )
+
+
+async def test_wait_beyond_max_wait_raises_without_sleeping(limiter):
+    await limiter.acquire()
+    sleep = AsyncMock()
+
+    with (
+        patch("app.integrations.llm_rate_limiter.asyncio.sleep", sleep),
+        pytest.raises(RateLimitWaitExceededError),
+    ):
+        await limiter.acquire(max_wait=0.5)
+
+    sleep.assert_not_awaited()
+
+
+async def test_max_wait_bounds_the_total_of_repeated_waits(limiter):
+    await limiter.acquire()
+    sleep = AsyncMock()
+
+    # The bucket doesn't refill under the patched sleep, so the second ~1s
+    # wait pushes the total past max_wait
+    with (
+        patch("app.integrations.llm_rate_limiter.asyncio.sleep", sleep),
+        pytest.raises(RateLimitWaitExceededError),
+    ):
+        await limiter.acquire(max_wait=1.5)
+
+    sleep.assert_awaited_once()
+
+
+async def test_loop_change_closes_the_previous_client(monkeypatch):
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", True)
+    stale_client = MagicMock()
+    stale_client.aclose = AsyncMock()
+    limiter = LLMRateLimiter("embedding")
+    limiter._client = stale_client
+    limiter._client_loop = MagicMock()  # a loop that has since finished
+
+    with patch("app.integrations.llm_rate_limiter.redis.from_url") as from_url:
+        assert limiter._get_client() is from_url.return_value
+        await asyncio.gather(*limiter._closing_tasks)
+
+    stale_client.aclose.assert_awaited_once()
+
+
+async def test_redis_failure_fails_open(monkeypatch):
+    monkeypatch.setattr(settings, "llm_rate_limit_enabled", True)
+    client = MagicMock()
+    client.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+    with patch("app.integrations.llm_rate_limiter.redis.from_url", return_value=client):
+        assert await LLMRateLimiter("embedding").acquire(100) == 0.0
+
+
+async def test_disabled_limiter_does_not_connect():
+    with patch("app.integrations.llm_rate_limiter.redis.from_url") as from_url:
+        assert await LLMRateLimiter("embedding").acquire(100) == 0.0
+        await LLMRateLimiter("embedding").penalize(1.0)
+
+    from_url.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Retry-After": "7"}, 7.0),
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"Content-Type": "application/json"}, None),
+        ({"Retry-After": "soon"}, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    error = Exception("429")
+    error.response = MagicMock(headers=headers)
+
+    assert retry_after_seconds(error) == expected
+
+
+def test_retry_after_http_date():
+    error = Exception("429")
+    when = datetime.now(UTC) + timedelta(seconds=30)
+    error.response = MagicMock(headers={"Retry-After": format_datetime(when, True)})
+
+    assert 28 < retry_after_seconds(error) <= 30
+
+
+def test_retry_after_without_response():
+    assert retry_after_seconds(Exception("429")) is None
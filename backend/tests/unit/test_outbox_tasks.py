@@ -4,13 +4,16 @@ Tests the dispatch_event logic and event handler routing without
 actual database or external service dependencies.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
 from app.workers.outbox_tasks import (
     MAX_OUTBOX_ATTEMPTS,
+    _handle_kb_delete,
+    _run_excerpt_backfill,
+    _run_stems_backfill,
     dispatch_event,
 )
 
@@ -162,3 +165,110 @@ class TestMaxOutboxAttempts:
     def test_max_attempts_is_five(self) -> None:
         """Test max outbox attempts is set to 5 per spec."""
         assert MAX_OUTBOX_ATTEMPTS == 5
+
+
+class TestExcerptBackfill:
+    """Tests for the excerpt payload backfill job."""
+
+    @pytest.mark.asyncio
+    async def test_sets_excerpt_on_points_missing_it(self) -> None:
+        """Each scrolled page becomes one batched payload update."""
+        kb_id = uuid4()
+        session = AsyncMock()
+        session.execute.return_value.all = MagicMock(return_value=[(kb_id,)])
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+
+        long_text = "x" * 150
+        pages = [
+            ([MagicMock(id="p1", payload={"chunk_text": long_text})], "p2"),
+            ([MagicMock(id="p2", payload={"chunk_text": "short"})], None),
+        ]
+        mock_qdrant = MagicMock()
+        mock_qdrant.collection_exists = AsyncMock(return_value=True)
+        mock_qdrant.async_client.scroll = AsyncMock(side_effect=pages)
+        mock_qdrant.async_client.batch_update_points = AsyncMock()
+
+        with (
+            patch("app.workers.outbox_tasks.async_session_factory", session_factory),
+            patch("app.integrations.qdrant_client.qdrant_service", mock_qdrant),
+        ):
+            result = await _run_excerpt_backfill()
+
+        assert result == {"points_updated": 2}
+        updates = mock_qdrant.async_client.batch_update_points.call_args_list
+        assert len(updates) == 2
+        first = updates[0].kwargs["update_operations"][0].set_payload
+        assert first.points == ["p1"]
+        assert first.payload["excerpt"] == "x" * 100 + "..."
+        scroll = mock_qdrant.async_client.scroll.call_args_list[0].kwargs
+        assert scroll["collection_name"] == f"kb_{kb_id}"
+        assert scroll["with_payload"] == ["chunk_text"]
+
+    @pytest.mark.asyncio
+    async def test_sets_stems_on_points_missing_them(self) -> None:
+        """Stems are derived from chunk_text the way chunking stores them."""
+        session = AsyncMock()
+        session.execute.return_value.all = MagicMock(return_value=[(uuid4(),)])
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+
+        pages = [
+            ([MagicMock(id="p1", payload={"chunk_text": "Running runs ran"})], None)
+        ]
+        mock_qdrant = MagicMock()
+        mock_qdrant.collection_exists = AsyncMock(return_value=True)
+        mock_qdrant.async_client.scroll = AsyncMock(side_effect=pages)
+        mock_qdrant.async_client.batch_update_points = AsyncMock()
+
+        with (
+            patch("app.workers.outbox_tasks.async_session_factory", session_factory),
+            patch("app.integrations.qdrant_client.qdrant_service", mock_qdrant),
+        ):
+            result = await _run_stems_backfill()
+
+        assert result == {"points_updated": 1}
+        update = mock_qdrant.async_client.batch_update_points.call_args.kwargs
+        assert update["update_operations"][0].set_payload.payload == {
+            "stems": ["ran", "run"]
+        }
+        scroll = mock_qdrant.async_client.scroll.call_args.kwargs
+        assert scroll["scroll_filter"].must[0].is_empty.key == "stems"
+
+
+class TestKBDelete:
+    """Tests for the kb.delete handler."""
+
+    @pytest.mark.asyncio
+    async def test_forgets_chunk_locations_of_deleted_collection(self) -> None:
+        """Point IDs are listed before the collection is dropped, then HDEL'd."""
+        kb_id = str(uuid4())
+        session = AsyncMock()
+        session.execute.return_value.scalar = MagicMock(return_value=0)
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.collection_exists = AsyncMock(return_value=True)
+        mock_qdrant.list_point_ids = AsyncMock(return_value=["p1", "p2"])
+        mock_qdrant.delete_collection = AsyncMock(return_value=True)
+        mock_minio = MagicMock()
+        mock_minio.delete_bucket = AsyncMock(return_value=True)
+
+        with (
+            patch("app.workers.outbox_tasks.async_session_factory", session_factory),
+            patch("app.integrations.qdrant_client.qdrant_service", mock_qdrant),
+            patch("app.integrations.minio_client.minio_service", mock_minio),
+            patch(
+                "app.services.search_cache.bump_index_generation",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "app.services.chunk_locator.forget_chunk_locations",
+                new_callable=AsyncMock,
+            ) as mock_forget,
+        ):
+            await _handle_kb_delete(kb_id, "event-1")
+
+        mock_qdrant.delete_collection.assert_awaited_once()
+        mock_forget.assert_awaited_once_with(["p1", "p2"])
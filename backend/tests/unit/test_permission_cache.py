@@ -0,0 +1,233 @@
+"""Unit tests for ACL snapshot resolution and caching."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.permission import PermissionLevel
+from app.services.kb_service import KBPermissionService
+from app.services.permission_cache import ACL_VERSION_KEY, PermissionCache
+
+pytestmark = pytest.mark.unit
+
+KB_OWNED = str(uuid4())
+KB_READ = str(uuid4())
+KB_WRITE = str(uuid4())
+KB_OTHER = str(uuid4())
+
+
+@pytest.fixture
+def mock_redis():
+    """In-memory stand-in for the async Redis client."""
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+    redis.mget.side_effect = lambda *keys: [store.get(k) for k in keys]
+    redis.get.side_effect = lambda key: store.get(key)
+
+    async def setex(key, _ttl, value):
+        store[key] = value
+
+    async def delete(key):
+        store.pop(key, None)
+
+    async def incr(key):
+        store[key] = str(int(store.get(key, 0)) + 1)
+        return int(store[key])
+
+    def pipeline(transaction=True):  # noqa: ARG001
+        ops = []
+        pipe = MagicMock()
+        pipe.incr.side_effect = lambda key: ops.append(incr(key))
+        pipe.expire.side_effect = lambda *_: None
+        pipe.delete.side_effect = lambda key: ops.append(delete(key))
+
+        async def execute():
+            return [await op for op in ops]
+
+        pipe.execute.side_effect = execute
+        return pipe
+
+    redis.setex.side_effect = setex
+    redis.delete.side_effect = delete
+    redis.incr.side_effect = incr
+    redis.pipeline = MagicMock(side_effect=pipeline)
+    redis.store = store
+
+    with patch(
+        "app.services.permission_cache.RedisClient.get_client",
+        AsyncMock(return_value=redis),
+    ):
+        yield redis
+
+
+def _acl_row(kb_id, owner_id=None, level=None, is_superuser=False):
+    return MagicMock(
+        id=kb_id, owner_id=owner_id, permission_level=level, is_superuser=is_superuser
+    )
+
+
+@pytest.fixture
+def user_id():
+    return uuid4()
+
+
+@pytest.fixture
+def session(user_id):
+    """Session returning one owned KB, one READ KB and one WRITE KB."""
+    rows = [
+        _acl_row(KB_OWNED, owner_id=user_id),
+        _acl_row(KB_READ, level=PermissionLevel.READ),
+        _acl_row(KB_WRITE, level=PermissionLevel.WRITE),
+    ]
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+    return session
+
+
+async def test_snapshot_resolved_with_single_query(mock_redis, session, user_id):
+    """A cache miss runs exactly one query and caches the result."""
+    service = KBPermissionService(session)
+
+    snapshot = await service.get_acl_snapshot(str(user_id))
+
+    assert snapshot == {KB_OWNED: "ADMIN", KB_READ: "READ", KB_WRITE: "WRITE"}
+    assert session.execute.await_count == 1
+    mock_redis.setex.assert_awaited_once()
+
+
+async def test_snapshot_served_from_cache(mock_redis, session, user_id):
+    """A second lookup does not touch the database."""
+    service = KBPermissionService(session)
+
+    await service.get_acl_snapshot(str(user_id))
+    await service.get_acl_snapshot(str(user_id))
+
+    assert session.execute.await_count == 1
+
+
+async def test_check_permissions_is_subset_test(mock_redis, session, user_id):
+    """All requested KBs must be in the snapshot at the required level."""
+    service = KBPermissionService(session)
+    uid = str(user_id)
+
+    assert await service.check_permissions(uid, [KB_OWNED, KB_READ], "READ")
+    assert not await service.check_permissions(uid, [KB_READ, KB_OTHER], "READ")
+    assert await service.check_permissions(uid, [KB_OWNED, KB_WRITE], "WRITE")
+    assert not await service.check_permissions(uid, [KB_READ], "WRITE")
+    assert session.execute.await_count == 1
+
+
+async def test_check_permissions_normalizes_kb_ids(mock_redis, session, user_id):
+    """Non-canonical UUID spellings match; IDs that aren't UUIDs never do."""
+    service = KBPermissionService(session)
+    uid = str(user_id)
+
+    assert await service.check_permissions(uid, [KB_READ.upper()], "READ")
+    assert await service.check_permissions(uid, [f"{{{KB_OWNED}}}"], "READ")
+    assert await service.check_permissions(uid, [f"urn:uuid:{KB_WRITE}"], "WRITE")
+    assert not await service.check_permissions(uid, [KB_READ, "kb-read"], "READ")
+
+
+async def test_superuser_gets_admin_on_all_active_kbs(mock_redis):
+    """Superuser bypass maps every returned KB to ADMIN."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(
+        all=MagicMock(
+            return_value=[
+                _acl_row("kb-a", is_superuser=True),
+                _acl_row("kb-b", is_superuser=True),
+            ]
+        )
+    )
+    service = KBPermissionService(session)
+
+    snapshot = await service.get_acl_snapshot(str(uuid4()))
+
+    assert snapshot == {"kb-a": "ADMIN", "kb-b": "ADMIN"}
+
+
+async def test_invalidate_user_forces_reload(mock_redis, session, user_id):
+    """Grant/revoke invalidation drops the cached snapshot."""
+    service = KBPermissionService(session)
+
+    await service.get_acl_snapshot(str(user_id))
+    await PermissionCache().invalidate_user(str(user_id))
+    await service.get_acl_snapshot(str(user_id))
+
+    assert session.execute.await_count == 2
+
+
+async def test_invalidate_all_makes_snapshots_stale(mock_redis, session, user_id):
+    """Archive bumps the global version so older snapshots are ignored."""
+    service = KBPermissionService(session)
+
+    await service.get_acl_snapshot(str(user_id))
+    await PermissionCache().invalidate_all()
+
+    assert mock_redis.store[ACL_VERSION_KEY] == "1"
+    await service.get_acl_snapshot(str(user_id))
+    assert session.execute.await_count == 2
+
+    # Re-cached under the new version
+    cached = json.loads(mock_redis.store[f"acl:user:{user_id}"])
+    assert cached["version"] == 1
+
+
+async def test_invalidation_waits_for_commit(mock_redis, session, user_id):
+    """A search between flush and commit cannot re-cache the old snapshot."""
+    service = KBPermissionService(session)
+    cache = PermissionCache()
+    db_session = AsyncSession()
+
+    cache.invalidate_user_on_commit(db_session, user_id)
+    await service.get_acl_snapshot(str(user_id))  # cached before the commit
+    await service.get_acl_snapshot(str(user_id))
+    assert session.execute.await_count == 1
+
+    await db_session.commit()
+    await asyncio.gather(*cache._tasks)
+    await service.get_acl_snapshot(str(user_id))
+    assert session.execute.await_count == 2
+
+
+async def test_rollback_discards_pending_invalidation(mock_redis, user_id):
+    """Nothing is invalidated when the change is rolled back."""
+    cache = PermissionCache()
+    db_session = AsyncSession()
+    await db_session.begin()
+
+    cache.invalidate_all_on_commit(db_session)
+    cache.invalidate_user_on_commit(db_session, user_id)
+    await db_session.rollback()
+    await db_session.commit()
+
+    assert not cache._tasks
+    assert mock_redis.store == {}
+
+
+async def test_snapshot_read_before_invalidation_is_not_current(
+    mock_redis, session, user_id
+):
+    """A snapshot read from the DB before a commit but stored after is stale."""
+    cache = PermissionCache()
+    _, version = await cache.get(user_id)  # search starts, reads old rows
+
+    await cache.invalidate_user(user_id)  # grant committed meanwhile
+    await cache.set(user_id, {"kb-old": "READ"}, version)
+
+    cached, _ = await cache.get(user_id)
+    assert cached is None
+
+
+async def test_redis_failure_falls_back_to_database(session, user_id):
+    """Permission checks still work when Redis is unavailable."""
+    with patch(
+        "app.services.permission_cache.RedisClient.get_client",
+        AsyncMock(side_effect=ConnectionError("redis down")),
+    ):
+        service = KBPermissionService(session)
+        assert await service.check_permissions(str(user_id), [KB_READ], "READ")
@@ -0,0 +1,271 @@
+"""Unit tests for QdrantService async client usage.
+
+Verifies that Qdrant calls made from async code never block the event loop,
+using a slow Qdrant stand-in (no real Qdrant required).
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.integrations.qdrant_client import QdrantService, build_search_params
+from app.schemas.knowledge_base import KBVectorIndexSettings
+from app.services.search_service import SearchService
+
+pytestmark = pytest.mark.unit
+
+# Simulated Qdrant latency per call (seconds)
+SLOW_CALL_SECONDS = 0.2
+
+# Max tolerated gap between heartbeat ticks (seconds)
+MAX_LOOP_STALL_SECONDS = 0.1
+
+
+class SlowAsyncQdrant:
+    """Async Qdrant stand-in: every call takes SLOW_CALL_SECONDS without blocking."""
+
+    def __getattr__(self, name: str):
+        async def _slow_call(*_args, **_kwargs):
+            await asyncio.sleep(SLOW_CALL_SECONDS)
+            if name == "get_collection":
+                return MagicMock(status=None, vectors_count=0, points_count=0)
+            if name == "count":
+                return MagicMock(count=1)
+            if name == "retrieve":
+                return [MagicMock(vector=[0.1] * 4, payload={"document_name": "x"})]
+            return []
+
+        return _slow_call
+
+
+class BlockingSyncQdrant:
+    """Sync Qdrant stand-in that blocks the calling thread (must never be used)."""
+
+    def __getattr__(self, _name: str):
+        def _blocking_call(*_args, **_kwargs):
+            time.sleep(SLOW_CALL_SECONDS)
+            return MagicMock(count=1)
+
+        return _blocking_call
+
+
+async def _max_loop_stall(coro) -> float:
+    """Run coro while a heartbeat task measures the largest event loop stall."""
+    max_gap = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal max_gap
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await coro
+    finally:
+        done.set()
+        await beat
+    return max_gap
+
+
+@pytest.fixture
+async def slow_qdrant_service():
+    """QdrantService wired to slow stand-ins for both client flavours."""
+    service = QdrantService()
+    service._client = BlockingSyncQdrant()
+    service._async_client = SlowAsyncQdrant()
+    service._async_client_loop = asyncio.get_running_loop()
+    return service
+
+
+async def test_qdrant_service_methods_do_not_block_event_loop(slow_qdrant_service):
+    """All async QdrantService methods yield to the loop while Qdrant is slow."""
+    kb_id = uuid4()
+    flt = models.Filter(must=[])
+
+    async def exercise() -> None:
+        await asyncio.gather(
+            slow_qdrant_service.collection_exists(kb_id),
+            slow_qdrant_service.create_collection(kb_id),
+            slow_qdrant_service.upsert_points(kb_id, []),
+            slow_qdrant_service.delete_points_by_filter(kb_id, flt),
+            slow_qdrant_service.get_collection_info(kb_id),
+            slow_qdrant_service.delete_collection(kb_id),
+            slow_qdrant_service.health_check(),
+        )
+
+    max_gap = await _max_loop_stall(exercise())
+
+    assert max_gap < MAX_LOOP_STALL_SECONDS
+
+
+async def test_search_collections_does_not_block_event_loop(slow_qdrant_service):
+    """Cross-KB fan-out runs concurrently on the loop against a slow Qdrant."""
+    with patch("app.services.search_service.qdrant_service", slow_qdrant_service):
+        service = SearchService(
+            permission_service=AsyncMock(), audit_service=AsyncMock()
+        )
+        kb_ids = [f"kb-{i}" for i in range(5)]
+
+        start = time.perf_counter()
+        max_gap = await _max_loop_stall(
+            service._search_collections([0.1] * 4, kb_ids, limit=5)
+        )
+        elapsed = time.perf_counter() - start
+
+    assert max_gap < MAX_LOOP_STALL_SECONDS
+    # 5 collections searched concurrently, not one after another
+    assert elapsed < SLOW_CALL_SECONDS * len(kb_ids)
+
+
+async def test_async_client_recreated_when_event_loop_changes():
+    """Celery runs each task in a fresh loop; the client must follow it."""
+    service = QdrantService()
+    stale_client = AsyncMock()
+    service._async_client = stale_client
+    service._async_client_loop = MagicMock()  # some other (finished) loop
+
+    with patch("app.integrations.qdrant_client.AsyncQdrantClient") as mock_cls:
+        client = service.async_client
+
+    mock_cls.assert_called_once()
+    assert client is mock_cls.return_value
+    assert service._async_client_loop is asyncio.get_running_loop()
+
+    # The stale client's channel is closed instead of leaked
+    await asyncio.gather(*service._closing_tasks)
+    stale_client.close.assert_awaited_once()
+
+
+async def test_async_client_builds_grpc_channel_with_options():
+    """The real client accepts GRPC_OPTIONS (the channel opens lazily, offline)."""
+    service = QdrantService()
+    client = service.async_client
+    try:
+        assert client.grpc_collections is not None
+    finally:
+        await service.aclose()
+
+
+# =============================================================================
+# Per-KB collection configuration
+# =============================================================================
+
+
+@pytest.fixture
+async def configurable_qdrant_service():
+    """QdrantService with an AsyncMock client and no existing collections."""
+    service = QdrantService()
+    service._async_client = AsyncMock()
+    service._async_client.get_collection.side_effect = UnexpectedResponse(
+        status_code=404, reason_phrase="Not Found", content=b"", headers=None
+    )
+    service._async_client_loop = asyncio.get_running_loop()
+    return service
+
+
+async def test_create_collection_applies_kb_index_settings(
+    configurable_qdrant_service,
+):
+    index = KBVectorIndexSettings(
+        quantization="scalar", on_disk_vectors=True, on_disk_payload=True, hnsw_m=32
+    )
+
+    await configurable_qdrant_service.create_collection(uuid4(), index)
+
+    call = configurable_qdrant_service._async_client.create_collection.call_args
+    assert call.kwargs["vectors_config"].on_disk is True
+    assert call.kwargs["on_disk_payload"] is True
+    assert call.kwargs["hnsw_config"].m == 32
+    quantization = call.kwargs["quantization_config"]
+    assert quantization.scalar.type == models.ScalarType.INT8
+
+
+async def test_create_collection_defaults_match_qdrant(configurable_qdrant_service):
+    await configurable_qdrant_service.create_collection(uuid4())
+
+    call = configurable_qdrant_service._async_client.create_collection.call_args
+    assert call.kwargs["hnsw_config"] is None
+    assert call.kwargs["quantization_config"] is None
+    assert call.kwargs["vectors_config"].on_disk is False
+
+
+async def test_update_collection_config_can_disable_quantization(
+    configurable_qdrant_service,
+):
+    await configurable_qdrant_service.update_collection_config(
+        uuid4(), KBVectorIndexSettings(on_disk_vectors=True)
+    )
+
+    call = configurable_qdrant_service._async_client.update_collection.call_args
+    assert call.kwargs["quantization_config"] == models.Disabled.DISABLED
+    assert call.kwargs["vectors_config"][""].on_disk is True
+
+
+async def test_collection_info_reports_memory_footprint(configurable_qdrant_service):
+    info = MagicMock(points_count=1000, vectors_count=1000, status=None)
+    info.config.params.vectors = models.VectorParams(
+        size=1536, distance=models.Distance.COSINE, on_disk=True
+    )
+    info.config.params.on_disk_payload = True
+    info.config.hnsw_config.m = 16
+    info.config.quantization_config = models.BinaryQuantization(
+        binary=models.BinaryQuantizationConfig(always_ram=True)
+    )
+    configurable_qdrant_service._async_client.get_collection.side_effect = None
+    configurable_qdrant_service._async_client.get_collection.return_value = info
+
+    result = await configurable_qdrant_service.get_collection_info(uuid4())
+
+    memory = result["memory"]
+    assert memory["quantization"] == "binary"
+    assert memory["original_vectors_bytes"] == 1000 * 1536 * 4
+    assert memory["quantized_vectors_bytes"] == 1000 * 1536 // 8
+    # Originals on disk: RAM holds the HNSW graph and the binary vectors
+    assert memory["estimated_ram_bytes"] == (
+        memory["hnsw_bytes"] + memory["quantized_vectors_bytes"]
+    )
+    assert memory["estimated_disk_bytes"] == memory["original_vectors_bytes"]
+
+
+def test_build_search_params():
+    assert build_search_params(KBVectorIndexSettings()) is None
+
+    params = build_search_params(
+        KBVectorIndexSettings(
+            quantization="scalar", quantization_oversampling=3.0, hnsw_ef=128
+        )
+    )
+
+    assert params.hnsw_ef == 128
+    assert params.quantization.oversampling == 3.0
+    assert params.quantization.rescore is True
+
+
+async def test_list_point_ids_scrolls_every_page_without_payloads():
+    service = QdrantService()
+    client = AsyncMock()
+    client.scroll.side_effect = [
+        ([MagicMock(id="p1"), MagicMock(id="p2")], "p3"),
+        ([MagicMock(id="p3")], None),
+    ]
+    service._async_client = client
+    service._async_client_loop = asyncio.get_running_loop()
+    kb_id = uuid4()
+
+    assert await service.list_point_ids(kb_id) == ["p1", "p2", "p3"]
+
+    first, second = client.scroll.call_args_list
+    assert first.kwargs["collection_name"] == f"kb_{kb_id}"
+    assert first.kwargs["with_payload"] is False
+    assert first.kwargs["with_vectors"] is False
+    assert second.kwargs["offset"] == "p3"
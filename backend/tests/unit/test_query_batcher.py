@@ -0,0 +1,154 @@
+"""Unit tests for micro-batching of query embeddings."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import settings
+from app.services.query_batcher import QueryEmbeddingBatcher
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _enable_batching(monkeypatch):
+    monkeypatch.setattr(settings, "query_embedding_batch_enabled", True)
+
+
+@pytest.fixture
+def embed_many():
+    """Embedding call returning [len(text)] per text."""
+
+    async def fake(texts):
+        await asyncio.sleep(0)
+        return [[float(len(text))] for text in texts]
+
+    return AsyncMock(side_effect=fake)
+
+
+async def test_low_traffic_embeds_immediately(embed_many):
+    batcher = QueryEmbeddingBatcher(window_ms=1000, min_qps=1000)
+
+    assert await batcher.embed("abc", embed_many) == [3.0]
+    assert await batcher.embed("de", embed_many) == [2.0]
+
+    assert [call.args[0] for call in embed_many.await_args_list] == [["abc"], ["de"]]
+    assert batcher.stats.direct == 2
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+async def test_explicit_batch_skips_low_traffic_bypass(
+    embed_many, monkeypatch, enabled
+):
+    monkeypatch.setattr(settings, "query_embedding_batch_enabled", enabled)
+    batcher = QueryEmbeddingBatcher(window_ms=5, min_qps=1000)
+
+    results = await asyncio.gather(
+        *(batcher.embed(q, embed_many, batch=True) for q in ["a", "bb", "ccc"])
+    )
+
+    embed_many.assert_awaited_once_with(["a", "bb", "ccc"])
+    assert results == [[1.0], [2.0], [3.0]]
+    assert batcher.stats.direct == 0
+
+
+async def test_concurrent_queries_share_one_request(embed_many):
+    batcher = QueryEmbeddingBatcher(window_ms=5, max_size=32, min_qps=1)
+    queries = [f"query {'x' * n}" for n in range(10)]
+
+    results = await asyncio.gather(*(batcher.embed(q, embed_many) for q in queries))
+
+    embed_many.assert_awaited_once_with(queries)
+    assert results == [[float(len(q))] for q in queries]
+    assert batcher.stats.flushes == 1
+
+
+async def test_full_batch_flushes_without_waiting(embed_many):
+    batcher = QueryEmbeddingBatcher(window_ms=60_000, max_size=3, min_qps=1)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed(q, embed_many) for q in ["a", "bb", "ccc"])),
+        timeout=1,
+    )
+
+    assert results == [[1.0], [2.0], [3.0]]
+
+
+async def test_batches_split_at_max_size(embed_many):
+    batcher = QueryEmbeddingBatcher(window_ms=5, max_size=3, min_qps=1)
+
+    await asyncio.gather(*(batcher.embed(f"q{n}", embed_many) for n in range(7)))
+
+    assert [len(call.args[0]) for call in embed_many.await_args_list] == [3, 3, 1]
+
+
+async def test_duplicate_queries_are_embedded_once(embed_many):
+    batcher = QueryEmbeddingBatcher(window_ms=5, min_qps=1)
+
+    results = await asyncio.gather(
+        batcher.embed("same", embed_many), batcher.embed("same", embed_many)
+    )
+
+    embed_many.assert_awaited_once_with(["same"])
+    assert results == [[4.0], [4.0]]
+
+
+async def test_errors_reach_every_caller(embed_many):
+    embed_many.side_effect = ConnectionError("litellm down")
+    batcher = QueryEmbeddingBatcher(window_ms=5, min_qps=1)
+
+    results = await asyncio.gather(
+        batcher.embed("a", embed_many),
+        batcher.embed("b", embed_many),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    embed_many.assert_awaited_once()
+
+
+async def test_disabled_batcher_embeds_directly(monkeypatch, embed_many):
+    monkeypatch.setattr(settings, "query_embedding_batch_enabled", False)
+    batcher = QueryEmbeddingBatcher(window_ms=5, min_qps=1)
+
+    await asyncio.gather(batcher.embed("a", embed_many), batcher.embed("b", embed_many))
+
+    assert embed_many.await_count == 2
+
+
+async def test_wrong_vector_count_fails_every_caller(embed_many):
+    embed_many.side_effect = None
+    embed_many.return_value = [[1.0]]
+    batcher = QueryEmbeddingBatcher(window_ms=5, min_qps=1)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.embed("a", embed_many),
+            batcher.embed("b", embed_many),
+            return_exceptions=True,
+        ),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_flush_cancels_every_caller():
+    started = asyncio.Event()
+
+    async def hang(texts):
+        started.set()
+        await asyncio.Event().wait()
+
+    batcher = QueryEmbeddingBatcher(window_ms=1, min_qps=1)
+    callers = [asyncio.create_task(batcher.embed(q, hang)) for q in ["a", "b"]]
+    await started.wait()
+
+    for task in list(batcher._flushing):
+        task.cancel()
+    results = await asyncio.wait_for(
+        asyncio.gather(*callers, return_exceptions=True), timeout=1
+    )
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,116 @@
+"""Unit tests for the offline search benchmark harness."""
+
+import pytest
+import structlog
+
+from benchmarks.search_benchmark import (
+    BenchmarkConfig,
+    ScenarioResult,
+    TimerOverhead,
+    compare,
+    format_timer_overhead,
+    main,
+    percentile,
+    placeholder_embedding,
+    run_benchmark,
+    run_timer_overhead,
+)
+
+pytestmark = pytest.mark.unit
+
+TINY = BenchmarkConfig(
+    dimension=8,
+    points_per_kb=20,
+    requests=4,
+    concurrency=2,
+    embed_delay_ms=0,
+    first_token_delay_ms=0,
+    token_delay_ms=0,
+)
+
+
+TINY_ARGS = [
+    "--kb-counts=1",
+    "--modes=quick",
+    "--requests=2",
+    "--dimension=8",
+    "--points-per-kb=5",
+    "--embed-delay-ms=0",
+]
+
+
+def _result(rps: float, p95_ms: float) -> ScenarioResult:
+    return ScenarioResult("sync", 10, 100, rps, 50.0, p95_ms, 120.0)
+
+
+def test_percentile_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_placeholder_embedding_is_deterministic_unit_vector():
+    vector = placeholder_embedding("auth flow", 16)
+
+    assert vector == placeholder_embedding("auth flow", 16)
+    assert vector != placeholder_embedding("billing", 16)
+    assert sum(x * x for x in vector) == pytest.approx(1.0)
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"results": {"sync/10": {"rps": 100.0, "p95_ms": 100.0}}}
+
+    assert compare([_result(rps=90.0, p95_ms=110.0)], baseline, 0.15) == []
+    regressions = compare([_result(rps=80.0, p95_ms=130.0)], baseline, 0.15)
+
+    assert len(regressions) == 2
+    assert all(r.startswith("sync/10") for r in regressions)
+
+
+def test_compare_ignores_scenarios_missing_from_baseline():
+    assert compare([_result(rps=1.0, p95_ms=1e6)], {"results": {}}, 0.15) == []
+
+
+async def test_run_benchmark_covers_every_scenario():
+    results = await run_benchmark(TINY, ["quick", "sync", "stream"], [1, 2])
+
+    assert [r.key for r in results] == [
+        "quick/1",
+        "sync/1",
+        "stream/1",
+        "quick/2",
+        "sync/2",
+        "stream/2",
+    ]
+    assert all(r.requests == TINY.requests and r.rps > 0 for r in results)
+
+
+def test_main_fails_without_baseline(tmp_path, capsys, monkeypatch):
+    # Keep main() from reconfiguring logging for the rest of the suite
+    monkeypatch.setattr(structlog, "configure", lambda **_: None)
+    baseline = tmp_path / "search.json"
+
+    assert main([*TINY_ARGS, f"--baseline={baseline}"]) == 2
+    assert "--save-baseline" in capsys.readouterr().err
+
+    assert main([*TINY_ARGS, f"--baseline={baseline}", "--save-baseline"]) == 0
+    assert main([*TINY_ARGS, f"--baseline={baseline}", "--tolerance=100"]) == 0
+
+
+async def test_timer_overhead_measures_both_timers():
+    overheads = await run_timer_overhead(TINY, [1, 2])
+
+    assert [o.kb_count for o in overheads] == [1, 2]
+    assert all(o.timed_p50_ms > 0 and o.untimed_p50_ms > 0 for o in overheads)
+    assert all(0 < o.bookkeeping_p50_ms < o.timed_p50_ms for o in overheads)
+
+
+def test_format_timer_overhead_reports_percentage():
+    report = format_timer_overhead([TimerOverhead(1, 10, 2.03, 2.0, 0.03, 0.02)])
+
+    assert "quick/1" in report
+    assert "1.00%" in report
+    assert "+1.50%" in report
@@ -0,0 +1,203 @@
+"""Unit tests for the versioned search-result cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.citation import Citation
+from app.schemas.search import SearchResponse, SearchResultSchema
+from app.schemas.sse import CitationEvent, DoneEvent, StatusEvent, TokenEvent
+from app.services.search_cache import (
+    KB_INDEX_GENERATION_PREFIX,
+    SearchResultCache,
+    bump_index_generation,
+)
+from app.services.search_service import KBMetadata, SearchService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def _enable_search_result_cache(monkeypatch):
+    monkeypatch.setattr(settings, "search_result_cache_enabled", True)
+
+
+@pytest.fixture
+def mock_redis():
+    """In-memory stand-in for the async Redis client."""
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+    redis.get.side_effect = lambda key: store.get(key)
+    redis.mget.side_effect = lambda keys: [store.get(k) for k in keys]
+
+    async def setex(key, _ttl, value):
+        store[key] = value
+
+    redis.setex.side_effect = setex
+    redis.store = store
+
+    with patch(
+        "app.services.search_cache.RedisClient.get_client",
+        AsyncMock(return_value=redis),
+    ):
+        yield redis
+
+
+def _response(query: str = "oauth flow") -> SearchResponse:
+    result = SearchResultSchema(
+        document_id="doc-1",
+        document_name="Auth.pdf",
+        kb_id="kb-a",
+        kb_name="Security",
+        chunk_text="OAuth 2.0 with PKCE.",
+        relevance_score=0.9,
+        char_start=0,
+        char_end=20,
+    )
+    citation = Citation(
+        number=1,
+        document_id="doc-1",
+        document_name="Auth.pdf",
+        excerpt="OAuth 2.0 with PKCE.",
+        char_start=0,
+        char_end=20,
+        confidence=0.9,
+    )
+    return SearchResponse(
+        query=query,
+        answer="We use OAuth [1] everywhere.",
+        citations=[citation],
+        confidence=0.85,
+        results=[result],
+        result_count=1,
+    )
+
+
+async def test_store_then_lookup(mock_redis):
+    """Same normalized query and KB set (any order) hits the cache."""
+    cache = SearchResultCache()
+
+    cached, key = await cache.lookup("OAuth  flow", ["kb-b", "kb-a"], 10)
+    assert cached is None
+    await cache.store(key, _response())
+
+    cached, _ = await cache.lookup("oauth flow", ["kb-a", "kb-b"], 10)
+    assert cached == _response()
+
+
+async def test_generation_bump_makes_entries_stale(mock_redis):
+    """Re-indexing one KB invalidates entries that include it."""
+    cache = SearchResultCache()
+    _, key = await cache.lookup("oauth flow", ["kb-a", "kb-b"], 10)
+    await cache.store(key, _response())
+
+    mock_redis.store[f"{KB_INDEX_GENERATION_PREFIX}kb-b"] = "1"
+
+    cached, new_key = await cache.lookup("oauth flow", ["kb-a", "kb-b"], 10)
+    assert cached is None
+    assert new_key != key
+
+
+async def test_limit_is_part_of_key(mock_redis):
+    cache = SearchResultCache()
+    _, key = await cache.lookup("oauth flow", ["kb-a"], 10)
+    await cache.store(key, _response())
+
+    cached, _ = await cache.lookup("oauth flow", ["kb-a"], 5)
+    assert cached is None
+
+
+async def test_redis_failure_is_a_miss():
+    with patch(
+        "app.services.search_cache.RedisClient.get_client",
+        AsyncMock(side_effect=ConnectionError("redis down")),
+    ):
+        cached, key = await SearchResultCache().lookup("q", ["kb-a"], 10)
+
+    assert cached is None
+    assert key is None
+
+
+async def test_bump_index_generation_increments_counter():
+    client = AsyncMock()
+    with patch("app.services.search_cache.redis.from_url", return_value=client):
+        await bump_index_generation("kb-a")
+
+    client.incr.assert_awaited_once_with(f"{KB_INDEX_GENERATION_PREFIX}kb-a")
+    client.aclose.assert_awaited_once()
+
+
+@pytest.fixture
+def search_service():
+    permission_service = AsyncMock()
+    permission_service.check_permissions.return_value = True
+    return SearchService(
+        permission_service=permission_service, audit_service=AsyncMock()
+    )
+
+
+async def test_sync_search_served_from_cache(mock_redis, search_service):
+    """A cache hit skips embedding, Qdrant and synthesis."""
+    _, key = await SearchResultCache().lookup("oauth flow", ["kb-a"], 10)
+    await SearchResultCache().store(key, _response())
+    search_service._embed_query = AsyncMock()
+
+    response = await search_service.search("OAuth Flow", ["kb-a"], "user-1")
+
+    assert response.answer == "We use OAuth [1] everywhere."
+    assert response.query == "OAuth Flow"
+    search_service._embed_query.assert_not_called()
+    search_service.audit_service.log_search.assert_awaited_once()
+
+
+async def test_stream_replays_cached_answer(mock_redis, search_service):
+    """A cache hit in SSE mode replays status, tokens, citations and done."""
+    _, key = await SearchResultCache().lookup("oauth flow", ["kb-a"], 10)
+    await SearchResultCache().store(key, _response())
+    search_service._embed_query = AsyncMock()
+
+    stream = await search_service.search("oauth flow", ["kb-a"], "user-1", stream=True)
+    events = [event async for event in stream]
+
+    assert isinstance(events[0], StatusEvent)
+    tokens = [e.content for e in events if isinstance(e, TokenEvent)]
+    assert "".join(tokens) == "We use OAuth [1] everywhere."
+    citation_index = next(
+        i for i, e in enumerate(events) if isinstance(e, CitationEvent)
+    )
+    # Citation follows the token that completes the [1] marker
+    assert events[citation_index - 1].content == "[1] "
+    assert isinstance(events[-1], DoneEvent)
+    assert events[-1].confidence == 0.85
+    search_service._embed_query.assert_not_called()
+
+
+async def test_sync_search_populates_cache(mock_redis, search_service):
+    """A miss runs the pipeline and stores the synthesized response."""
+    search_service._embed_query = AsyncMock(return_value=[0.1] * 4)
+    search_service._get_kb_metadata = AsyncMock(
+        return_value=KBMetadata(names={"kb-a": "Security"})
+    )
+    search_service._search_collections = AsyncMock(
+        return_value=[
+            {
+                "document_id": "doc-1",
+                "document_name": "Auth.pdf",
+                "kb_id": "kb-a",
+                "chunk_text": "OAuth 2.0 with PKCE.",
+                "score": 0.9,
+                "char_start": 0,
+                "char_end": 20,
+            }
+        ]
+    )
+    search_service._synthesize_answer = AsyncMock(return_value="OAuth [1].")
+    search_service.citation_service = MagicMock()
+    search_service.citation_service.extract_citations.return_value = ("OAuth [1].", [])
+
+    await search_service.search("oauth flow", ["kb-a"], "user-1")
+    await search_service.search("oauth flow", ["kb-a"], "user-1")
+
+    search_service._embed_query.assert_awaited_once()
+    mock_redis.setex.assert_awaited_once()
@@ -1,22 +1,37 @@
 """Unit tests for SearchService (Story 3.1 - Task 4)."""
 
-import json
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.config import settings
+from app.core.timing import Deadline
+from app.integrations.llm_rate_limiter import RateLimitWaitExceededError
 from app.schemas.search import QuickSearchResponse, SearchResponse
-from app.services.search_service import SearchService
+from app.services.admission import SYNTHESIS_OVERLOADED, AdmissionRejectedError
+from app.services.embedding_cache import pack_vector
+from app.services.search_service import (
+    QUICK_SEARCH_PAYLOAD_FIELDS,
+    SEARCH_RESULT_PAYLOAD,
+    SYNTHESIS_DEADLINE_EXCEEDED,
+    KBMetadata,
+    SearchService,
+)
 
 pytestmark = pytest.mark.unit
 
+# The real KB metadata query (conftest stubs it out for every test)
+_get_kb_metadata = SearchService._get_kb_metadata
+
 
 @pytest.fixture
 def mock_permission_service():
     """Mock KBPermissionService."""
     service = AsyncMock()
     service.get_permitted_kb_ids.return_value = ["kb-123", "kb-456"]
-    service.check_permission.return_value = True
+    service.check_permissions.return_value = True
     return service
 
 
@@ -54,7 +69,9 @@ async def test_embed_query_generates_embedding(search_service):
     with patch("app.services.search_service.embedding_client") as mock_client:
         mock_client.get_embeddings = AsyncMock(return_value=[expected_embedding])
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None  # Cache miss
             mock_redis_instance.setex = AsyncMock()
@@ -75,7 +92,9 @@ async def test_embed_query_raises_connection_error_on_litellm_failure(search_ser
     with patch("app.services.search_service.embedding_client") as mock_client:
         mock_client.get_embeddings = AsyncMock(side_effect=Exception("LiteLLM error"))
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis.return_value = mock_redis_instance
@@ -93,11 +112,13 @@ async def test_embed_query_raises_connection_error_on_litellm_failure(search_ser
 async def test_embed_query_cache_hit(search_service):
     """Test _embed_query returns cached embedding on cache hit."""
     query = "cached query"
-    cached_embedding = [0.4, 0.5, 0.6]
+    cached_embedding = [0.25, 0.5, 0.75]  # exactly representable in float32
 
-    with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+    with patch(
+        "app.services.embedding_cache.BinaryRedisClient.get_client"
+    ) as mock_redis:
         mock_redis_instance = AsyncMock()
-        mock_redis_instance.get.return_value = json.dumps(cached_embedding)
+        mock_redis_instance.get.return_value = pack_vector(cached_embedding)
         mock_redis.return_value = mock_redis_instance
 
         result = await search_service._embed_query(query)
@@ -115,7 +136,9 @@ async def test_embed_query_cache_miss_stores_result(search_service):
     with patch("app.services.search_service.embedding_client") as mock_client:
         mock_client.get_embeddings = AsyncMock(return_value=[embedding])
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis_instance.setex = AsyncMock()
@@ -123,10 +146,11 @@ async def test_embed_query_cache_miss_stores_result(search_service):
 
             await search_service._embed_query(query)
 
-            # Verify cache was populated with 1-hour TTL (3600s)
+            # Verify cache was populated with 1-hour TTL (3600s) as float32 bytes
             mock_redis_instance.setex.assert_called_once()
             call_args = mock_redis_instance.setex.call_args[0]
             assert call_args[1] == 3600  # TTL
+            assert call_args[2] == pack_vector(embedding)
 
 
 # =============================================================================
@@ -154,11 +178,14 @@ async def test_search_collections_returns_chunks(search_service):
         "char_end": 100,
     }
 
-    search_service.qdrant_client = MagicMock()
+    search_service.qdrant_client = AsyncMock()
     search_service.qdrant_client.search.return_value = [mock_result]
 
     chunks = await search_service._search_collections(embedding, kb_ids, limit)
 
+    call = search_service.qdrant_client.search.call_args.kwargs
+    assert call["with_payload"] == SEARCH_RESULT_PAYLOAD
+    assert SEARCH_RESULT_PAYLOAD.exclude == ["stems"]
     assert len(chunks) == 1
     assert chunks[0]["kb_id"] == "kb-123"
     assert chunks[0]["score"] == 0.95
@@ -195,7 +222,7 @@ async def test_search_collections_sorts_by_relevance(search_service):
         "char_end": 50,
     }
 
-    search_service.qdrant_client = MagicMock()
+    search_service.qdrant_client = AsyncMock()
     search_service.qdrant_client.search.side_effect = [
         [mock_result1],  # First KB
         [mock_result2],  # Second KB
@@ -222,7 +249,7 @@ async def test_search_collections_raises_connection_error_on_qdrant_failure(
     kb_ids = ["kb-123"]
     limit = 10
 
-    search_service.qdrant_client = MagicMock()
+    search_service.qdrant_client = AsyncMock()
     search_service.qdrant_client.search.side_effect = Exception("Qdrant error")
 
     with pytest.raises(ConnectionError, match="Vector search unavailable"):
@@ -244,13 +271,15 @@ async def test_search_returns_empty_results_with_message(search_service):
     with patch("app.services.search_service.embedding_client") as mock_client:
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis_instance.setex = AsyncMock()
             mock_redis.return_value = mock_redis_instance
 
-            search_service.qdrant_client = MagicMock()
+            search_service.qdrant_client = AsyncMock()
             search_service.qdrant_client.search.return_value = []  # No results
 
             response = await search_service.search(query, kb_ids, user_id, limit=10)
@@ -275,13 +304,14 @@ async def test_search_checks_permissions_before_search(
     kb_ids = ["kb-123"]
     user_id = "user-1"
 
-    mock_permission_service.check_permission.return_value = False
+    mock_permission_service.check_permissions.return_value = False
 
     with pytest.raises(PermissionError):
         await search_service.search(query, kb_ids, user_id)
 
-    mock_permission_service.check_permission.assert_called_once_with(
-        user_id, "kb-123", "READ"
+    # All requested KBs are checked in one batched call
+    mock_permission_service.check_permissions.assert_called_once_with(
+        user_id, ["kb-123"], "READ"
     )
 
 
@@ -295,13 +325,15 @@ async def test_search_logs_audit_event(search_service, mock_audit_service):
     with patch("app.services.search_service.embedding_client") as mock_client:
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis_instance.setex = AsyncMock()
             mock_redis.return_value = mock_redis_instance
 
-            search_service.qdrant_client = MagicMock()
+            search_service.qdrant_client = AsyncMock()
             search_service.qdrant_client.search.return_value = []
 
             await search_service.search(query, kb_ids, user_id)
@@ -450,14 +482,16 @@ async def test_search_with_answer_synthesis_success(search_service):
         ].message.content = "OAuth 2.0 [1] is an authorization framework."
         mock_embed_client.chat_completion = AsyncMock(return_value=mock_response)
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis_instance.setex = AsyncMock()
             mock_redis.return_value = mock_redis_instance
 
             # Mock Qdrant results
-            search_service.qdrant_client = MagicMock()
+            search_service.qdrant_client = AsyncMock()
             mock_result = MagicMock()
             mock_result.score = 0.92
             mock_result.payload = {
@@ -494,14 +528,16 @@ async def test_search_synthesis_failure_graceful_degradation(search_service):
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1, 0.2]])
         mock_client.chat_completion = AsyncMock(side_effect=Exception("LLM error"))
 
-        with patch("app.services.search_service.RedisClient.get_client") as mock_redis:
+        with patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis:
             mock_redis_instance = AsyncMock()
             mock_redis_instance.get.return_value = None
             mock_redis_instance.setex = AsyncMock()
             mock_redis.return_value = mock_redis_instance
 
             # Mock Qdrant results
-            search_service.qdrant_client = MagicMock()
+            search_service.qdrant_client = AsyncMock()
             mock_result = MagicMock()
             mock_result.score = 0.92
             mock_result.payload = {
@@ -526,6 +562,63 @@ async def test_search_synthesis_failure_graceful_degradation(search_service):
             assert response.result_count == 1  # Raw results still returned
 
 
+@pytest.mark.asyncio
+async def test_search_returns_results_when_synthesis_is_shed(search_service):
+    """An overloaded LLM yields retrieval-only results flagged as skipped."""
+    search_service._embed_query = AsyncMock(return_value=[0.1, 0.2])
+    search_service._search_collections = AsyncMock(
+        return_value=[
+            {
+                "document_id": "doc-1",
+                "document_name": "Test.pdf",
+                "kb_id": "kb-123",
+                "chunk_text": "test",
+                "score": 0.92,
+                "char_start": 0,
+                "char_end": 4,
+            }
+        ]
+    )
+    search_service._synthesize_answer = AsyncMock(
+        side_effect=AdmissionRejectedError("synthesis", "queue_full")
+    )
+
+    response = await search_service.search("test", ["kb-123"], "user-1")
+
+    assert response.answer == ""
+    assert response.result_count == 1
+    assert response.synthesis_skipped == SYNTHESIS_OVERLOADED
+
+
+@pytest.mark.asyncio
+async def test_synthesis_is_shed_when_llm_quota_wait_is_too_long(search_service):
+    """Waiting past the rate limiter's max_wait sheds synthesis like overload."""
+    search_service._embed_query = AsyncMock(return_value=[0.1, 0.2])
+    search_service._search_collections = AsyncMock(
+        return_value=[
+            {
+                "document_id": "doc-1",
+                "document_name": "Test.pdf",
+                "kb_id": "kb-123",
+                "chunk_text": "test",
+                "score": 0.92,
+                "char_start": 0,
+                "char_end": 4,
+            }
+        ]
+    )
+
+    with patch("app.services.search_service.embedding_client") as mock_client:
+        mock_client.chat_completion = AsyncMock(
+            side_effect=RateLimitWaitExceededError("llm", 30.0)
+        )
+        response = await search_service.search("test", ["kb-123"], "user-1")
+
+    assert response.answer == ""
+    assert response.result_count == 1
+    assert response.synthesis_skipped == SYNTHESIS_OVERLOADED
+
+
 # =============================================================================
 # Story 3.7: Test quick_search() method
 # =============================================================================
@@ -545,7 +638,9 @@ async def test_quick_search_returns_top_5_results(
 
     with (
         patch("app.services.search_service.embedding_client") as mock_client,
-        patch("app.services.search_service.RedisClient.get_client") as mock_redis,
+        patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis,
     ):
         # Mock embedding
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1] * 1536])
@@ -557,7 +652,7 @@ async def test_quick_search_returns_top_5_results(
         mock_redis.return_value = mock_redis_instance
 
         # Mock Qdrant results (5 results)
-        search_service.qdrant_client = MagicMock()
+        search_service.qdrant_client = AsyncMock()
         mock_results = []
         for i in range(5):
             mock_result = MagicMock()
@@ -605,7 +700,9 @@ async def test_quick_search_truncates_excerpt(search_service, mock_permission_se
 
     with (
         patch("app.services.search_service.embedding_client") as mock_client,
-        patch("app.services.search_service.RedisClient.get_client") as mock_redis,
+        patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis,
     ):
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1] * 1536])
         mock_redis_instance = AsyncMock()
@@ -613,7 +710,7 @@ async def test_quick_search_truncates_excerpt(search_service, mock_permission_se
         mock_redis.return_value = mock_redis_instance
 
         # Mock result with long chunk_text
-        search_service.qdrant_client = MagicMock()
+        search_service.qdrant_client = AsyncMock()
         mock_result = MagicMock()
         mock_result.score = 0.95
         long_text = "a" * 200  # 200 characters
@@ -633,6 +730,27 @@ async def test_quick_search_truncates_excerpt(search_service, mock_permission_se
         assert response.results[0].excerpt.endswith("...")
 
 
+@pytest.mark.asyncio
+async def test_quick_search_fetches_excerpt_not_chunk_text(search_service):
+    """Quick search projects the payload and uses the precomputed excerpt."""
+    mock_result = MagicMock()
+    mock_result.score = 0.9
+    mock_result.payload = {
+        "document_id": "doc-1",
+        "document_name": "test.pdf",
+        "excerpt": "Precomputed excerpt...",
+    }
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search.return_value = [mock_result]
+    search_service._embed_query = AsyncMock(return_value=[0.1] * 4)
+
+    response = await search_service.quick_search("test", ["kb-123"], "user-1")
+
+    call = search_service.qdrant_client.search.call_args.kwargs
+    assert call["with_payload"] == QUICK_SEARCH_PAYLOAD_FIELDS
+    assert response.results[0].excerpt == "Precomputed excerpt..."
+
+
 @pytest.mark.asyncio
 async def test_quick_search_respects_permissions(
     search_service, mock_permission_service
@@ -644,7 +762,7 @@ async def test_quick_search_respects_permissions(
 
     # User only has access to kb-123, not kb-restricted
     mock_permission_service.get_permitted_kb_ids.return_value = ["kb-123"]
-    mock_permission_service.check_permission = AsyncMock(
+    mock_permission_service.check_permissions = AsyncMock(
         return_value=False
     )  # No access
 
@@ -664,14 +782,16 @@ async def test_quick_search_cross_kb_default(search_service, mock_permission_ser
 
     with (
         patch("app.services.search_service.embedding_client") as mock_client,
-        patch("app.services.search_service.RedisClient.get_client") as mock_redis,
+        patch(
+            "app.services.embedding_cache.BinaryRedisClient.get_client"
+        ) as mock_redis,
     ):
         mock_client.get_embeddings = AsyncMock(return_value=[[0.1] * 1536])
         mock_redis_instance = AsyncMock()
         mock_redis_instance.get.return_value = None
         mock_redis.return_value = mock_redis_instance
 
-        search_service.qdrant_client = MagicMock()
+        search_service.qdrant_client = AsyncMock()
         search_service.qdrant_client.search.return_value = []  # No results
 
         response = await search_service.quick_search(
@@ -680,3 +800,589 @@ async def test_quick_search_cross_kb_default(search_service, mock_permission_ser
 
         # Should search all 3 KBs
         assert response.kb_count == 3
+
+
+# =============================================================================
+# Stage DAG: embedding, ACL and KB metadata run concurrently
+# =============================================================================
+
+STAGE_DELAY_SECONDS = 0.1
+
+
+def _slow(result):
+    async def _stage(*_args, **_kwargs):
+        await asyncio.sleep(STAGE_DELAY_SECONDS)
+        return result
+
+    return _stage
+
+
+@pytest.fixture
+def slow_stage_service(search_service, mock_permission_service):
+    """SearchService whose ACL, embedding and KB-name stages each take 100ms."""
+    mock_permission_service.check_permissions.side_effect = _slow(True)
+    search_service._embed_query = AsyncMock(side_effect=_slow([0.1] * 4))
+    search_service._get_kb_metadata = AsyncMock(
+        side_effect=_slow(KBMetadata(names={"kb-1": "KB"}))
+    )
+    search_service._search_collections = AsyncMock(return_value=[])
+    return search_service
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap(slow_stage_service):
+    """ACL, embedding and KB names run at once instead of back to back."""
+    start = time.perf_counter()
+    await slow_stage_service.quick_search("test", ["kb-1"], "user-1")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2 * STAGE_DELAY_SECONDS
+    slow_stage_service._search_collections.assert_awaited_once_with(
+        [0.1] * 4,
+        ["kb-1"],
+        limit=5,
+        kb_name_map={"kb-1": "KB"},
+        payload_fields=QUICK_SEARCH_PAYLOAD_FIELDS,
+        kb_search_params={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_stage_timings_logged(slow_stage_service):
+    """Completion log carries per-stage durations."""
+    with patch("app.services.search_service.logger") as mock_logger:
+        await slow_stage_service.search("test", ["kb-1"], "user-1")
+
+    completed = [
+        c for c in mock_logger.info.call_args_list if c.args[0] == "search_completed"
+    ]
+    stage_ms = completed[0].kwargs["stage_ms"]
+    assert {"acl", "embed", "kb_metadata", "qdrant", "audit"} <= stage_ms.keys()
+
+
+@pytest.mark.asyncio
+async def test_permission_denied_cancels_pending_stages(
+    slow_stage_service, mock_permission_service
+):
+    """A failed ACL check does not leave the embedding call running."""
+    mock_permission_service.check_permissions.side_effect = None
+    mock_permission_service.check_permissions.return_value = False
+    embed_finished = asyncio.Event()
+
+    async def slow_embed(_query):
+        await asyncio.sleep(STAGE_DELAY_SECONDS)
+        embed_finished.set()
+        return [0.1] * 4
+
+    slow_stage_service._embed_query = slow_embed
+
+    with pytest.raises(PermissionError):
+        await slow_stage_service.search("test", ["kb-1"], "user-1")
+    await asyncio.sleep(STAGE_DELAY_SECONDS * 1.5)
+
+    assert not embed_finished.is_set()
+
+
+# =============================================================================
+# Latency budget: straggler KBs are dropped and reported
+# =============================================================================
+
+
+def _chunk_result(score: float) -> MagicMock:
+    result = MagicMock()
+    result.score = score
+    result.payload = {
+        "document_id": "doc-1",
+        "document_name": "test.pdf",
+        "chunk_text": "Content",
+        "char_start": 0,
+        "char_end": 50,
+    }
+    return result
+
+
+@pytest.mark.asyncio
+async def test_search_collections_drops_straggler_kbs(search_service):
+    """KBs still searching at the deadline are cancelled and reported."""
+
+    async def qdrant_search(collection_name, **_kwargs):
+        if collection_name == "kb_kb-slow":
+            await asyncio.sleep(1)
+        return [_chunk_result(0.8)]
+
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search.side_effect = qdrant_search
+    partial_kbs: list[str] = []
+
+    start = time.perf_counter()
+    chunks = await search_service._search_collections(
+        [0.1] * 4,
+        ["kb-fast", "kb-slow"],
+        10,
+        deadline=Deadline(50),
+        partial_kbs=partial_kbs,
+    )
+
+    assert time.perf_counter() - start < 0.5
+    assert [c["kb_id"] for c in chunks] == ["kb-fast"]
+    assert partial_kbs == ["kb-slow"]
+
+
+@pytest.mark.asyncio
+async def test_search_collections_all_stragglers_raise(search_service):
+    """If no KB answers in time the search fails like a Qdrant outage."""
+
+    async def qdrant_search(**_kwargs):
+        await asyncio.sleep(1)
+
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search.side_effect = qdrant_search
+
+    with pytest.raises(ConnectionError, match="Vector search unavailable"):
+        await search_service._search_collections(
+            [0.1] * 4, ["kb-slow"], 10, deadline=Deadline(20)
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_reports_partial_kbs_and_skips_cache(search_service):
+    """Partial results are flagged in the response and never cached."""
+
+    async def search_collections(*_args, partial_kbs, **_kwargs):
+        partial_kbs.append("kb-456")
+        return []
+
+    search_service._embed_query = AsyncMock(return_value=[0.1] * 4)
+    search_service._search_collections = AsyncMock(side_effect=search_collections)
+
+    with patch(
+        "app.services.search_service.search_result_cache.store", AsyncMock()
+    ) as store:
+        response = await search_service.search(
+            "test", ["kb-123", "kb-456"], "user-1", deadline_ms=500
+        )
+
+    assert response.partial_kbs == ["kb-456"]
+    store.assert_not_called()
+    deadline = search_service._search_collections.call_args.kwargs["deadline"]
+    assert deadline.budget_ms == 500 * settings.search_retrieval_share
+
+
+@pytest.mark.asyncio
+async def test_embedding_past_deadline_raises_connection_error(search_service):
+    search_service._embed_query = AsyncMock(side_effect=_slow([0.1] * 4))
+
+    with pytest.raises(ConnectionError, match="timed out"):
+        await search_service.search("test", ["kb-123"], "user-1", deadline_ms=100)
+
+
+_DEADLINE_CHUNK = {
+    "document_id": "doc-1",
+    "document_name": "Test.pdf",
+    "kb_id": "kb-123",
+    "chunk_text": "test",
+    "score": 0.92,
+    "char_start": 0,
+    "char_end": 4,
+}
+
+
+@pytest.mark.asyncio
+async def test_slow_synthesis_is_skipped_at_deadline(search_service):
+    """Synthesis that outlives the budget returns results flagged, not failed."""
+    search_service._embed_query = AsyncMock(return_value=[0.1] * 4)
+    search_service._search_collections = AsyncMock(return_value=[_DEADLINE_CHUNK])
+
+    async def slow_completion(*_args, **_kwargs):
+        await asyncio.sleep(1)
+        return "too late [1]"
+
+    with (
+        patch("app.services.search_service.embedding_client") as mock_client,
+        patch(
+            "app.services.search_service.search_result_cache.store", AsyncMock()
+        ) as store,
+    ):
+        mock_client.chat_completion = AsyncMock(side_effect=slow_completion)
+        response = await search_service.search(
+            "test", ["kb-123"], "user-1", deadline_ms=100
+        )
+
+    assert response.answer == ""
+    assert response.result_count == 1
+    assert response.synthesis_skipped == SYNTHESIS_DEADLINE_EXCEEDED
+    store.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_synthesis_not_started_when_budget_is_spent(search_service):
+    """No LLM call is made once retrieval has used the whole budget."""
+    search_service._embed_query = AsyncMock(return_value=[0.1] * 4)
+    search_service._search_collections = AsyncMock(side_effect=_slow([_DEADLINE_CHUNK]))
+
+    with patch("app.services.search_service.embedding_client") as mock_client:
+        mock_client.chat_completion = AsyncMock(return_value="answer [1]")
+        response = await search_service.search(
+            "test", ["kb-123"], "user-1", deadline_ms=50
+        )
+
+    mock_client.chat_completion.assert_not_called()
+    assert response.result_count == 1
+    assert response.synthesis_skipped == SYNTHESIS_DEADLINE_EXCEEDED
+
+
+def test_deadline_share_is_capped_by_parent():
+    deadline = Deadline(1000)
+
+    retrieval = deadline.share(0.3)
+
+    assert retrieval.budget_ms == 300
+    assert retrieval.remaining() <= deadline.remaining()
+    assert deadline.share(2.0).budget_ms == 1000
+    assert not deadline.expired
+
+
+@pytest.mark.asyncio
+async def test_search_collections_passes_per_kb_search_params(search_service):
+    """Each KB is searched with its own hnsw_ef / quantization params."""
+    tuned = MagicMock(name="search_params")
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search.return_value = []
+
+    await search_service._search_collections(
+        [0.1] * 4, ["kb-tuned", "kb-default"], 10, kb_search_params={"kb-tuned": tuned}
+    )
+
+    params = {
+        c.kwargs["collection_name"]: c.kwargs["search_params"]
+        for c in search_service.qdrant_client.search.call_args_list
+    }
+    assert params == {"kb_kb-tuned": tuned, "kb_kb-default": None}
+
+
+@pytest.mark.asyncio
+async def test_kb_names_and_search_params_fetched_in_one_query(search_service):
+    """Display names and per-KB search params come from a single query."""
+    tuned = MagicMock(id="kb-tuned", settings={"vector_index": {"hnsw_ef": 256}})
+    tuned.name = "Tuned"
+    default = MagicMock(id="kb-default", settings=None)
+    default.name = "Default"
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(
+        all=MagicMock(return_value=[tuned, default])
+    )
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+
+    with patch("app.core.database.async_session_factory", session_factory):
+        metadata = await _get_kb_metadata(search_service, ["kb-tuned", "kb-default"])
+
+    session.execute.assert_awaited_once()
+    assert metadata.names == {"kb-tuned": "Tuned", "kb-default": "Default"}
+    assert metadata.search_params.keys() == {"kb-tuned"}
+    assert metadata.search_params["kb-tuned"].hnsw_ef == 256
+
+
+# =============================================================================
+# Batch search: one embedding request, one search_batch per KB
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_embed_queries_sends_misses_in_one_request(search_service):
+    """Cached queries are skipped and duplicate misses are embedded once."""
+    cached = {"cached": [0.5, 0.5]}
+    cache = MagicMock()
+    cache.get = AsyncMock(side_effect=lambda query, _model: cached.get(query))
+    cache.key_for = MagicMock(side_effect=lambda query, model: f"{model}:{query}")
+    cache.set = AsyncMock()
+
+    with (
+        patch("app.services.search_service.query_embedding_cache", cache),
+        patch("app.services.search_service.embedding_client") as mock_client,
+    ):
+        mock_client.get_embeddings = AsyncMock(return_value=[[0.1, 0.1], [0.2, 0.2]])
+
+        result = await search_service._embed_queries(["a", "cached", "b", "a"])
+
+    mock_client.get_embeddings.assert_awaited_once_with(["a", "b"])
+    assert result == [[0.1, 0.1], [0.5, 0.5], [0.2, 0.2], [0.1, 0.1]]
+    assert cache.set.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_embed_queries_joins_in_flight_single_query(search_service):
+    """A miss already being embedded by a single search is not sent again."""
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.key_for = MagicMock(side_effect=lambda query, model: f"{model}:{query}")
+    cache.set = AsyncMock()
+    release = asyncio.Event()
+    requests: list[list[str]] = []
+
+    async def get_embeddings(texts):
+        requests.append(texts)
+        await release.wait()
+        return [[float(len(text))] * 2 for text in texts]
+
+    with (
+        patch("app.services.search_service.query_embedding_cache", cache),
+        patch("app.services.search_service.embedding_client") as mock_client,
+    ):
+        mock_client.get_embeddings = AsyncMock(side_effect=get_embeddings)
+        single = asyncio.create_task(search_service._embed_query("aa"))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(search_service._embed_queries(["aa", "bbb"]))
+        await asyncio.sleep(0.02)
+        release.set()
+        await single
+        result = await batch
+
+    assert requests == [["aa"], ["bbb"]]
+    assert result == [[2.0, 2.0], [3.0, 3.0]]
+
+
+@pytest.mark.asyncio
+async def test_search_collections_batch_one_call_per_kb(search_service):
+    """Every KB gets a single search_batch carrying all query vectors."""
+
+    async def search_batch(collection_name, requests):
+        if collection_name == "kb_kb-down":
+            raise ConnectionError("qdrant down")
+        return [[_chunk_result(0.9 - i / 10)] for i in range(len(requests))]
+
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search_batch.side_effect = search_batch
+    partial_kbs: list[str] = []
+
+    chunks_per_query = await search_service._search_collections_batch(
+        [[0.1] * 4, [0.2] * 4],
+        ["kb-123", "kb-456", "kb-down"],
+        1,
+        partial_kbs=partial_kbs,
+    )
+
+    assert search_service.qdrant_client.search_batch.await_count == 3
+    call = search_service.qdrant_client.search_batch.call_args_list[0]
+    assert len(call.kwargs["requests"]) == 2
+    assert call.kwargs["requests"][0].with_payload == SEARCH_RESULT_PAYLOAD
+    assert [len(chunks) for chunks in chunks_per_query] == [1, 1]
+    assert chunks_per_query[1][0]["score"] == pytest.approx(0.8)
+    assert partial_kbs == ["kb-down"]
+
+
+@pytest.mark.asyncio
+async def test_batch_search_checks_permissions_once_and_bulk_audits(
+    search_service, mock_permission_service, mock_audit_service
+):
+    chunk = {
+        "document_id": "doc-1",
+        "document_name": "test.pdf",
+        "kb_id": "kb-123",
+        "chunk_text": "Content",
+        "score": 0.9,
+        "char_start": 0,
+        "char_end": 7,
+    }
+    search_service._embed_queries = AsyncMock(return_value=[[0.1] * 4] * 3)
+    search_service._search_collections_batch = AsyncMock(
+        return_value=[[chunk], [], [chunk]]
+    )
+
+    response = await search_service.batch_search(
+        ["q1", "q2", "q3"], ["kb-123"], "user-1"
+    )
+
+    assert [r.query for r in response.responses] == ["q1", "q2", "q3"]
+    assert [r.result_count for r in response.responses] == [1, 0, 1]
+    assert response.responses[1].message is not None
+    mock_permission_service.check_permissions.assert_awaited_once()
+    search_service._embed_queries.assert_awaited_once_with(["q1", "q2", "q3"])
+    mock_audit_service.log_search.assert_not_called()
+    mock_audit_service.log_searches.assert_awaited_once()
+    searches = mock_audit_service.log_searches.call_args.kwargs["searches"]
+    assert [s["query"] for s in searches] == ["q1", "q2", "q3"]
+
+
+@pytest.mark.asyncio
+async def test_batch_search_denied_caller_embeds_nothing(
+    search_service, mock_permission_service
+):
+    """The ACL check runs before any query reaches LiteLLM."""
+    mock_permission_service.check_permissions.return_value = False
+    search_service._embed_queries = AsyncMock(return_value=[[0.1] * 4])
+
+    with pytest.raises(PermissionError):
+        await search_service.batch_search(["q1"], ["kb-123"], "user-1")
+
+    search_service._embed_queries.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_search_bounds_synthesis_concurrency(search_service, monkeypatch):
+    monkeypatch.setattr(settings, "search_batch_synthesis_concurrency", 2)
+    chunk = {
+        "document_id": "doc-1",
+        "document_name": "test.pdf",
+        "kb_id": "kb-123",
+        "chunk_text": "Content",
+        "score": 0.9,
+        "char_start": 0,
+        "char_end": 7,
+    }
+    search_service._embed_queries = AsyncMock(return_value=[[0.1] * 4] * 5)
+    search_service._search_collections_batch = AsyncMock(return_value=[[chunk]] * 5)
+    in_flight = peak = 0
+
+    async def synthesize(_query, _chunks):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "Answer [1]."
+
+    search_service._synthesize_answer = AsyncMock(side_effect=synthesize)
+
+    response = await search_service.batch_search(
+        [f"q{i}" for i in range(5)], ["kb-123"], "user-1", synthesize=True
+    )
+
+    assert peak == 2
+    assert search_service._synthesize_answer.await_count == 5
+    assert all(r.answer == "Answer [1]." for r in response.responses)
+
+
+# =============================================================================
+# Similar search: server-side recommend, chunk -> KB lookup
+# =============================================================================
+
+
+def _similar_service(search_service, source_points):
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.retrieve.return_value = source_points
+    search_service.qdrant_client.recommend.return_value = [_chunk_result(0.8)]
+    search_service._synthesize_answer = AsyncMock(return_value="")
+    return search_service
+
+
+@pytest.mark.asyncio
+async def test_similar_search_recommends_without_fetching_vectors(search_service):
+    """The source point is the positive example; its vector stays in Qdrant."""
+    service = _similar_service(
+        search_service, [MagicMock(payload={"document_name": "a.pdf"})]
+    )
+
+    response = await service.similar_search(
+        "chunk-1", ["kb-123", "kb-456"], "user-1", limit=5, source_kb_id="kb-123"
+    )
+
+    assert response.query == "Similar to: a.pdf"
+    retrieve = service.qdrant_client.retrieve.call_args.kwargs
+    assert retrieve["collection_name"] == "kb_kb-123"
+    assert not retrieve.get("with_vectors")
+    calls = {
+        c.kwargs["collection_name"]: c.kwargs
+        for c in service.qdrant_client.recommend.call_args_list
+    }
+    assert calls["kb_kb-123"]["positive"] == ["chunk-1"]
+    assert calls["kb_kb-123"]["with_payload"] == SEARCH_RESULT_PAYLOAD
+    assert calls["kb_kb-123"]["lookup_from"] is None
+    assert calls["kb_kb-456"]["lookup_from"].collection == "kb_kb-123"
+    assert response.result_count == 2
+
+
+@pytest.mark.asyncio
+async def test_similar_search_uses_chunk_kb_map(search_service):
+    service = _similar_service(
+        search_service, [MagicMock(payload={"document_name": "a.pdf"})]
+    )
+
+    with patch(
+        "app.services.search_service.lookup_chunk_kb",
+        AsyncMock(return_value="kb-456"),
+    ):
+        await service.similar_search("chunk-1", ["kb-123", "kb-456"], "user-1")
+
+    service.qdrant_client.retrieve.assert_awaited_once()
+    assert (
+        service.qdrant_client.retrieve.call_args.kwargs["collection_name"]
+        == "kb_kb-456"
+    )
+
+
+@pytest.mark.asyncio
+async def test_similar_search_probes_and_remembers_unmapped_chunk(search_service):
+    service = _similar_service(search_service, [])
+
+    async def retrieve(collection_name, **_kwargs):
+        if collection_name == "kb_kb-456":
+            return [MagicMock(payload={"document_name": "b.pdf"})]
+        return []
+
+    service.qdrant_client.retrieve.side_effect = retrieve
+
+    with (
+        patch(
+            "app.services.search_service.lookup_chunk_kb",
+            AsyncMock(return_value=None),
+        ),
+        patch("app.services.search_service.remember_chunk_kb", AsyncMock()) as remember,
+    ):
+        response = await service.similar_search(
+            "chunk-1", ["kb-123", "kb-456"], "user-1"
+        )
+
+    assert response.query == "Similar to: b.pdf"
+    remember.assert_awaited_once_with("chunk-1", "kb-456")
+
+
+@pytest.mark.asyncio
+async def test_similar_search_missing_chunk_raises_value_error(search_service):
+    service = _similar_service(search_service, [])
+
+    with (
+        patch(
+            "app.services.search_service.lookup_chunk_kb",
+            AsyncMock(return_value=None),
+        ),
+        pytest.raises(ValueError, match="no longer available"),
+    ):
+        await service.similar_search("chunk-1", ["kb-123"], "user-1")
+
+    service.qdrant_client.recommend.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_embedding_and_search(
+    search_service,
+):
+    """A burst of the same question makes one LiteLLM and one Qdrant call."""
+
+    async def slow_search(**_kwargs):
+        await asyncio.sleep(0.01)
+        return [_chunk_result(0.9)]
+
+    search_service.qdrant_client = AsyncMock()
+    search_service.qdrant_client.search.side_effect = slow_search
+
+    with (
+        patch("app.services.search_service.embedding_client") as mock_client,
+        patch(
+            "app.services.search_service.query_embedding_cache.get",
+            AsyncMock(return_value=None),
+        ),
+        patch("app.services.search_service.query_embedding_cache.set", AsyncMock()),
+    ):
+        mock_client.model = "test-model"
+        mock_client.get_embeddings = AsyncMock(return_value=[[0.3] * 4])
+
+        async def one_request():
+            embedding = await search_service._embed_query("popular question")
+            return await search_service._search_collections(embedding, ["kb-123"], 10)
+
+        results = await asyncio.gather(*(one_request() for _ in range(5)))
+
+    mock_client.get_embeddings.assert_awaited_once()
+    search_service.qdrant_client.search.assert_awaited_once()
+    assert all(len(chunks) == 1 for chunks in results)
@@ -4,20 +4,24 @@ Tests SearchService._search_stream() and SSE event serialization.
 All dependencies (LiteLLM, Qdrant) are mocked.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.timing import Deadline
 from app.schemas.citation import Citation
 from app.schemas.search import SearchResultSchema
 from app.schemas.sse import (
     CitationEvent,
     DoneEvent,
     ErrorEvent,
+    SourcesEvent,
     StatusEvent,
     TokenEvent,
 )
-from app.services.search_service import SearchService
+from app.services.admission import SYNTHESIS_OVERLOADED, AdmissionRejectedError
+from app.services.search_service import SYNTHESIS_DEADLINE_EXCEEDED, SearchService
 
 
 @pytest.mark.unit
@@ -102,7 +106,7 @@ class TestSearchServiceStreaming:
         """Mock permission service."""
         service = MagicMock()
         service.get_permitted_kb_ids = AsyncMock(return_value=["kb-123"])
-        service.check_permission = AsyncMock(return_value=True)
+        service.check_permissions = AsyncMock(return_value=True)
         return service
 
     @pytest.fixture
@@ -139,7 +143,7 @@ class TestSearchServiceStreaming:
         """Create SearchService with mocked dependencies."""
         # Mock qdrant_service to avoid initialization
         with patch("app.services.search_service.qdrant_service") as mock_qdrant_service:
-            mock_qdrant_service.client = MagicMock()
+            mock_qdrant_service.async_client = AsyncMock()
 
             service = SearchService(
                 permission_service=mock_permission_service,
@@ -147,7 +151,7 @@ class TestSearchServiceStreaming:
                 citation_service=mock_citation_service,
             )
             # Keep mock active for test
-            service.qdrant_client = MagicMock()
+            service.qdrant_client = AsyncMock()
             return service
 
     @pytest.fixture
@@ -245,6 +249,157 @@ class TestSearchServiceStreaming:
                     assert 0.0 <= done_events[0].confidence <= 1.0
                     assert done_events[0].result_count > 0
 
+    async def test_sources_event_precedes_synthesis(self, search_service):
+        """With include_sources, results are streamed before the LLM is called."""
+        llm_started_after: list[type] = []
+        events = []
+
+        async def mock_llm_stream(*args, **kwargs):
+            llm_started_after.append(type(events[-1]))
+            yield "OAuth."
+
+        search_service._embed_query = AsyncMock(return_value=[0.1] * 1536)
+        search_service._search_collections = AsyncMock(
+            return_value=[
+                {
+                    "document_id": "doc-123",
+                    "document_name": "Test.pdf",
+                    "kb_id": "kb-123",
+                    "kb_name": "Test KB",
+                    "chunk_text": "OAuth 2.0",
+                    "score": 0.92,
+                    "char_start": 100,
+                    "char_end": 200,
+                }
+            ]
+        )
+        search_service._synthesize_answer_stream = mock_llm_stream
+
+        async for event in search_service._search_stream(
+            query="test",
+            kb_ids=["kb-123"],
+            user_id="user-1",
+            limit=10,
+            include_sources=True,
+        ):
+            events.append(event)
+
+        assert isinstance(events[1], SourcesEvent)
+        assert events[1].result_count == 1
+        assert events[1].results[0]["document_id"] == "doc-123"
+        assert llm_started_after == [StatusEvent]
+
+    async def test_shed_synthesis_streams_sources_and_flags_done(self, search_service):
+        """An overloaded LLM ends the stream with sources and a skipped flag."""
+
+        async def overloaded_stream(*args, **kwargs):
+            raise AdmissionRejectedError("synthesis", "timeout")
+            yield  # pragma: no cover
+
+        search_service._embed_query = AsyncMock(return_value=[0.1] * 1536)
+        search_service._search_collections = AsyncMock(
+            return_value=[
+                {
+                    "document_id": "doc-123",
+                    "document_name": "Test.pdf",
+                    "kb_id": "kb-123",
+                    "kb_name": "Test KB",
+                    "chunk_text": "OAuth 2.0",
+                    "score": 0.92,
+                    "char_start": 100,
+                    "char_end": 200,
+                }
+            ]
+        )
+        search_service._synthesize_answer_stream = overloaded_stream
+
+        events = [
+            event
+            async for event in search_service._search_stream(
+                query="test", kb_ids=["kb-123"], user_id="user-1", limit=10
+            )
+        ]
+
+        assert not any(isinstance(e, TokenEvent | ErrorEvent) for e in events)
+        assert isinstance(events[-2], SourcesEvent)
+        assert events[-1].synthesis_skipped == SYNTHESIS_OVERLOADED
+        assert events[-1].result_count == 1
+
+    async def test_confidence_scores_the_packed_sources(self, search_service):
+        """Confidence reflects the sources the answer was built from."""
+
+        async def mock_llm_stream(*args, **kwargs):
+            yield "OAuth [1]"
+
+        chunk = {
+            "document_id": "doc-123",
+            "document_name": "Test.pdf",
+            "kb_id": "kb-123",
+            "kb_name": "Test KB",
+            "score": 0.9,
+        }
+        search_service._embed_query = AsyncMock(return_value=[0.1] * 1536)
+        # Two touching chunks of one document are packed into one source
+        search_service._search_collections = AsyncMock(
+            return_value=[
+                {**chunk, "chunk_text": "OAuth 2.0", "char_start": 0, "char_end": 9},
+                {**chunk, "chunk_text": "flows", "char_start": 10, "char_end": 15},
+            ]
+        )
+        search_service._synthesize_answer_stream = mock_llm_stream
+
+        events = [
+            event
+            async for event in search_service._search_stream(
+                query="test", kb_ids=["kb-123"], user_id="user-1", limit=10
+            )
+        ]
+
+        # One source at 0.9: 0.9 * 0.4 + (1 / 3) * 0.3 + 0.9 * 0.3
+        assert events[-1].result_count == 2
+        assert events[-1].confidence == pytest.approx(0.73)
+
+    async def test_slow_synthesis_stops_at_deadline(self, search_service):
+        """A stream that outlives the latency budget ends with the sources."""
+
+        async def slow_stream(*args, **kwargs):
+            yield "OAuth "
+            await asyncio.sleep(1)
+            yield "2.0"  # pragma: no cover
+
+        search_service._embed_query = AsyncMock(return_value=[0.1] * 1536)
+        search_service._search_collections = AsyncMock(
+            return_value=[
+                {
+                    "document_id": "doc-123",
+                    "document_name": "Test.pdf",
+                    "kb_id": "kb-123",
+                    "kb_name": "Test KB",
+                    "chunk_text": "OAuth 2.0",
+                    "score": 0.92,
+                    "char_start": 100,
+                    "char_end": 200,
+                }
+            ]
+        )
+        search_service._synthesize_answer_stream = slow_stream
+
+        events = [
+            event
+            async for event in search_service._search_stream(
+                query="test",
+                kb_ids=["kb-123"],
+                user_id="user-1",
+                limit=10,
+                deadline=Deadline(50),
+            )
+        ]
+
+        assert [e.content for e in events if isinstance(e, TokenEvent)] == ["OAuth "]
+        assert isinstance(events[-2], SourcesEvent)
+        assert events[-1].synthesis_skipped == SYNTHESIS_DEADLINE_EXCEEDED
+        assert events[-1].confidence == 0.0
+
     async def test_citation_event_emitted_when_marker_detected(
         self,
         search_service,
@@ -0,0 +1,319 @@
+"""Unit tests for the semantic answer cache."""
+
+import math
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from app.core.config import settings
+from app.schemas.citation import Citation
+from app.services.search_service import KBMetadata, SearchService
+from app.services.semantic_cache import SemanticAnswerCache
+
+pytestmark = pytest.mark.unit
+
+EMBEDDING = [0.1, 0.2, 0.3]
+
+
+@pytest.fixture
+def generations():
+    """Index generations returned for any KB set."""
+    values = {"kb-a": "0", "kb-b": "0"}
+
+    async def get_index_generations(kb_ids):
+        return {kb: values[kb] for kb in sorted(set(kb_ids))}
+
+    with patch(
+        "app.services.semantic_cache.get_index_generations", get_index_generations
+    ):
+        yield values
+
+
+@pytest.fixture
+def mock_qdrant():
+    """Async Qdrant client stand-in with an existing cache collection."""
+    client = AsyncMock()
+    client.collection_exists.return_value = True
+    client.search.return_value = []
+    with patch("app.services.semantic_cache.qdrant_service") as service:
+        service.async_client = client
+        yield client
+
+
+def _citation() -> Citation:
+    return Citation(
+        number=1,
+        document_id="doc-1",
+        document_name="Auth.pdf",
+        excerpt="OAuth 2.0 with PKCE.",
+        char_start=0,
+        char_end=20,
+        confidence=0.9,
+    )
+
+
+async def test_lookup_miss_counts_and_returns_key(generations, mock_qdrant):
+    cache = SemanticAnswerCache(threshold=0.9)
+
+    cached, key = await cache.lookup(EMBEDDING, ["kb-a"])
+
+    assert cached is None
+    assert key is not None
+    call = mock_qdrant.search.call_args.kwargs
+    assert call["score_threshold"] == 0.9
+    assert call["limit"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+async def test_lookup_hit_returns_cached_answer(generations, mock_qdrant):
+    cache = SemanticAnswerCache()
+    mock_qdrant.search.return_value = [
+        MagicMock(
+            score=0.97,
+            payload={
+                "answer": "OAuth [1].",
+                "citations": [_citation().model_dump()],
+                "confidence": 0.8,
+            },
+        )
+    ]
+
+    cached, _ = await cache.lookup(EMBEDDING, ["kb-a"])
+
+    assert cached.answer == "OAuth [1]."
+    assert cached.citations == [_citation()]
+    assert cached.confidence == 0.8
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["hit_ratio"] == 1.0
+    assert stats["avg_hit_similarity"] == 0.97
+
+
+async def test_key_depends_on_kb_set_and_generation(generations, mock_qdrant):
+    """Re-indexing a KB changes the generation; a different KB set changes both."""
+    cache = SemanticAnswerCache()
+
+    _, key_a = await cache.lookup(EMBEDDING, ["kb-a", "kb-b"])
+    _, key_a_reordered = await cache.lookup(EMBEDDING, ["kb-b", "kb-a"])
+    _, key_other_set = await cache.lookup(EMBEDDING, ["kb-a"])
+    generations["kb-b"] = "1"
+    _, key_reindexed = await cache.lookup(EMBEDDING, ["kb-a", "kb-b"])
+
+    assert key_a == key_a_reordered
+    assert key_other_set.kb_set != key_a.kb_set
+    assert key_reindexed.kb_set == key_a.kb_set
+    assert key_reindexed.generation != key_a.generation
+
+
+async def test_store_upserts_and_prunes_old_generations(generations, mock_qdrant):
+    cache = SemanticAnswerCache()
+    _, key = await cache.lookup(EMBEDDING, ["kb-a"])
+
+    await cache.store(key, EMBEDDING, "OAuth [1].", [_citation()], 0.8)
+
+    point = mock_qdrant.upsert.call_args.kwargs["points"][0]
+    assert point.payload["answer"] == "OAuth [1]."
+    assert point.payload["generation"] == key.generation
+    mock_qdrant.delete.assert_awaited_once()
+    assert cache.get_stats()["stores"] == 1
+
+
+async def test_store_deletes_expired_points(generations, mock_qdrant):
+    """Expired answers of any KB set are removed, not just skipped on lookup."""
+    cache = SemanticAnswerCache(ttl_seconds=60)
+    _, key = await cache.lookup(EMBEDDING, ["kb-a"])
+
+    with patch("app.services.semantic_cache.time.time", return_value=1000.0):
+        await cache.store(key, EMBEDDING, "OAuth [1].", [_citation()], 0.8)
+
+    selector = mock_qdrant.delete.call_args.kwargs["points_selector"]
+    stale_generation, expired = selector.filter.should
+    assert stale_generation.must_not[0].match.value == key.generation
+    assert expired.key == "created_at"
+    assert expired.range.lt == 940.0
+
+
+async def test_store_skipped_without_key(mock_qdrant):
+    await SemanticAnswerCache().store(None, EMBEDDING, "answer", [], 0.5)
+
+    mock_qdrant.upsert.assert_not_called()
+
+
+async def test_collection_created_on_first_use(generations, mock_qdrant):
+    mock_qdrant.collection_exists.return_value = False
+    cache = SemanticAnswerCache()
+
+    await cache.lookup(EMBEDDING, ["kb-a"])
+    await cache.lookup(EMBEDDING, ["kb-a"])
+
+    mock_qdrant.create_collection.assert_awaited_once()
+    assert mock_qdrant.create_payload_index.await_count == 3
+
+
+async def test_concurrent_collection_create_is_not_an_error(generations, mock_qdrant):
+    """Losing the create race to another worker still leaves the cache usable."""
+    mock_qdrant.collection_exists.side_effect = [False, True]
+    mock_qdrant.create_collection.side_effect = RuntimeError("already exists")
+    cache = SemanticAnswerCache()
+
+    await cache.lookup(EMBEDDING, ["kb-a"])
+    await cache.lookup(EMBEDDING, ["kb-a"])
+
+    assert mock_qdrant.search.await_count == 2
+    assert cache.get_stats()["errors"] == 0
+    mock_qdrant.create_collection.assert_awaited_once()
+
+
+def _at_similarity(similarity: float) -> list[float]:
+    """Unit vector with the given cosine similarity to [1, 0, 0]."""
+    return [similarity, math.sqrt(1 - similarity**2), 0.0]
+
+
+async def test_related_but_distinct_question_is_not_served(generations):
+    """ada-002 scores related questions ~0.96; they must not share an answer."""
+    client = AsyncQdrantClient(location=":memory:")
+    cache = SemanticAnswerCache()
+    with patch("app.services.semantic_cache.qdrant_service") as service:
+        service.async_client = client
+        _, key = await cache.lookup([1.0, 0.0, 0.0], ["kb-a"])
+        await cache.store(key, [1.0, 0.0, 0.0], "OAuth [1].", [_citation()], 0.8)
+
+        related, _ = await cache.lookup(_at_similarity(0.96), ["kb-a"])
+        rephrased, _ = await cache.lookup(_at_similarity(0.995), ["kb-a"])
+
+    assert related is None
+    assert rephrased is not None
+    assert rephrased.answer == "OAuth [1]."
+    await client.close()
+
+
+async def test_qdrant_failure_is_a_miss(generations, mock_qdrant):
+    mock_qdrant.search.side_effect = ConnectionError("qdrant down")
+    cache = SemanticAnswerCache()
+
+    cached, key = await cache.lookup(EMBEDDING, ["kb-a"])
+
+    assert cached is None
+    assert key is None
+    assert cache.get_stats()["errors"] == 1
+
+
+@pytest.fixture
+def search_service(monkeypatch):
+    monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+    permission_service = AsyncMock()
+    permission_service.check_permissions.return_value = True
+    service = SearchService(
+        permission_service=permission_service, audit_service=AsyncMock()
+    )
+    service._embed_query = AsyncMock(return_value=EMBEDDING)
+    service._search_collections = AsyncMock(
+        return_value=[
+            {
+                "document_id": "doc-1",
+                "document_name": "Auth.pdf",
+                "kb_id": "kb-a",
+                "chunk_text": "OAuth 2.0 with PKCE.",
+                "score": 0.9,
+                "char_start": 0,
+                "char_end": 20,
+            }
+        ]
+    )
+    service._synthesize_answer = AsyncMock(return_value="OAuth [1].")
+
+    async def synthesize_answer_stream(_query, _sources):
+        for token in ("OAuth ", "[1]."):
+            yield token
+
+    service._synthesize_answer_stream = MagicMock(side_effect=synthesize_answer_stream)
+    service._get_kb_metadata = AsyncMock(
+        return_value=KBMetadata(semantic_cache_allowed=True)
+    )
+    return service
+
+
+async def test_search_skips_synthesis_on_semantic_hit(search_service):
+    cached = MagicMock(answer="Cached [1].", citations=[_citation()], confidence=0.7)
+    with patch(
+        "app.services.search_service.semantic_answer_cache.lookup",
+        AsyncMock(return_value=(cached, MagicMock())),
+    ):
+        response = await search_service.search("how do we log in?", ["kb-a"], "u1")
+
+    assert response.answer == "Cached [1]."
+    assert response.confidence == 0.7
+    search_service._synthesize_answer.assert_not_called()
+
+
+async def test_search_stores_answer_on_semantic_miss(search_service):
+    key = MagicMock()
+    with (
+        patch(
+            "app.services.search_service.semantic_answer_cache.lookup",
+            AsyncMock(return_value=(None, key)),
+        ),
+        patch(
+            "app.services.search_service.semantic_answer_cache.store", AsyncMock()
+        ) as store,
+    ):
+        await search_service.search("how do we log in?", ["kb-a"], "u1")
+
+    search_service._synthesize_answer.assert_awaited_once()
+    assert store.call_args.args[0] is key
+
+
+async def test_search_respects_per_kb_toggle(search_service):
+    search_service._get_kb_metadata.return_value = KBMetadata(
+        semantic_cache_allowed=False
+    )
+    with patch(
+        "app.services.search_service.semantic_answer_cache.lookup", AsyncMock()
+    ) as lookup:
+        await search_service.search("how do we log in?", ["kb-a"], "u1")
+
+    lookup.assert_not_called()
+    search_service._synthesize_answer.assert_awaited_once()
+
+
+async def test_stream_replays_semantic_hit(search_service):
+    """The SSE path reuses a near-duplicate's answer instead of the LLM."""
+    cached = MagicMock(answer="Cached [1].", citations=[_citation()], confidence=0.7)
+    with patch(
+        "app.services.search_service.semantic_answer_cache.lookup",
+        AsyncMock(return_value=(cached, MagicMock())),
+    ):
+        stream = await search_service.search(
+            "how do we log in?", ["kb-a"], "u1", stream=True
+        )
+        events = [event async for event in stream]
+
+    tokens = "".join(e.content for e in events if e.type == "token")
+    assert tokens == "Cached [1]."
+    assert [e.data["number"] for e in events if e.type == "citation"] == [1]
+    assert events[-1].confidence == 0.7
+    search_service._synthesize_answer_stream.assert_not_called()
+
+
+async def test_stream_stores_answer_on_semantic_miss(search_service):
+    key = MagicMock()
+    with (
+        patch(
+            "app.services.search_service.semantic_answer_cache.lookup",
+            AsyncMock(return_value=(None, key)),
+        ),
+        patch(
+            "app.services.search_service.semantic_answer_cache.store", AsyncMock()
+        ) as store,
+    ):
+        stream = await search_service.search(
+            "how do we log in?", ["kb-a"], "u1", stream=True
+        )
+        [event async for event in stream]
+
+    search_service._synthesize_answer_stream.assert_called_once()
+    stored_key, _, answer, citations, _ = store.call_args.args
+    assert stored_key is key
+    assert answer == "OAuth [1]."
+    assert [c.number for c in citations] == [1]
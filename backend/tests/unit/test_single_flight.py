@@ -0,0 +1,118 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.unit
+
+
+async def test_concurrent_identical_calls_share_one_call():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def embed():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [0.1, 0.2]
+
+    results = await asyncio.gather(*(flight.do("q", embed) for _ in range(10)))
+
+    assert calls == 1
+    assert results == [[0.1, 0.2]] * 10
+    stats = flight.get_stats()
+    assert stats["calls"] == 1
+    assert stats["coalesced"] == 9
+    assert stats["in_flight"] == 0
+
+
+async def test_different_keys_are_not_coalesced():
+    flight = SingleFlight("test")
+    fn = AsyncMock(return_value="ok")
+
+    await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+
+    assert fn.await_count == 2
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("litellm down")
+
+    results = await asyncio.gather(
+        flight.do("q", fail), flight.do("q", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert flight.get_stats()["calls"] == 1
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flight.do("q", slow))
+    second = asyncio.create_task(flight.do("q", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+async def test_remote_holder_result_is_read_from_cache(monkeypatch):
+    """A worker that loses the Redis lock polls the shared cache."""
+    monkeypatch.setattr(settings, "single_flight_distributed", True)
+    monkeypatch.setattr(settings, "single_flight_poll_interval_ms", 1)
+    redis = AsyncMock()
+    redis.set.return_value = None  # lock held by another worker
+    redis.exists.return_value = 1
+    lookup = AsyncMock(side_effect=[None, [0.5]])
+    fn = AsyncMock()
+    flight = SingleFlight("test")
+
+    with patch(
+        "app.services.single_flight.RedisClient.get_client",
+        AsyncMock(return_value=redis),
+    ):
+        result = await flight.do("q", fn, lookup=lookup)
+
+    assert result == [0.5]
+    fn.assert_not_called()
+    assert flight.get_stats()["remote_coalesced"] == 1
+
+
+async def test_lock_holder_makes_call_and_releases(monkeypatch):
+    monkeypatch.setattr(settings, "single_flight_distributed", True)
+    redis = AsyncMock()
+    redis.set.return_value = True
+    flight = SingleFlight("test")
+
+    with patch(
+        "app.services.single_flight.RedisClient.get_client",
+        AsyncMock(return_value=redis),
+    ):
+        result = await flight.do("q", AsyncMock(return_value=[0.5]), lookup=AsyncMock())
+
+    assert result == [0.5]
+    redis.eval.assert_awaited_once()
+
+
+async def test_disabled_calls_through(monkeypatch):
+    monkeypatch.setattr(settings, "single_flight_enabled", False)
+    flight = SingleFlight("test")
+    fn = AsyncMock(return_value="ok")
+
+    await asyncio.gather(flight.do("q", fn), flight.do("q", fn))
+
+    assert fn.await_count == 2
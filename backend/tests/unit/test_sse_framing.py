@@ -0,0 +1,103 @@
+"""Unit tests for SSE token coalescing and frame encoding."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.schemas.sse import CitationEvent, DoneEvent, SourcesEvent, TokenEvent
+from app.services.sse_framing import coalesce_token_events, encode_sse_frame
+
+pytestmark = pytest.mark.unit
+
+
+async def _events(*events, delay: float = 0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+async def test_consecutive_tokens_are_merged():
+    source = _events(
+        TokenEvent(content="OAuth "),
+        TokenEvent(content="2.0 "),
+        TokenEvent(content="is used."),
+        DoneEvent(confidence=0.8, result_count=1),
+    )
+
+    events = await _collect(coalesce_token_events(source, 1000, 1000))
+
+    assert [type(e) for e in events] == [TokenEvent, DoneEvent]
+    assert events[0].content == "OAuth 2.0 is used."
+
+
+async def test_citation_flushes_pending_text_first():
+    """A citation still follows the text containing its marker."""
+    citation = CitationEvent(data={"number": 1})
+    source = _events(
+        TokenEvent(content="OAuth "),
+        TokenEvent(content="[1] "),
+        citation,
+        TokenEvent(content="done."),
+    )
+
+    events = await _collect(coalesce_token_events(source, 1000, 1000))
+
+    assert events == [
+        TokenEvent(content="OAuth [1] "),
+        citation,
+        TokenEvent(content="done."),
+    ]
+
+
+async def test_flush_on_size():
+    source = _events(*(TokenEvent(content="abcd") for _ in range(4)))
+
+    events = await _collect(coalesce_token_events(source, 1000, 8))
+
+    assert [e.content for e in events] == ["abcdabcd", "abcdabcd"]
+
+
+async def test_flush_on_interval_when_llm_stalls():
+    """Buffered text is sent after the interval even if no new token arrives."""
+    source = _events(TokenEvent(content="a"), TokenEvent(content="b"), delay=0.1)
+
+    events = await _collect(coalesce_token_events(source, 20, 1000))
+
+    assert [e.content for e in events] == ["a", "b"]
+
+
+async def test_closing_stream_closes_source():
+    closed = asyncio.Event()
+
+    async def source():
+        try:
+            yield TokenEvent(content="a")
+            await asyncio.sleep(10)
+            yield TokenEvent(content="b")
+        finally:
+            closed.set()
+
+    stream = coalesce_token_events(source(), 10, 1000)
+    assert (await anext(stream)).content == "a"
+    await stream.aclose()
+
+    assert closed.is_set()
+
+
+def test_encode_sse_frame_matches_pydantic_output():
+    for event in (
+        TokenEvent(content='say "hi" ✓'),
+        SourcesEvent(results=[{"document_id": "doc-1"}], result_count=1),
+        DoneEvent(confidence=0.5, result_count=2, partial_kbs=["kb-1"]),
+    ):
+        frame = encode_sse_frame(event)
+
+        assert frame.startswith(b"data: ")
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame[6:]) == json.loads(event.model_dump_json())
@@ -0,0 +1,75 @@
+"""Unit tests for stage timing, Server-Timing and stage histograms."""
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from app.core.timing import StageTimer, format_server_timing, server_timings
+
+pytestmark = pytest.mark.unit
+
+
+def _observations(operation: str, stage: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "lumikb_stage_duration_seconds_count",
+            {"operation": operation, "stage": stage},
+        )
+        or 0.0
+    )
+
+
+async def _noop() -> str:
+    return "ok"
+
+
+async def test_run_records_stage_and_histogram():
+    before = _observations("test_op", "embed")
+    timer = StageTimer("test_op")
+
+    assert await timer.run("embed", _noop()) == "ok"
+
+    assert "embed" in timer.as_dict()
+    assert _observations("test_op", "embed") == before + 1
+
+
+async def test_measure_records_on_failure():
+    timer = StageTimer()
+
+    with pytest.raises(ValueError), timer.measure("parse"):
+        raise ValueError("bad input")
+
+    assert "parse" in timer.as_dict()
+
+
+async def test_stages_reported_to_request_collector():
+    timings: dict[str, float] = {}
+    token = server_timings.set(timings)
+    try:
+        await StageTimer("test_op").run("acl", _noop())
+    finally:
+        server_timings.reset(token)
+
+    assert list(timings) == ["acl"]
+
+
+def test_format_server_timing():
+    assert (
+        format_server_timing({"acl": 1.2, "embed": 35.0})
+        == "acl;dur=1.2, embed;dur=35.0"
+    )
+
+
+async def test_response_carries_server_timing(client: AsyncClient):
+    response = await client.get("/api/health")
+
+    assert "total;dur=" in response.headers["Server-Timing"]
+
+
+async def test_metrics_endpoint_exposes_stage_histogram(client: AsyncClient):
+    await StageTimer("test_op").run("qdrant", _noop())
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "lumikb_stage_duration_seconds_bucket" in response.text